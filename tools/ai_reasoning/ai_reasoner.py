@@ -133,7 +133,10 @@ class AIReasoner:
             llm_provider=self.llm_provider,
             max_depth=args.max_depth,
             branching_factor=args.branching_factor,
-            beam_width=args.beam_width
+            beam_width=args.beam_width,
+            max_concurrency=args.max_concurrency,
+            batch_generations=args.batch_generations,
+            transposition_table=args.transposition_table
         )
 
         with TracingContext(self.tracer, "ToT Exploration", tags=["tot"]) as trace_id:
@@ -315,6 +318,12 @@ def create_parser():
     tot_parser.add_argument("--max-depth", type=int, default=3)
     tot_parser.add_argument("--branching-factor", type=int, default=3)
     tot_parser.add_argument("--beam-width", type=int, default=2)
+    tot_parser.add_argument("--max-concurrency", type=int, default=1,
+                           help="Maximum LLM requests in flight")
+    tot_parser.add_argument("--batch-generations", action="store_true",
+                           help="Request all branches of a node in one call")
+    tot_parser.add_argument("--transposition-table", action="store_true",
+                           help="Merge duplicate thoughts and reuse their scores")
     tot_parser.add_argument("--visualize", action="store_true")
     tot_parser.add_argument("--output-format", choices=["text", "json"], default="text")
 
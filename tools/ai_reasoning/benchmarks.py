@@ -0,0 +1,848 @@
+"""
+Benchmarks for the AI Reasoning Framework.
+
+Every benchmark runs offline against MockLLMProvider with injected latency,
+so the numbers measure how many provider round trips a code path waits on
+rather than model speed. Each benchmark returns a list of result
+dictionaries; running the module prints them as tables.
+
+Examples:
+    python benchmarks.py tot
+    python benchmarks.py tot --latency 0.05 --concurrency 1 4 16
+    python benchmarks.py tot-cache
+    python benchmarks.py pool --requests 2000 --clients 16
+    python benchmarks.py context --entries 10000
+    python benchmarks.py restore --entries 10000
+    python benchmarks.py templates --renders 100000
+    python benchmarks.py evaluate --questions 1000 --concurrency 1 16 64
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from chain_of_thought import ChainOfThoughtReasoner, ReasoningStrategy
+from context_manager import ContextManager
+from evaluator import BenchmarkEvaluator
+from llm_providers import LLMProviderPool, MockLLMProvider, SchedulingMode
+from prompt_templates import PromptTemplate, PromptTemplateLibrary
+from tree_of_thought import SearchStrategy, TreeOfThoughtsExplorer
+
+
+BENCHMARK_QUESTION = (
+    "How should we split a monolithic order service into independently "
+    "deployable components?"
+)
+
+
+# Paraphrases of a few ideas, so generated thoughts repeat up to case,
+# punctuation and spacing the way sampled LLM output tends to.
+TRANSPOSITION_QUESTIONS = [
+    BENCHMARK_QUESTION,
+    "Which caching layer should sit in front of the pricing API?",
+    "How do we roll out a schema migration without downtime?",
+    "What is the safest way to rotate the service credentials?",
+]
+TRANSPOSITION_THOUGHTS = [
+    "Start from the data each component owns.",
+    "Start from the data each component owns",
+    "Measure the current bottlenecks first.",
+    "start from the data each component owns.",
+    "Measure the current bottlenecks first!",
+    "Ship it behind a feature flag.",
+    "ship it behind a feature flag",
+]
+
+
+class _MemoryReasoningCache:
+    """In-process stand-in for ReasoningCache's transposition methods."""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, Dict[str, Any]] = {}
+
+    def get_transpositions(self, problem: str) -> Optional[Dict[str, Any]]:
+        return self.tables.get(problem)
+
+    def cache_transpositions(self, problem: str, table: Dict[str, Any]) -> str:
+        self.tables[problem] = table
+        return problem
+
+
+def print_results(title: str, results: List[Dict[str, Any]]) -> None:
+    """Print benchmark results as a plain-text table."""
+    if not results:
+        print(f"{title}: no results")
+        return
+
+    headers = list(results[0].keys())
+    rows = [[str(result.get(h, "")) for h in headers] for result in results]
+    widths = [
+        max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)
+    ]
+
+    print(f"\n{title}")
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(cell.ljust(w) for cell, w in zip(row, widths)))
+
+
+async def benchmark_tot(
+    latency: float = 0.05,
+    max_depth: int = 3,
+    branching_factor: int = 3,
+    beam_width: int = 2,
+    concurrency: Sequence[int] = (1, 4, 16),
+    strategies: Sequence[SearchStrategy] = (
+        SearchStrategy.BEAM_SEARCH,
+        SearchStrategy.BREADTH_FIRST,
+    ),
+) -> List[Dict[str, Any]]:
+    """
+    Compare sequential and fanned-out Tree-of-Thoughts exploration.
+
+    max_concurrency=1 reproduces the one-request-at-a-time behaviour; the
+    other rows fan out sibling generations and evaluations, and the
+    "+batch" rows also request all branches of a node in one call.
+
+    Args:
+        latency: Simulated seconds per provider request
+        max_depth: Tree depth
+        branching_factor: Children per node
+        beam_width: Beam width for beam search
+        concurrency: max_concurrency values to compare
+        strategies: Search strategies to run
+
+    Returns:
+        One result dictionary per strategy and mode
+    """
+    results: List[Dict[str, Any]] = []
+
+    for strategy in strategies:
+        baseline = None
+        modes = [(c, False) for c in concurrency] + [(max(concurrency), True)]
+        for max_concurrency, batch in modes:
+            provider = MockLLMProvider(latency=latency)
+            explorer = TreeOfThoughtsExplorer(
+                provider,
+                max_depth=max_depth,
+                branching_factor=branching_factor,
+                beam_width=beam_width,
+                max_concurrency=max_concurrency,
+                batch_generations=batch,
+            )
+
+            start = time.perf_counter()
+            result = await explorer.explore(BENCHMARK_QUESTION, strategy=strategy)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+
+            results.append({
+                "strategy": strategy.value,
+                "max_concurrency": max_concurrency,
+                "batch": batch,
+                "nodes": result.total_nodes,
+                "requests": provider.request_count,
+                "elapsed_s": round(elapsed, 2),
+                "serial_latencies": round(elapsed / latency, 1),
+                "speedup": round(baseline / elapsed, 1),
+            })
+
+    return results
+
+
+async def benchmark_tot_cache(
+    questions: Sequence[str] = tuple(TRANSPOSITION_QUESTIONS),
+    repeats: int = 2,
+    max_depth: int = 3,
+    branching_factor: int = 3,
+    beam_width: int = 2,
+) -> List[Dict[str, Any]]:
+    """
+    Count LLM requests with and without the ToT transposition table.
+
+    Every question is explored `repeats` times, each time by a new explorer
+    as a separate process would, so with the table enabled later runs are
+    served from the shared reasoning cache.
+
+    Args:
+        questions: Benchmark question set
+        repeats: Explorations per question
+        max_depth: Tree depth
+        branching_factor: Children per node
+        beam_width: Beam width for beam search
+
+    Returns:
+        One result dictionary per mode and run
+    """
+    results: List[Dict[str, Any]] = []
+
+    for transpositions in (False, True):
+        reasoning_cache = _MemoryReasoningCache() if transpositions else None
+        for run in range(repeats):
+            requests = saved = nodes = 0
+            for question in questions:
+                provider = MockLLMProvider(responses=TRANSPOSITION_THOUGHTS, latency=0)
+                explorer = TreeOfThoughtsExplorer(
+                    provider,
+                    max_depth=max_depth,
+                    branching_factor=branching_factor,
+                    beam_width=beam_width,
+                    reasoning_cache=reasoning_cache,
+                )
+                result = await explorer.explore(
+                    question, strategy=SearchStrategy.BEAM_SEARCH
+                )
+                requests += provider.request_count
+                saved += result.metadata.get("llm_calls_saved", 0)
+                nodes += result.total_nodes
+
+            results.append({
+                "transposition_table": transpositions,
+                "run": run + 1,
+                "questions": len(questions),
+                "nodes": nodes,
+                "requests": requests,
+                "llm_calls_saved": saved,
+            })
+
+    return results
+
+
+def _latency_distribution(
+    rng: random.Random,
+    median: float,
+    sigma: float,
+    tail_probability: float,
+    tail_factor: float,
+):
+    """Log-normal latencies around a median with an occasional slow tail."""
+    def sample() -> float:
+        latency = rng.lognormvariate(0.0, sigma) * median
+        if rng.random() < tail_probability:
+            latency *= tail_factor
+        return latency
+    return sample
+
+
+async def benchmark_pool(
+    requests: int = 2000,
+    clients: int = 16,
+    latency: float = 0.05,
+    sigma: float = 0.3,
+    tail_probability: float = 0.03,
+    tail_factor: float = 20.0,
+    slow_factor: float = 3.0,
+    failure_rate: float = 0.3,
+    max_concurrency: int = 8,
+    seed: int = 7,
+) -> List[Dict[str, Any]]:
+    """
+    Compare round-robin and adaptive LLMProviderPool scheduling.
+
+    The pool holds two healthy providers, one that is slow_factor times
+    slower, and one that is as fast as the healthy ones but fails at
+    failure_rate. All of them hit a slow tail with tail_probability.
+    `clients` workers issue `requests` requests back to back.
+
+    Args:
+        requests: Total requests
+        clients: Concurrent callers
+        latency: Median seconds per request for a healthy provider
+        sigma: Log-normal shape of the latency distribution
+        tail_probability: Chance of a tail_factor slower request
+        tail_factor: Slowdown of tail requests
+        slow_factor: Slowdown of the degraded provider
+        failure_rate: Failure probability of the flaky provider
+        max_concurrency: Requests in flight per provider (adaptive modes)
+        seed: Seed for the latency distributions
+
+    Returns:
+        One result dictionary per scheduling mode
+    """
+    modes = [
+        ("round_robin", SchedulingMode.ROUND_ROBIN, None),
+        ("adaptive", SchedulingMode.ADAPTIVE, None),
+        ("adaptive+hedge", SchedulingMode.ADAPTIVE, 0.95),
+    ]
+    results: List[Dict[str, Any]] = []
+
+    for name, mode, hedge_percentile in modes:
+        random.seed(seed)
+        rng = random.Random(seed)
+        medians = [latency, latency, latency * slow_factor, latency]
+        providers = [
+            MockLLMProvider(
+                latency=_latency_distribution(
+                    rng, median, sigma, tail_probability, tail_factor
+                ),
+                failure_rate=failure_rate if i == 3 else 0.0,
+            )
+            for i, median in enumerate(medians)
+        ]
+        pool = LLMProviderPool(
+            providers,
+            mode=mode,
+            max_concurrency=max_concurrency,
+            hedge_percentile=hedge_percentile,
+        )
+
+        latencies: List[float] = []
+        errors = 0
+        remaining = iter(range(requests))
+
+        async def client() -> None:
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    await pool.generate("Summarize the incident timeline.")
+                except RuntimeError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+        cut = statistics.quantiles(latencies, n=100)
+        results.append({
+            "mode": name,
+            "ok": len(latencies),
+            "errors": errors,
+            "p50_ms": round(cut[49] * 1000, 1),
+            "p99_ms": round(cut[98] * 1000, 1),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+            "hedges": sum(stats.hedges for stats in pool.stats),
+            "provider_requests": "/".join(str(p.request_count) for p in providers),
+            "elapsed_s": round(elapsed, 2),
+        })
+
+    return results
+
+
+class HashEmbeddingModel:
+    """Deterministic pseudo-random embeddings, one request per text."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.requests = 0
+
+    async def embed(self, text: str) -> List[float]:
+        self.requests += 1
+        return self._vector(text).tolist()
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32)
+
+
+class BatchHashEmbeddingModel(HashEmbeddingModel):
+    """The same embeddings, with a single request for a batch of texts."""
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.requests += 1
+        return [self._vector(text).tolist() for text in texts]
+
+
+def _list_search(
+    manager: ContextManager, query: List[float], top_k: int, threshold: float
+) -> List[Any]:
+    """Similarity search as a per-entry Python loop over embedding lists."""
+    similarities = []
+    for entry in manager.context_window.entries:
+        if entry.embedding:
+            similarity = manager._cosine_similarity(query, list(entry.embedding))
+            if similarity >= threshold:
+                similarities.append((entry, similarity))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+async def benchmark_context(
+    entries: int = 10000,
+    dim: int = 384,
+    queries: int = 20,
+    top_k: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Restore a long session with load_from_redis and search it.
+
+    The session is written to an in-memory fakeredis server, once with
+    embeddings persisted next to the entries and once in the older format
+    without them, which makes the restore re-embed every entry.
+
+    Args:
+        entries: Entries in the session
+        dim: Embedding dimension
+        queries: Similarity searches to time
+        top_k: Results per search
+
+    Returns:
+        One result dictionary per restore and search path
+    """
+    import fakeredis.aioredis
+
+    redis_client = fakeredis.aioredis.FakeRedis()
+    writer = ContextManager(
+        max_tokens=entries * 100,
+        redis_client=redis_client,
+        embedding_model=BatchHashEmbeddingModel(dim),
+    )
+    await writer.add_entries([
+        {"content": f"Step {i}: observation about component {i % 97}",
+         "role": "user" if i % 2 else "assistant", "tokens": 20}
+        for i in range(entries)
+    ])
+
+    results: List[Dict[str, Any]] = []
+
+    async def restore(model: HashEmbeddingModel) -> ContextManager:
+        manager = ContextManager(
+            max_tokens=entries * 100, redis_client=redis_client, embedding_model=model
+        )
+        start = time.perf_counter()
+        await manager.load_from_redis("benchmark")
+        results.append({
+            "operation": "load_from_redis",
+            "variant": (
+                "embeddings persisted" if not stripped
+                else "re-embed, " + ("batched" if hasattr(model, "embed_batch")
+                                     else "per entry")
+            ),
+            "entries": len(manager.context_window.entries),
+            "embed_requests": model.requests,
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+        })
+        return manager
+
+    stripped = False
+    manager = await restore(BatchHashEmbeddingModel(dim))
+
+    query_vectors = [
+        manager.embedding_model._vector(f"query {i}").tolist() for i in range(queries)
+    ]
+    for variant, search in (
+        ("python lists", lambda q: _list_search(manager, q, top_k, 0.0)),
+        ("float32 matrix", lambda q: manager.context_window.embeddings.search(
+            q, top_k, 0.0)),
+    ):
+        start = time.perf_counter()
+        for query in query_vectors:
+            search(query)
+        results.append({
+            "operation": "similarity search",
+            "variant": variant,
+            "entries": len(manager.context_window.entries),
+            "embed_requests": 0,
+            "ms": round((time.perf_counter() - start) * 1000 / queries, 2),
+        })
+
+    # Older sessions were persisted without embeddings
+    stripped = True
+    async for key in redis_client.scan_iter("context:entry:*"):
+        data = json.loads(await redis_client.get(key))
+        data.pop("embedding_f32", None)
+        await redis_client.set(key, json.dumps(data))
+    await restore(HashEmbeddingModel(dim))
+    await restore(BatchHashEmbeddingModel(dim))
+
+    await redis_client.aclose()
+    return results
+
+
+async def _restore_per_key(redis_client: Any, session_id: str) -> int:
+    """Restore a session with one GET round trip per entry."""
+    ids = await redis_client.lrange(ContextManager._session_key(session_id), 0, -1)
+    entries = []
+    for entry_id in ids:
+        value = await redis_client.get(f"context:entry:{entry_id.decode()}")
+        if value:
+            entries.append(ContextManager._deserialize_entry(value))
+    return len(entries)
+
+
+async def benchmark_restore(
+    entries: int = 10000,
+    dim: int = 384,
+    write_batch_size: int = 256,
+    window: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Measure session persistence and restore for a long-running agent.
+
+    An agent adds `entries` entries one at a time, first writing each one
+    through to fakeredis and then through the write-behind buffer. The
+    session is then restored per key, eagerly with pipelined MGETs, and
+    lazily (recent window first), including the first similarity search
+    that pages the older entries in.
+
+    Args:
+        entries: Entries in the session
+        dim: Embedding dimension
+        write_batch_size: Write-behind batch size
+        window: Recent entries a lazy restore loads first
+
+    Returns:
+        One result dictionary per write and restore path
+    """
+    import fakeredis.aioredis
+
+    results: List[Dict[str, Any]] = []
+    items = [
+        (f"Step {i}: observation about component {i % 97}",
+         "user" if i % 2 else "assistant")
+        for i in range(entries)
+    ]
+
+    for batch_size in (1, write_batch_size):
+        redis_client = fakeredis.aioredis.FakeRedis()
+        async with ContextManager(
+            max_tokens=entries * 100,
+            redis_client=redis_client,
+            embedding_model=BatchHashEmbeddingModel(dim),
+            session_id="agent",
+            write_batch_size=batch_size,
+        ) as writer:
+            start = time.perf_counter()
+            for content, role in items:
+                await writer.add_entry(content, role, 20)
+            await writer.flush()
+            results.append({
+                "operation": "add_entry x N",
+                "variant": "write-through" if batch_size == 1
+                else f"write-behind ({batch_size})",
+                "entries": entries,
+                "ms": round((time.perf_counter() - start) * 1000, 1),
+            })
+
+    def reader(lazy_window: int = window) -> ContextManager:
+        return ContextManager(
+            max_tokens=entries * 100,
+            sliding_window_size=lazy_window,
+            redis_client=redis_client,
+            embedding_model=BatchHashEmbeddingModel(dim),
+        )
+
+    start = time.perf_counter()
+    count = await _restore_per_key(redis_client, "agent")
+    results.append({
+        "operation": "restore", "variant": "GET per entry", "entries": count,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    })
+
+    start = time.perf_counter()
+    count = await reader().load_from_redis("agent")
+    results.append({
+        "operation": "restore", "variant": "eager, pipelined MGET", "entries": count,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    })
+
+    manager = reader()
+    start = time.perf_counter()
+    count = await manager.load_from_redis("agent", lazy=True)
+    await manager.get_context(max_entries=window)
+    results.append({
+        "operation": "restore", "variant": f"lazy, last {window}", "entries": count,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    })
+
+    start = time.perf_counter()
+    await manager.search_similar("component 42", top_k=5, similarity_threshold=0.0)
+    results.append({
+        "operation": "first search_similar",
+        "variant": "pages in older entries",
+        "entries": len(manager.context_window.entries),
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    })
+
+    await redis_client.aclose()
+    return results
+
+
+def _render_by_replace(template: PromptTemplate, **kwargs: Any) -> str:
+    """Render the way PromptTemplate did before templates were compiled."""
+    rendered = template.template
+    for var, value in kwargs.items():
+        rendered = rendered.replace(f"{{{var}}}", str(value))
+    return rendered
+
+
+def benchmark_templates(
+    renders: int = 100000,
+    repeats: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Measure prompt rendering throughput over the built-in templates.
+
+    Each path renders every built-in template in turn, `renders` times in
+    total: the old per-variable str.replace loop, PromptTemplate.render on
+    the cached compiled form, and the same two through a library lookup
+    by name (max() over the versions vs the latest-version pointer).
+    Each path reports its best of `repeats` runs.
+
+    Args:
+        renders: Total renders per path
+        repeats: Timed runs per path
+
+    Returns:
+        One result dictionary per rendering path
+    """
+    library = PromptTemplateLibrary()
+    templates = library.list_templates()
+    values = [
+        {var: f"value of {var} " * 8 for var in template.variables}
+        for template in templates
+    ]
+    jobs = [
+        (templates[i % len(templates)], values[i % len(templates)])
+        for i in range(renders)
+    ]
+
+    def latest(name: str) -> PromptTemplate:
+        versions = library.templates[name]
+        return versions[max(versions.keys())]
+
+    paths = [
+        ("PromptTemplate", "str.replace per variable",
+         lambda t, v: _render_by_replace(t, **v)),
+        ("PromptTemplate", "compiled, single join",
+         lambda t, v: t.render(**v)),
+        ("PromptTemplateLibrary", "max(versions) + str.replace",
+         lambda t, v: _render_by_replace(latest(t.name), **v)),
+        ("PromptTemplateLibrary", "latest pointer + compiled",
+         lambda t, v: library.render(t.name, **v)),
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for api, variant, render in paths:
+        elapsed = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for template, kwargs in jobs:
+                render(template, kwargs)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        results.append({
+            "api": api,
+            "variant": variant,
+            "templates": len(templates),
+            "renders_per_sec": round(renders / elapsed),
+            "us_per_render": round(elapsed * 1e6 / renders, 2),
+        })
+    return results
+
+
+async def benchmark_evaluate(
+    questions: int = 1000,
+    latency: float = 0.05,
+    concurrency: Sequence[int] = (1, 16, 64),
+    item_timeout: float = 30.0,
+) -> List[Dict[str, Any]]:
+    """
+    Measure BenchmarkEvaluator.run_benchmark on a synthetic dataset.
+
+    A zero-shot CoT reasoner answers `questions` questions against
+    MockLLMProvider, with results written to a JSONL file. The run is
+    repeated at each concurrency level; the last level is then resumed
+    after dropping the final tenth of its results file, as if it had been
+    interrupted.
+
+    Args:
+        questions: Dataset size
+        latency: Simulated seconds per LLM request
+        concurrency: Items in flight per run
+        item_timeout: Seconds allowed per item
+
+    Returns:
+        One result dictionary per run
+    """
+    dataset = [
+        {"id": str(i), "question": f"Question {i}: {BENCHMARK_QUESTION}",
+         "answer": "mock response"}
+        for i in range(questions)
+    ]
+    results: List[Dict[str, Any]] = []
+
+    async def run(limit: int, path: str, label: str) -> None:
+        provider = MockLLMProvider(latency=latency)
+        benchmark = BenchmarkEvaluator(MockLLMProvider(latency=latency))
+        start = time.perf_counter()
+        report = await benchmark.run_benchmark(
+            dataset,
+            ChainOfThoughtReasoner(provider, max_steps=3),
+            strategy=ReasoningStrategy.ZERO_SHOT,
+            concurrency=limit,
+            item_timeout=item_timeout,
+            results_path=path,
+            cost_model="gpt-4o",
+        )
+        summary = report["strategies"]["zero_shot"]
+        results.append({
+            "run": label,
+            "concurrency": limit,
+            "items_run": questions - report["resumed"],
+            "errors": summary["errors"],
+            "wall_s": round(time.perf_counter() - start, 2),
+            "p50_ms": round(summary["latency_ms"]["p50"], 1),
+            "p99_ms": round(summary["latency_ms"]["p99"], 1),
+            "p50_tokens": summary["tokens"]["p50"],
+            "cost_usd": round(summary["total_cost_usd"], 4),
+        })
+
+    with tempfile.TemporaryDirectory() as directory:
+        for limit in concurrency:
+            path = os.path.join(directory, f"results-{limit}.jsonl")
+            await run(limit, path, "full")
+
+        with open(path) as f:
+            lines = f.readlines()
+        with open(path, "w") as f:
+            f.writelines(lines[:len(lines) - len(lines) // 10])
+        await run(concurrency[-1], path, "resumed")
+
+    return results
+
+
+def main() -> None:
+    """Run benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="AI Reasoning benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    tot_parser = subparsers.add_parser(
+        "tot", help="Tree-of-Thoughts sibling fan-out"
+    )
+    tot_parser.add_argument("--latency", type=float, default=0.05)
+    tot_parser.add_argument("--max-depth", type=int, default=3)
+    tot_parser.add_argument("--branching-factor", type=int, default=3)
+    tot_parser.add_argument("--beam-width", type=int, default=2)
+    tot_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+
+    cache_parser = subparsers.add_parser(
+        "tot-cache", help="Tree-of-Thoughts transposition table"
+    )
+    cache_parser.add_argument("--repeats", type=int, default=2)
+    cache_parser.add_argument("--max-depth", type=int, default=3)
+    cache_parser.add_argument("--branching-factor", type=int, default=3)
+    cache_parser.add_argument("--beam-width", type=int, default=2)
+
+    pool_parser = subparsers.add_parser(
+        "pool", help="LLMProviderPool scheduling under skewed latency"
+    )
+    pool_parser.add_argument("--requests", type=int, default=2000)
+    pool_parser.add_argument("--clients", type=int, default=16)
+    pool_parser.add_argument("--latency", type=float, default=0.05)
+    pool_parser.add_argument("--sigma", type=float, default=0.3)
+    pool_parser.add_argument("--tail-probability", type=float, default=0.03)
+    pool_parser.add_argument("--tail-factor", type=float, default=20.0)
+    pool_parser.add_argument("--slow-factor", type=float, default=3.0)
+    pool_parser.add_argument("--failure-rate", type=float, default=0.3)
+    pool_parser.add_argument("--max-concurrency", type=int, default=8)
+
+    context_parser = subparsers.add_parser(
+        "context", help="ContextManager restore and similarity search"
+    )
+    context_parser.add_argument("--entries", type=int, default=10000)
+    context_parser.add_argument("--dim", type=int, default=384)
+    context_parser.add_argument("--queries", type=int, default=20)
+
+    restore_parser = subparsers.add_parser(
+        "restore", help="ContextManager write-behind and lazy session restore"
+    )
+    restore_parser.add_argument("--entries", type=int, default=10000)
+    restore_parser.add_argument("--dim", type=int, default=384)
+    restore_parser.add_argument("--write-batch-size", type=int, default=256)
+    restore_parser.add_argument("--window", type=int, default=10)
+
+    templates_parser = subparsers.add_parser(
+        "templates", help="Prompt template rendering throughput"
+    )
+    templates_parser.add_argument("--renders", type=int, default=100000)
+    templates_parser.add_argument("--repeats", type=int, default=3)
+
+    evaluate_parser = subparsers.add_parser(
+        "evaluate", help="BenchmarkEvaluator concurrent, resumable runs"
+    )
+    evaluate_parser.add_argument("--questions", type=int, default=1000)
+    evaluate_parser.add_argument("--latency", type=float, default=0.05)
+    evaluate_parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 16, 64]
+    )
+    evaluate_parser.add_argument("--item-timeout", type=float, default=30.0)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.command == "tot":
+        results = asyncio.run(benchmark_tot(
+            latency=args.latency,
+            max_depth=args.max_depth,
+            branching_factor=args.branching_factor,
+            beam_width=args.beam_width,
+            concurrency=args.concurrency,
+        ))
+        print_results("TreeOfThoughtsExplorer.explore", results)
+    elif args.command == "tot-cache":
+        results = asyncio.run(benchmark_tot_cache(
+            repeats=args.repeats,
+            max_depth=args.max_depth,
+            branching_factor=args.branching_factor,
+            beam_width=args.beam_width,
+        ))
+        print_results("ToT transposition table", results)
+    elif args.command == "pool":
+        results = asyncio.run(benchmark_pool(
+            requests=args.requests,
+            clients=args.clients,
+            latency=args.latency,
+            sigma=args.sigma,
+            tail_probability=args.tail_probability,
+            tail_factor=args.tail_factor,
+            slow_factor=args.slow_factor,
+            failure_rate=args.failure_rate,
+            max_concurrency=args.max_concurrency,
+        ))
+        print_results("LLMProviderPool.generate", results)
+    elif args.command == "context":
+        results = asyncio.run(benchmark_context(
+            entries=args.entries,
+            dim=args.dim,
+            queries=args.queries,
+        ))
+        print_results("ContextManager", results)
+    elif args.command == "restore":
+        results = asyncio.run(benchmark_restore(
+            entries=args.entries,
+            dim=args.dim,
+            write_batch_size=args.write_batch_size,
+            window=args.window,
+        ))
+        print_results("ContextManager session persistence", results)
+    elif args.command == "templates":
+        results = benchmark_templates(
+            renders=args.renders,
+            repeats=args.repeats,
+        )
+        print_results("Prompt template rendering", results)
+    elif args.command == "evaluate":
+        results = asyncio.run(benchmark_evaluate(
+            questions=args.questions,
+            latency=args.latency,
+            concurrency=args.concurrency,
+            item_timeout=args.item_timeout,
+        ))
+        print_results("BenchmarkEvaluator.run_benchmark", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,16 +11,21 @@ Protocol Coverage:
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+import base64
 import hashlib
 import json
 import asyncio
 
+import numpy as np
+
 
 logger = logging.getLogger(__name__)
 
+ENTRY_TTL_SECONDS = 86400  # 24h expiry for persisted entries
+
 
 @dataclass
 class ContextEntry:
@@ -45,6 +50,115 @@ class ContextEntry:
         }
 
 
+class EmbeddingMatrix:
+    """
+    Float32 matrix of unit-length entry embeddings.
+
+    Row i belongs to the i-th entry it was built from. Entries without a
+    usable embedding (missing, zero, or of another dimension) keep a zero
+    row and are masked out of searches. Storage doubles as it grows, so
+    appends are amortized O(1).
+    """
+
+    def __init__(self) -> None:
+        self.dim: Optional[int] = None
+        self.ids: List[str] = []
+        self._rows = np.zeros((0, 0), dtype=np.float32)
+        self._valid = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def matches(self, entries: Sequence[ContextEntry]) -> bool:
+        """Check that the rows still line up with a list of entries."""
+        return len(entries) == len(self.ids) and (
+            not entries or entries[-1].id == self.ids[-1]
+        )
+
+    def extend(self, entries: Sequence[ContextEntry]) -> None:
+        """Append one row per entry."""
+        vectors = [
+            np.asarray(entry.embedding, dtype=np.float32).ravel()
+            if entry.embedding else None
+            for entry in entries
+        ]
+        if self.dim is None:
+            first = next((v for v in vectors if v is not None), None)
+            if first is not None:
+                self.dim = first.shape[0]
+                self._rows = np.zeros((self._rows.shape[0], self.dim), dtype=np.float32)
+
+        start = len(self.ids)
+        self._reserve(start + len(entries))
+        self._rows[start:start + len(entries)] = 0.0
+        self._valid[start:start + len(entries)] = False
+
+        rows = [
+            start + offset for offset, vector in enumerate(vectors)
+            if vector is not None and vector.shape[0] == self.dim
+        ]
+        if rows:
+            block = np.stack([vectors[row - start] for row in rows])
+            norms = np.linalg.norm(block, axis=1)
+            usable = norms > 0
+            index = np.asarray(rows)[usable]
+            self._rows[index] = block[usable] / norms[usable, None]
+            self._valid[index] = True
+
+        self.ids.extend(entry.id for entry in entries)
+
+    def rebuild(self, entries: Sequence[ContextEntry]) -> None:
+        """Replace all rows with those of a new list of entries."""
+        self.ids = []
+        self.extend(entries)
+
+    def search(
+        self,
+        query: Sequence[float],
+        top_k: int,
+        threshold: float
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the rows most similar to a query with one matrix product.
+
+        Args:
+            query: Query embedding
+            top_k: Number of results to return
+            threshold: Minimum cosine similarity
+
+        Returns:
+            (row, similarity) tuples, most similar first
+        """
+        size = len(self.ids)
+        vector = np.asarray(query, dtype=np.float32).ravel()
+        if top_k <= 0 or size == 0 or self.dim is None or vector.shape[0] != self.dim:
+            return []
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return []
+
+        scores = self._rows[:size] @ (vector / norm)
+        candidates = np.flatnonzero(self._valid[:size] & (scores >= threshold))
+        if len(candidates) > top_k:
+            candidates = candidates[
+                np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            ]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(row), float(scores[row])) for row in order]
+
+    def _reserve(self, size: int) -> None:
+        """Grow storage to hold at least size rows."""
+        capacity = self._rows.shape[0]
+        if size <= capacity:
+            return
+        capacity = max(16, capacity * 2, size)
+        rows = np.zeros((capacity, self.dim or 0), dtype=np.float32)
+        rows[:len(self.ids)] = self._rows[:len(self.ids)]
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:len(self.ids)] = self._valid[:len(self.ids)]
+        self._rows, self._valid = rows, valid
+
+
 @dataclass
 class ContextWindow:
     """Represents a context window with entries."""
@@ -52,6 +166,7 @@ class ContextWindow:
     total_tokens: int
     max_tokens: int
     compression_ratio: float = 1.0
+    embeddings: EmbeddingMatrix = field(default_factory=EmbeddingMatrix)
 
     def is_full(self) -> bool:
         """Check if window is at capacity."""
@@ -74,7 +189,11 @@ class ContextManager:
         sliding_window_size: int = 10,
         compression_threshold: float = 0.8,
         redis_client: Optional[Any] = None,
-        embedding_model: Optional[Any] = None
+        embedding_model: Optional[Any] = None,
+        session_id: Optional[str] = None,
+        write_batch_size: int = 1,
+        flush_interval: float = 1.0,
+        page_size: int = 500
     ):
         """
         Initialize context manager.
@@ -85,12 +204,31 @@ class ContextManager:
             compression_threshold: Threshold to trigger compression
             redis_client: Redis client for persistence
             embedding_model: Model for generating embeddings
+            session_id: Session whose ordered entry index persisted entries
+                are appended to (set by load_from_redis as well)
+            write_batch_size: Entries buffered before a pipelined write to
+                Redis; 1 writes every entry as it is added
+            flush_interval: Seconds a partial batch may wait before it is
+                written anyway
+            page_size: Entries fetched per MGET when loading from Redis
         """
+        if write_batch_size < 1:
+            raise ValueError("write_batch_size must be at least 1")
         self.max_tokens = max_tokens
         self.sliding_window_size = sliding_window_size
         self.compression_threshold = compression_threshold
         self.redis_client = redis_client
         self.embedding_model = embedding_model
+        self.session_id = session_id
+        self.write_batch_size = write_batch_size
+        self.flush_interval = flush_interval
+        self.page_size = page_size
+
+        self._write_buffer: List[ContextEntry] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        # Index positions of older session entries not loaded yet
+        self._unloaded = 0
 
         self.context_window = ContextWindow(
             entries=[],
@@ -119,25 +257,49 @@ class ContextManager:
         Returns:
             Created ContextEntry
         """
-        entry_id = self._generate_entry_id(content, role)
+        entries = await self.add_entries([{
+            "content": content,
+            "role": role,
+            "tokens": tokens,
+            "metadata": metadata
+        }])
+        return entries[0]
+
+    async def add_entries(self, items: List[Dict[str, Any]]) -> List[ContextEntry]:
+        """
+        Add several entries, embedding them in one batch.
 
-        entry = ContextEntry(
-            id=entry_id,
-            content=content,
-            timestamp=datetime.now(),
-            role=role,
-            tokens=tokens,
-            metadata=metadata or {}
-        )
+        Args:
+            items: Dictionaries with content, role, tokens and optional
+                metadata keys (the arguments of add_entry)
 
-        # Generate embedding if model available
-        if self.embedding_model:
-            entry.embedding = await self._generate_embedding(content)
+        Returns:
+            Created ContextEntry objects
+        """
+        entries = [
+            ContextEntry(
+                id=self._generate_entry_id(item["content"], item["role"]),
+                content=item["content"],
+                timestamp=datetime.now(),
+                role=item["role"],
+                tokens=item["tokens"],
+                metadata=item.get("metadata") or {}
+            )
+            for item in items
+        ]
 
-        self.context_window.entries.append(entry)
-        self.context_window.total_tokens += tokens
+        # Generate embeddings if model available
+        if self.embedding_model:
+            embeddings = await self._generate_embeddings([e.content for e in entries])
+            for entry, embedding in zip(entries, embeddings):
+                entry.embedding = embedding
 
-        logger.debug(f"Added entry: {role}, {tokens} tokens")
+        self._sync_embeddings()
+        self.context_window.entries.extend(entries)
+        self.context_window.embeddings.extend(entries)
+        for entry in entries:
+            self.context_window.total_tokens += entry.tokens
+            logger.debug(f"Added entry: {entry.role}, {entry.tokens} tokens")
 
         # Check if compression needed
         if self._should_compress():
@@ -145,9 +307,10 @@ class ContextManager:
 
         # Persist to Redis if available
         if self.redis_client:
-            await self._persist_entry(entry)
+            for entry in entries:
+                await self._persist_entry(entry)
 
-        return entry
+        return entries
 
     async def get_context(
         self,
@@ -164,10 +327,17 @@ class ContextManager:
         Returns:
             List of context entries
         """
-        entries = self.context_window.entries
-
-        if not include_system:
-            entries = [e for e in entries if e.role != "system"]
+        def select() -> List[ContextEntry]:
+            entries = self.context_window.entries
+            if not include_system:
+                entries = [e for e in entries if e.role != "system"]
+            return entries
+
+        # Page older entries in until the request can be served
+        entries = select()
+        while self._unloaded and (max_entries is None or len(entries) < max_entries):
+            await self.load_older_entries(None if max_entries is None else self.page_size)
+            entries = select()
 
         if max_entries:
             entries = entries[-max_entries:]
@@ -185,6 +355,7 @@ class ContextManager:
             Compression statistics
         """
         logger.info("Starting context compression")
+        await self.load_older_entries()
 
         original_token_count = self.context_window.total_tokens
         original_entry_count = len(self.context_window.entries)
@@ -197,6 +368,8 @@ class ContextManager:
             logger.info("No entries to compress")
             return {"compressed": False}
 
+        older_tokens = sum(e.tokens for e in older_entries)
+
         # Summarize older entries
         if llm_provider:
             summary = await self._summarize_entries(older_entries, llm_provider)
@@ -213,14 +386,15 @@ class ContextManager:
             metadata={
                 "compressed": True,
                 "original_entries": len(older_entries),
-                "original_tokens": sum(e.tokens for e in older_entries)
+                "original_tokens": older_tokens
             }
         )
 
         # Update context window
         self.context_window.entries = [compressed_entry] + recent_entries
-        self.context_window.total_tokens = sum(
-            e.tokens for e in self.context_window.entries
+        self.context_window.embeddings.rebuild(self.context_window.entries)
+        self.context_window.total_tokens = (
+            original_token_count - older_tokens + compressed_entry.tokens
         )
 
         # Calculate compression ratio
@@ -268,21 +442,20 @@ class ContextManager:
             logger.warning("Embedding model not available for similarity search")
             return []
 
+        await self.load_older_entries()
+
         # Generate query embedding
         query_embedding = await self._generate_embedding(query)
 
-        # Calculate similarities
-        similarities = []
-        for entry in self.context_window.entries:
-            if entry.embedding:
-                similarity = self._cosine_similarity(query_embedding, entry.embedding)
-                if similarity >= similarity_threshold:
-                    similarities.append((entry, similarity))
-
-        # Sort by similarity
-        similarities.sort(key=lambda x: x[1], reverse=True)
-
-        return similarities[:top_k]
+        # Score every entry with one matrix-vector product
+        self._sync_embeddings()
+        entries = self.context_window.entries
+        return [
+            (entries[row], similarity)
+            for row, similarity in self.context_window.embeddings.search(
+                query_embedding, top_k, similarity_threshold
+            )
+        ]
 
     async def clear_context(self, keep_system: bool = True) -> None:
         """
@@ -292,6 +465,7 @@ class ContextManager:
             keep_system: Keep system messages
         """
         if keep_system:
+            await self.load_older_entries()
             system_entries = [
                 e for e in self.context_window.entries if e.role == "system"
             ]
@@ -300,7 +474,9 @@ class ContextManager:
         else:
             self.context_window.entries = []
             self.context_window.total_tokens = 0
+            self._unloaded = 0
 
+        self.context_window.embeddings.rebuild(self.context_window.entries)
         logger.info("Context cleared")
 
     async def get_summary(self, llm_provider: Optional[Any] = None) -> str:
@@ -313,6 +489,8 @@ class ContextManager:
         Returns:
             Context summary
         """
+        await self.load_older_entries()
+
         if not self.context_window.entries:
             return "No context available"
 
@@ -334,7 +512,9 @@ class ContextManager:
             "utilization": self.context_window.total_tokens / self.max_tokens,
             "compression_ratio": self.context_window.compression_ratio,
             "compression_count": len(self.compression_history),
-            "role_distribution": self._get_role_distribution()
+            "role_distribution": self._get_role_distribution(),
+            "unloaded_entries": self._unloaded,
+            "buffered_writes": len(self._write_buffer)
         }
 
     async def validate_context(self) -> Dict[str, Any]:
@@ -450,6 +630,34 @@ Provide a summary that captures the main points and decisions:
             logger.error(f"Failed to generate embedding: {e}")
             return []
 
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts.
+
+        Uses the model's embed_batch() when it has one, otherwise embeds
+        the texts concurrently.
+        """
+        if not self.embedding_model or not texts:
+            return [[] for _ in texts]
+
+        if not hasattr(self.embedding_model, "embed_batch"):
+            return list(await asyncio.gather(
+                *(self._generate_embedding(text) for text in texts)
+            ))
+
+        try:
+            embeddings = await self.embedding_model.embed_batch(texts)
+            return [list(embedding) for embedding in embeddings]
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}")
+            return [[] for _ in texts]
+
+    def _sync_embeddings(self) -> None:
+        """Rebuild the embedding matrix if entries were replaced directly."""
+        window = self.context_window
+        if not window.embeddings.matches(window.entries):
+            window.embeddings.rebuild(window.entries)
+
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between vectors."""
         if not vec1 or not vec2 or len(vec1) != len(vec2):
@@ -477,24 +685,100 @@ Provide a summary that captures the main points and decisions:
         return distribution
 
     async def _persist_entry(self, entry: ContextEntry) -> None:
-        """Persist entry to Redis."""
+        """Queue an entry for Redis, writing once a batch is full."""
         if not self.redis_client:
             return
 
-        try:
-            key = f"context:entry:{entry.id}"
-            value = json.dumps(entry.to_dict())
-            await self.redis_client.set(key, value, ex=86400)  # 24h expiry
-            logger.debug(f"Persisted entry to Redis: {entry.id}")
-        except Exception as e:
-            logger.error(f"Failed to persist entry to Redis: {e}")
+        self._write_buffer.append(entry)
+        if len(self._write_buffer) >= self.write_batch_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
 
-    async def load_from_redis(self, session_id: str) -> int:
+    async def flush(self) -> int:
+        """
+        Write buffered entries to Redis in one pipelined round trip.
+
+        Entries are appended to the session index (when there is a session)
+        in the order they were added. On failure they stay buffered for the
+        next flush.
+
+        Returns:
+            Number of entries written
+        """
+        if not self.redis_client or not self._write_buffer:
+            return 0
+
+        async with self._flush_lock:
+            batch, self._write_buffer = self._write_buffer, []
+            if not batch:
+                return 0
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for entry in batch:
+                pipe.set(
+                    f"context:entry:{entry.id}",
+                    self._serialize_entry(entry),
+                    ex=ENTRY_TTL_SECONDS
+                )
+            if self.session_id:
+                index_key = self._session_key(self.session_id)
+                pipe.rpush(index_key, *(entry.id for entry in batch))
+                pipe.expire(index_key, ENTRY_TTL_SECONDS)
+
+            try:
+                await pipe.execute()
+            except asyncio.CancelledError:
+                self._write_buffer[:0] = batch
+                raise
+            except Exception as e:
+                logger.error(f"Failed to persist entries to Redis: {e}")
+                self._write_buffer[:0] = batch
+                return 0
+
+            logger.debug(f"Persisted {len(batch)} entries to Redis")
+            return len(batch)
+
+    async def close(self) -> None:
+        """Flush buffered entries and stop the background flush timer."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
+
+    async def __aenter__(self) -> "ContextManager":
+        """Use the manager as an async context that flushes on exit."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Flush buffered entries on exit."""
+        await self.close()
+
+    async def _flush_later(self) -> None:
+        """Write a partial batch after flush_interval seconds."""
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def load_from_redis(self, session_id: str, lazy: bool = False) -> int:
         """
         Load context from Redis.
 
+        Sessions persisted with a session_id are read in order from their
+        index with pipelined MGETs of page_size entries. With lazy=True only
+        the most recent sliding_window_size entries are read; older entries
+        are paged in by load_older_entries(), which get_context,
+        search_similar, get_summary and compress_context call when they
+        need them. Entries persisted without a session are read eagerly;
+        a session with no index of its own only gets those, never entries
+        indexed under another session.
+
         Args:
             session_id: Session identifier
+            lazy: Load only the recent window now
 
         Returns:
             Number of entries loaded
@@ -504,34 +788,149 @@ Provide a summary that captures the main points and decisions:
             return 0
 
         try:
-            pattern = f"context:entry:*"
-            keys = await self.redis_client.keys(pattern)
-
-            for key in keys:
-                value = await self.redis_client.get(key)
-                if value:
-                    entry_dict = json.loads(value)
-                    entry = ContextEntry(
-                        id=entry_dict["id"],
-                        content=entry_dict["content"],
-                        timestamp=datetime.fromisoformat(entry_dict["timestamp"]),
-                        role=entry_dict["role"],
-                        tokens=entry_dict["tokens"],
-                        metadata=entry_dict.get("metadata", {})
-                    )
-                    self.context_window.entries.append(entry)
-
-            self.context_window.total_tokens = sum(
-                e.tokens for e in self.context_window.entries
+            await self.flush()
+            self.session_id = session_id
+            index_key = self._session_key(session_id)
+
+            total = await self.redis_client.llen(index_key)
+            if total:
+                start = max(0, total - self.sliding_window_size) if lazy else 0
+                ids = await self.redis_client.lrange(index_key, start, -1)
+                loaded = await self._fetch_entries(ids)
+                self._unloaded = start
+            else:
+                loaded = await self._fetch_unindexed_entries()
+
+            await self._embed_missing(loaded)
+            self._sync_embeddings()
+            self.context_window.entries.extend(loaded)
+            self.context_window.embeddings.extend(loaded)
+            self.context_window.total_tokens += sum(e.tokens for e in loaded)
+
+            logger.info(
+                f"Loaded {len(loaded)} entries from Redis "
+                f"({self._unloaded} older entries not loaded yet)"
             )
-
-            logger.info(f"Loaded {len(keys)} entries from Redis")
-            return len(keys)
+            return len(loaded)
 
         except Exception as e:
             logger.error(f"Failed to load context from Redis: {e}")
             return 0
 
+    async def load_older_entries(self, limit: Optional[int] = None) -> int:
+        """
+        Page in session entries older than those loaded by a lazy restore.
+
+        Args:
+            limit: Maximum entries to load, all remaining if None
+
+        Returns:
+            Number of entries loaded
+        """
+        if not self._unloaded or not self.redis_client:
+            return 0
+
+        count = self._unloaded if limit is None else min(limit, self._unloaded)
+        start = self._unloaded - count
+        ids = await self.redis_client.lrange(
+            self._session_key(self.session_id), start, self._unloaded - 1
+        )
+        older = await self._fetch_entries(ids)
+        self._unloaded = start
+
+        await self._embed_missing(older)
+        self.context_window.entries[:0] = older
+        self.context_window.embeddings.rebuild(self.context_window.entries)
+        self.context_window.total_tokens += sum(e.tokens for e in older)
+
+        logger.debug(f"Paged in {len(older)} older entries")
+        return len(older)
+
+    async def _fetch_entries(self, ids: Sequence[Any]) -> List[ContextEntry]:
+        """MGET entries by id, page_size at a time, skipping expired ones."""
+        entries = []
+        for offset in range(0, len(ids), self.page_size):
+            keys = [
+                f"context:entry:{self._decode(entry_id)}"
+                for entry_id in ids[offset:offset + self.page_size]
+            ]
+            for value in await self.redis_client.mget(keys):
+                if value:
+                    entries.append(self._deserialize_entry(value))
+        return entries
+
+    async def _fetch_unindexed_entries(self) -> List[ContextEntry]:
+        """
+        Load entries persisted without a session index, oldest first.
+
+        Entries listed in any session's index belong to that session and
+        are skipped, so a new session never picks up another one's context.
+        """
+        indexed = set()
+        async for index_key in self.redis_client.scan_iter(
+            match=self._session_key("*")
+        ):
+            for entry_id in await self.redis_client.lrange(index_key, 0, -1):
+                indexed.add(f"context:entry:{self._decode(entry_id)}")
+
+        keys = [
+            key for key in await self.redis_client.keys("context:entry:*")
+            if self._decode(key) not in indexed
+        ]
+        entries = []
+        for offset in range(0, len(keys), self.page_size):
+            for value in await self.redis_client.mget(keys[offset:offset + self.page_size]):
+                if value:
+                    entries.append(self._deserialize_entry(value))
+        entries.sort(key=lambda e: e.timestamp)
+        return entries
+
+    async def _embed_missing(self, entries: List[ContextEntry]) -> None:
+        """Embed, in one batch, entries persisted without embeddings."""
+        missing = [e for e in entries if not e.embedding]
+        if self.embedding_model and missing:
+            embeddings = await self._generate_embeddings([e.content for e in missing])
+            for entry, embedding in zip(missing, embeddings):
+                entry.embedding = embedding
+
+    @staticmethod
+    def _serialize_entry(entry: ContextEntry) -> str:
+        """Encode an entry for Redis, its embedding as base64 float32."""
+        data = entry.to_dict()
+        if entry.embedding:
+            vector = np.asarray(entry.embedding, dtype="<f4")
+            data["embedding_f32"] = base64.b64encode(vector.tobytes()).decode("ascii")
+        return json.dumps(data)
+
+    @staticmethod
+    def _deserialize_entry(value: Any) -> ContextEntry:
+        """Decode an entry written by _serialize_entry."""
+        entry_dict = json.loads(value)
+        embedding = entry_dict.get("embedding")
+        if "embedding_f32" in entry_dict:
+            embedding = np.frombuffer(
+                base64.b64decode(entry_dict["embedding_f32"]), dtype="<f4"
+            ).tolist()
+        return ContextEntry(
+            id=entry_dict["id"],
+            content=entry_dict["content"],
+            timestamp=datetime.fromisoformat(entry_dict["timestamp"]),
+            role=entry_dict["role"],
+            tokens=entry_dict["tokens"],
+            embedding=embedding,
+            metadata=entry_dict.get("metadata", {})
+        )
+
+    @staticmethod
+    def _session_key(session_id: str) -> str:
+        """Redis list holding a session's entry ids in order."""
+        return f"context:session:{session_id}:entries"
+
+    @staticmethod
+    def _decode(value: Any) -> str:
+        """Turn a Redis reply into str."""
+        return value.decode() if isinstance(value, bytes) else value
+
 
 # Example usage
 if __name__ == "__main__":
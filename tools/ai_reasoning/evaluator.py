@@ -10,15 +10,26 @@ Protocol Coverage:
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from contextvars import ContextVar
+import json
+import os
 import statistics
 import asyncio
+import time
+
+from cost_tracker import CostTracker
 
 
 logger = logging.getLogger(__name__)
 
+# Token usage of the benchmark item running in the current task
+_item_usage: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "benchmark_item_usage", default=None
+)
+
 
 class MetricType(Enum):
     """Evaluation metric types."""
@@ -421,6 +432,74 @@ Provide only the average score as a decimal (e.g., 0.85):
         )
 
 
+class _UsageMeter:
+    """
+    Provider wrapper that attributes token usage to the current benchmark item.
+
+    Reasoners accumulate tokens on themselves, which is meaningless once
+    several items share a reasoner concurrently. The meter adds each
+    response's usage to the item recorded in a context variable instead;
+    tasks a reasoner fans out copy the context and so report to the same item.
+    """
+
+    def __init__(self, provider: Any):
+        self._provider = provider
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._provider, name)
+
+    async def generate(self, *args, **kwargs) -> Any:
+        response = await self._provider.generate(*args, **kwargs)
+        self._record(response)
+        return response
+
+    async def generate_many(self, *args, **kwargs) -> List[Any]:
+        responses = await self._provider.generate_many(*args, **kwargs)
+        for response in responses:
+            self._record(response)
+        return responses
+
+    @staticmethod
+    def _record(response: Any) -> None:
+        usage = _item_usage.get()
+        if usage is None:
+            return
+
+        metadata = response.metadata or {}
+        input_tokens = metadata.get("prompt_tokens", metadata.get("input_tokens", 0))
+        output_tokens = metadata.get(
+            "completion_tokens", metadata.get("output_tokens", 0)
+        )
+        if not input_tokens and not output_tokens:
+            output_tokens = response.token_count
+
+        usage["input_tokens"] += input_tokens
+        usage["output_tokens"] += output_tokens
+        model = usage["cost_model"] or response.model
+        by_model = usage["by_model"].setdefault(model, [0, 0])
+        by_model[0] += input_tokens
+        by_model[1] += output_tokens
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    """Mean and nearest-rank percentiles of a sample."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def at(percentile: float) -> float:
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+    return {
+        "mean": statistics.mean(ordered),
+        "p50": at(0.50),
+        "p90": at(0.90),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": ordered[-1],
+    }
+
+
 class BenchmarkEvaluator:
     """Evaluator for benchmark datasets."""
 
@@ -433,59 +512,247 @@ class BenchmarkEvaluator:
         """
         self.llm_provider = llm_provider
         self.evaluator = ReasoningEvaluator(llm_provider)
+        self.cost_tracker = CostTracker()
+        self._prices: Dict[str, Tuple[float, float]] = {}
 
     async def run_benchmark(
         self,
         dataset: List[Dict[str, str]],
         reasoner: Any,
-        strategy: Optional[Any] = None
+        strategy: Optional[Any] = None,
+        strategies: Optional[Sequence[Any]] = None,
+        concurrency: int = 1,
+        item_timeout: Optional[float] = None,
+        results_path: Optional[str] = None,
+        cost_model: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Run benchmark evaluation.
 
+        Up to `concurrency` items are reasoned about and evaluated at once.
+        An item that fails or exceeds `item_timeout` is recorded with an
+        error instead of aborting the run. With `results_path`, every
+        finished item is appended to a JSONL file as soon as it completes,
+        and items already recorded there without an error are skipped, so
+        an interrupted run resumes where it stopped.
+
         Args:
-            dataset: List of question-answer pairs
+            dataset: List of question-answer pairs; an item's "id" (or its
+                index) identifies it across resumed runs
             reasoner: CoT or ToT reasoner
             strategy: Reasoning strategy
+            strategies: Several strategies to run every item with
+                (overrides `strategy`)
+            concurrency: Maximum items in flight
+            item_timeout: Seconds allowed per item (reasoning and evaluation)
+            results_path: JSONL file for incremental, resumable results
+            cost_model: Model whose pricing is used for cost (defaults to
+                the model reported by each response)
 
         Returns:
-            Benchmark results
+            Benchmark results, with latency, token and cost percentiles
+            per strategy
         """
-        results = []
-        correct = 0
-        total = len(dataset)
-
-        for item in dataset:
-            question = item["question"]
-            ground_truth = item["answer"]
-
-            # Run reasoning
-            result = await reasoner.reason(question, strategy=strategy)
-
-            # Evaluate
-            evaluations = await self.evaluator.evaluate_cot(result, ground_truth)
-
-            # Check accuracy
-            if "accuracy" in evaluations:
-                if evaluations["accuracy"].score >= 0.8:
-                    correct += 1
+        strategies = list(strategies) if strategies else [strategy]
+        jobs = [
+            (str(item.get("id", index)), item, run_strategy)
+            for index, item in enumerate(dataset)
+            for run_strategy in strategies
+        ]
 
-            results.append({
-                "question": question,
-                "answer": result.final_answer,
-                "ground_truth": ground_truth,
-                "evaluations": {k: v.to_dict() for k, v in evaluations.items()}
-            })
+        records = self._load_results(results_path)
+        pending = []
+        for item_id, item, run_strategy in jobs:
+            record = records.get((item_id, self._strategy_name(run_strategy)))
+            if record is None or "error" in record:
+                pending.append((item_id, item, run_strategy))
+        resumed = len(jobs) - len(pending)
+        if resumed:
+            logger.info(f"Resuming benchmark: {resumed} of {len(jobs)} items done")
+
+        metered = hasattr(reasoner, "llm_provider")
+        if metered:
+            provider = reasoner.llm_provider
+            reasoner.llm_provider = _UsageMeter(provider)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        results_file = self._open_results(results_path) if results_path else None
+
+        async def run(job: Tuple[str, Dict[str, str], Any]) -> None:
+            item_id, item, run_strategy = job
+            async with semaphore:
+                record = await self._run_item(
+                    item_id, item, reasoner, run_strategy,
+                    item_timeout, cost_model, metered
+                )
+            records[(item_id, record["strategy"])] = record
+            if results_file:
+                results_file.write(json.dumps(record) + "\n")
+                results_file.flush()
 
+        try:
+            await asyncio.gather(*(run(job) for job in pending))
+        finally:
+            if results_file:
+                results_file.close()
+            if metered:
+                reasoner.llm_provider = provider
+
+        results = [
+            records[(item_id, self._strategy_name(run_strategy))]
+            for item_id, _, run_strategy in jobs
+        ]
+        correct = sum(1 for record in results if record.get("correct"))
+        total = len(results)
         accuracy = correct / total if total > 0 else 0.0
 
         return {
             "total_questions": total,
             "correct": correct,
             "accuracy": accuracy,
+            "resumed": resumed,
+            "strategies": self._summarize(results),
             "results": results
         }
 
+    async def _run_item(
+        self,
+        item_id: str,
+        item: Dict[str, str],
+        reasoner: Any,
+        strategy: Optional[Any],
+        item_timeout: Optional[float],
+        cost_model: Optional[str],
+        metered: bool
+    ) -> Dict[str, Any]:
+        """Reason about and evaluate one item, recording its usage."""
+        question = item["question"]
+        ground_truth = item["answer"]
+        record: Dict[str, Any] = {
+            "item_id": item_id,
+            "strategy": self._strategy_name(strategy),
+            "question": question,
+            "ground_truth": ground_truth
+        }
+        usage = {
+            "input_tokens": 0, "output_tokens": 0,
+            "cost_model": cost_model, "by_model": {}
+        }
+
+        async def reason_and_evaluate() -> None:
+            _item_usage.set(usage)
+            start = time.perf_counter()
+            result = await reasoner.reason(question, strategy=strategy)
+            record["latency_ms"] = (time.perf_counter() - start) * 1000
+
+            evaluations = await self.evaluator.evaluate_cot(result, ground_truth)
+
+            record["answer"] = result.final_answer
+            record["correct"] = (
+                "accuracy" in evaluations
+                and evaluations["accuracy"].score >= 0.8
+            )
+            record["evaluations"] = {k: v.to_dict() for k, v in evaluations.items()}
+            if not metered:
+                usage["output_tokens"] = result.token_count
+
+        try:
+            await asyncio.wait_for(reason_and_evaluate(), item_timeout)
+        except asyncio.TimeoutError:
+            record["error"] = f"timed out after {item_timeout}s"
+        except Exception as e:
+            logger.warning(f"Benchmark item {item_id} failed: {e}")
+            record["error"] = f"{type(e).__name__}: {e}"
+
+        record["input_tokens"] = usage["input_tokens"]
+        record["output_tokens"] = usage["output_tokens"]
+        record["tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        record["cost_usd"] = sum(
+            self._cost(model, input_tokens, output_tokens)
+            for model, (input_tokens, output_tokens) in usage["by_model"].items()
+        )
+        if "error" in record:
+            record["correct"] = False
+        return record
+
+    def _cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Cost of tokens at a model's pricing, looked up once per model."""
+        if model not in self._prices:
+            per_million = self.cost_tracker.estimate_cost(model, 1_000_000, 1_000_000)
+            self._prices[model] = (per_million.input_cost, per_million.output_cost)
+        input_price, output_price = self._prices[model]
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+    def _summarize(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Accuracy, errors and latency/token/cost percentiles per strategy."""
+        by_strategy: Dict[str, List[Dict[str, Any]]] = {}
+        for record in results:
+            by_strategy.setdefault(record["strategy"], []).append(record)
+
+        summary = {}
+        for name, records in by_strategy.items():
+            completed = [record for record in records if "error" not in record]
+            correct = sum(1 for record in completed if record["correct"])
+            summary[name] = {
+                "total_questions": len(records),
+                "correct": correct,
+                "accuracy": correct / len(records),
+                "errors": len(records) - len(completed),
+                "total_tokens": sum(record["tokens"] for record in records),
+                "total_cost_usd": sum(record["cost_usd"] for record in records),
+                "latency_ms": _percentiles(
+                    [record["latency_ms"] for record in completed]
+                ),
+                "tokens": _percentiles([record["tokens"] for record in completed]),
+                "cost_usd": _percentiles([record["cost_usd"] for record in completed])
+            }
+        return summary
+
+    @staticmethod
+    def _strategy_name(strategy: Optional[Any]) -> str:
+        """Label a strategy the way it is recorded in results."""
+        if strategy is None:
+            return "default"
+        return str(getattr(strategy, "value", strategy))
+
+    @staticmethod
+    def _open_results(results_path: str) -> Any:
+        """Open a results file for appending, after any partial last line."""
+        partial = False
+        if os.path.exists(results_path) and os.path.getsize(results_path):
+            with open(results_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                partial = f.read(1) != b"\n"
+
+        results_file = open(results_path, "a")
+        if partial:
+            results_file.write("\n")
+        return results_file
+
+    @staticmethod
+    def _load_results(
+        results_path: Optional[str]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Results recorded by a previous run, the last record per item winning."""
+        records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        if not results_path or not os.path.exists(results_path):
+            return records
+
+        with open(results_path) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A run killed mid-write leaves a partial last line
+                    logger.warning(
+                        f"Skipping unreadable line {line_number} of {results_path}"
+                    )
+                    continue
+                records[(record["item_id"], record["strategy"])] = record
+        return records
+
 
 # Example usage
 if __name__ == "__main__":
@@ -10,11 +10,15 @@ Protocol Coverage:
 """
 
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import (
+    Dict, Any, Optional, List, Set, Callable, Awaitable, Union, Sequence, Deque
+)
+from dataclasses import dataclass, field
+from collections import deque
 from enum import Enum
 import asyncio
 from abc import ABC, abstractmethod
+import random
 import time
 
 
@@ -88,6 +92,40 @@ class BaseLLMProvider(ABC):
         """Generate completion from prompt."""
         pass
 
+    async def generate_many(
+        self,
+        prompt: str,
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> List[LLMResponse]:
+        """
+        Generate n independent completions for the same prompt.
+
+        Providers whose API can return several choices per request override
+        this to make a single call; the default issues n concurrent calls.
+
+        Args:
+            prompt: Input prompt
+            n: Number of completions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per completion
+            **kwargs: Additional API parameters
+
+        Returns:
+            List of n LLMResponse objects
+        """
+        return list(await asyncio.gather(*(
+            self.generate(prompt, temperature, max_tokens, **kwargs)
+            for _ in range(n)
+        )))
+
+    @property
+    def native_batching(self) -> bool:
+        """Whether generate_many() makes one request rather than n."""
+        return type(self).generate_many is not BaseLLMProvider.generate_many
+
     async def _check_rate_limit(self) -> None:
         """Check and enforce rate limiting."""
         current_time = time.time()
@@ -210,6 +248,64 @@ class OpenAIProvider(BaseLLMProvider):
 
         return await self._retry_with_backoff(_make_request)
 
+    async def generate_many(
+        self,
+        prompt: str,
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> List[LLMResponse]:
+        """
+        Generate n completions in a single request using the n parameter.
+
+        The request's token usage is reported on the first response; the
+        others carry a token_count of 0 so totals are not double counted.
+
+        Args:
+            prompt: Input prompt
+            n: Number of completions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per completion
+            **kwargs: Additional API parameters
+
+        Returns:
+            List of n LLMResponse objects
+        """
+        await self._initialize_client()
+        await self._check_rate_limit()
+
+        async def _make_request():
+            response = await self._client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                n=n,
+                **kwargs
+            )
+
+            token_count = response.usage.total_tokens
+            self._total_tokens += token_count
+
+            return [
+                LLMResponse(
+                    text=choice.message.content,
+                    token_count=token_count if i == 0 else 0,
+                    provider="openai",
+                    model=self.model,
+                    finish_reason=choice.finish_reason,
+                    metadata={
+                        "prompt_tokens": response.usage.prompt_tokens,
+                        "completion_tokens": response.usage.completion_tokens,
+                        "choice_index": i
+                    }
+                )
+                for i, choice in enumerate(response.choices)
+            ]
+
+        return await self._retry_with_backoff(_make_request)
+
     async def generate_streaming(
         self,
         prompt: str,
@@ -369,6 +465,8 @@ class MockLLMProvider(BaseLLMProvider):
         self,
         responses: Optional[List[str]] = None,
         token_multiplier: float = 1.3,
+        latency: Union[float, Callable[[], float]] = 0.1,
+        failure_rate: float = 0.0,
         **kwargs
     ):
         """
@@ -377,6 +475,9 @@ class MockLLMProvider(BaseLLMProvider):
         Args:
             responses: List of pre-defined responses
             token_multiplier: Multiplier for token estimation
+            latency: Simulated seconds per request, or a function that
+                samples them (e.g. from a latency distribution)
+            failure_rate: Probability that a request raises RuntimeError
             **kwargs: Additional base provider arguments
         """
         super().__init__(api_key="mock_key", **kwargs)
@@ -386,7 +487,10 @@ class MockLLMProvider(BaseLLMProvider):
             "Final mock response to demonstrate functionality."
         ]
         self.token_multiplier = token_multiplier
+        self.latency = latency
+        self.failure_rate = failure_rate
         self.call_count = 0
+        self.request_count = 0
 
     async def generate(
         self,
@@ -408,8 +512,45 @@ class MockLLMProvider(BaseLLMProvider):
             LLMResponse with mock data
         """
         # Simulate some delay
-        await asyncio.sleep(0.1)
+        await self._simulate_request()
+
+        return self._mock_response(prompt)
+
+    async def generate_many(
+        self,
+        prompt: str,
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> List[LLMResponse]:
+        """
+        Generate n mock completions in a single simulated request.
 
+        Args:
+            prompt: Input prompt (used for token estimation)
+            n: Number of completions
+            temperature: Ignored in mock
+            max_tokens: Ignored in mock
+            **kwargs: Ignored in mock
+
+        Returns:
+            List of n LLMResponse objects
+        """
+        await self._simulate_request()
+
+        return [self._mock_response(prompt) for _ in range(n)]
+
+    async def _simulate_request(self) -> None:
+        """Wait out one request's latency and fail it at failure_rate."""
+        self.request_count += 1
+        latency = self.latency() if callable(self.latency) else self.latency
+        await asyncio.sleep(latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError("Mock provider failure")
+
+    def _mock_response(self, prompt: str) -> LLMResponse:
+        """Build the next canned response and account for its tokens."""
         # Cycle through responses
         text = self.responses[self.call_count % len(self.responses)]
         self.call_count += 1
@@ -475,18 +616,113 @@ class LLMProviderFactory:
             raise ValueError(f"Unsupported provider: {provider_type}")
 
 
+class SchedulingMode(Enum):
+    """How an LLMProviderPool picks a provider for each request."""
+    ROUND_ROBIN = "round_robin"
+    ADAPTIVE = "adaptive"
+
+
+@dataclass
+class ProviderStats:
+    """Live load, latency and health of one provider in a pool."""
+    max_concurrency: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    outstanding: int = 0
+    ewma_latency: Optional[float] = None
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    token_log: Deque[List[float]] = field(default_factory=deque)
+    requests: int = 0
+    failures: int = 0
+    hedges: int = 0
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+    def tokens_in_window(self, now: float) -> float:
+        """Tokens sent (or reserved) in the last minute."""
+        while self.token_log and now - self.token_log[0][0] >= 60:
+            self.token_log.popleft()
+        return sum(tokens for _, tokens in self.token_log)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Observed latency at a percentile, None without samples."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+    def circuit_state(self, now: float, recovery_timeout: float) -> str:
+        """Return "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at >= recovery_timeout:
+            return "half_open"
+        return "open"
+
+
 class LLMProviderPool:
-    """Pool of LLM providers for load balancing."""
+    """
+    Pool of LLM providers for load balancing.
+
+    In ROUND_ROBIN mode (the default) providers simply take turns. In
+    ADAPTIVE mode each request goes to the provider with the lowest
+    (outstanding requests + 1) x EWMA latency among those that are under
+    their concurrency limit and tokens-per-minute budget and whose circuit
+    is not open. A request still running after the provider's observed
+    hedge_percentile latency is duplicated on a second free provider and
+    the first answer wins. A provider that fails failure_threshold times in
+    a row is skipped for recovery_timeout seconds, then gets one trial
+    request; failed requests are retried on the remaining providers.
+    """
 
-    def __init__(self, providers: List[BaseLLMProvider]):
+    def __init__(
+        self,
+        providers: List[BaseLLMProvider],
+        mode: SchedulingMode = SchedulingMode.ROUND_ROBIN,
+        max_concurrency: Union[int, Sequence[Optional[int]], None] = None,
+        tokens_per_minute: Union[int, Sequence[Optional[int]], None] = None,
+        hedge_percentile: Optional[float] = 0.95,
+        hedge_min_samples: int = 20,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        ewma_alpha: float = 0.2
+    ):
         """
         Initialize provider pool.
 
         Args:
             providers: List of LLM providers
+            mode: Scheduling mode
+            max_concurrency: Requests in flight per provider (one value for
+                all providers or one per provider; None for no limit)
+            tokens_per_minute: Token budget per provider, counting prompt
+                estimate plus max_tokens until the real usage is known
+            hedge_percentile: Latency percentile after which a request is
+                hedged to a second provider (None disables hedging)
+            hedge_min_samples: Latency samples needed before hedging
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds before an open circuit allows a trial
+            ewma_alpha: Weight of the newest sample in the latency EWMA
         """
+        if not providers:
+            raise ValueError("Provider pool needs at least one provider")
+
         self.providers = providers
         self.current_index = 0
+        self.mode = mode
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.ewma_alpha = ewma_alpha
+        self.stats = [
+            ProviderStats(max_concurrency=limit, tokens_per_minute=budget)
+            for limit, budget in zip(
+                self._per_provider(max_concurrency),
+                self._per_provider(tokens_per_minute)
+            )
+        ]
+        self._changed = asyncio.Event()
 
     async def generate(
         self,
@@ -496,7 +732,7 @@ class LLMProviderPool:
         **kwargs
     ) -> LLMResponse:
         """
-        Generate using next available provider (round-robin).
+        Generate using the next provider chosen by the scheduling mode.
 
         Args:
             prompt: Input prompt
@@ -507,10 +743,62 @@ class LLMProviderPool:
         Returns:
             LLMResponse
         """
-        provider = self.providers[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.providers)
+        if self.mode == SchedulingMode.ROUND_ROBIN:
+            provider = self.providers[self.current_index]
+            self.current_index = (self.current_index + 1) % len(self.providers)
+
+            return await provider.generate(prompt, temperature, max_tokens, **kwargs)
+
+        return await self._dispatch(
+            lambda provider: provider.generate(
+                prompt, temperature, max_tokens, **kwargs
+            ),
+            self._estimate_tokens(prompt, max_tokens),
+            lambda response: response.token_count
+        )
+
+    async def generate_many(
+        self,
+        prompt: str,
+        n: int,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> List[LLMResponse]:
+        """
+        Generate n completions using the next provider chosen by the
+        scheduling mode.
+
+        Args:
+            prompt: Input prompt
+            n: Number of completions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per completion
+            **kwargs: Additional API parameters
 
-        return await provider.generate(prompt, temperature, max_tokens, **kwargs)
+        Returns:
+            List of n LLMResponse objects
+        """
+        if self.mode == SchedulingMode.ROUND_ROBIN:
+            provider = self.providers[self.current_index]
+            self.current_index = (self.current_index + 1) % len(self.providers)
+
+            return await provider.generate_many(
+                prompt, n, temperature, max_tokens, **kwargs
+            )
+
+        return await self._dispatch(
+            lambda provider: provider.generate_many(
+                prompt, n, temperature, max_tokens, **kwargs
+            ),
+            self._estimate_tokens(prompt, max_tokens) * n,
+            lambda responses: sum(r.token_count for r in responses)
+        )
+
+    @property
+    def native_batching(self) -> bool:
+        """Whether generate_many() makes one request on every provider."""
+        return all(provider.native_batching for provider in self.providers)
 
     def get_total_tokens(self) -> Dict[str, int]:
         """Get total tokens used by each provider."""
@@ -519,6 +807,216 @@ class LLMProviderPool:
             for i, provider in enumerate(self.providers)
         }
 
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get scheduling statistics for each provider."""
+        now = time.monotonic()
+        return {
+            f"provider_{i}": {
+                "outstanding": stats.outstanding,
+                "requests": stats.requests,
+                "failures": stats.failures,
+                "hedges": stats.hedges,
+                "ewma_latency": stats.ewma_latency,
+                "p95_latency": stats.latency_percentile(0.95),
+                "tokens_last_minute": stats.tokens_in_window(now),
+                "circuit": stats.circuit_state(now, self.recovery_timeout)
+            }
+            for i, stats in enumerate(self.stats)
+        }
+
+    def _per_provider(
+        self, value: Union[int, Sequence[Optional[int]], None]
+    ) -> List[Optional[int]]:
+        """Expand a pool-wide or per-provider setting to one per provider."""
+        if value is None or isinstance(value, int):
+            return [value] * len(self.providers)
+        if len(value) != len(self.providers):
+            raise ValueError("Per-provider settings need one value per provider")
+        return list(value)
+
+    @staticmethod
+    def _estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """Upper-bound a request's tokens before the response is known."""
+        return int(len(prompt.split()) * 1.3) + max_tokens
+
+    async def _dispatch(
+        self,
+        call: Callable[[BaseLLMProvider], Awaitable[Any]],
+        estimate: int,
+        count_tokens: Callable[[Any], int]
+    ) -> Any:
+        """Run a request on the best provider, hedging and failing over."""
+        tried: Set[int] = set()
+        pending: Set["asyncio.Task[Any]"] = set()
+        error: Optional[BaseException] = None
+
+        try:
+            while len(tried) < len(self.providers):
+                index = await self._acquire(estimate, tried)
+                if index is None:
+                    break
+                tried.add(index)
+                pending = {self._start(index, call, estimate, count_tokens)}
+                delay = self._hedge_delay(index)
+
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        # Slower than usual: race a second provider, once
+                        delay = None
+                        hedge = self._try_acquire(estimate, tried)
+                        if hedge is not None:
+                            tried.add(hedge)
+                            self.stats[hedge].hedges += 1
+                            pending.add(self._start(hedge, call, estimate, count_tokens))
+                        continue
+
+                    for task in done:
+                        if task.exception() is None:
+                            return task.result()
+                        error = task.exception()
+                        logger.warning(f"Provider request failed: {error}")
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if error is not None:
+            raise error
+        raise RuntimeError("No LLM provider available: all circuits are open")
+
+    async def _acquire(self, estimate: int, exclude: Set[int]) -> Optional[int]:
+        """Wait for a provider with capacity; None if all circuits are open."""
+        while True:
+            index = self._try_acquire(estimate, exclude)
+            if index is not None:
+                return index
+
+            now = time.monotonic()
+            candidates = [i for i in range(len(self.providers)) if i not in exclude]
+            if all(
+                self.stats[i].circuit_state(now, self.recovery_timeout) == "open"
+                for i in candidates
+            ):
+                return None
+
+            # Wake on the next completion, or when a token budget frees up
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=self._budget_wait(now))
+            except asyncio.TimeoutError:
+                pass
+
+    def _try_acquire(self, estimate: int, exclude: Set[int]) -> Optional[int]:
+        """Reserve the best provider that can take a request right now."""
+        now = time.monotonic()
+        count = len(self.providers)
+        best_index, best_key = None, None
+
+        for offset in range(count):
+            index = (self.current_index + offset) % count
+            stats = self.stats[index]
+            if index in exclude:
+                continue
+            state = stats.circuit_state(now, self.recovery_timeout)
+            if state == "open" or (state == "half_open" and stats.probing):
+                continue
+            if stats.max_concurrency is not None and stats.outstanding >= stats.max_concurrency:
+                continue
+            if stats.tokens_per_minute is not None:
+                used = stats.tokens_in_window(now)
+                if used and used + estimate > stats.tokens_per_minute:
+                    continue
+
+            key = ((stats.outstanding + 1) * (stats.ewma_latency or 0.0), stats.outstanding)
+            if best_key is None or key < best_key:
+                best_index, best_key = index, key
+
+        if best_index is None:
+            return None
+
+        stats = self.stats[best_index]
+        if stats.circuit_state(now, self.recovery_timeout) == "half_open":
+            stats.probing = True
+        stats.outstanding += 1
+        stats.requests += 1
+        self.current_index = (best_index + 1) % count
+        return best_index
+
+    def _start(
+        self,
+        index: int,
+        call: Callable[[BaseLLMProvider], Awaitable[Any]],
+        estimate: int,
+        count_tokens: Callable[[Any], int]
+    ) -> "asyncio.Task[Any]":
+        """Run a request on a reserved provider and keep its stats."""
+        stats = self.stats[index]
+        reservation = [time.monotonic(), float(estimate)]
+        stats.token_log.append(reservation)
+
+        async def run() -> Any:
+            start = time.monotonic()
+            try:
+                result = await call(self.providers[index])
+            except asyncio.CancelledError:
+                stats.probing = False
+                raise
+            except Exception:
+                self._record_failure(stats)
+                reservation[1] = 0.0
+                raise
+            else:
+                self._record_success(stats, time.monotonic() - start)
+                reservation[1] = float(count_tokens(result))
+                return result
+            finally:
+                stats.outstanding -= 1
+                changed, self._changed = self._changed, asyncio.Event()
+                changed.set()
+
+        return asyncio.ensure_future(run())
+
+    def _record_success(self, stats: ProviderStats, latency: float) -> None:
+        """Fold a latency sample into the stats and close the circuit."""
+        stats.latencies.append(latency)
+        if stats.ewma_latency is None:
+            stats.ewma_latency = latency
+        else:
+            stats.ewma_latency += self.ewma_alpha * (latency - stats.ewma_latency)
+        stats.consecutive_failures = 0
+        stats.opened_at = None
+        stats.probing = False
+
+    def _record_failure(self, stats: ProviderStats) -> None:
+        """Count a failure and open the circuit when they repeat."""
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if stats.probing or stats.consecutive_failures >= self.failure_threshold:
+            if stats.opened_at is None or stats.probing:
+                logger.warning(
+                    f"Opening circuit after {stats.consecutive_failures} failures"
+                )
+            stats.opened_at = time.monotonic()
+        stats.probing = False
+
+    def _hedge_delay(self, index: int) -> Optional[float]:
+        """Delay after which a request to this provider is hedged."""
+        stats = self.stats[index]
+        if self.hedge_percentile is None or len(stats.latencies) < self.hedge_min_samples:
+            return None
+        return stats.latency_percentile(self.hedge_percentile)
+
+    def _budget_wait(self, now: float) -> Optional[float]:
+        """Seconds until the oldest budgeted tokens leave the window."""
+        waits = [
+            60 - (now - stats.token_log[0][0])
+            for stats in self.stats
+            if stats.tokens_per_minute is not None and stats.token_log
+        ]
+        return max(min(waits), 0.01) if waits else None
+
 
 # Example usage
 if __name__ == "__main__":
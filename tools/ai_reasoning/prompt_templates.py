@@ -10,14 +10,18 @@ Protocol Coverage:
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import json
+import re
 
 
 logger = logging.getLogger(__name__)
 
+# {name} placeholders; other braces (e.g. JSON in a template) stay literal
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
 
 class TemplateType(Enum):
     """Prompt template types."""
@@ -29,6 +33,88 @@ class TemplateType(Enum):
     EVALUATION = "evaluation"
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template tokenized into alternating literal and placeholder segments.
+
+    literals has one more element than placeholders: rendering emits
+    literals[0], then each placeholder's value followed by the next literal.
+    """
+    source: str
+    variables: Tuple[str, ...]
+    literals: Tuple[str, ...]
+    placeholders: Tuple[str, ...]
+    segments: Tuple[Tuple[str, str], ...] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "segments", tuple(zip(self.placeholders, self.literals[1:]))
+        )
+
+    def missing(self, values: Dict[str, Any]) -> List[str]:
+        """Declared variables that have no value in `values`."""
+        return [var for var in self.variables if var not in values]
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """
+        Substitute values in a single pass and join once.
+
+        Placeholders without a value are left as {name}, and substituted
+        values are never scanned for placeholders themselves.
+
+        Args:
+            values: Variable values
+
+        Returns:
+            Rendered prompt
+        """
+        parts = [self.literals[0]]
+        append = parts.append
+        for name, literal in self.segments:
+            append(str(values[name]) if name in values else f"{{{name}}}")
+            append(literal)
+        return "".join(parts)
+
+
+def compile_template(template: str, variables: Sequence[str]) -> CompiledTemplate:
+    """
+    Tokenize a template and check its placeholders against its variables.
+
+    Args:
+        template: Template text with {name} placeholders
+        variables: Declared variable names
+
+    Declared variables that never appear in the template are only logged,
+    since rendering ignores them.
+
+    Returns:
+        CompiledTemplate
+
+    Raises:
+        ValueError: If a placeholder is not declared
+    """
+    parts = _PLACEHOLDER.split(template)
+    literals, placeholders = tuple(parts[0::2]), tuple(parts[1::2])
+
+    undeclared = sorted(set(placeholders) - set(variables))
+    if undeclared:
+        raise ValueError(
+            f"Template placeholders are not declared as variables "
+            f"(undeclared: {undeclared})"
+        )
+    unused = [var for var in variables if var not in placeholders]
+    if unused:
+        logger.warning(f"Template variables never used: {unused}")
+
+    return CompiledTemplate(
+        source=template,
+        variables=tuple(variables),
+        literals=literals,
+        placeholders=placeholders
+    )
+
+
 @dataclass
 class PromptTemplate:
     """Represents a prompt template."""
@@ -40,6 +126,33 @@ class PromptTemplate:
     description: str
     examples: List[Dict[str, str]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _compiled: Optional[CompiledTemplate] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _compiled_variables: List[str] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    def compile(self) -> CompiledTemplate:
+        """
+        Tokenize and validate the template, once until it changes.
+
+        Returns:
+            CompiledTemplate
+
+        Raises:
+            ValueError: If a placeholder is not declared
+        """
+        compiled = self._compiled
+        if (
+            compiled is None
+            or compiled.source is not self.template
+            or self._compiled_variables != self.variables
+        ):
+            compiled = compile_template(self.template, self.variables)
+            self._compiled = compiled
+            self._compiled_variables = list(self.variables)
+        return compiled
 
     def render(self, **kwargs) -> str:
         """
@@ -51,18 +164,14 @@ class PromptTemplate:
         Returns:
             Rendered prompt
         """
+        compiled = self.compile()
+
         # Check for missing variables
-        missing = [var for var in self.variables if var not in kwargs]
+        missing = compiled.missing(kwargs)
         if missing:
             logger.warning(f"Missing variables: {missing}")
 
-        # Simple variable substitution
-        rendered = self.template
-        for var, value in kwargs.items():
-            placeholder = f"{{{var}}}"
-            rendered = rendered.replace(placeholder, str(value))
-
-        return rendered
+        return compiled.render(kwargs)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -84,6 +193,7 @@ class PromptTemplateLibrary:
     def __init__(self):
         """Initialize template library."""
         self.templates: Dict[str, Dict[str, PromptTemplate]] = {}
+        self._latest: Dict[str, str] = {}
         self._load_default_templates()
 
     def _load_default_templates(self) -> None:
@@ -263,13 +373,24 @@ Analysis:""",
         """
         Register a new template.
 
+        The template is compiled here, so an undeclared placeholder is
+        reported before it can be used.
+
         Args:
             template: Template to register
+
+        Raises:
+            ValueError: If a placeholder is not declared
         """
+        template.compile()
+
         if template.name not in self.templates:
             self.templates[template.name] = {}
 
         self.templates[template.name][template.version] = template
+        latest = self._latest.get(template.name)
+        if latest is None or template.version > latest:
+            self._latest[template.name] = template.version
         logger.debug(f"Registered template: {template.name} v{template.version}")
 
     def get(
@@ -297,8 +418,48 @@ Analysis:""",
             return versions.get(version)
         else:
             # Return latest version
-            latest_version = max(versions.keys())
-            return versions[latest_version]
+            return versions[self._latest_version(name)]
+
+    def render(self, name: str, version: Optional[str] = None, **kwargs) -> str:
+        """
+        Render a registered template from its compiled form.
+
+        The template caches its compiled form and recompiles it when its
+        text or variables are edited after registration.
+
+        Args:
+            name: Template name
+            version: Template version (latest if not specified)
+            **kwargs: Variable values
+
+        Returns:
+            Rendered prompt
+
+        Raises:
+            ValueError: If the template is not registered or an edit left a
+                placeholder undeclared
+        """
+        if name not in self.templates:
+            raise ValueError(f"Template not found: {name}")
+
+        version = version or self._latest_version(name)
+        template = self.templates[name].get(version)
+        if template is None:
+            raise ValueError(f"Template not found: {name} v{version}")
+        compiled = template.compile()
+
+        missing = compiled.missing(kwargs)
+        if missing:
+            logger.warning(f"Missing variables: {missing}")
+
+        return compiled.render(kwargs)
+
+    def _latest_version(self, name: str) -> str:
+        """Latest version of a template, recomputed only if stale."""
+        latest = self._latest.get(name)
+        if latest not in self.templates[name]:
+            latest = self._latest[name] = max(self.templates[name].keys())
+        return latest
 
     def list_templates(
         self,
@@ -340,9 +501,12 @@ Analysis:""",
                 del self.templates[name][version]
                 if not self.templates[name]:
                     del self.templates[name]
+                if self._latest.get(name) == version:
+                    del self._latest[name]
                 return True
         else:
             del self.templates[name]
+            self._latest.pop(name, None)
             return True
 
         return False
@@ -370,6 +534,9 @@ Analysis:""",
         """
         Import templates from JSON file.
 
+        Invalid templates are logged and skipped, so one bad entry does not
+        leave the library half imported.
+
         Args:
             filepath: Input file path
 
@@ -382,17 +549,21 @@ Analysis:""",
         count = 0
         for name, versions in import_data.items():
             for version, template_dict in versions.items():
-                template = PromptTemplate(
-                    name=template_dict["name"],
-                    type=TemplateType(template_dict["type"]),
-                    version=template_dict["version"],
-                    template=template_dict["template"],
-                    variables=template_dict["variables"],
-                    description=template_dict["description"],
-                    examples=template_dict.get("examples", []),
-                    metadata=template_dict.get("metadata", {})
-                )
-                self.register(template)
+                try:
+                    template = PromptTemplate(
+                        name=template_dict["name"],
+                        type=TemplateType(template_dict["type"]),
+                        version=template_dict["version"],
+                        template=template_dict["template"],
+                        variables=template_dict["variables"],
+                        description=template_dict["description"],
+                        examples=template_dict.get("examples", []),
+                        metadata=template_dict.get("metadata", {})
+                    )
+                    self.register(template)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.error(f"Skipping template {name} v{version}: {e}")
+                    continue
                 count += 1
 
         logger.info(f"Imported {count} templates from {filepath}")
@@ -7,6 +7,7 @@ without requiring actual API keys.
 
 import pytest
 import asyncio
+import json
 from datetime import datetime
 from unittest.mock import Mock, AsyncMock, patch
 from typing import Dict, Any
@@ -18,17 +19,18 @@ from chain_of_thought import (
 )
 from tree_of_thought import (
     TreeOfThoughtsExplorer, SearchStrategy, ThoughtNode,
-    NodeState, TreePath, ToTResult
+    NodeState, TreePath, ToTResult, TranspositionTable
 )
 from context_manager import ContextManager, ContextEntry
 from llm_providers import (
-    MockLLMProvider, LLMProviderFactory, LLMProvider,
-    OpenAIProvider, AnthropicProvider
+    BaseLLMProvider, MockLLMProvider, LLMProviderFactory, LLMProvider,
+    OpenAIProvider, AnthropicProvider, LLMProviderPool, SchedulingMode
 )
 from prompt_templates import (
-    PromptTemplate, PromptTemplateLibrary, TemplateType, FewShotExample
+    PromptTemplate, PromptTemplateLibrary, TemplateType, FewShotExample,
+    compile_template
 )
-from evaluator import ReasoningEvaluator, MetricType
+from evaluator import ReasoningEvaluator, BenchmarkEvaluator, MetricType
 from tracer import LangSmithTracer, TracingContext, TraceType
 from cost_tracker import CostTracker, TokenCounter, CostOptimizer
 
@@ -240,6 +242,140 @@ async def test_tot_beam_search(mock_llm_provider, sample_question):
     assert result.strategy == SearchStrategy.BEAM_SEARCH
 
 
+@pytest.mark.asyncio
+async def test_tot_concurrent_exploration(sample_question):
+    """Test that sibling fan-out overlaps requests and batching merges them."""
+    sequential_provider = MockLLMProvider(latency=0.05)
+    sequential = TreeOfThoughtsExplorer(
+        llm_provider=sequential_provider,
+        max_depth=2,
+        branching_factor=3,
+        beam_width=2
+    )
+    start = asyncio.get_running_loop().time()
+    sequential_result = await sequential.explore(
+        question=sample_question,
+        strategy=SearchStrategy.BEAM_SEARCH
+    )
+    sequential_time = asyncio.get_running_loop().time() - start
+
+    concurrent_provider = MockLLMProvider(latency=0.05)
+    concurrent = TreeOfThoughtsExplorer(
+        llm_provider=concurrent_provider,
+        max_depth=2,
+        branching_factor=3,
+        beam_width=2,
+        max_concurrency=8,
+        batch_generations=True
+    )
+    start = asyncio.get_running_loop().time()
+    concurrent_result = await concurrent.explore(
+        question=sample_question,
+        strategy=SearchStrategy.BEAM_SEARCH
+    )
+    concurrent_time = asyncio.get_running_loop().time() - start
+
+    assert concurrent_result.total_nodes == sequential_result.total_nodes == 10
+    # One batched generation per expanded node instead of three calls
+    assert sequential_provider.request_count == 18
+    assert concurrent_provider.request_count == 3 + 9
+    # Two levels of (generate, evaluate) round trips
+    assert concurrent_time < 0.05 * 6 < sequential_time
+
+    with pytest.raises(ValueError):
+        TreeOfThoughtsExplorer(llm_provider=concurrent_provider, max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_tot_batch_fallback_respects_concurrency(sample_question):
+    """Test batching a provider without native generate_many stays limited."""
+
+    class SingleCallProvider(MockLLMProvider):
+        generate_many = BaseLLMProvider.generate_many
+
+    provider = SingleCallProvider(latency=0.01)
+    generate = provider.generate
+    in_flight = peak = 0
+
+    async def tracked_generate(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await generate(*args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    provider.generate = tracked_generate
+    assert MockLLMProvider(latency=0).native_batching
+    assert not provider.native_batching
+
+    explorer = TreeOfThoughtsExplorer(
+        llm_provider=provider,
+        max_depth=2,
+        branching_factor=3,
+        beam_width=2,
+        max_concurrency=2,
+        batch_generations=True
+    )
+    await explorer.explore(sample_question, SearchStrategy.BEAM_SEARCH)
+
+    assert provider.request_count == 18
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_tot_transposition_table(sample_question):
+    """Test that duplicate thoughts are merged and their LLM calls reused."""
+    responses = ["Split by bounded context.", "split by  bounded CONTEXT"]
+    baseline_provider = MockLLMProvider(responses=responses, latency=0)
+    await TreeOfThoughtsExplorer(
+        llm_provider=baseline_provider, max_depth=2, branching_factor=3
+    ).explore(sample_question, strategy=SearchStrategy.BEAM_SEARCH)
+
+    store: Dict[str, Any] = {}
+    reasoning_cache = Mock()
+    reasoning_cache.get_transpositions.side_effect = store.get
+    reasoning_cache.cache_transpositions.side_effect = store.__setitem__
+
+    provider = MockLLMProvider(responses=responses, latency=0)
+    explorer = TreeOfThoughtsExplorer(
+        llm_provider=provider,
+        max_depth=2,
+        branching_factor=3,
+        reasoning_cache=reasoning_cache
+    )
+    result = await explorer.explore(sample_question, strategy=SearchStrategy.BEAM_SEARCH)
+
+    # Siblings collapse into one thought: one evaluation, no second expansion
+    assert baseline_provider.request_count == 18
+    assert provider.request_count == 3 + 1 + 3
+    assert result.metadata["llm_calls_saved"] == 2 + 3
+    duplicates = [n for n in result.all_nodes.values() if "transposition" in n.metadata]
+    assert result.metadata["transpositions"] == len(duplicates) == 5
+    assert all(n.score == 0.5 for n in duplicates)
+
+    # A fresh explorer sharing the cache replays the tree without any request
+    fresh_provider = MockLLMProvider(responses=responses, latency=0)
+    replay = await TreeOfThoughtsExplorer(
+        llm_provider=fresh_provider,
+        max_depth=2,
+        branching_factor=3,
+        reasoning_cache=reasoning_cache
+    ).explore(sample_question, strategy=SearchStrategy.BEAM_SEARCH)
+    assert fresh_provider.request_count == 0
+    assert replay.total_nodes == result.total_nodes
+    assert replay.metadata["llm_calls_saved"] == 12
+
+    table = TranspositionTable(
+        embedding_fn=lambda text: [1.0, 0.1] if "context" in text else [0.0, 1.0],
+        similarity_threshold=0.9
+    )
+    table.scores[table.key("Split by bounded context")] = 0.8
+    assert table.key("Decompose along context boundaries") == "split by bounded context"
+    assert table.key("Rewrite everything") == "rewrite everything"
+
+
 def test_tot_node_creation():
     """Test ToT node creation and state."""
     node = ThoughtNode(
@@ -326,6 +462,143 @@ async def test_context_validation():
     assert validation["is_valid"]
 
 
+class KeywordEmbeddingModel:
+    """Embeds text by keyword counts; counts single and batch requests."""
+
+    KEYWORDS = ["cache", "database", "queue", "api"]
+
+    def __init__(self):
+        self.requests = 0
+
+    async def embed(self, text):
+        self.requests += 1
+        return [float(text.count(word)) for word in self.KEYWORDS]
+
+    async def embed_batch(self, texts):
+        self.requests += 1
+        return [[float(text.count(word)) for word in self.KEYWORDS] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_context_manager_similarity_search():
+    """Test matrix-backed similarity search and batched embeddings."""
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    redis_client = fakeredis.FakeRedis()
+    model = KeywordEmbeddingModel()
+    manager = ContextManager(
+        max_tokens=100000, redis_client=redis_client, embedding_model=model
+    )
+
+    contents = [
+        "cache the api responses",
+        "database index tuning",
+        "cache cache invalidation",
+        "queue consumers and api",
+        "nothing relevant here",
+    ]
+    await manager.add_entries(
+        [{"content": c, "role": "user", "tokens": 10} for c in contents]
+    )
+    assert model.requests == 1
+
+    results = await manager.search_similar("cache", top_k=2, similarity_threshold=0.5)
+    assert [entry.content for entry, _ in results] == [
+        "cache cache invalidation", "cache the api responses"
+    ]
+    assert results[0][1] == pytest.approx(1.0)
+    assert results[1][1] == pytest.approx(manager._cosine_similarity(
+        [1.0, 0.0, 0.0, 0.0], [1.0, 0.0, 0.0, 1.0]
+    ))
+
+    # Entries replaced behind the manager's back are picked up again
+    manager.context_window.entries = manager.context_window.entries[1:2]
+    results = await manager.search_similar("database", similarity_threshold=0.5)
+    assert [entry.content for entry, _ in results] == ["database index tuning"]
+
+    restored_model = KeywordEmbeddingModel()
+    restored = ContextManager(
+        max_tokens=100000, redis_client=redis_client, embedding_model=restored_model
+    )
+    assert await restored.load_from_redis("session") == len(contents)
+    assert restored_model.requests == 0
+    results = await restored.search_similar("queue", top_k=1)
+    assert results[0][0].content == "queue consumers and api"
+
+    await restored.clear_context(keep_system=False)
+    assert await restored.search_similar("queue") == []
+
+
+@pytest.mark.asyncio
+async def test_context_manager_write_behind_and_lazy_restore():
+    """Test batched Redis writes, flush on close and lazy session paging."""
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    redis_client = fakeredis.FakeRedis()
+
+    async with ContextManager(
+        max_tokens=100000,
+        redis_client=redis_client,
+        embedding_model=KeywordEmbeddingModel(),
+        session_id="agent-1",
+        write_batch_size=4,
+        flush_interval=60
+    ) as writer:
+        for i in range(10):
+            await writer.add_entry(f"step {i} api call", "assistant", 10)
+        # Two full batches written, the rest waits in the buffer
+        assert await redis_client.llen("context:session:agent-1:entries") == 8
+        assert writer.get_stats()["buffered_writes"] == 2
+        await writer.add_entry("cache warmed", "user", 10)
+
+    # Closing flushed the partial batch
+    assert await redis_client.llen("context:session:agent-1:entries") == 11
+
+    manager = ContextManager(
+        max_tokens=100000,
+        sliding_window_size=3,
+        redis_client=redis_client,
+        embedding_model=KeywordEmbeddingModel()
+    )
+    assert await manager.load_from_redis("agent-1", lazy=True) == 3
+    assert [e.content for e in manager.context_window.entries] == [
+        "step 8 api call", "step 9 api call", "cache warmed"
+    ]
+    assert manager.get_stats()["unloaded_entries"] == 8
+
+    context = await manager.get_context(max_entries=5)
+    assert [e.content for e in context][0] == "step 6 api call"
+
+    results = await manager.search_similar("cache", top_k=1, similarity_threshold=0.5)
+    assert results[0][0].content == "cache warmed"
+    assert manager.get_stats()["unloaded_entries"] == 0
+    assert [e.content for e in manager.context_window.entries][:2] == [
+        "step 0 api call", "step 1 api call"
+    ]
+    assert manager.context_window.total_tokens == 110
+    assert (await manager.validate_context())["warnings"] == []
+
+
+@pytest.mark.asyncio
+async def test_context_manager_new_session_isolated():
+    """Test that a fresh session does not load another session's entries."""
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    redis_client = fakeredis.FakeRedis()
+
+    async with ContextManager(redis_client=redis_client, session_id="A") as writer:
+        await writer.add_entry("secret of A", "user", 5)
+
+    # Entries written without a session are still loaded by any session
+    legacy = ContextManager(redis_client=redis_client)
+    await legacy.add_entry("legacy entry", "user", 5)
+
+    manager = ContextManager(redis_client=redis_client)
+    assert await manager.load_from_redis("B") == 1
+    assert [e.content for e in manager.context_window.entries] == ["legacy entry"]
+
+    manager = ContextManager(redis_client=redis_client)
+    assert await manager.load_from_redis("A") == 1
+    assert [e.content for e in manager.context_window.entries] == ["secret of A"]
+
+
 # LLM Provider Tests
 
 @pytest.mark.asyncio
@@ -373,6 +646,78 @@ async def test_provider_rate_limiting():
     assert duration > 0
 
 
+@pytest.mark.asyncio
+async def test_provider_pool_adaptive_routing():
+    """Test that the adaptive pool prefers fast providers within budgets."""
+    fast = MockLLMProvider(latency=0.01)
+    slow = MockLLMProvider(latency=0.05)
+    pool = LLMProviderPool([fast, slow], mode=SchedulingMode.ADAPTIVE)
+
+    for _ in range(10):
+        await pool.generate("Test prompt", 0.7, 100)
+
+    # Each provider is tried once, then the lower EWMA latency wins
+    assert slow.request_count == 1
+    assert fast.request_count == 9
+
+    capped = MockLLMProvider(latency=0.01)
+    spare = MockLLMProvider(latency=0.05)
+    pool = LLMProviderPool(
+        [capped, spare], mode=SchedulingMode.ADAPTIVE, max_concurrency=[2, None]
+    )
+    await asyncio.gather(*(pool.generate("Test prompt", 0.7, 100) for _ in range(6)))
+    assert capped.request_count == 2
+    assert spare.request_count == 4
+
+    # Requests reserve prompt + max_tokens until their real usage is known
+    budgeted = MockLLMProvider(latency=0.01)
+    spare = MockLLMProvider(latency=0.05)
+    pool = LLMProviderPool(
+        [budgeted, spare], mode=SchedulingMode.ADAPTIVE, tokens_per_minute=[150, None]
+    )
+    for _ in range(20):
+        await pool.generate("Test prompt", 0.7, 100)
+    assert pool.get_stats()["provider_0"]["tokens_last_minute"] <= 150
+    assert 1 < budgeted.request_count < 10
+
+
+@pytest.mark.asyncio
+async def test_provider_pool_hedging_and_circuit_breaker():
+    """Test hedged requests and failover around a failing provider."""
+    latencies = iter([0.01] * 5 + [1.0] + [0.01] * 10)
+    tail = MockLLMProvider(latency=lambda: next(latencies))
+    backup = MockLLMProvider(latency=0.02)
+    pool = LLMProviderPool(
+        [tail, backup], mode=SchedulingMode.ADAPTIVE, hedge_min_samples=5
+    )
+    for _ in range(6):
+        await pool.generate("Test prompt")
+
+    start = asyncio.get_running_loop().time()
+    await pool.generate("Test prompt")
+    assert asyncio.get_running_loop().time() - start < 0.5
+    assert pool.get_stats()["provider_1"]["hedges"] == 1
+
+    broken = MockLLMProvider(latency=0, failure_rate=1.0)
+    healthy = MockLLMProvider(latency=0.01)
+    pool = LLMProviderPool(
+        [broken, healthy],
+        mode=SchedulingMode.ADAPTIVE,
+        failure_threshold=2,
+        recovery_timeout=60
+    )
+    for _ in range(5):
+        response = await pool.generate("Test prompt")
+        assert response.text
+
+    assert broken.request_count == 2
+    assert pool.get_stats()["provider_0"]["circuit"] == "open"
+
+    lonely = LLMProviderPool([broken], mode=SchedulingMode.ADAPTIVE)
+    with pytest.raises(RuntimeError):
+        await lonely.generate("Test prompt")
+
+
 # Prompt Template Tests
 
 def test_prompt_template_library():
@@ -408,6 +753,92 @@ def test_render_prompt_template():
     assert "What is AI?" in rendered
 
 
+def test_compiled_prompt_template():
+    """Test compiled rendering, validation and the latest-version pointer."""
+    template = PromptTemplate(
+        name="json",
+        type=TemplateType.EVALUATION,
+        version="1.0",
+        template='Rate {thought} for {question}. Reply as {"score": 0.5}.',
+        variables=["question", "thought"],
+        description="Literal braces"
+    )
+
+    # Values are not rescanned; missing values stay as placeholders
+    assert template.render(question="{thought}", thought="X") == (
+        'Rate X for {thought}. Reply as {"score": 0.5}.'
+    )
+    assert template.render(thought="X") == (
+        'Rate X for {question}. Reply as {"score": 0.5}.'
+    )
+    assert template.compile() is template.compile()
+
+    template.variables = ["question"]
+    with pytest.raises(ValueError, match="undeclared"):
+        template.compile()
+    # Unused variables are only logged
+    assert compile_template(
+        "Question: {question}", ["question", "context"]
+    ).render({"question": "Q"}) == "Question: Q"
+
+    library = PromptTemplateLibrary()
+    with pytest.raises(ValueError):
+        library.register(template)
+
+    # Matches per-variable substitution for every built-in template
+    for builtin in library.list_templates():
+        values = {var: f"<{var}>" for var in builtin.variables}
+        expected = builtin.template
+        for var, value in values.items():
+            expected = expected.replace(f"{{{var}}}", value)
+        assert library.render(builtin.name, **values) == expected
+
+    for version in ("1.0", "2.0", "1.5"):
+        library.register(PromptTemplate(
+            name="versioned",
+            type=TemplateType.CHAIN_OF_THOUGHT,
+            version=version,
+            template=f"v{version}: {{question}}",
+            variables=["question"],
+            description="Versioned"
+        ))
+    assert library.get("versioned").version == "2.0"
+    assert library.render("versioned", question="Q") == "v2.0: Q"
+    assert library.render("versioned", version="1.0", question="Q") == "v1.0: Q"
+
+    library.delete("versioned", "2.0")
+    assert library.render("versioned", question="Q") == "v1.5: Q"
+    # Edits after registration are picked up by library.render
+    library.get("versioned", "1.0").template = "edited: {question}"
+    assert library.render("versioned", version="1.0", question="Q") == "edited: Q"
+
+    library.delete("versioned")
+    with pytest.raises(ValueError):
+        library.render("versioned", question="Q")
+
+
+def test_import_templates_skips_invalid(tmp_path):
+    """Test a bad template in an import file does not abort the import."""
+    def entry(name, template, variables):
+        return {"1.0": {
+            "name": name, "type": "chain_of_thought", "version": "1.0",
+            "template": template, "variables": variables, "description": name
+        }}
+
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps({
+        "extra_var": entry("extra_var", "Q: {question}", ["question", "context"]),
+        "undeclared": entry("undeclared", "Q: {question} {hint}", ["question"]),
+        "good": entry("good", "Answer {question}", ["question"]),
+    }))
+
+    library = PromptTemplateLibrary()
+    assert library.import_templates(str(path)) == 2
+    assert library.render("extra_var", question="Q") == "Q: Q"
+    assert library.render("good", question="Q") == "Answer Q"
+    assert library.get("undeclared") is None
+
+
 def test_few_shot_examples():
     """Test few-shot example management."""
     manager = FewShotExample()
@@ -489,6 +920,57 @@ async def test_self_consistency_evaluation():
     assert 0 <= eval_result.score <= 1
 
 
+@pytest.mark.asyncio
+async def test_concurrent_resumable_benchmark(tmp_path):
+    """Test concurrent benchmarking with timeouts and resumable results."""
+    provider = MockLLMProvider(latency=0.01)
+    reasoner = ChainOfThoughtReasoner(provider, max_steps=3)
+    benchmark = BenchmarkEvaluator(MockLLMProvider(latency=0.0))
+    dataset = [
+        {"id": f"q{i}", "question": f"Question {i}?", "answer": "mock response"}
+        for i in range(12)
+    ]
+    strategies = [ReasoningStrategy.ZERO_SHOT, ReasoningStrategy.SELF_CONSISTENCY]
+    results_path = tmp_path / "results.jsonl"
+
+    report = await benchmark.run_benchmark(
+        dataset, reasoner, strategies=strategies, concurrency=8,
+        item_timeout=5.0, results_path=str(results_path), cost_model="gpt-4o"
+    )
+
+    assert report["total_questions"] == 24
+    assert report["resumed"] == 0
+    assert len(results_path.read_text().splitlines()) == 24
+    assert reasoner.llm_provider is provider
+
+    # Tokens are attributed per item even though items share the reasoner
+    zero_shot = report["strategies"]["zero_shot"]
+    assert zero_shot["errors"] == 0
+    assert zero_shot["tokens"]["max"] < report["strategies"]["self_consistency"]["tokens"]["p50"]
+    assert zero_shot["cost_usd"]["p50"] > 0
+    assert set(zero_shot["latency_ms"]) == {"mean", "p50", "p90", "p95", "p99", "max"}
+
+    # A resumed run only redoes the items that are missing or failed
+    lines = results_path.read_text().splitlines()
+    results_path.write_text("\n".join(lines[:-2]) + '\n{"item_id": "q')
+    requests = provider.request_count
+    report = await benchmark.run_benchmark(
+        dataset, reasoner, strategies=strategies, concurrency=8,
+        results_path=str(results_path)
+    )
+    assert report["resumed"] == 22
+    assert report["total_questions"] == 24
+    assert 0 < provider.request_count - requests < requests / 4
+
+    report = await benchmark.run_benchmark(
+        dataset[:2], reasoner, strategy=ReasoningStrategy.ZERO_SHOT,
+        item_timeout=0.001
+    )
+    assert report["correct"] == 0
+    assert report["strategies"]["zero_shot"]["errors"] == 2
+    assert all("timed out" in record["error"] for record in report["results"])
+
+
 # Tracer Tests
 
 def test_tracer_initialization():
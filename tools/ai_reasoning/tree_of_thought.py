@@ -11,16 +11,23 @@ Protocol Coverage:
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import (
+    List, Dict, Any, Optional, Tuple, Awaitable, TypeVar, Callable, Sequence
+)
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
 import heapq
-from collections import deque
+import math
+import string
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
 
 class SearchStrategy(Enum):
     """Tree search strategy types."""
@@ -116,6 +123,93 @@ class ToTResult:
         }
 
 
+class TranspositionTable:
+    """
+    Memo of Tree-of-Thoughts work keyed by normalized thought text.
+
+    Thoughts that differ only in case, punctuation or whitespace share an
+    entry. With an embedding function, a thought whose embedding is within
+    similarity_threshold (cosine) of a known thought shares that entry too.
+    The table holds evaluation scores and the child thoughts generated from
+    a thought at a given depth, so neither has to be requested again.
+    """
+
+    def __init__(
+        self,
+        embedding_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.95
+    ):
+        """
+        Initialize an empty table.
+
+        Args:
+            embedding_fn: Optional function mapping text to an embedding
+            similarity_threshold: Minimum cosine similarity for two
+                thoughts to share an entry when embedding_fn is set
+        """
+        self.embedding_fn = embedding_fn
+        self.similarity_threshold = similarity_threshold
+        self.scores: Dict[str, float] = {}
+        self.expansions: Dict[str, List[str]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._embeddings: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        """Number of scored thoughts."""
+        return len(self.scores)
+
+    @staticmethod
+    def normalize(thought: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace."""
+        return " ".join(thought.lower().translate(_PUNCTUATION).split())
+
+    def key(self, thought: str) -> str:
+        """Return the table key a thought resolves to."""
+        normalized = self.normalize(thought)
+        if self.embedding_fn is None:
+            return normalized
+        if normalized not in self._aliases:
+            self._aliases[normalized] = self._nearest(normalized) or normalized
+        return self._aliases[normalized]
+
+    def expansion_key(self, thought: str, depth: int) -> str:
+        """Return the key for the children generated from a thought."""
+        return f"{depth}:{self.key(thought)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a serializable dictionary."""
+        return {"scores": dict(self.scores), "expansions": dict(self.expansions)}
+
+    def update(self, data: Dict[str, Any]) -> None:
+        """Merge entries from a dictionary produced by to_dict()."""
+        self.scores.update(data.get("scores", {}))
+        self.expansions.update(data.get("expansions", {}))
+
+    def _nearest(self, normalized: str) -> Optional[str]:
+        """Find the most similar known key above the similarity threshold."""
+        vector = self._embed(normalized)
+        best_key, best_similarity = None, self.similarity_threshold
+        for known in set(self._aliases.values()) | set(self.scores):
+            similarity = _cosine_similarity(vector, self._embed(known))
+            if similarity >= best_similarity:
+                best_key, best_similarity = known, similarity
+        return best_key
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed text once and remember the vector."""
+        if text not in self._embeddings:
+            self._embeddings[text] = [float(x) for x in self.embedding_fn(text)]
+        return self._embeddings[text]
+
+
+def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors (0.0 if either is zero)."""
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    if norm == 0:
+        return 0.0
+    return sum(x * y for x, y in zip(a, b)) / norm
+
+
 class TreeOfThoughtsExplorer:
     """
     Tree-of-Thoughts exploration engine with multi-path exploration,
@@ -129,7 +223,13 @@ class TreeOfThoughtsExplorer:
         branching_factor: int = 3,
         beam_width: int = 2,
         pruning_threshold: float = 0.3,
-        temperature: float = 0.8
+        temperature: float = 0.8,
+        max_concurrency: int = 1,
+        batch_generations: bool = False,
+        transposition_table: bool = False,
+        reasoning_cache: Optional[Any] = None,
+        embedding_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.95
     ):
         """
         Initialize ToT explorer.
@@ -141,15 +241,46 @@ class TreeOfThoughtsExplorer:
             beam_width: Width for beam search
             pruning_threshold: Minimum score to keep exploring
             temperature: LLM temperature for diversity
+            max_concurrency: Maximum LLM requests in flight; sibling
+                generations and evaluations fan out up to this limit
+                (1 keeps requests strictly sequential, node by node)
+            batch_generations: Request all branches of a node in one
+                provider call via generate_many() when the provider batches
+                natively (native_batching); other providers make one
+                request per branch, each counted against max_concurrency
+            transposition_table: Merge duplicate thoughts and reuse their
+                scores and expansions, within a run and across explore()
+                calls for the same question
+            reasoning_cache: Optional cache_management ReasoningCache that
+                persists transposition tables across processes (implies
+                transposition_table)
+            embedding_fn: Optional text embedding function; thoughts within
+                similarity_threshold of each other are treated as duplicates
+            similarity_threshold: Cosine similarity for embedding matches
         """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         self.llm_provider = llm_provider
         self.max_depth = max_depth
         self.branching_factor = branching_factor
         self.beam_width = beam_width
         self.pruning_threshold = pruning_threshold
         self.temperature = temperature
+        self.max_concurrency = max_concurrency
+        self.batch_generations = batch_generations
+        self.transposition_table = transposition_table or reasoning_cache is not None
+        self.reasoning_cache = reasoning_cache
+        self.embedding_fn = embedding_fn
+        self.similarity_threshold = similarity_threshold
         self.token_count = 0
         self.node_counter = 0
+        self.llm_calls_saved = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tables: Dict[str, TranspositionTable] = {}
+        self._table: Optional[TranspositionTable] = None
+        self._seen: Dict[str, str] = {}
+        self._pending_scores: Dict[str, "asyncio.Future[float]"] = {}
 
     async def explore(
         self,
@@ -175,9 +306,21 @@ class TreeOfThoughtsExplorer:
 
         logger.info(f"Starting ToT exploration with strategy: {strategy.value}")
 
+        # One limiter per run; semaphores are bound to the running loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Transposition state: the table outlives the run, the rest does not
+        problem = self._problem_key(question, context)
+        self._table = self._load_table(problem) if self.transposition_table else None
+        self._seen = {}
+        self._pending_scores = {}
+        self.llm_calls_saved = 0
+
         # Initialize tree
         root_node = self._create_root_node(question)
         all_nodes = {root_node.id: root_node}
+        if self._table is not None:
+            self._seen[self._table.key(root_node.thought)] = root_node.id
 
         # Explore based on strategy
         if strategy == SearchStrategy.BREADTH_FIRST:
@@ -215,6 +358,13 @@ class TreeOfThoughtsExplorer:
             execution_time=time.time() - start_time
         )
 
+        if self._table is not None:
+            result.metadata["llm_calls_saved"] = self.llm_calls_saved
+            result.metadata["transpositions"] = sum(
+                1 for node in all_nodes.values() if "transposition" in node.metadata
+            )
+            self._save_table(problem, self._table)
+
         logger.info(
             f"ToT exploration completed: {len(all_nodes)} nodes, "
             f"{pruned_count} pruned, {result.execution_time:.2f}s"
@@ -229,34 +379,43 @@ class TreeOfThoughtsExplorer:
         goal_checker: Optional[Any],
         context: Optional[str]
     ) -> Tuple[TreePath, List[TreePath]]:
-        """Breadth-first tree exploration."""
-        queue = deque([root])
+        """Breadth-first tree exploration, one level at a time."""
+        level = [root]
         explored_paths = []
 
-        while queue:
-            node = queue.popleft()
-
-            if node.depth >= self.max_depth:
-                path = self._construct_path(node, all_nodes)
-                explored_paths.append(path)
-                continue
-
-            # Check if goal reached
-            if goal_checker and await goal_checker(node):
-                node.state = NodeState.SOLUTION
-                path = self._construct_path(node, all_nodes)
-                return path, explored_paths
+        while level:
+            expandable = []
+            expansions = []
+            for node in level:
+                if node.depth >= self.max_depth:
+                    path = self._construct_path(node, all_nodes)
+                    explored_paths.append(path)
+                    continue
 
-            # Generate children
-            children = await self._generate_children(node, question, context)
-            for child in children:
-                all_nodes[child.id] = child
-                node.children_ids.append(child.id)
+                # Check if goal reached
+                if goal_checker and await goal_checker(node):
+                    node.state = NodeState.SOLUTION
+                    path = self._construct_path(node, all_nodes)
+                    return path, explored_paths
 
-                # Evaluate and prune
-                await self._evaluate_node(child, question, context)
+                if self.max_concurrency == 1:
+                    # Sequential runs keep the node-by-node request order
+                    expansions.append(
+                        await self._expand(node, all_nodes, question, context)
+                    )
+                else:
+                    expandable.append(node)
+
+            # Generate and evaluate children for the whole level at once
+            expansions += await asyncio.gather(*(
+                self._expand(node, all_nodes, question, context)
+                for node in expandable
+            ))
+            level = []
+            for child in (child for children in expansions for child in children):
+                # Prune
                 if child.score >= self.pruning_threshold:
-                    queue.append(child)
+                    level.append(child)
                 else:
                     child.state = NodeState.PRUNED
 
@@ -290,14 +449,10 @@ class TreeOfThoughtsExplorer:
                 path = self._construct_path(node, all_nodes)
                 return path, explored_paths
 
-            # Generate children
-            children = await self._generate_children(node, question, context)
+            # Generate and evaluate children
+            children = await self._expand(node, all_nodes, question, context)
             for child in children:
-                all_nodes[child.id] = child
-                node.children_ids.append(child.id)
-
-                # Evaluate and prune
-                await self._evaluate_node(child, question, context)
+                # Prune
                 if child.score >= self.pruning_threshold:
                     stack.append(child)
                 else:
@@ -335,14 +490,10 @@ class TreeOfThoughtsExplorer:
                 path = self._construct_path(node, all_nodes)
                 return path, explored_paths
 
-            # Generate children
-            children = await self._generate_children(node, question, context)
+            # Generate and evaluate children
+            children = await self._expand(node, all_nodes, question, context)
             for child in children:
-                all_nodes[child.id] = child
-                node.children_ids.append(child.id)
-
-                # Evaluate and prune
-                await self._evaluate_node(child, question, context)
+                # Prune
                 if child.score >= self.pruning_threshold:
                     heapq.heappush(heap, (-child.score, counter, child))
                     counter += 1
@@ -366,8 +517,8 @@ class TreeOfThoughtsExplorer:
         explored_paths = []
 
         for depth in range(self.max_depth):
-            next_beam = []
-
+            expandable = []
+            expansions = []
             for node in current_beam:
                 # Check if goal reached
                 if goal_checker and await goal_checker(node):
@@ -375,15 +526,20 @@ class TreeOfThoughtsExplorer:
                     path = self._construct_path(node, all_nodes)
                     return path, explored_paths
 
-                # Generate children
-                children = await self._generate_children(node, question, context)
-                for child in children:
-                    all_nodes[child.id] = child
-                    node.children_ids.append(child.id)
+                if self.max_concurrency == 1:
+                    # Sequential runs keep the node-by-node request order
+                    expansions.append(
+                        await self._expand(node, all_nodes, question, context)
+                    )
+                else:
+                    expandable.append(node)
 
-                    # Evaluate
-                    await self._evaluate_node(child, question, context)
-                    next_beam.append(child)
+            # Expand the whole beam at once
+            expansions += await asyncio.gather(*(
+                self._expand(node, all_nodes, question, context)
+                for node in expandable
+            ))
+            next_beam = [child for children in expansions for child in children]
 
             # Keep top beam_width nodes
             next_beam.sort(key=lambda n: n.score, reverse=True)
@@ -405,6 +561,45 @@ class TreeOfThoughtsExplorer:
         best_path = max(explored_paths, key=lambda p: p.total_score) if explored_paths else self._construct_path(root, all_nodes)
         return best_path, explored_paths
 
+    async def _limited(self, request: Awaitable[T]) -> T:
+        """Await an LLM request under the explorer's concurrency limit."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await request
+
+    async def _expand(
+        self,
+        node: ThoughtNode,
+        all_nodes: Dict[str, ThoughtNode],
+        question: str,
+        context: Optional[str]
+    ) -> List[ThoughtNode]:
+        """
+        Generate a node's children, attach them and evaluate them together.
+
+        Children that repeat a thought already in the tree are attached and
+        scored but marked with metadata["transposition"] (the id of the first
+        occurrence) and left out of the returned list, so they are not
+        expanded again.
+        """
+        children = await self._generate_children(node, question, context)
+        fresh = []
+        for child in children:
+            all_nodes[child.id] = child
+            node.children_ids.append(child.id)
+            if self._table is not None:
+                original = self._seen.setdefault(self._table.key(child.thought), child.id)
+                if original != child.id:
+                    child.metadata["transposition"] = original
+                    continue
+            fresh.append(child)
+
+        await asyncio.gather(*(
+            self._evaluate_node(child, question, context) for child in children
+        ))
+        return fresh
+
     async def _generate_children(
         self,
         parent: ThoughtNode,
@@ -414,19 +609,50 @@ class TreeOfThoughtsExplorer:
         """Generate child nodes for a parent node."""
         parent.state = NodeState.EXPLORING
 
-        prompt = self._build_branching_prompt(parent, question, context)
-
-        children = []
-        for i in range(self.branching_factor):
-            response = await self.llm_provider.generate(
-                prompt=prompt,
-                temperature=self.temperature,
-                max_tokens=300
-            )
+        # A batch holds one permit, so only providers that answer it with a
+        # single request may batch; the fallback fans out n requests
+        batched = self.batch_generations and getattr(
+            self.llm_provider, "native_batching", False
+        )
 
-            self.token_count += response.token_count
-            thought = response.text.strip()
+        thoughts = None
+        if self._table is not None:
+            expansion_key = self._table.expansion_key(parent.thought, parent.depth)
+            cached = self._table.expansions.get(expansion_key, [])
+            if len(cached) >= self.branching_factor:
+                thoughts = cached[:self.branching_factor]
+                self.llm_calls_saved += 1 if batched else self.branching_factor
+
+        if thoughts is None:
+            prompt = self._build_branching_prompt(parent, question, context)
+
+            if batched:
+                responses = await self._limited(self.llm_provider.generate_many(
+                    prompt=prompt,
+                    n=self.branching_factor,
+                    temperature=self.temperature,
+                    max_tokens=300
+                ))
+            else:
+                responses = await asyncio.gather(*(
+                    self._limited(self.llm_provider.generate(
+                        prompt=prompt,
+                        temperature=self.temperature,
+                        max_tokens=300
+                    ))
+                    for _ in range(self.branching_factor)
+                ))
+
+            thoughts = []
+            for response in responses:
+                self.token_count += response.token_count
+                thoughts.append(response.text.strip())
+
+            if self._table is not None:
+                self._table.expansions[expansion_key] = thoughts
 
+        children = []
+        for thought in thoughts:
             child = ThoughtNode(
                 id=self._generate_node_id(),
                 depth=parent.depth + 1,
@@ -444,14 +670,42 @@ class TreeOfThoughtsExplorer:
         question: str,
         context: Optional[str]
     ) -> None:
-        """Evaluate a node and assign score."""
+        """Evaluate a node and assign score, reusing known scores if possible."""
+        if self._table is None:
+            node.score = await self._score_thought(node.thought, question, context)
+        else:
+            key = self._table.key(node.thought)
+            if key in self._table.scores:
+                self.llm_calls_saved += 1
+            else:
+                # Concurrent evaluations of the same thought share one request
+                pending = self._pending_scores.get(key)
+                if pending is None:
+                    pending = asyncio.ensure_future(
+                        self._score_thought(node.thought, question, context)
+                    )
+                    self._pending_scores[key] = pending
+                else:
+                    self.llm_calls_saved += 1
+                self._table.scores[key] = await pending
+            node.score = self._table.scores[key]
+
+        node.state = NodeState.EVALUATED
+
+    async def _score_thought(
+        self,
+        thought: str,
+        question: str,
+        context: Optional[str]
+    ) -> float:
+        """Ask the LLM to score a thought."""
         evaluation_prompt = f"""
 Evaluate the following thought in the context of solving this problem:
 
 Question: {question}
 {f"Context: {context}" if context else ""}
 
-Thought: {node.thought}
+Thought: {thought}
 
 Rate this thought on a scale of 0.0 to 1.0 based on:
 1. Relevance to the question
@@ -462,22 +716,47 @@ Rate this thought on a scale of 0.0 to 1.0 based on:
 Provide only the numerical score (e.g., 0.75):
 """
 
-        response = await self.llm_provider.generate(
+        response = await self._limited(self.llm_provider.generate(
             prompt=evaluation_prompt,
             temperature=0.2,
             max_tokens=10
-        )
+        ))
 
         self.token_count += response.token_count
 
         try:
             score_text = response.text.strip()
-            node.score = float(score_text)
+            return float(score_text)
         except ValueError:
             logger.warning(f"Failed to parse score: {response.text}")
-            node.score = 0.5
+            return 0.5
 
-        node.state = NodeState.EVALUATED
+    @staticmethod
+    def _problem_key(question: str, context: Optional[str]) -> str:
+        """Identify the problem a transposition table belongs to."""
+        return f"{question}\n\nContext: {context}" if context else question
+
+    def _load_table(self, problem: str) -> TranspositionTable:
+        """Get the problem's table, loading it from the reasoning cache once."""
+        table = self._tables.get(problem)
+        if table is None:
+            table = TranspositionTable(self.embedding_fn, self.similarity_threshold)
+            if self.reasoning_cache is not None:
+                stored = self.reasoning_cache.get_transpositions(problem)
+                if stored:
+                    table.update(stored)
+                    logger.info(f"Loaded {len(table)} cached thought scores")
+            self._tables[problem] = table
+        return table
+
+    def _save_table(self, problem: str, table: TranspositionTable) -> None:
+        """Persist a table to the reasoning cache, if one is configured."""
+        if self.reasoning_cache is None:
+            return
+        try:
+            self.reasoning_cache.cache_transpositions(problem, table.to_dict())
+        except Exception as e:
+            logger.warning(f"Failed to persist transposition table: {e}")
 
     def _create_root_node(self, question: str) -> ThoughtNode:
         """Create root node of the tree."""
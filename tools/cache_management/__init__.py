@@ -10,18 +10,24 @@ matching for fuzzy cache hits.
 __version__ = "1.0.0"
 __author__ = "devCrew_s1"
 
-from .cache_manager import (CacheManager, CacheStats, CacheWarmer,
-                            EvictionPolicy)
-from .distributed_cache import (DistributedCache, ReplicationConfig,
-                                ShardingStrategy)
+from .ann_index import ANNBackend, ANNIndexConfig, PartitionedANNIndex
+from .async_llm_cache import AsyncLLMCache
+from .cache_manager import (AdmissionMode, CacheManager, CacheStats,
+                            CacheWarmer, EvictionPolicy)
+from .distributed_cache import (ConsistencyLevel, ConsistentHashRing,
+                                DistributedCache, HashAlgorithm,
+                                ReplicationConfig, ShardingStrategy)
 from .llm_cache import CacheBackend, CacheConfig, CachedResponse, LLMCache
 from .metrics import CacheMetrics, MetricsCollector, PerformanceMetrics
 from .reasoning_cache import CoTStep, ReasoningCache, ReasoningResult, ToTNode
-from .similarity_matcher import (EmbeddingModel, SimilarityConfig,
+from .similarity_matcher import (EmbeddingBatcher, EmbeddingMemo,
+                                 EmbeddingModel, EmbeddingPrecision,
+                                 EmbeddingStore, SimilarityConfig,
                                  SimilarityMatcher, SimilarMatch)
 
 __all__ = [
     "LLMCache",
+    "AsyncLLMCache",
     "CacheConfig",
     "CachedResponse",
     "CacheBackend",
@@ -33,11 +39,22 @@ __all__ = [
     "SimilarityConfig",
     "SimilarMatch",
     "EmbeddingModel",
+    "EmbeddingPrecision",
+    "EmbeddingStore",
+    "EmbeddingMemo",
+    "EmbeddingBatcher",
+    "PartitionedANNIndex",
+    "ANNIndexConfig",
+    "ANNBackend",
     "CacheManager",
     "EvictionPolicy",
+    "AdmissionMode",
     "CacheStats",
     "CacheWarmer",
     "DistributedCache",
+    "ConsistencyLevel",
+    "ConsistentHashRing",
+    "HashAlgorithm",
     "ShardingStrategy",
     "ReplicationConfig",
     "MetricsCollector",
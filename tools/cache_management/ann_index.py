@@ -0,0 +1,556 @@
+"""
+Approximate Nearest-Neighbour Index for Semantic Cache Lookups.
+
+This module provides incremental vector indexes used to answer fuzzy cache
+lookups without scanning every cached embedding. Indexes are partitioned by
+model name so a prompt is only ever matched against responses produced by the
+same model.
+
+Backends:
+- EXACT: brute-force inner product over a growable NumPy matrix
+- IVF: inverted file index (k-means coarse quantizer) in pure NumPy
+- HNSW: hierarchical navigable small world graph via optional ``hnswlib``
+
+All backends operate on L2-normalized float32 vectors, so returned scores are
+cosine similarities.
+
+Author: devCrew_s1
+License: MIT
+"""
+
+import logging
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, field_validator
+
+logger = logging.getLogger(__name__)
+
+
+class ANNBackend(str, Enum):
+    """Supported nearest-neighbour index backends."""
+
+    EXACT = "exact"  # Brute-force NumPy search
+    IVF = "ivf"  # Inverted file index with k-means coarse quantizer
+    HNSW = "hnsw"  # Graph index (requires hnswlib)
+
+
+class ANNIndexConfig(BaseModel):
+    """Configuration for approximate nearest-neighbour indexes."""
+
+    backend: ANNBackend = Field(default=ANNBackend.IVF, description="Index backend")
+    nlist: int = Field(default=256, description="IVF: number of coarse clusters")
+    nprobe: int = Field(default=8, description="IVF: clusters probed per query")
+    train_size: Optional[int] = Field(
+        default=None,
+        description="IVF: vectors required before training (default 39 * nlist)",
+    )
+    kmeans_iterations: int = Field(default=10, description="IVF: k-means iterations")
+    hnsw_m: int = Field(default=16, description="HNSW: graph degree")
+    hnsw_ef_construction: int = Field(
+        default=200, description="HNSW: construction beam width"
+    )
+    hnsw_ef_search: int = Field(default=64, description="HNSW: query beam width")
+    initial_capacity: int = Field(
+        default=1024, description="Initial preallocated vectors per partition"
+    )
+    seed: int = Field(default=42, description="Random seed for k-means training")
+
+    @field_validator("nlist", "nprobe", "kmeans_iterations", "initial_capacity")
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        """Validate integer settings are positive."""
+        if v <= 0:
+            raise ValueError("Index settings must be positive")
+        return v
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize a vector or matrix of row vectors as float32."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the ``k`` highest scores, sorted descending."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class VectorStore:
+    """
+    Growable, preallocated float32 matrix keyed by string ids.
+
+    Rows are appended into spare capacity (doubling when full) and removals
+    move the last row into the freed slot, so add and remove are O(1).
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        """
+        Initialize an empty vector store.
+
+        Args:
+            initial_capacity: Rows to preallocate once the dimension is known
+        """
+        self._initial_capacity = initial_capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def _ensure_capacity(self, dim: int, extra: int) -> None:
+        """Allocate or grow the backing matrix to hold ``extra`` more rows."""
+        needed = len(self._keys) + extra
+        if self._vectors is None:
+            capacity = max(self._initial_capacity, needed)
+            self._vectors = np.empty((capacity, dim), dtype=np.float32)
+        elif needed > self._vectors.shape[0]:
+            capacity = max(self._vectors.shape[0] * 2, needed)
+            grown = np.empty((capacity, dim), dtype=np.float32)
+            grown[: len(self._keys)] = self._vectors[: len(self._keys)]
+            self._vectors = grown
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        """Insert or overwrite the vector stored under ``key``."""
+        row = self._rows.get(key)
+        if row is not None:
+            self._vectors[row] = vector  # type: ignore[index]
+            return
+
+        self._ensure_capacity(vector.shape[-1], 1)
+        row = len(self._keys)
+        self._vectors[row] = vector  # type: ignore[index]
+        self._keys.append(key)
+        self._rows[key] = row
+
+    def add_batch(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Append many new vectors at once."""
+        if len(set(keys)) != len(keys):
+            for key, vector in zip(keys, vectors):
+                self.add(key, vector)
+            return
+
+        new = [i for i, key in enumerate(keys) if key not in self._rows]
+        for i, key in enumerate(keys):
+            if key in self._rows:
+                self.add(key, vectors[i])
+        if not new:
+            return
+
+        self._ensure_capacity(vectors.shape[-1], len(new))
+        start = len(self._keys)
+        self._vectors[start : start + len(new)] = vectors[new]  # type: ignore[index]
+        for offset, i in enumerate(new):
+            self._keys.append(keys[i])
+            self._rows[keys[i]] = start + offset
+
+    def remove(self, key: str) -> bool:
+        """Remove ``key`` by moving the last row into its slot."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+
+        last = len(self._keys) - 1
+        if row != last:
+            moved_key = self._keys[last]
+            self._vectors[row] = self._vectors[last]  # type: ignore[index]
+            self._keys[row] = moved_key
+            self._rows[moved_key] = row
+        self._keys.pop()
+        return True
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Return the ``k`` keys with highest inner product to ``query``."""
+        if not self._keys or k <= 0:
+            return []
+        scores = self.matrix @ query
+        return [(self._keys[i], float(scores[i])) for i in _top_k(scores, k)]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """View of the populated rows."""
+        if self._vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._vectors[: len(self._keys)]
+
+    @property
+    def keys(self) -> List[str]:
+        """Keys in row order."""
+        return self._keys
+
+    def __len__(self) -> int:
+        """Get the number of stored vectors."""
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        """Check if a key is stored."""
+        return key in self._rows
+
+
+class ExactIndex:
+    """Brute-force inner-product index; the reference for recall."""
+
+    def __init__(self, config: ANNIndexConfig):
+        """Initialize exact index."""
+        self._store = VectorStore(config.initial_capacity)
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        """Add a normalized vector."""
+        self._store.add(key, vector)
+
+    def add_batch(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Add many normalized vectors."""
+        self._store.add_batch(keys, vectors)
+
+    def remove(self, key: str) -> bool:
+        """Remove a vector by key."""
+        return self._store.remove(key)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Return exact top-k matches."""
+        return self._store.search(query, k)
+
+    def __len__(self) -> int:
+        """Get the number of indexed vectors."""
+        return len(self._store)
+
+
+class IVFIndex:
+    """
+    Inverted file index with a k-means coarse quantizer.
+
+    Vectors are held in a flat store until ``train_size`` vectors have been
+    seen; the index then trains ``nlist`` centroids and moves every vector
+    into the inverted list of its nearest centroid. Queries scan only the
+    ``nprobe`` closest lists.
+    """
+
+    def __init__(self, config: ANNIndexConfig):
+        """Initialize untrained IVF index."""
+        self.config = config
+        self._train_size = config.train_size or config.nlist * 39
+        self._flat = VectorStore(config.initial_capacity)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[VectorStore] = []
+        self._assignments: Dict[str, int] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the coarse quantizer has been trained."""
+        return self._centroids is not None
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        """Add a normalized vector, training the quantizer when ready."""
+        if not self.is_trained:
+            self._flat.add(key, vector)
+            if len(self._flat) >= self._train_size:
+                self.train()
+            return
+
+        self.remove(key)
+        list_id = int(np.argmax(self._centroids @ vector))  # type: ignore[operator]
+        self._lists[list_id].add(key, vector)
+        self._assignments[key] = list_id
+
+    def add_batch(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Add many normalized vectors with one assignment pass."""
+        if not self.is_trained:
+            self._flat.add_batch(keys, vectors)
+            if len(self._flat) >= self._train_size:
+                self.train()
+            return
+
+        for key in keys:
+            self.remove(key)
+        list_ids = self._assign(vectors)
+        for list_id in np.unique(list_ids):
+            members = np.flatnonzero(list_ids == list_id)
+            self._lists[list_id].add_batch([keys[i] for i in members], vectors[members])
+            for i in members:
+                self._assignments[keys[i]] = int(list_id)
+
+    def _assign(self, vectors: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        """Nearest-centroid assignment, chunked to bound memory."""
+        out = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk):
+            block = vectors[start : start + chunk]
+            out[start : start + chunk] = np.argmax(
+                block @ self._centroids.T, axis=1  # type: ignore[union-attr]
+            )
+        return out
+
+    def train(self) -> None:
+        """Train centroids with spherical k-means and redistribute vectors."""
+        data = self._flat.matrix
+        nlist = min(self.config.nlist, len(data))
+        if nlist == 0:
+            return
+
+        rng = np.random.default_rng(self.config.seed)
+        sample_size = min(len(data), max(self._train_size, nlist * 39))
+        sample = data[rng.choice(len(data), sample_size, replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(self.config.kmeans_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty clusters from random samples
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        self._centroids = centroids
+        self._lists = [
+            VectorStore(max(16, self.config.initial_capacity // nlist))
+            for _ in range(nlist)
+        ]
+        # ``data`` keeps the old flat matrix alive while it is redistributed
+        keys = list(self._flat.keys)
+        self._flat = VectorStore(self.config.initial_capacity)
+        self.add_batch(keys, data)
+
+        logger.info(f"Trained IVF index with {nlist} lists on {sample_size} vectors")
+
+    def remove(self, key: str) -> bool:
+        """Remove a vector by key."""
+        if not self.is_trained:
+            return self._flat.remove(key)
+
+        list_id = self._assignments.pop(key, None)
+        if list_id is None:
+            return False
+        return self._lists[list_id].remove(key)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Return approximate top-k matches from the closest lists."""
+        if not self.is_trained:
+            return self._flat.search(query, k)
+
+        centroid_scores = self._centroids @ query  # type: ignore[operator]
+        probes = _top_k(centroid_scores, self.config.nprobe)
+
+        results: List[Tuple[str, float]] = []
+        for list_id in probes:
+            results.extend(self._lists[list_id].search(query, k))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results[:k]
+
+    def __len__(self) -> int:
+        """Get the number of indexed vectors."""
+        if not self.is_trained:
+            return len(self._flat)
+        return len(self._assignments)
+
+
+class HNSWIndex:
+    """Graph index backed by the optional ``hnswlib`` package."""
+
+    def __init__(self, config: ANNIndexConfig):
+        """
+        Initialize HNSW index.
+
+        Raises:
+            ImportError: If hnswlib is not installed
+        """
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImportError(
+                "hnswlib not installed. Install with: pip install hnswlib"
+            )
+
+        self.config = config
+        self._hnswlib = hnswlib
+        self._index: Any = None
+        self._labels: Dict[str, int] = {}
+        self._keys: Dict[int, str] = {}
+        self._next_label = 0
+
+    def _ensure_capacity(self, dim: int, extra: int) -> None:
+        """Create or resize the underlying graph."""
+        needed = self._next_label + extra
+        if self._index is None:
+            self._index = self._hnswlib.Index(space="ip", dim=dim)
+            self._index.init_index(
+                max_elements=max(self.config.initial_capacity, needed),
+                ef_construction=self.config.hnsw_ef_construction,
+                M=self.config.hnsw_m,
+                random_seed=self.config.seed,
+            )
+            self._index.set_ef(self.config.hnsw_ef_search)
+        elif needed > self._index.get_max_elements():
+            self._index.resize_index(max(self._index.get_max_elements() * 2, needed))
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        """Add a normalized vector."""
+        self.add_batch([key], vector.reshape(1, -1))
+
+    def add_batch(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Add many normalized vectors."""
+        for key in keys:
+            self.remove(key)
+        self._ensure_capacity(vectors.shape[-1], len(keys))
+        labels = np.arange(self._next_label, self._next_label + len(keys))
+        self._index.add_items(vectors, labels)
+        for key, label in zip(keys, labels):
+            self._labels[key] = int(label)
+            self._keys[int(label)] = key
+        self._next_label += len(keys)
+
+    def remove(self, key: str) -> bool:
+        """Mark a vector deleted."""
+        label = self._labels.pop(key, None)
+        if label is None:
+            return False
+        self._index.mark_deleted(label)
+        del self._keys[label]
+        return True
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Return approximate top-k matches."""
+        if not self._labels or k <= 0:
+            return []
+        k = min(k, len(self._labels))
+        labels, distances = self._index.knn_query(query, k=k)
+        # hnswlib "ip" space reports 1 - inner product as the distance
+        return [
+            (self._keys[int(label)], float(1.0 - distance))
+            for label, distance in zip(labels[0], distances[0])
+        ]
+
+    def __len__(self) -> int:
+        """Get the number of live vectors."""
+        return len(self._labels)
+
+
+class PartitionedANNIndex:
+    """
+    Nearest-neighbour index partitioned by model name.
+
+    Examples:
+        >>> index = PartitionedANNIndex(ANNIndexConfig(backend=ANNBackend.IVF))
+        >>> index.add("key-1", embedding, partition="gpt-4")
+        >>> index.search(query_embedding, partition="gpt-4", top_k=1)
+        [('key-1', 0.97)]
+    """
+
+    def __init__(self, config: Optional[ANNIndexConfig] = None):
+        """
+        Initialize partitioned index.
+
+        Args:
+            config: Index configuration (IVF defaults if None)
+        """
+        self.config = config or ANNIndexConfig()
+        self._partitions: Dict[str, Any] = {}
+        self._key_partitions: Dict[str, str] = {}
+
+        if self.config.backend == ANNBackend.HNSW:
+            try:
+                HNSWIndex(self.config)
+            except ImportError as e:
+                logger.warning(f"{e}; falling back to IVF index")
+                self.config = self.config.model_copy(
+                    update={"backend": ANNBackend.IVF}
+                )
+
+    def _create_index(self) -> Any:
+        """Create an empty index for the configured backend."""
+        if self.config.backend == ANNBackend.HNSW:
+            return HNSWIndex(self.config)
+        if self.config.backend == ANNBackend.IVF:
+            return IVFIndex(self.config)
+        return ExactIndex(self.config)
+
+    def _partition(self, name: str) -> Any:
+        """Get or create the index for a partition."""
+        index = self._partitions.get(name)
+        if index is None:
+            index = self._create_index()
+            self._partitions[name] = index
+        return index
+
+    def add(self, key: str, embedding: np.ndarray, partition: str) -> None:
+        """
+        Add or replace an embedding.
+
+        Args:
+            key: Cache key
+            embedding: Embedding vector (normalized internally)
+            partition: Partition name, typically the model name
+        """
+        previous = self._key_partitions.get(key)
+        if previous is not None and previous != partition:
+            self.remove(key)
+        self._partition(partition).add(key, _normalize(embedding))
+        self._key_partitions[key] = partition
+
+    def add_batch(
+        self, keys: Sequence[str], embeddings: np.ndarray, partition: str
+    ) -> None:
+        """Add many embeddings to one partition."""
+        for key in keys:
+            previous = self._key_partitions.get(key)
+            if previous is not None and previous != partition:
+                self.remove(key)
+        self._partition(partition).add_batch(list(keys), _normalize(embeddings))
+        for key in keys:
+            self._key_partitions[key] = partition
+
+    def remove(self, key: str) -> bool:
+        """Remove an embedding from whichever partition holds it."""
+        partition = self._key_partitions.pop(key, None)
+        if partition is None:
+            return False
+        return self._partitions[partition].remove(key)
+
+    def search(
+        self,
+        embedding: np.ndarray,
+        partition: str,
+        top_k: int = 1,
+        threshold: float = 0.0,
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the nearest cached keys within a partition.
+
+        Args:
+            embedding: Query embedding
+            partition: Partition name to search
+            top_k: Maximum results
+            threshold: Minimum cosine similarity
+
+        Returns:
+            List of (key, similarity) tuples, sorted descending
+        """
+        index = self._partitions.get(partition)
+        if index is None or len(index) == 0:
+            return []
+        results = index.search(_normalize(embedding), top_k)
+        return [(key, score) for key, score in results if score >= threshold]
+
+    def clear(self) -> None:
+        """Drop all partitions."""
+        self._partitions.clear()
+        self._key_partitions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-partition sizes and the active backend."""
+        return {
+            "backend": self.config.backend.value,
+            "total_vectors": len(self._key_partitions),
+            "partitions": {name: len(idx) for name, idx in self._partitions.items()},
+        }
+
+    def __len__(self) -> int:
+        """Get the number of indexed embeddings."""
+        return len(self._key_partitions)
+
+    def __contains__(self, key: str) -> bool:
+        """Check if a key is indexed."""
+        return key in self._key_partitions
@@ -0,0 +1,618 @@
+"""
+Asynchronous LLM Cache.
+
+This module provides an asyncio front-end to the LLM cache for callers that
+issue many concurrent requests from a single event loop. Redis is accessed
+through ``redis.asyncio`` with a connection pool shared by every cache on the
+same loop, the disk backend is offloaded to a thread pool so SQLite I/O never
+blocks the loop, and concurrent misses on the same key are coalesced so only
+one upstream LLM call is made.
+
+Author: devCrew_s1
+License: MIT
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+try:
+    from .llm_cache import (INDEX_KEY_PREFIX, CacheBackend, CacheConfig,
+                            CachedResponse, CacheStats, LLMCache,
+                            make_cache_key, make_cached_response,
+                            parse_redis_address, queue_index_updates)
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from llm_cache import (INDEX_KEY_PREFIX, CacheBackend,  # type: ignore
+                           CacheConfig, CachedResponse, CacheStats, LLMCache,
+                           make_cache_key, make_cached_response,
+                           parse_redis_address, queue_index_updates)
+
+logger = logging.getLogger(__name__)
+
+# Connection pools are bound to the loop that opened their sockets, so they
+# are shared per event loop and dropped together with it.
+_SHARED_POOLS: "weakref.WeakKeyDictionary[Any, Dict[Tuple[Any, ...], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+ResponseLoader = Callable[[], Awaitable[str]]
+
+
+def _shared_pool(config: CacheConfig) -> aioredis.ConnectionPool:
+    """Return the connection pool for ``config`` on the running loop."""
+    loop = asyncio.get_running_loop()
+    host, port = parse_redis_address(config.redis_url)
+    pool_key = (
+        host,
+        port,
+        config.redis_db,
+        config.redis_password,
+        config.redis_max_connections,
+    )
+    pools = _SHARED_POOLS.setdefault(loop, {})
+    pool = pools.get(pool_key)
+    if pool is None:
+        # A blocking pool makes callers queue for a free connection instead of
+        # failing once more coroutines than max_connections are in flight.
+        pool = aioredis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=config.redis_db,
+            password=config.redis_password,
+            max_connections=config.redis_max_connections,
+            decode_responses=False,
+        )
+        pools[pool_key] = pool
+    return pool
+
+
+class AsyncLLMCache:
+    """
+    Asyncio LLM cache with the same semantics as LLMCache.
+
+    ``get``/``set``/``exists``/``invalidate`` mirror the synchronous API and use
+    the same key scheme and serialization, so both front-ends can share a Redis
+    database or disk directory. ``get_or_set`` adds single-flight loading:
+    while one coroutine is fetching a missing response, other coroutines
+    asking for the same key wait for that result instead of calling the LLM.
+
+    Examples:
+        >>> cache = AsyncLLMCache(CacheConfig(backend=CacheBackend.REDIS))
+        >>> response = await cache.get_or_set(prompt, lambda: call_llm(prompt))
+        >>> print(response.value)
+        >>> await cache.close()
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        redis_client: Optional[aioredis.Redis] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        max_workers: int = 4,
+    ):
+        """
+        Initialize async LLM cache with specified configuration.
+
+        Args:
+            config: Cache configuration object
+            redis_client: Pre-built ``redis.asyncio`` client to use instead of
+                the shared pool (Redis backend only)
+            executor: Thread pool for disk I/O; one is created if None
+            max_workers: Worker count for the created disk I/O thread pool
+
+        Raises:
+            IOError: If disk cache directory cannot be created
+        """
+        self.config = config
+        self._redis: Optional[aioredis.Redis] = redis_client
+        self._owns_redis = redis_client is None
+        self._local: Optional[LLMCache] = None
+        self._executor = executor
+        self._owns_executor = False
+        self._inflight: Dict[str, "asyncio.Future[CachedResponse]"] = {}
+        self._stats_hits = 0
+        self._stats_misses = 0
+        self._loader_calls = 0
+        self._coalesced = 0
+        self._index_additions = 0
+        self._prune_task: Optional["asyncio.Task[int]"] = None
+
+        if config.backend == CacheBackend.REDIS:
+            pass  # client is created lazily on the running loop
+        elif config.backend in (CacheBackend.MEMORY, CacheBackend.DISK):
+            self._local = LLMCache(config)
+            if config.backend == CacheBackend.DISK and executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="llm-cache-disk"
+                )
+                self._owns_executor = True
+        else:
+            raise ValueError(f"Unsupported cache backend: {config.backend}")
+
+        logger.info(f"Initialized async LLM cache with backend: {config.backend}")
+
+    def _key(self, prompt: str, model_params: Optional[Dict[str, Any]]) -> str:
+        """Cache key for a prompt, identical to LLMCache's."""
+        return make_cache_key(prompt, model_params, self.config.include_model_params)
+
+    def _client(self) -> aioredis.Redis:
+        """Redis client bound to the shared pool of the running loop."""
+        if self._redis is None:
+            self._redis = aioredis.Redis(connection_pool=_shared_pool(self.config))
+        return self._redis
+
+    async def _run_local(self, method: Callable[..., Any], *args: Any) -> Any:
+        """Call a synchronous LLMCache method without blocking the loop."""
+        if self.config.backend == CacheBackend.DISK:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(method, *args)
+            )
+        return method(*args)
+
+    async def _store(self, cached_response: CachedResponse) -> bool:
+        """Write a built response to the backend."""
+        if self._local is not None:
+            return await self._run_local(self._local.store_response, cached_response)
+
+        try:
+            serialized = json.dumps(cached_response.model_dump()).encode("utf-8")
+            pipe = self._client().pipeline(transaction=False)
+            if cached_response.ttl > 0:
+                pipe.setex(cached_response.key, cached_response.ttl, serialized)
+            else:
+                pipe.set(cached_response.key, serialized)
+            queue_index_updates(pipe, cached_response)
+            await pipe.execute()
+            self._count_index_additions(cached_response)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache response: {e}")
+            return False
+
+    async def set(
+        self,
+        prompt: str,
+        response: str,
+        ttl: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        model_params: Optional[Dict[str, Any]] = None,
+        token_count: Optional[int] = None,
+        model_name: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Cache an LLM response with specified TTL.
+
+        Args:
+            prompt: Input prompt text
+            response: LLM response text
+            ttl: Time-to-live in seconds (uses config default if None)
+            metadata: Additional metadata to store
+            model_params: Model parameters to include in cache key
+            token_count: Token count for the response
+            model_name: Name of the model used
+            tags: Invalidation tags for the entry
+
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        ttl_value = ttl if ttl is not None else self.config.ttl_seconds
+        cached_response = make_cached_response(
+            self._key(prompt, model_params),
+            prompt,
+            response,
+            ttl_value,
+            metadata=metadata,
+            token_count=token_count,
+            model_name=model_name,
+            tags=tags,
+        )
+        return await self._store(cached_response)
+
+    async def get(
+        self, prompt: str, model_params: Optional[Dict[str, Any]] = None
+    ) -> Optional[CachedResponse]:
+        """
+        Retrieve cached LLM response for exact prompt match.
+
+        Args:
+            prompt: Input prompt text
+            model_params: Model parameters used in cache key
+
+        Returns:
+            CachedResponse object if found and not expired, None otherwise
+        """
+        if self._local is not None:
+            return await self._run_local(self._local.get, prompt, model_params)
+
+        try:
+            cache_key = self._key(prompt, model_params)
+            client = self._client()
+            data = await client.get(cache_key)
+            if data is None:
+                self._stats_misses += 1
+                return None
+
+            cached_response = CachedResponse(**json.loads(data.decode("utf-8")))
+            if cached_response.is_expired():
+                await client.delete(cache_key)
+                self._stats_misses += 1
+                return None
+
+            cached_response.hit_count += 1
+            try:
+                # XX + KEEPTTL rewrites the hit count in one round trip without
+                # resurrecting a key that expired or was invalidated meanwhile.
+                await client.set(
+                    cache_key,
+                    json.dumps(cached_response.model_dump()).encode("utf-8"),
+                    keepttl=True,
+                    xx=True,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to update hit count: {e}")
+
+            self._stats_hits += 1
+            logger.debug(f"Cache hit for key {cache_key[:16]}...")
+            return cached_response
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve cached response: {e}")
+            self._stats_misses += 1
+            return None
+
+    async def exists(
+        self, prompt: str, model_params: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Check if a prompt is cached without retrieving it.
+
+        Args:
+            prompt: Input prompt text
+            model_params: Model parameters used in cache key
+
+        Returns:
+            True if cached and not expired, False otherwise
+        """
+        if self._local is not None:
+            return await self._run_local(self._local.exists, prompt, model_params)
+
+        try:
+            return await self._client().exists(self._key(prompt, model_params)) > 0
+        except Exception as e:
+            logger.error(f"Failed to check cache existence: {e}")
+            return False
+
+    async def invalidate(self, pattern: str) -> int:
+        """
+        Invalidate cache entries matching pattern.
+
+        Args:
+            pattern: Pattern to match (for Redis: glob pattern, others: prefix)
+
+        Returns:
+            Number of entries invalidated
+        """
+        if self._local is not None:
+            return await self._run_local(self._local.invalidate, pattern)
+
+        try:
+            client = self._client()
+            prefix = INDEX_KEY_PREFIX.encode("utf-8")
+            count = 0
+            cursor = 0
+            while True:
+                cursor, keys = await client.scan(cursor, match=pattern, count=1000)
+                keys = [k for k in keys if not k.startswith(prefix)]
+                if keys:
+                    count += await client.unlink(*keys)
+                if cursor == 0:
+                    break
+
+            logger.info(
+                f"Invalidated {count} cache entries matching pattern: {pattern}"
+            )
+            return count
+
+        except Exception as e:
+            logger.error(f"Failed to invalidate cache entries: {e}")
+            return 0
+
+    async def invalidate_tag(self, tag: str, batch_size: int = 1000) -> int:
+        """
+        Invalidate every entry cached with the given tag.
+
+        Args:
+            tag: Tag passed to set()
+            batch_size: Members read and deleted per round trip
+
+        Returns:
+            Number of entries invalidated
+        """
+        return await self._invalidate_index(f"tag:{tag}", batch_size)
+
+    async def invalidate_model(self, model_name: str, batch_size: int = 1000) -> int:
+        """
+        Invalidate every entry cached for the given model.
+
+        Args:
+            model_name: Model name passed to set()
+            batch_size: Members read and deleted per round trip
+
+        Returns:
+            Number of entries invalidated
+        """
+        return await self._invalidate_index(f"model:{model_name}", batch_size)
+
+    async def prune_index(self, batch_size: int = 1000) -> int:
+        """
+        Remove index members whose entries have expired or been deleted.
+
+        Same sweep as LLMCache.prune_index(); it also runs as a background
+        task after every 2 * max_entries index additions.
+
+        Args:
+            batch_size: Members checked per round trip
+
+        Returns:
+            Number of index members removed
+        """
+        if self._local is not None:
+            return await self._run_local(self._local.prune_index, batch_size)
+
+        try:
+            client = self._client()
+            removed = 0
+            async for index_key in client.scan_iter(
+                match=INDEX_KEY_PREFIX + "*", count=batch_size
+            ):
+                cursor = 0
+                while True:
+                    cursor, members = await client.sscan(
+                        index_key, cursor, count=batch_size
+                    )
+                    if members:
+                        pipe = client.pipeline(transaction=False)
+                        for member in members:
+                            pipe.exists(member)
+                        dead = [
+                            member
+                            for member, alive in zip(members, await pipe.execute())
+                            if not alive
+                        ]
+                        if dead:
+                            removed += await client.srem(index_key, *dead)
+                    if cursor == 0:
+                        break
+            return removed
+
+        except Exception as e:
+            logger.error(f"Failed to prune index: {e}")
+            return 0
+
+    def _count_index_additions(self, cached_response: CachedResponse) -> None:
+        """Start a background prune_index() once enough members were added."""
+        self._index_additions += len(cached_response.tags) + bool(
+            cached_response.model_name
+        )
+        if self._index_additions <= 2 * max(self.config.max_entries, 1024):
+            return
+        self._index_additions = 0
+        if self._prune_task is None or self._prune_task.done():
+            self._prune_task = asyncio.create_task(self.prune_index())
+
+    async def _invalidate_index(self, name: str, batch_size: int) -> int:
+        """Delete the members of one secondary index and the index itself."""
+        if self._local is not None:
+            return await self._run_local(
+                self._local._invalidate_index, name, batch_size
+            )
+
+        try:
+            client = self._client()
+            index_key = INDEX_KEY_PREFIX + name
+            count = 0
+            while True:
+                members = await client.spop(index_key, batch_size)
+                if not members:
+                    break
+                count += await client.unlink(*members)
+            return count
+
+        except Exception as e:
+            logger.error(f"Failed to invalidate index {name}: {e}")
+            return 0
+
+    async def get_or_set(
+        self,
+        prompt: str,
+        loader: ResponseLoader,
+        ttl: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        model_params: Optional[Dict[str, Any]] = None,
+        token_count: Optional[int] = None,
+        model_name: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> CachedResponse:
+        """
+        Return the cached response, calling ``loader`` at most once per miss.
+
+        Concurrent callers for the same key share a single lookup: the first
+        one reads the backend and, on a miss, runs ``loader`` and stores the
+        result, while the others wait for that outcome instead of issuing
+        their own reads and LLM calls. If the caller leading a load is
+        cancelled, its waiters retry and one of them takes over the load.
+        De-duplication is per cache instance; separate processes still load
+        independently.
+
+        Args:
+            prompt: Input prompt text
+            loader: Coroutine function producing the LLM response text
+            ttl: Time-to-live in seconds (uses config default if None)
+            metadata: Additional metadata to store
+            model_params: Model parameters used in cache key
+            token_count: Token count for the response
+            model_name: Name of the model used
+            tags: Invalidation tags for the entry
+
+        Returns:
+            Cached or freshly loaded CachedResponse
+
+        Raises:
+            Exception: Whatever ``loader`` raised; nothing is cached and every
+                coalesced waiter receives the same exception
+        """
+        cache_key = self._key(prompt, model_params)
+
+        while True:
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                break
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this waiter was cancelled, not the leader
+                # The leader was cancelled; the first waiter to retry leads
+
+        future: "asyncio.Future[CachedResponse]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        # Mark the exception retrieved so an unawaited failure is not logged.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[cache_key] = future
+        try:
+            cached_response = await self.get(prompt, model_params)
+            if cached_response is None:
+                self._loader_calls += 1
+                response = await loader()
+                ttl_value = ttl if ttl is not None else self.config.ttl_seconds
+                cached_response = make_cached_response(
+                    cache_key,
+                    prompt,
+                    response,
+                    ttl_value,
+                    metadata=metadata,
+                    token_count=token_count,
+                    model_name=model_name,
+                    tags=tags,
+                )
+                await self._store(cached_response)
+            future.set_result(cached_response)
+            return cached_response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[cache_key]
+
+    async def clear(self) -> bool:
+        """
+        Clear all cache entries.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if self._local is not None:
+            return await self._run_local(self._local.clear)
+
+        try:
+            await self._client().flushdb()
+            self._stats_hits = 0
+            self._stats_misses = 0
+            logger.info("Cache cleared successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to clear cache: {e}")
+            return False
+
+    async def get_stats(self) -> CacheStats:
+        """
+        Get cache statistics.
+
+        Returns:
+            CacheStats object with current statistics
+        """
+        if self._local is not None:
+            return await self._run_local(self._local.get_stats)
+
+        total_entries = 0
+        total_size_bytes = 0
+        try:
+            client = self._client()
+            total_entries = await client.dbsize()
+            info = await client.info("memory")
+            total_size_bytes = info.get("used_memory", 0)
+        except Exception as e:
+            logger.error(f"Failed to get cache statistics: {e}")
+
+        total_requests = self._stats_hits + self._stats_misses
+        return CacheStats(
+            total_entries=total_entries,
+            total_hits=self._stats_hits,
+            total_misses=self._stats_misses,
+            hit_rate=self._stats_hits / total_requests if total_requests else 0.0,
+            total_size_bytes=total_size_bytes,
+            total_size_mb=total_size_bytes / (1024 * 1024),
+            backend=self.config.backend.value,
+            eviction_policy=self.config.eviction_policy.value,
+        )
+
+    def get_flight_stats(self) -> Dict[str, int]:
+        """
+        Get single-flight loader statistics.
+
+        Returns:
+            Dictionary with loader_calls, coalesced and in_flight counts
+        """
+        return {
+            "loader_calls": self._loader_calls,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+    async def close(self) -> None:
+        """Close connections and cleanup resources."""
+        try:
+            if self._prune_task is not None and not self._prune_task.done():
+                self._prune_task.cancel()
+            if self._redis is not None and self._owns_redis:
+                # Clients on the shared pool leave it open for other caches.
+                await self._redis.aclose()
+            self._redis = None
+            if self._local is not None:
+                await self._run_local(self._local.close)
+            if self._owns_executor and self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        except Exception as e:
+            logger.error(f"Error closing cache: {e}")
+
+    @staticmethod
+    async def close_shared_pools() -> None:
+        """Disconnect every shared Redis pool opened on the running loop."""
+        pools = _SHARED_POOLS.pop(asyncio.get_running_loop(), {})
+        for pool in pools.values():
+            await pool.disconnect()
+
+    async def __aenter__(self) -> "AsyncLLMCache":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit."""
+        await self.close()
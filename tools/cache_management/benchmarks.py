@@ -0,0 +1,1345 @@
+"""
+Micro-benchmarks for the Cache Management Platform.
+
+Each benchmark returns a list of result dictionaries so it can be driven
+from tests or notebooks; running the module prints the results as tables.
+
+Examples:
+    python benchmarks.py eviction -s 10000 -s 100000 -s 1000000
+    python benchmarks.py eviction --policy lfu --admission byte_budget
+    python benchmarks.py ann -s 100000 -b ivf -b hnsw
+    python benchmarks.py store -s 100000 -p int8
+    python benchmarks.py startup -s 100000 -s 1000000
+    python benchmarks.py embedding -t 16 -n 4000
+    python benchmarks.py replication -b 1000 -b 10000
+    python benchmarks.py ring -n 16 -n 128
+    python benchmarks.py async -c 1000 -d 50
+    python benchmarks.py invalidate -s 100000
+    python benchmarks.py tot -s 10000 -s 50000
+
+Author: devCrew_s1
+License: MIT
+"""
+
+import asyncio
+import gc
+import itertools
+import json
+import logging
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import click
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+try:
+    from .ann_index import ANNBackend, ANNIndexConfig, PartitionedANNIndex
+    from .async_llm_cache import AsyncLLMCache
+    from .cache_manager import AdmissionMode, CacheManager, EvictionPolicy
+    from .distributed_cache import (
+        ConsistencyLevel,
+        ConsistentHashRing,
+        DistributedCache,
+        HashAlgorithm,
+        ReplicationConfig,
+    )
+    from .llm_cache import INDEX_KEY_PREFIX, CacheBackend, CacheConfig, LLMCache
+    from .reasoning_cache import ReasoningCache, ReasoningResult, ToTNode
+    from .similarity_matcher import (
+        EmbeddingIndex,
+        EmbeddingPrecision,
+        EmbeddingStore,
+        SimilarityConfig,
+        SimilarityMatcher,
+        read_index_files,
+        write_index_files,
+    )
+except ImportError:
+    # Fallback for direct execution
+    sys.path.insert(0, str(Path(__file__).parent))
+    from ann_index import ANNBackend, ANNIndexConfig, PartitionedANNIndex
+    from async_llm_cache import AsyncLLMCache
+    from cache_manager import AdmissionMode, CacheManager, EvictionPolicy
+    from distributed_cache import (
+        ConsistencyLevel,
+        ConsistentHashRing,
+        DistributedCache,
+        HashAlgorithm,
+        ReplicationConfig,
+    )
+    from llm_cache import INDEX_KEY_PREFIX, CacheBackend, CacheConfig, LLMCache
+    from reasoning_cache import ReasoningCache, ReasoningResult, ToTNode
+    from similarity_matcher import (
+        EmbeddingIndex,
+        EmbeddingPrecision,
+        EmbeddingStore,
+        SimilarityConfig,
+        SimilarityMatcher,
+        read_index_files,
+        write_index_files,
+    )
+
+console = Console()
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def _ops_per_second(count: int, elapsed: float) -> float:
+    """Convert an operation count and elapsed seconds into ops/sec."""
+    return count / elapsed if elapsed > 0 else float("inf")
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    """Run ``func`` once and return the elapsed wall-clock seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _best_ms(func: Callable[[], Any], repeats: int = 3) -> float:
+    """Best of ``repeats`` runs in milliseconds, collecting garbage first."""
+    gc.collect()
+    return round(min(_timed(func) for _ in range(repeats)) * 1000, 1)
+
+
+def benchmark_eviction(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    policy: EvictionPolicy = EvictionPolicy.LRU,
+    admission_mode: AdmissionMode = AdmissionMode.BATCH,
+) -> List[Dict[str, Any]]:
+    """
+    Measure CacheManager put/get/evict throughput at several cache sizes.
+
+    The cache is filled with ``size`` entries, every entry is read back once
+    (exercising LRU/LFU promotion), and then a quarter of the entries are
+    evicted through ``enforce_eviction_policy``.
+
+    Args:
+        sizes: Entry counts to benchmark
+        policy: Eviction policy to exercise
+        admission_mode: Admission mode used for puts
+
+    Returns:
+        One result dictionary per size with ops/sec for each phase
+    """
+    results: List[Dict[str, Any]] = []
+
+    for size in sizes:
+        manager = CacheManager(
+            max_memory_mb=float("inf"),
+            eviction_policy=policy,
+            admission_mode=admission_mode,
+        )
+        prompts = [f"benchmark prompt {i}" for i in range(size)]
+
+        put_time = _timed(lambda: [manager.put(p, p) for p in prompts])
+        get_time = _timed(
+            lambda: [manager.orchestrate_get(p, use_fuzzy=False) for p in prompts]
+        )
+
+        evicted: List[int] = []
+        evict_time = _timed(lambda: evicted.append(manager.enforce_eviction_policy()))
+
+        results.append(
+            {
+                "size": size,
+                "policy": policy.value,
+                "admission_mode": admission_mode.value,
+                "put_ops_per_sec": round(_ops_per_second(size, put_time)),
+                "get_ops_per_sec": round(_ops_per_second(size, get_time)),
+                "evict_ops_per_sec": round(_ops_per_second(evicted[0], evict_time)),
+                "evicted": evicted[0],
+            }
+        )
+
+    return results
+
+
+def _synthetic_embeddings(
+    count: int, dim: int, clusters: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Generate normalized, clustered embeddings resembling prompt topics."""
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, count)
+    vectors = centers[labels] + 0.35 * rng.standard_normal(
+        (count, dim), dtype=np.float32
+    )
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def _brute_force_top_k(
+    query: np.ndarray, embeddings: np.ndarray, k: int
+) -> np.ndarray:
+    """Top-k as computed by SimilarityMatcher.compute_similarity_batch + sort."""
+    similarities = np.dot(embeddings, query)
+    return np.argsort(similarities)[::-1][:k]
+
+
+def benchmark_ann(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    backends: Sequence[ANNBackend] = (ANNBackend.IVF, ANNBackend.HNSW),
+    dim: int = 384,
+    queries: int = 200,
+    top_k: int = 10,
+    nlist: int = 1024,
+    nprobes: Sequence[int] = (4, 8, 16),
+    seed: int = 7,
+) -> List[Dict[str, Any]]:
+    """
+    Compare recall@k and query latency of ANN backends with brute force.
+
+    Queries are noisy copies of indexed embeddings (paraphrase stand-ins);
+    recall is measured against the exact brute-force top-k.
+
+    Args:
+        sizes: Number of indexed embeddings
+        backends: ANN backends to compare
+        dim: Embedding dimension (384 matches MiniLM)
+        queries: Number of timed queries
+        top_k: Neighbours per query
+        nlist: IVF cluster count
+        nprobes: IVF probe counts to sweep
+        seed: Random seed
+
+    Returns:
+        One result dictionary per (size, backend, nprobe)
+    """
+    results: List[Dict[str, Any]] = []
+    rng = np.random.default_rng(seed)
+
+    for size in sizes:
+        embeddings = _synthetic_embeddings(size, dim, max(16, size // 100), rng)
+        keys = [f"key-{i}" for i in range(size)]
+        picks = rng.integers(0, size, queries)
+        query_vectors = embeddings[picks] + 0.05 * rng.standard_normal(
+            (queries, dim), dtype=np.float32
+        )
+        query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+
+        start = time.perf_counter()
+        truth = [
+            set(_brute_force_top_k(q, embeddings, top_k).tolist())
+            for q in query_vectors
+        ]
+        brute_ms = (time.perf_counter() - start) * 1000 / queries
+        results.append(
+            {
+                "size": size,
+                "backend": "brute_force",
+                "nprobe": "-",
+                "build_s": 0.0,
+                "query_ms": round(brute_ms, 3),
+                f"recall@{top_k}": 1.0,
+            }
+        )
+
+        for backend in backends:
+            config = ANNIndexConfig(backend=backend, nlist=min(nlist, size // 39))
+            index = PartitionedANNIndex(config)
+            if index.config.backend != backend:
+                continue
+
+            build_s = _timed(
+                lambda: index.add_batch(keys, embeddings, partition="bench")
+            )
+            sweep = nprobes if backend == ANNBackend.IVF else ("-",)
+
+            for nprobe in sweep:
+                if nprobe != "-":
+                    # Partitions share the index config, so this applies to all
+                    index.config.nprobe = nprobe
+
+                found: List[List[Tuple[str, float]]] = []
+                query_s = _timed(
+                    lambda: found.extend(
+                        index.search(q, partition="bench", top_k=top_k)
+                        for q in query_vectors
+                    )
+                )
+                hits = sum(
+                    len(truth[i] & {int(key[4:]) for key, _ in found[i]})
+                    for i in range(queries)
+                )
+                results.append(
+                    {
+                        "size": size,
+                        "backend": backend.value,
+                        "nprobe": nprobe,
+                        "build_s": round(build_s, 2),
+                        "query_ms": round(query_s * 1000 / queries, 3),
+                        f"recall@{top_k}": round(hits / (queries * top_k), 3),
+                    }
+                )
+
+    return results
+
+
+def benchmark_embedding_store(
+    sizes: Sequence[int] = (10_000, 100_000),
+    precisions: Sequence[EmbeddingPrecision] = tuple(EmbeddingPrecision),
+    dim: int = 384,
+    queries: int = 100,
+    top_k: int = 5,
+    seed: int = 11,
+) -> List[Dict[str, Any]]:
+    """
+    Measure SimilarityMatcher embedding store inserts, deletes and top-k.
+
+    Inserts are issued one at a time, matching ``index_prompt``; the
+    ``restack_insert_ms`` column shows what a single insert used to cost when
+    the whole matrix was re-stacked with ``np.vstack``.
+
+    Args:
+        sizes: Number of stored embeddings
+        precisions: Storage precisions to compare
+        dim: Embedding dimension
+        queries: Timed top-k queries
+        top_k: Neighbours per query
+        seed: Random seed
+
+    Returns:
+        One result dictionary per (size, precision)
+    """
+    results: List[Dict[str, Any]] = []
+    rng = np.random.default_rng(seed)
+
+    for size in sizes:
+        embeddings = _synthetic_embeddings(size, dim, max(16, size // 100), rng)
+        keys = [f"key-{i}" for i in range(size)]
+        rows = [embeddings[i] for i in range(size)]
+        restack_ms = _timed(lambda: np.vstack(rows)) * 1000
+
+        for precision in precisions:
+            store = EmbeddingStore(precision=precision)
+            insert_s = _timed(
+                lambda: [store.add(keys[i], embeddings[i]) for i in range(size)]
+            )
+
+            def query_all() -> None:
+                for q in embeddings[:queries]:
+                    scores = np.where(store.alive, store.dot(q), -np.inf)
+                    top = np.argpartition(-scores, top_k)[:top_k]
+                    top[np.argsort(-scores[top])]
+
+            query_s = _timed(query_all)
+            delete_count = size // 10
+            delete_s = _timed(
+                lambda: [store.remove(keys[i]) for i in range(delete_count)]
+            )
+
+            results.append(
+                {
+                    "size": size,
+                    "precision": precision.value,
+                    "insert_ops_per_sec": round(_ops_per_second(size, insert_s)),
+                    "restack_insert_ms": round(restack_ms, 2),
+                    "delete_ops_per_sec": round(
+                        _ops_per_second(delete_count, delete_s)
+                    ),
+                    "top_k_query_ms": round(query_s * 1000 / queries, 3),
+                    "matrix_mb": round(store.nbytes / (1024 * 1024), 1),
+                }
+            )
+
+    return results
+
+
+def _memory_mb() -> Tuple[float, float]:
+    """Get (RSS, anonymous heap) memory of this process in MB."""
+    values: Dict[str, int] = {}
+    try:
+        with open("/proc/self/smaps_rollup", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    values[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        import resource
+
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return rss, float("nan")
+    return values.get("Rss", 0) / 1024, values.get("Anonymous", 0) / 1024
+
+
+def _probe_load(path: Path, mode: str) -> Dict[str, float]:
+    """Load an index in this process and report time and memory deltas."""
+    rss_before, heap_before = _memory_mb()
+    start = time.perf_counter()
+    if mode == "pickle":
+        # Mirrors the legacy SimilarityMatcher persistence load path
+        with open(path, "rb") as f:
+            data = pickle.load(f)  # nosec B301 - benchmark-generated file
+        entries = {k: EmbeddingIndex(**v) for k, v in data.items()}
+        store = EmbeddingStore()
+        keys = list(entries)
+        store.add_batch(
+            keys, np.vstack([entries[k].get_embedding_array() for k in keys])
+        )
+    else:
+        entries, store = read_index_files(path, verify_checksum=mode == "verify")
+    load_s = time.perf_counter() - start
+
+    # One full scan faults in every page of the matrix
+    scan_start = time.perf_counter()
+    store.dot(np.ones(store.dimension, dtype=np.float32))
+    scan_s = time.perf_counter() - scan_start
+    rss_after, heap_after = _memory_mb()
+    return {
+        "entries": len(entries),
+        "load_ms": load_s * 1000,
+        "first_scan_ms": scan_s * 1000,
+        "rss_mb": rss_after - rss_before,
+        "heap_mb": heap_after - heap_before,
+    }
+
+
+def benchmark_startup(
+    sizes: Sequence[int] = (10_000, 100_000),
+    dim: int = 384,
+    legacy_max: int = 100_000,
+    seed: int = 13,
+) -> List[Dict[str, Any]]:
+    """
+    Measure SimilarityMatcher index load time and memory per format.
+
+    Each load runs in a fresh interpreter so RSS is not polluted by the
+    writer. ``heap_mb`` is anonymous memory the process owns outright; for
+    the memory-mapped format the matrix only shows up in ``rss_mb`` as
+    file-backed page cache, which concurrent or forked workers share. The legacy pickle
+    format is only measured up to ``legacy_max`` entries.
+
+    Args:
+        sizes: Number of stored embeddings
+        dim: Embedding dimension
+        legacy_max: Largest size to also measure with the legacy pickle
+        seed: Random seed
+
+    Returns:
+        One result dictionary per (size, format)
+    """
+    results: List[Dict[str, Any]] = []
+    rng = np.random.default_rng(seed)
+
+    for size in sizes:
+        embeddings = _synthetic_embeddings(size, dim, max(16, size // 100), rng)
+        keys = [f"key-{i}" for i in range(size)]
+        entries = {
+            key: EmbeddingIndex.model_construct(
+                cache_key=key,
+                prompt=f"prompt {i}",
+                embedding=[],
+                prompt_hash=f"{i:064x}",
+                timestamp=float(i),
+                metadata={},
+            )
+            for i, key in enumerate(keys)
+        }
+        store = EmbeddingStore.from_arrays(
+            keys,
+            embeddings,
+            np.ones(size, dtype=np.float32),
+            np.linalg.norm(embeddings, axis=1).astype(np.float32),
+            EmbeddingPrecision.FLOAT32,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index_dir = Path(tmp) / "index"
+            write_s = _timed(lambda: write_index_files(index_dir, entries, store))
+            runs = [("mmap", index_dir), ("verify", index_dir)]
+
+            if size <= legacy_max:
+                legacy_file = Path(tmp) / "embedding_index.pkl"
+                with open(legacy_file, "wb") as f:
+                    pickle.dump(
+                        {
+                            key: {
+                                **entries[key].model_dump(),
+                                "embedding": embeddings[i].tolist(),
+                            }
+                            for i, key in enumerate(keys)
+                        },
+                        f,
+                    )
+                runs.append(("pickle", legacy_file))
+
+            for mode, path in runs:
+                output = subprocess.run(
+                    [sys.executable, __file__, "load-probe", str(path), mode],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                probe = json.loads(output.strip().splitlines()[-1])
+                results.append(
+                    {
+                        "size": size,
+                        "format": mode,
+                        "write_ms": round(write_s * 1000) if mode == "mmap" else "",
+                        "load_ms": round(probe["load_ms"], 1),
+                        "first_scan_ms": round(probe["first_scan_ms"], 1),
+                        "rss_mb": round(probe["rss_mb"], 1),
+                        "heap_mb": round(probe["heap_mb"], 1),
+                    }
+                )
+
+    return results
+
+
+class SimulatedEncoder:
+    """
+    Encoder stand-in with a transformer-like cost profile.
+
+    Each ``encode`` call costs a fixed overhead plus a per-text cost. Calls
+    hold a device lock while they sleep, like a compute-bound model on one
+    CPU/GPU, so batching and memoization show up the same way they would
+    with a real model.
+    """
+
+    def __init__(self, dim: int = 384, call_ms: float = 4.0, text_ms: float = 0.5):
+        self.dim = dim
+        self.call_ms = call_ms
+        self.text_ms = text_ms
+        self.calls = 0
+        self.texts = 0
+        self.busy_s = 0.0
+        self._lock = threading.Lock()
+        self._device = threading.Lock()
+
+    def encode(self, texts: Any, **kwargs: Any) -> np.ndarray:
+        """Embed texts deterministically after simulating model time."""
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        cost = (self.call_ms + self.text_ms * len(batch)) / 1000
+        with self._device:
+            time.sleep(cost)
+        with self._lock:
+            self.calls += 1
+            self.texts += len(batch)
+            self.busy_s += cost
+
+        vectors = np.vstack(
+            [
+                np.random.default_rng(abs(hash(text)) % (2**32))
+                .standard_normal(self.dim)
+                .astype(np.float32)
+                for text in batch
+            ]
+        )
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0] if single else vectors
+
+
+def benchmark_embedding(
+    threads: int = 16,
+    requests: int = 4000,
+    distinct: int = 1000,
+    window_ms: float = 0.0,
+    call_ms: float = 4.0,
+    text_ms: float = 0.5,
+    seed: int = 17,
+) -> List[Dict[str, Any]]:
+    """
+    Measure generate_embedding under concurrent load with memo and batching.
+
+    ``requests`` prompts drawn (Zipf-like) from ``distinct`` unique texts are
+    embedded from ``threads`` worker threads, as concurrent
+    ``CacheManager.orchestrate_get`` calls would.
+
+    Args:
+        threads: Concurrent callers
+        requests: Total generate_embedding calls
+        distinct: Number of unique prompts
+        window_ms: Batch window for the batching configurations
+        call_ms: Simulated fixed cost per encode call
+        text_ms: Simulated cost per encoded text
+        seed: Random seed
+
+    Returns:
+        One result dictionary per configuration
+    """
+    rng = np.random.default_rng(seed)
+    ranks = np.minimum(rng.zipf(1.2, requests), distinct) - 1
+    prompts = [f"prompt number {rank}" for rank in ranks]
+    configurations = [
+        ("baseline", 0, False),
+        ("memo", 4096, False),
+        ("batching", 0, True),
+        ("memo+batching", 4096, True),
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for name, memo_size, batching in configurations:
+        encoder = SimulatedEncoder(call_ms=call_ms, text_ms=text_ms)
+        matcher = SimilarityMatcher(
+            SimilarityConfig(
+                enable_persistence=False,
+                embedding_memo_size=memo_size,
+                enable_batching=batching,
+                batch_window_ms=window_ms,
+            ),
+            LLMCache(CacheConfig()),
+            model=encoder,
+        )
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            elapsed = _timed(lambda: list(pool.map(matcher.generate_embedding, prompts)))
+
+        results.append(
+            {
+                "config": name,
+                "requests": requests,
+                "requests_per_sec": round(_ops_per_second(requests, elapsed)),
+                "encode_calls": encoder.calls,
+                "texts_encoded": encoder.texts,
+                "encoder_busy_ms": round(encoder.busy_s * 1000),
+            }
+        )
+
+    return results
+
+
+def benchmark_replication(
+    batch_sizes: Sequence[int] = (1_000, 10_000),
+    nodes: int = 3,
+    replicas: int = 2,
+    value_bytes: int = 256,
+) -> List[Dict[str, Any]]:
+    """
+    Compare per-key and bulk replicated reads/writes over TCP.
+
+    Each node is an in-process ``fakeredis`` TCP server, so every command
+    pays a real socket round-trip like a local redis-server would.
+
+    Args:
+        batch_sizes: Keys per batch
+        nodes: Number of Redis nodes
+        replicas: Replicas per key
+        value_bytes: Size of each cached value
+
+    Returns:
+        One result dictionary per (batch size, API)
+    """
+    from fakeredis import TcpFakeServer
+
+    servers = []
+    for _ in range(nodes):
+        server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+    cache = DistributedCache(
+        [{"host": s.server_address[0], "port": s.server_address[1]} for s in servers],
+        replication_config=ReplicationConfig(replicas=replicas),
+    )
+    value = "x" * value_bytes
+    results: List[Dict[str, Any]] = []
+
+    try:
+        for batch in batch_sizes:
+            items = {f"bench:{batch}:{i}": value for i in range(batch)}
+            keys = list(items)
+            runs: List[Tuple[str, Callable[[], Any]]] = [
+                (
+                    "set_replicated",
+                    lambda: [cache.set_replicated(k, v) for k, v in items.items()],
+                ),
+                ("get_replicated", lambda: [cache.get_replicated(k) for k in keys]),
+                ("mset_replicated", lambda: cache.mset_replicated(items)),
+                ("mget_replicated", lambda: cache.mget_replicated(keys)),
+                (
+                    "mget_replicated(quorum)",
+                    lambda: cache.mget_replicated(keys, ConsistencyLevel.QUORUM),
+                ),
+            ]
+            for api, run in runs:
+                elapsed = _timed(run)
+                results.append(
+                    {
+                        "batch": batch,
+                        "api": api,
+                        "keys_per_sec": round(_ops_per_second(batch, elapsed)),
+                        "elapsed_ms": round(elapsed * 1000, 1),
+                    }
+                )
+    finally:
+        cache.close()
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    return results
+
+
+_FAKE_REDIS_SERVER = """
+import os, sys, threading
+from fakeredis import TcpFakeServer
+server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+print(server.server_address[1], flush=True)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+sys.stdin.read()
+os._exit(0)  # connection handler threads would otherwise keep it alive
+"""
+
+
+def _spawn_fake_redis() -> Tuple[subprocess.Popen, int]:
+    """
+    Start a ``fakeredis`` TCP server in a child process.
+
+    Keeping the server out of the benchmark process stops it competing for
+    the GIL with an event loop, which would otherwise dominate asyncio timings.
+
+    Returns:
+        Tuple of (server process, port); closing its stdin stops it
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-c", _FAKE_REDIS_SERVER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout is not None
+    return process, int(process.stdout.readline())
+
+
+def _percentile_ms(latencies: List[float], percentile: float) -> float:
+    """Latency percentile in milliseconds."""
+    return round(float(np.percentile(latencies, percentile)) * 1000, 1)
+
+
+async def _drive_llm_load(
+    cache: Any, prompts: List[str], llm_latency: float
+) -> Dict[str, Any]:
+    """
+    Issue one coroutine per prompt against ``cache`` and a simulated LLM.
+
+    ``AsyncLLMCache`` goes through ``get_or_set``; a synchronous ``LLMCache``
+    uses the usual check-then-call-then-set pattern from inside the loop.
+    Latency is measured from the moment all requests are released, and a
+    1 ms ticker records the longest time the event loop was blocked.
+
+    Returns:
+        Dictionary with llm_calls, elapsed, latencies and loop_stall
+    """
+    calls = 0
+    stall = 0.0
+    started = time.perf_counter()
+
+    async def call_llm(prompt: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(llm_latency)
+        return f"response to {prompt}"
+
+    async def request(prompt: str) -> float:
+        if isinstance(cache, AsyncLLMCache):
+            await cache.get_or_set(prompt, lambda: call_llm(prompt))
+        elif cache.get(prompt) is None:
+            cache.set(prompt, await call_llm(prompt))
+        return time.perf_counter() - started
+
+    async def ticker() -> None:
+        nonlocal stall
+        while True:
+            tick = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - tick - 0.001)
+
+    monitor = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(request(p) for p in prompts))
+    elapsed = time.perf_counter() - started
+    monitor.cancel()
+    return {
+        "llm_calls": calls,
+        "elapsed": elapsed,
+        "latencies": list(latencies),
+        "loop_stall": stall,
+    }
+
+
+def benchmark_async(
+    coroutines: int = 1_000,
+    distinct: int = 50,
+    llm_latency_ms: float = 50.0,
+    backends: Sequence[CacheBackend] = tuple(CacheBackend),
+) -> List[Dict[str, Any]]:
+    """
+    Compare LLMCache and AsyncLLMCache under many concurrent coroutines.
+
+    Every run fires ``coroutines`` requests at once over ``distinct`` prompts,
+    first against an empty cache (cold) and then again (warm). Redis is a
+    ``fakeredis`` TCP server in a child process so each command pays a
+    socket round-trip.
+
+    Args:
+        coroutines: Concurrent requests per run
+        distinct: Unique prompts among those requests
+        llm_latency_ms: Simulated upstream LLM latency
+        backends: Cache backends to compare
+
+    Returns:
+        One result dictionary per (backend, API, phase)
+    """
+    prompts = [f"prompt {i % distinct}" for i in range(coroutines)]
+    results: List[Dict[str, Any]] = []
+
+    for backend in backends:
+        server = None
+        config = CacheConfig(backend=backend)
+        with tempfile.TemporaryDirectory() as tmp:
+            if backend == CacheBackend.REDIS:
+                server, port = _spawn_fake_redis()
+                config = CacheConfig(
+                    backend=backend, redis_url=f"redis://127.0.0.1:{port}"
+                )
+            elif backend == CacheBackend.DISK:
+                config = CacheConfig(backend=backend, disk_cache_dir=tmp)
+
+            async def run() -> None:
+                for api in ("LLMCache", "AsyncLLMCache"):
+                    cache: Any = (
+                        LLMCache(config) if api == "LLMCache" else AsyncLLMCache(config)
+                    )
+                    if isinstance(cache, AsyncLLMCache):
+                        await cache.clear()
+                    else:
+                        cache.clear()
+                    for phase in ("cold", "warm"):
+                        run_stats = await _drive_llm_load(
+                            cache, prompts, llm_latency_ms / 1000
+                        )
+                        results.append(
+                            {
+                                "backend": backend.value,
+                                "api": api,
+                                "phase": phase,
+                                "llm_calls": run_stats["llm_calls"],
+                                "requests_per_sec": round(
+                                    _ops_per_second(coroutines, run_stats["elapsed"])
+                                ),
+                                "p50_ms": _percentile_ms(run_stats["latencies"], 50),
+                                "p99_ms": _percentile_ms(run_stats["latencies"], 99),
+                                "max_loop_stall_ms": round(
+                                    run_stats["loop_stall"] * 1000, 1
+                                ),
+                            }
+                        )
+                    if isinstance(cache, AsyncLLMCache):
+                        await cache.close()
+                    else:
+                        cache.close()
+                await AsyncLLMCache.close_shared_pools()
+
+            try:
+                asyncio.run(run())
+            finally:
+                if server is not None:
+                    server.communicate()
+
+    return results
+
+
+def benchmark_invalidation(
+    sizes: Sequence[int] = (100_000,),
+    batch_size: int = 1_000,
+) -> List[Dict[str, Any]]:
+    """
+    Measure invalidation time and the read latency other clients see.
+
+    A reader thread issues GETs on its own connection throughout each run,
+    so a long single command (KEYS + DEL) shows up as a read stall while the
+    batched SCAN/UNLINK sweep and tag index lets reads interleave.
+
+    Args:
+        sizes: Keys to invalidate per run
+        batch_size: SCAN COUNT / UNLINK batch size
+
+    Returns:
+        One result dictionary per (size, method)
+    """
+    import redis as redis_lib
+
+    server, port = _spawn_fake_redis()
+    url = f"redis://127.0.0.1:{port}"
+    cache = LLMCache(CacheConfig(backend=CacheBackend.REDIS, redis_url=url))
+    client = cache._cache
+    results: List[Dict[str, Any]] = []
+
+    def populate(size: int) -> None:
+        keys = [f"bench:{i}" for i in range(size)]
+        for i in range(0, size, 10_000):
+            chunk = keys[i : i + 10_000]
+            pipe = client.pipeline(transaction=False)
+            pipe.mset({key: "x" * 64 for key in chunk})
+            pipe.sadd(f"{INDEX_KEY_PREFIX}tag:bench", *chunk)
+            pipe.execute()
+
+    def keys_and_del() -> int:
+        keys = client.keys("bench:*")
+        return client.delete(*keys) if keys else 0
+
+    def background() -> int:
+        return cache.start_invalidation("bench:*", batch_size=batch_size).wait()
+
+    methods: List[Tuple[str, Callable[[], Any]]] = [
+        ("KEYS + DEL", keys_and_del),
+        ("invalidate (SCAN/UNLINK)", lambda: cache.invalidate("bench:*")),
+        ("start_invalidation", background),
+        ("invalidate_tag", lambda: cache.invalidate_tag("bench", batch_size)),
+    ]
+
+    try:
+        reader_client = redis_lib.Redis.from_url(url)
+        reader_client.set("probe", "x")
+        for size in sizes:
+            for method, run in methods:
+                client.delete(f"{INDEX_KEY_PREFIX}tag:bench")
+                populate(size)
+                stop = threading.Event()
+                latencies: List[float] = []
+
+                def reader() -> None:
+                    while not stop.is_set():
+                        started = time.perf_counter()
+                        reader_client.get("probe")
+                        latencies.append(time.perf_counter() - started)
+
+                thread = threading.Thread(target=reader, daemon=True)
+                thread.start()
+                time.sleep(0.05)
+                elapsed = _timed(run)
+                stop.set()
+                thread.join()
+                results.append(
+                    {
+                        "keys": size,
+                        "method": method,
+                        "elapsed_ms": round(elapsed * 1000, 1),
+                        "reads_during": len(latencies),
+                        "read_p99_ms": _percentile_ms(latencies, 99),
+                        "read_max_ms": round(max(latencies) * 1000, 1),
+                    }
+                )
+        reader_client.close()
+    finally:
+        cache.close()
+        server.communicate()
+
+    return results
+
+
+def _synthetic_tot_tree(size: int, branching: int = 4) -> Dict[str, ToTNode]:
+    """Build a ToT tree of ``size`` nodes with random scores and thoughts."""
+    rng = np.random.default_rng(0)
+    nodes = {"n0": ToTNode(node_id="n0", thought="root", evaluation_score=0.5)}
+    for i in range(1, size):
+        parent = nodes[f"n{(i - 1) // branching}"]
+        node = ToTNode(
+            node_id=f"n{i}",
+            thought=f"Consider option {i}: " + "reasoning " * 20,
+            evaluation_score=float(rng.random()),
+            parent_id=parent.node_id,
+            depth=parent.depth + 1,
+            metadata={"tokens": int(rng.integers(50, 500))},
+        )
+        parent.add_child(node.node_id)
+        nodes[node.node_id] = node
+    return nodes
+
+
+def benchmark_tot(sizes: Sequence[int] = (10_000, 50_000)) -> List[Dict[str, Any]]:
+    """
+    Compare single-blob and node-table storage of ToT trees.
+
+    Each format reports stored bytes, a full load, a best-path load
+    (top_k_paths=1), a two-level load and appending four children to a
+    leaf. The single-blob format always reads and rewrites the whole tree.
+    The in-memory backend is used because the fakeredis TCP server cannot
+    return multi-megabyte values; timings therefore exclude network
+    transfer, which would only widen the gap.
+
+    Args:
+        sizes: Tree sizes in nodes
+
+    Returns:
+        One result dictionary per (size, format)
+    """
+    llm_cache = LLMCache(CacheConfig(backend=CacheBackend.MEMORY))
+    reasoning = ReasoningCache(llm_cache)
+    results: List[Dict[str, Any]] = []
+
+    def stored_bytes() -> int:
+        entries = llm_cache.get_entries_by_keys(llm_cache.get_all_keys())
+        return sum(len(entry.value) for entry in entries.values())
+
+    new_ids = itertools.count()
+
+    def new_children() -> List[ToTNode]:
+        return [
+            ToTNode(node_id=f"x{next(new_ids)}", thought="new", evaluation_score=0.1)
+            for _ in range(4)
+        ]
+
+    for size in sizes:
+        nodes = _synthetic_tot_tree(size)
+        root, leaf = nodes["n0"], f"n{size - 1}"
+        problem = f"tot benchmark {size}"
+        cache_key = reasoning._generate_cache_key(problem, "tot")
+
+        def store_legacy() -> None:
+            result = ReasoningResult(
+                problem=problem,
+                reasoning_type="tot",
+                tree_root=root,
+                tree_nodes=nodes,
+                solution="",
+                cache_key=cache_key,
+                total_steps=len(nodes),
+            )
+            llm_cache.set(
+                prompt=cache_key,
+                response=reasoning._serialize_reasoning(result).hex(),
+            )
+
+        def expand_legacy() -> None:
+            tree = reasoning.get_tot_tree(problem)
+            tree.tree_nodes.update({n.node_id: n for n in new_children()})
+            tree.total_steps = len(tree.tree_nodes)
+            llm_cache.set(
+                prompt=cache_key,
+                response=reasoning._serialize_reasoning(tree).hex(),
+            )
+
+        formats: List[Tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+            ("single blob", store_legacy, expand_legacy),
+            (
+                "node table",
+                lambda: reasoning.cache_tot_tree(problem, root, nodes),
+                lambda: reasoning.expand_tot_tree(problem, leaf, new_children()),
+            ),
+        ]
+        for name, store_tree, expand in formats:
+            llm_cache.clear()
+            gc.collect()
+            store_ms = round(_timed(store_tree) * 1000, 1)
+            results.append(
+                {
+                    "nodes": size,
+                    "format": name,
+                    "stored_kb": round(stored_bytes() / 1024, 1),
+                    "store_ms": store_ms,
+                    "full_load_ms": _best_ms(lambda: reasoning.get_tot_tree(problem)),
+                    "best_path_ms": _best_ms(
+                        lambda: reasoning.get_tot_tree(problem, top_k_paths=1)
+                    ),
+                    "depth_2_ms": _best_ms(
+                        lambda: reasoning.get_tot_tree(problem, max_depth=2)
+                    ),
+                    "expand_ms": _best_ms(expand),
+                }
+            )
+
+    return results
+
+
+def benchmark_ring(
+    node_counts: Sequence[int] = (16, 128),
+    algorithms: Sequence[HashAlgorithm] = tuple(HashAlgorithm),
+    lookups: int = 100_000,
+) -> List[Dict[str, Any]]:
+    """
+    Measure ConsistentHashRing membership changes, lookups and key movement.
+
+    ``predicted_moved`` is the exact key-space fraction reported by the ring
+    when one node joins; ``observed_moved`` is the share of ``lookups``
+    sample keys whose node actually changed.
+
+    Args:
+        node_counts: Ring sizes
+        algorithms: Hash algorithms to compare
+        lookups: Keys looked up per configuration
+
+    Returns:
+        One result dictionary per (node count, algorithm)
+    """
+    results: List[Dict[str, Any]] = []
+    keys = [f"llm_cache:key-{i}" for i in range(lookups)]
+
+    for count in node_counts:
+        names = [f"10.0.{i // 256}.{i % 256}:6379" for i in range(count)]
+        for algorithm in algorithms:
+            one_by_one = ConsistentHashRing(hash_algorithm=algorithm)
+            add_each_s = _timed(lambda: [one_by_one.add_node(n) for n in names])
+
+            ring = ConsistentHashRing(hash_algorithm=algorithm)
+            add_bulk_s = _timed(lambda: ring.add_nodes(names))
+            lookup_s = _timed(lambda: [ring.get_node(k) for k in keys])
+
+            before = [ring.get_node(k) for k in keys]
+            predicted = ring.add_node("10.1.0.0:6379")
+            after = [ring.get_node(k) for k in keys]
+            observed = sum(b != a for b, a in zip(before, after)) / lookups
+
+            remove_s = _timed(lambda: ring.remove_nodes(names[: count // 4]))
+            results.append(
+                {
+                    "nodes": count,
+                    "hash": algorithm.value,
+                    "add_each_ms": round(add_each_s * 1000, 1),
+                    "add_bulk_ms": round(add_bulk_s * 1000, 1),
+                    "remove_quarter_ms": round(remove_s * 1000, 1),
+                    "lookups_per_sec": round(_ops_per_second(lookups, lookup_s)),
+                    "predicted_moved": round(predicted, 4),
+                    "observed_moved": round(observed, 4),
+                }
+            )
+
+    return results
+
+
+def print_results(title: str, results: List[Dict[str, Any]]) -> None:
+    """Render benchmark results as a rich table."""
+    if not results:
+        console.print(f"[yellow]{title}: no results[/yellow]")
+        return
+
+    table = Table(title=title)
+    for column in results[0]:
+        table.add_column(column, justify="right")
+    for row in results:
+        table.add_row(*[str(value) for value in row.values()])
+    console.print(table)
+
+
+@click.group()
+def cli() -> None:
+    """Cache management micro-benchmarks."""
+    logging.basicConfig(level=logging.WARNING)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=DEFAULT_SIZES,
+    help="Cache sizes to benchmark",
+)
+@click.option(
+    "--policy",
+    "-p",
+    type=click.Choice([p.value for p in EvictionPolicy]),
+    default=EvictionPolicy.LRU.value,
+    help="Eviction policy",
+)
+@click.option(
+    "--admission",
+    "-a",
+    type=click.Choice([m.value for m in AdmissionMode]),
+    default=AdmissionMode.BATCH.value,
+    help="Admission mode",
+)
+def eviction(sizes: Sequence[int], policy: str, admission: str) -> None:
+    """Benchmark CacheManager get/put/evict throughput."""
+    results = benchmark_eviction(
+        sizes, EvictionPolicy(policy), AdmissionMode(admission)
+    )
+    print_results("CacheManager eviction throughput", results)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=DEFAULT_SIZES,
+    help="Index sizes to benchmark",
+)
+@click.option(
+    "--backend",
+    "-b",
+    type=click.Choice([b.value for b in ANNBackend if b != ANNBackend.EXACT]),
+    multiple=True,
+    default=(ANNBackend.IVF.value, ANNBackend.HNSW.value),
+    help="ANN backends to compare",
+)
+@click.option("--dim", type=int, default=384, help="Embedding dimension")
+@click.option("--queries", "-q", type=int, default=200, help="Timed queries")
+@click.option("--top-k", "-k", type=int, default=10, help="Neighbours per query")
+def ann(
+    sizes: Sequence[int], backend: Sequence[str], dim: int, queries: int, top_k: int
+) -> None:
+    """Benchmark ANN recall and latency against brute-force search."""
+    results = benchmark_ann(
+        sizes, [ANNBackend(b) for b in backend], dim=dim, queries=queries, top_k=top_k
+    )
+    print_results("Fuzzy lookup recall vs latency", results)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=(10_000, 100_000),
+    help="Store sizes to benchmark",
+)
+@click.option(
+    "--precision",
+    "-p",
+    type=click.Choice([p.value for p in EmbeddingPrecision]),
+    multiple=True,
+    default=tuple(p.value for p in EmbeddingPrecision),
+    help="Storage precisions to compare",
+)
+def store(sizes: Sequence[int], precision: Sequence[str]) -> None:
+    """Benchmark the embedding store insert/delete/top-k paths."""
+    results = benchmark_embedding_store(
+        sizes, [EmbeddingPrecision(p) for p in precision]
+    )
+    print_results("SimilarityMatcher embedding store", results)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=(10_000, 100_000),
+    help="Index sizes to benchmark",
+)
+@click.option("--dim", type=int, default=384, help="Embedding dimension")
+@click.option(
+    "--legacy-max",
+    type=int,
+    default=100_000,
+    help="Largest size to also load with the legacy pickle format",
+)
+def startup(sizes: Sequence[int], dim: int, legacy_max: int) -> None:
+    """Benchmark index load time and RSS: memory-mapped vs. legacy pickle."""
+    results = benchmark_startup(sizes, dim=dim, legacy_max=legacy_max)
+    print_results("SimilarityMatcher index startup", results)
+
+
+@cli.command()
+@click.option("--threads", "-t", type=int, default=16, help="Concurrent callers")
+@click.option("--requests", "-n", type=int, default=4000, help="Total requests")
+@click.option("--distinct", "-d", type=int, default=1000, help="Unique prompts")
+@click.option("--window-ms", "-w", type=float, default=0.0, help="Batch window")
+def embedding(threads: int, requests: int, distinct: int, window_ms: float) -> None:
+    """Benchmark embedding memo and micro-batching under concurrent load."""
+    results = benchmark_embedding(threads, requests, distinct, window_ms)
+    print_results("SimilarityMatcher.generate_embedding", results)
+
+
+@cli.command()
+@click.option(
+    "--batch",
+    "-b",
+    type=int,
+    multiple=True,
+    default=(1_000, 10_000),
+    help="Keys per batch",
+)
+@click.option("--nodes", "-n", type=int, default=3, help="Redis nodes")
+@click.option("--replicas", "-r", type=int, default=2, help="Replicas per key")
+def replication(batch: Sequence[int], nodes: int, replicas: int) -> None:
+    """Benchmark per-key vs. pipelined bulk DistributedCache replication."""
+    results = benchmark_replication(batch, nodes=nodes, replicas=replicas)
+    print_results("DistributedCache replication throughput", results)
+
+
+@cli.command()
+@click.option(
+    "--nodes",
+    "-n",
+    type=int,
+    multiple=True,
+    default=(16, 128),
+    help="Ring sizes to benchmark",
+)
+@click.option("--lookups", "-l", type=int, default=100_000, help="Keys looked up")
+def ring(nodes: Sequence[int], lookups: int) -> None:
+    """Benchmark hash ring membership changes, lookups and key movement."""
+    results = benchmark_ring(nodes, lookups=lookups)
+    print_results("ConsistentHashRing", results)
+
+
+@cli.command("async")
+@click.option("--coroutines", "-c", type=int, default=1_000, help="Concurrent requests")
+@click.option("--distinct", "-d", type=int, default=50, help="Unique prompts")
+@click.option("--latency-ms", type=float, default=50.0, help="Simulated LLM latency")
+@click.option(
+    "--backend",
+    "-b",
+    type=click.Choice([b.value for b in CacheBackend]),
+    multiple=True,
+    default=tuple(b.value for b in CacheBackend),
+    help="Cache backends to compare",
+)
+def async_load(
+    coroutines: int, distinct: int, latency_ms: float, backend: Sequence[str]
+) -> None:
+    """Benchmark LLMCache vs. AsyncLLMCache under concurrent coroutines."""
+    results = benchmark_async(
+        coroutines, distinct, latency_ms, [CacheBackend(b) for b in backend]
+    )
+    print_results("LLM cache under concurrent coroutines", results)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=(100_000,),
+    help="Keys to invalidate",
+)
+@click.option("--batch-size", "-b", type=int, default=1_000, help="SCAN batch")
+def invalidate(sizes: Sequence[int], batch_size: int) -> None:
+    """Benchmark invalidation strategies and concurrent read latency."""
+    results = benchmark_invalidation(sizes, batch_size=batch_size)
+    print_results("LLMCache invalidation vs. concurrent reads", results)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=(10_000, 50_000),
+    help="Tree sizes in nodes",
+)
+def tot(sizes: Sequence[int]) -> None:
+    """Benchmark ToT tree storage: single blob vs. node table."""
+    results = benchmark_tot(sizes)
+    print_results("ReasoningCache ToT tree storage", results)
+
+
+@cli.command("load-probe", hidden=True)
+@click.argument("path", type=click.Path(exists=True, path_type=Path))
+@click.argument("mode", type=click.Choice(["mmap", "verify", "pickle"]))
+def load_probe(path: Path, mode: str) -> None:
+    """Load one index and print its measurements as JSON (used by startup)."""
+    click.echo(json.dumps(_probe_load(path, mode)))
+
+
+if __name__ == "__main__":
+    cli()
@@ -16,13 +16,14 @@ import logging
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import click
 import yaml
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (BarColumn, Progress, SpinnerColumn,
+                           TaskProgressColumn, TextColumn)
 from rich.syntax import Syntax
 from rich.table import Table
 from rich.tree import Tree
@@ -96,6 +97,15 @@ class CLIContext:
             threshold=self.config.get("similarity_threshold", 0.85),
         )
         similarity_matcher = SimilarityMatcher(similarity_config, llm_cache)
+        # A pre-built index is memory-mapped, so every CLI process or forked
+        # worker pointing at the same export shares one copy of the matrix.
+        # Checksums are only hashed the first time an export is loaded.
+        similarity_index_path = self.config.get("similarity_index_path")
+        if similarity_index_path and Path(similarity_index_path).exists():
+            similarity_matcher.import_index(
+                similarity_index_path,
+                verify_checksum=self.config.get("similarity_index_verify", True),
+            )
 
         self.cache_manager = CacheManager(
             llm_cache=llm_cache,
@@ -555,6 +565,20 @@ def get_reasoning(problem: str, format: str) -> None:
     help="Invalidate entries older than N seconds",
 )
 @click.option("--all", "-a", is_flag=True, help="Invalidate all cache entries")
+@click.option("--tag", "-t", multiple=True, help="Invalidate entries with this tag")
+@click.option("--model", "-m", help="Invalidate entries cached for this model")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=1000,
+    help="Keys scanned and deleted per batch",
+)
+@click.option(
+    "--pause-ms",
+    type=float,
+    default=0.0,
+    help="Pause between pattern batches to reduce server load",
+)
 @click.option(
     "--confirm/--no-confirm",
     default=True,
@@ -565,24 +589,35 @@ def invalidate(
     regex: bool,
     older_than: Optional[int],
     all: bool,
+    tag: Tuple[str, ...],
+    model: Optional[str],
+    batch_size: int,
+    pause_ms: float,
     confirm: bool,
 ) -> None:
     """
-    Invalidate cache entries by pattern or age.
+    Invalidate cache entries by pattern, tag, model or age.
+
+    Pattern invalidation scans the keyspace incrementally in the background
+    and reports progress; tag and model invalidation use the secondary index
+    maintained on set and never scan.
 
     \b
     Examples:
         cache-cli invalidate --pattern "What is*"
         cache-cli invalidate --regex --pattern "^Code.*"
+        cache-cli invalidate --tag docs-v1 --tag docs-v2
+        cache-cli invalidate --model gpt-3.5-turbo
         cache-cli invalidate --older-than 3600
         cache-cli invalidate --all
     """
     try:
         cli_context.initialize_cache_manager()
 
-        if not any([pattern, older_than, all]):
+        if not any([pattern, older_than, all, tag, model]):
             console.print(
-                "[red]Error: Must specify --pattern, --older-than, " "or --all[/red]"
+                "[red]Error: Must specify --pattern, --tag, --model, "
+                "--older-than, or --all[/red]"
             )
             sys.exit(1)
 
@@ -592,6 +627,11 @@ def invalidate(
                 msg = "Invalidate ALL cache entries?"
             elif pattern:
                 msg = f"Invalidate entries matching '{pattern}'?"
+            elif tag or model:
+                targets = [f"tag '{t}'" for t in tag]
+                if model:
+                    targets.append(f"model '{model}'")
+                msg = f"Invalidate entries for {', '.join(targets)}?"
             else:
                 msg = f"Invalidate entries older than {older_than}s?"
 
@@ -599,20 +639,43 @@ def invalidate(
                 console.print("[yellow]Operation cancelled[/yellow]")
                 sys.exit(0)
 
+        llm_cache = cli_context.cache_manager.llm_cache
+
         # Perform invalidation
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TextColumn("{task.fields[removed]} removed"),
             console=console,
         ) as progress:
-            task = progress.add_task("Invalidating cache...", total=None)
+            task = progress.add_task("Invalidating cache...", total=None, removed=0)
 
             if all:
-                cli_context.cache_manager.llm_cache.clear()
+                llm_cache.clear()
                 cli_context.cache_manager.reasoning_cache.invalidate_pattern("*")
                 count = 0  # Cannot easily count cleared entries
+            elif tag or model:
+                count = sum(llm_cache.invalidate_tag(t, batch_size) for t in tag)
+                if model:
+                    count += llm_cache.invalidate_model(model, batch_size)
             elif pattern:
-                count = cli_context.cache_manager.llm_cache.invalidate(pattern)
+                job = llm_cache.start_invalidation(
+                    pattern, batch_size=batch_size, pause_seconds=pause_ms / 1000
+                )
+                state = job.progress
+                while not state.done:
+                    progress.update(
+                        task,
+                        total=state.total_keys or None,
+                        completed=min(state.examined, state.total_keys),
+                        removed=state.invalidated,
+                    )
+                    state = job.wait(timeout=0.1)
+                if state.error:
+                    raise RuntimeError(state.error)
+                count = state.invalidated
                 count += cli_context.cache_manager.reasoning_cache.invalidate_pattern(
                     pattern
                 )
@@ -623,7 +686,7 @@ def invalidate(
                     "[yellow]Warning: older_than not fully implemented[/yellow]"
                 )
 
-            progress.update(task, completed=True)
+            progress.update(task, total=1, completed=1, removed=count)
 
         console.print(
             Panel(
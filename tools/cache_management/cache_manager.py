@@ -6,8 +6,9 @@ optimization capabilities including eviction policies, cache warming,
 batch invalidation, and usage analytics.
 
 Features:
-- Orchestrated get with exact and fuzzy matching
-- Multiple eviction policies (LRU, LFU, TTL, RANDOM)
+- Orchestrated get with exact and fuzzy (nearest-neighbour) matching
+- Multiple eviction policies (LRU, LFU, TTL, RANDOM) with O(1) bookkeeping
+- Byte-budget admission that evicts only as much as a new entry needs
 - Automated cache warming with scheduling
 - Batch invalidation with pattern matching
 - Usage analytics and efficiency metrics
@@ -16,15 +17,16 @@ Features:
 
 import hashlib
 import heapq
+import itertools
 import logging
 import random
 import re
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -40,6 +42,13 @@ class EvictionPolicy(str, Enum):
     RANDOM = "random"  # Random eviction
 
 
+class AdmissionMode(str, Enum):
+    """How ``put`` makes room when the memory budget is exhausted."""
+
+    BATCH = "batch"  # Evict a 25% batch of entries via the eviction policy
+    BYTE_BUDGET = "byte_budget"  # Evict just enough bytes to admit the entry
+
+
 class CacheStats(BaseModel):
     """Cache statistics and performance metrics."""
 
@@ -142,6 +151,7 @@ class CacheManager:
         max_memory_mb: float = 1024.0,
         default_ttl: int = 3600,
         eviction_policy: EvictionPolicy = EvictionPolicy.LRU,
+        admission_mode: AdmissionMode = AdmissionMode.BATCH,
     ):
         """
         Initialize cache manager.
@@ -153,6 +163,7 @@ class CacheManager:
             max_memory_mb: Maximum cache memory in MB
             default_ttl: Default TTL in seconds
             eviction_policy: Eviction policy to use
+            admission_mode: How puts make room once the memory budget is full
         """
         self.llm_cache = llm_cache
         self.reasoning_cache = reasoning_cache
@@ -160,11 +171,28 @@ class CacheManager:
         self.max_memory_mb = max_memory_mb
         self.default_ttl = default_ttl
         self.eviction_policy = eviction_policy
+        self.admission_mode = admission_mode
 
         # Internal state
         self._entries: Dict[str, CacheEntry] = {}
-        self._access_order: List[str] = []  # For LRU
-        self._access_frequency: Dict[str, int] = defaultdict(int)  # For LFU
+        # LRU order: least recently used first, moved to end on access
+        self._access_order: "OrderedDict[str, None]" = OrderedDict()
+        # LFU: key -> frequency, plus frequency -> keys in insertion order
+        self._access_frequency: Dict[str, int] = {}
+        self._frequency_buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_frequency = 0
+        # RANDOM: dense key list plus key -> slot, for O(1) picks and removals
+        self._keys: List[str] = []
+        self._key_slots: Dict[str, int] = {}
+        # TTL: min-heap of (expires_at, seq, entry); entries removed or
+        # replaced since they were pushed are skipped when they surface
+        self._expiry_heap: List[Tuple[float, int, CacheEntry]] = []
+        self._expiry_seq = itertools.count()
+        self._total_bytes = 0
+        # Fuzzy lookup index over prompt embeddings, partitioned by model name
+        self._similarity_index: Optional[Any] = (
+            similarity_matcher.create_ann_index() if similarity_matcher else None
+        )
         self._stats = CacheStats()
         self._warmers: List[CacheWarmer] = []
         self._warming_active = False
@@ -302,9 +330,33 @@ class CacheManager:
             # Calculate size
             size_bytes = self._estimate_size(response)
 
+            # Checked before a replaced entry is dropped, so an oversize
+            # replacement leaves the existing entry in place
+            if (
+                self.admission_mode == AdmissionMode.BYTE_BUDGET
+                and size_bytes > self.max_memory_mb * 1024 * 1024
+            ):
+                logger.debug(
+                    f"Rejected key={cache_key[:16]}... size={size_bytes} "
+                    f"bytes exceeds memory budget"
+                )
+                return False
+
+            # Replacing an entry must not double-count its bytes
+            if cache_key in self._entries:
+                self._remove_entry(cache_key)
+
             # Check memory limit
             if not self._has_space(size_bytes):
-                self.enforce_eviction_policy(self.eviction_policy)
+                if self.admission_mode == AdmissionMode.BYTE_BUDGET:
+                    if not self._make_room(size_bytes):
+                        logger.debug(
+                            f"Rejected key={cache_key[:16]}... size={size_bytes} "
+                            f"bytes exceeds memory budget"
+                        )
+                        return False
+                else:
+                    self.enforce_eviction_policy(self.eviction_policy)
 
             # Create entry
             entry = CacheEntry(
@@ -319,9 +371,8 @@ class CacheManager:
                 cost_usd=cost_usd,
             )
 
-            self._entries[cache_key] = entry
-            self._access_order.append(cache_key)
-            self._access_frequency[cache_key] = 0
+            self._add_entry(entry)
+            self._index_prompt(cache_key, prompt, model_name)
 
             # Update stats
             self._stats.entry_count = len(self._entries)
@@ -456,14 +507,13 @@ class CacheManager:
         invalidated_count = 0
 
         try:
-            compiled_patterns = [re.compile(p) for p in patterns]
-            keys_to_remove = []
-
-            for key in self._entries.keys():
-                for pattern in compiled_patterns:
-                    if pattern.search(key):
-                        keys_to_remove.append(key)
-                        break
+            if not patterns:
+                return 0
+            matchers = self._pattern_matchers(patterns)
+            keys_to_remove = [
+                key for key in self._entries
+                if any(match(key) for match in matchers)
+            ]
 
             for key in keys_to_remove:
                 self._remove_entry(key)
@@ -483,6 +533,37 @@ class CacheManager:
             logger.error(f"Error in batch_invalidate: {e}", exc_info=True)
             return 0
 
+    @staticmethod
+    def _pattern_matchers(patterns: List[str]) -> List[Callable[[str], Any]]:
+        """
+        Build search functions for batch_invalidate.
+
+        Plain patterns are merged into one alternation, so they cost a single
+        pass over each key. Patterns with groups or inline flags keep their
+        own regex, because merging would renumber backreferences, collide
+        named groups or move global flags.
+        """
+        default_flags = re.compile("").flags
+        simple: List[str] = []
+        matchers: List[Callable[[str], Any]] = []
+        for pattern in patterns:
+            regex = re.compile(pattern)
+            if regex.groups == 0 and regex.flags == default_flags:
+                simple.append(pattern)
+            else:
+                matchers.append(regex.search)
+
+        if len(simple) > 1:
+            try:
+                matchers.append(
+                    re.compile("|".join(f"(?:{p})" for p in simple)).search
+                )
+                simple = []
+            except re.error:
+                pass
+        matchers.extend(re.compile(p).search for p in simple)
+        return matchers
+
     def analyze_usage(self, days: int = 7) -> Dict[str, Any]:
         """
         Analyze cache usage patterns over time period.
@@ -634,6 +715,14 @@ class CacheManager:
             self._entries.clear()
             self._access_order.clear()
             self._access_frequency.clear()
+            self._frequency_buckets.clear()
+            self._min_frequency = 0
+            self._keys.clear()
+            self._key_slots.clear()
+            self._expiry_heap.clear()
+            self._total_bytes = 0
+            if self._similarity_index is not None:
+                self._similarity_index.clear()
 
             self._stats.entry_count = 0
             self._stats.memory_usage_mb = 0.0
@@ -657,6 +746,7 @@ class CacheManager:
             "stats": self._stats.model_dump(),
             "efficiency": self.get_efficiency_metrics(),
             "policy": self.eviction_policy.value,
+            "admission_mode": self.admission_mode.value,
             "max_memory_mb": self.max_memory_mb,
             "default_ttl": self.default_ttl,
             "active_warmers": len(self._warmers),
@@ -675,28 +765,140 @@ class CacheManager:
             return False
         return time.time() - entry.created_at > entry.ttl
 
+    def _add_entry(self, entry: CacheEntry) -> None:
+        """Insert entry and register it with the LRU/LFU structures."""
+        key = entry.key
+        self._entries[key] = entry
+        self._access_order[key] = None
+        self._access_frequency[key] = 0
+        self._frequency_buckets.setdefault(0, OrderedDict())[key] = None
+        self._min_frequency = 0
+        if key not in self._key_slots:
+            self._key_slots[key] = len(self._keys)
+            self._keys.append(key)
+        if entry.ttl is not None:
+            self._push_expiry(entry)
+        self._total_bytes += entry.size_bytes
+
+    def _push_expiry(self, entry: CacheEntry) -> None:
+        """Track an entry's expiry, rebuilding the heap once mostly stale."""
+        heap = self._expiry_heap
+        if len(heap) > 2 * len(self._entries) + 64:
+            heap[:] = [
+                item for item in heap if self._entries.get(item[2].key) is item[2]
+            ]
+            heapq.heapify(heap)
+        heapq.heappush(
+            heap, (entry.created_at + entry.ttl, next(self._expiry_seq), entry)
+        )
+
+    def _next_expired(self) -> Optional[str]:
+        """Return the key of the earliest-expiring entry if it has expired."""
+        heap = self._expiry_heap
+        now = time.time()
+        while heap:
+            expires_at, _, entry = heap[0]
+            if self._entries.get(entry.key) is not entry:
+                heapq.heappop(heap)  # removed or replaced since pushed
+                continue
+            return entry.key if expires_at < now else None
+        return None
+
     def _update_access(self, key: str) -> None:
         """Update access metadata for cache entry."""
-        if key in self._entries:
-            self._entries[key].last_accessed = time.time()
-            self._entries[key].access_count += 1
-            self._access_frequency[key] += 1
-
-            # Update LRU order
-            if key in self._access_order:
-                self._access_order.remove(key)
-            self._access_order.append(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        entry.last_accessed = time.time()
+        entry.access_count += 1
+
+        # Update LRU order
+        self._access_order.move_to_end(key)
+
+        # Promote to the next LFU frequency bucket
+        freq = self._access_frequency[key]
+        bucket = self._frequency_buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._frequency_buckets[freq]
+            if self._min_frequency == freq:
+                self._min_frequency = freq + 1
+        self._access_frequency[key] = freq + 1
+        self._frequency_buckets.setdefault(freq + 1, OrderedDict())[key] = None
 
     def _remove_entry(self, key: str) -> None:
         """Remove entry from cache."""
-        if key in self._entries:
-            del self._entries[key]
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size_bytes
+
+        self._access_order.pop(key, None)
+
+        slot = self._key_slots.pop(key, None)
+        if slot is not None:
+            last = self._keys.pop()
+            if last != key:
+                self._keys[slot] = last
+                self._key_slots[last] = slot
+
+        if self._similarity_index is not None:
+            self._similarity_index.remove(key)
+
+        freq = self._access_frequency.pop(key, None)
+        if freq is not None:
+            bucket = self._frequency_buckets[freq]
+            del bucket[key]
+            if not bucket:
+                del self._frequency_buckets[freq]
+                if self._min_frequency == freq and self._frequency_buckets:
+                    self._min_frequency = min(self._frequency_buckets)
+
+    def _next_victim(self, policy: EvictionPolicy) -> Optional[str]:
+        """Return the next key the given policy would evict."""
+        if not self._entries:
+            return None
+
+        if policy == EvictionPolicy.LFU:
+            bucket = self._frequency_buckets.get(self._min_frequency)
+            if not bucket:
+                self._min_frequency = min(self._frequency_buckets)
+                bucket = self._frequency_buckets[self._min_frequency]
+            return next(iter(bucket))
+
+        if policy == EvictionPolicy.RANDOM:
+            return self._keys[random.randrange(len(self._keys))]
+
+        if policy == EvictionPolicy.TTL:
+            expired = self._next_expired()
+            if expired is not None:
+                return expired
+
+        return next(iter(self._access_order))
+
+    def _make_room(self, required_bytes: int) -> bool:
+        """
+        Evict entries in policy order until ``required_bytes`` fit the budget.
+
+        Returns:
+            False if the entry can never fit, True once enough space is free
+        """
+        budget_bytes = self.max_memory_mb * 1024 * 1024
+        if required_bytes > budget_bytes:
+            return False
 
-        if key in self._access_order:
-            self._access_order.remove(key)
+        evicted = 0
+        while self._entries and self._total_bytes + required_bytes > budget_bytes:
+            key = self._next_victim(self.eviction_policy)
+            if key is None:
+                break
+            self._remove_entry(key)
+            evicted += 1
 
-        if key in self._access_frequency:
-            del self._access_frequency[key]
+        self._stats.eviction_count += evicted
+        self._stats.entry_count = len(self._entries)
+        self._update_memory_usage()
+        return self._total_bytes + required_bytes <= budget_bytes
 
     def _find_similar(
         self, prompt: str, model_name: str, threshold: float
@@ -704,26 +906,50 @@ class CacheManager:
         """Find similar cached entry using semantic similarity."""
         if not self.similarity_matcher or not self._entries:
             return None
+        if self._similarity_index is None or len(self._similarity_index) == 0:
+            return None
 
         try:
-            # Get embeddings for prompt
-            # In production, would use actual similarity matcher
-            # For now, return None (similarity matching requires embeddings)
+            embedding = self.similarity_matcher.generate_embedding(prompt)
+            # Over-fetch slightly so expired neighbours do not hide live ones
+            candidates = self._similarity_index.search(
+                embedding, partition=model_name, top_k=4, threshold=threshold
+            )
+
+            for key, score in candidates:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if self._is_expired(entry):
+                    self._remove_entry(key)
+                    continue
+                return key, score, entry.value
+
             return None
 
         except Exception as e:
             logger.error(f"Error finding similar entry: {e}")
             return None
 
+    def _index_prompt(self, key: str, prompt: str, model_name: str) -> None:
+        """Add the prompt embedding to the fuzzy lookup index."""
+        if self._similarity_index is None:
+            return
+
+        try:
+            embedding = self.similarity_matcher.generate_embedding(prompt)
+            self._similarity_index.add(key, embedding, partition=model_name)
+        except Exception as e:
+            logger.warning(f"Failed to index prompt for fuzzy lookup: {e}")
+
     def _evict_lru(self, count: int) -> int:
         """Evict least recently used entries."""
         evicted = 0
 
         for _ in range(min(count, len(self._access_order))):
-            if self._access_order:
-                key = self._access_order.pop(0)
-                self._remove_entry(key)
-                evicted += 1
+            key = next(iter(self._access_order))
+            self._remove_entry(key)
+            evicted += 1
 
         return evicted
 
@@ -731,46 +957,35 @@ class CacheManager:
         """Evict least frequently used entries."""
         evicted = 0
 
-        # Build min heap of (frequency, key)
-        heap = [(freq, key) for key, freq in self._access_frequency.items()]
-        heapq.heapify(heap)
-
-        for _ in range(min(count, len(heap))):
-            if heap:
-                _, key = heapq.heappop(heap)
-                self._remove_entry(key)
-                evicted += 1
+        for _ in range(min(count, len(self._entries))):
+            key = self._next_victim(EvictionPolicy.LFU)
+            if key is None:
+                break
+            self._remove_entry(key)
+            evicted += 1
 
         return evicted
 
     def _evict_expired(self) -> int:
         """Evict all expired entries."""
         evicted = 0
-        keys_to_remove = []
 
-        for key, entry in self._entries.items():
-            if self._is_expired(entry):
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
+        key = self._next_expired()
+        while key is not None:
             self._remove_entry(key)
             evicted += 1
+            key = self._next_expired()
 
         return evicted
 
     def _evict_random(self, count: int) -> int:
         """Evict random entries."""
-        evicted = 0
-        keys = list(self._entries.keys())
+        keys = random.sample(self._keys, min(count, len(self._keys)))
 
-        for _ in range(min(count, len(keys))):
-            if keys:
-                key = random.choice(keys)
-                keys.remove(key)
-                self._remove_entry(key)
-                evicted += 1
+        for key in keys:
+            self._remove_entry(key)
 
-        return evicted
+        return len(keys)
 
     def _estimate_size(self, obj: Any) -> int:
         """Estimate size of object in bytes."""
@@ -784,14 +999,12 @@ class CacheManager:
 
     def _has_space(self, required_bytes: int) -> bool:
         """Check if cache has space for new entry."""
-        current_mb = self._stats.memory_usage_mb
-        required_mb = required_bytes / (1024 * 1024)
-        return (current_mb + required_mb) <= self.max_memory_mb
+        required_total = self._total_bytes + required_bytes
+        return required_total <= self.max_memory_mb * 1024 * 1024
 
     def _update_memory_usage(self) -> None:
         """Update memory usage statistics."""
-        total_bytes = sum(e.size_bytes for e in self._entries.values())
-        self._stats.memory_usage_mb = total_bytes / (1024 * 1024)
+        self._stats.memory_usage_mb = self._total_bytes / (1024 * 1024)
 
     def _update_hit_rate(self) -> None:
         """Update cache hit rate."""
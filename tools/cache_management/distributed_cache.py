@@ -8,19 +8,23 @@ Features:
 - Redis cluster integration with automatic sharding
 - Consistent hashing for key distribution
 - Multi-replica support with sync/async replication
+- Pipelined bulk reads/writes with per-node fan-out and consistency levels
 - Distributed locking for coordination
 - Automatic failover and health monitoring
 - Cluster rebalancing and node management
 """
 
+import bisect
 import hashlib
 import logging
 import pickle
 import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import redis
 from pydantic import BaseModel, Field, field_validator
@@ -30,6 +34,8 @@ from redis.exceptions import TimeoutError as RedisTimeoutError
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class ShardingStrategy(str, Enum):
     """Sharding strategy for distributed cache."""
@@ -47,6 +53,14 @@ class NodeRole(str, Enum):
     STANDBY = "standby"
 
 
+class ConsistencyLevel(str, Enum):
+    """Replicas that must acknowledge a bulk read or write."""
+
+    ONE = "one"  # First replica that answers
+    QUORUM = "quorum"  # Majority of the key's replica set
+    ALL = "all"  # Every replica in the key's replica set
+
+
 class NodeStatus(str, Enum):
     """Node health status."""
 
@@ -63,6 +77,10 @@ class ReplicationConfig(BaseModel):
     sync_mode: bool = Field(default=False, description="Synchronous replication")
     failover_timeout: int = Field(default=5, description="Failover timeout in seconds")
     quorum: int = Field(default=1, description="Quorum for write operations")
+    consistency_level: ConsistencyLevel = Field(
+        default=ConsistencyLevel.QUORUM,
+        description="Default write consistency for bulk operations",
+    )
     read_preference: str = Field(
         default="primary", description="Read preference (primary/replica/any)"
     )
@@ -109,70 +127,235 @@ class ClusterNode(BaseModel):
         return v
 
 
+class HashAlgorithm(str, Enum):
+    """Hash function used to place keys and virtual nodes on the ring."""
+
+    XXH3 = "xxh3"  # 64-bit xxHash3 (requires xxhash), fastest
+    BLAKE2B = "blake2b"  # 64-bit BLAKE2b digest from the standard library
+    MD5 = "md5"  # 128-bit MD5, the default; placement of earlier releases
+
+
+def _make_hash_function(algorithm: HashAlgorithm) -> Callable[[str], int]:
+    """Build the string -> int hash function for an algorithm."""
+    if algorithm == HashAlgorithm.XXH3:
+        try:
+            import xxhash
+        except ImportError as e:
+            raise ImportError(
+                "xxhash is required for HashAlgorithm.XXH3. "
+                "Install with: pip install xxhash"
+            ) from e
+        xxh3 = xxhash.xxh3_64_intdigest
+        return lambda key: xxh3(key.encode())
+
+    if algorithm == HashAlgorithm.BLAKE2B:
+        return lambda key: int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8).digest(), "little"
+        )
+
+    # MD5 used for consistent hashing distribution, not for security
+    return lambda key: int(
+        hashlib.md5(key.encode(), usedforsecurity=False).hexdigest(), 16  # nosec B324
+    )
+
+
 @dataclass
 class ConsistentHashRing:
-    """Consistent hash ring for key distribution."""
+    """
+    Consistent hash ring for key distribution.
+
+    Virtual node positions are kept in a sorted list searched with
+    ``bisect``. Membership changes are applied in bulk with one merge or
+    filter pass. Each node gets ``replicas * weight`` virtual nodes.
+    """
 
     nodes: List[str] = field(default_factory=list)
-    replicas: int = 100  # Virtual nodes per physical node
+    replicas: int = 100  # Virtual nodes per physical node (at weight 1.0)
     ring: Dict[int, str] = field(default_factory=dict)
     sorted_keys: List[int] = field(default_factory=list)
+    weights: Dict[str, float] = field(default_factory=dict)
+    hash_algorithm: HashAlgorithm = HashAlgorithm.MD5
+    last_movement: float = 0.0  # Key-space fraction moved by the last change
+
+    def __post_init__(self) -> None:
+        """Bind the hash function for the configured algorithm."""
+        self._hash_fn = _make_hash_function(self.hash_algorithm)
+        self._space = 2**128 if self.hash_algorithm == HashAlgorithm.MD5 else 2**64
+
+    def _virtual_hashes(self, node: str) -> List[int]:
+        """Ring positions of a node's virtual nodes."""
+        count = max(1, round(self.replicas * self.weights.get(node, 1.0)))
+        return [self._hash(f"{node}:{i}") for i in range(count)]
 
-    def add_node(self, node: str) -> None:
-        """Add node to hash ring."""
-        for i in range(self.replicas):
-            virtual_key = f"{node}:{i}"
-            hash_value = self._hash(virtual_key)
-            self.ring[hash_value] = node
-            self.sorted_keys.append(hash_value)
+    def add_node(self, node: str, weight: float = 1.0) -> float:
+        """Add node to hash ring; returns the key-space fraction that moved."""
+        return self.add_nodes({node: weight})
 
+    def add_nodes(self, nodes: Union[List[str], Dict[str, float]]) -> float:
+        """
+        Add several nodes with a single merge of the sorted positions.
+
+        Args:
+            nodes: Node IDs, or weights by node ID
+
+        Returns:
+            Fraction of the key space whose owner changed
+        """
+        weighted = nodes if isinstance(nodes, dict) else dict.fromkeys(nodes, 1.0)
+        weighted = {n: w for n, w in weighted.items() if n not in self.weights}
+        if not weighted:
+            self.last_movement = 0.0
+            return 0.0
+
+        new_keys: List[int] = []
+        for node, weight in weighted.items():
+            if weight <= 0:
+                raise ValueError(f"Node weight must be positive: {node}={weight}")
+            self.weights[node] = weight
+            self.nodes.append(node)
+            for hash_value in self._virtual_hashes(node):
+                if hash_value not in self.ring:
+                    new_keys.append(hash_value)
+                self.ring[hash_value] = node
+
+        # Owner of each new position before the change
+        previous_owner = (
+            {h: self.ring[self.sorted_keys[self._find_index(h)]] for h in new_keys}
+            if self.sorted_keys
+            else {}
+        )
+
+        # Timsort merges the two sorted runs in linear time
+        new_keys.sort()
+        self.sorted_keys.extend(new_keys)
         self.sorted_keys.sort()
-        self.nodes.append(node)
 
-    def remove_node(self, node: str) -> None:
-        """Remove node from hash ring."""
-        for i in range(self.replicas):
-            virtual_key = f"{node}:{i}"
-            hash_value = self._hash(virtual_key)
-            if hash_value in self.ring:
-                del self.ring[hash_value]
-                self.sorted_keys.remove(hash_value)
+        # Only arcs ending at a new position change owner
+        moved = 0
+        for h in new_keys:
+            if previous_owner.get(h) != self.ring[h]:
+                moved += h - self._predecessor(self.sorted_keys, h)
+        self.last_movement = moved / self._space
+        return self.last_movement
+
+    def remove_node(self, node: str) -> float:
+        """Remove node from hash ring; returns the key-space fraction that moved."""
+        return self.remove_nodes([node])
+
+    def remove_nodes(self, nodes: List[str]) -> float:
+        """
+        Remove several nodes with a single filter pass over the positions.
 
-        if node in self.nodes:
-            self.nodes.remove(node)
+        Args:
+            nodes: Node IDs to remove
+
+        Returns:
+            Fraction of the key space whose owner changed
+        """
+        removing = {node for node in nodes if node in self.weights}
+        if not removing:
+            self.last_movement = 0.0
+            return 0.0
+
+        # Every arc a removed node owned moves to a surviving node
+        moved = sum(
+            h - self._predecessor(self.sorted_keys, h)
+            for h, n in self.ring.items()
+            if n in removing
+        )
+        self.ring = {h: n for h, n in self.ring.items() if n not in removing}
+        self.sorted_keys = [h for h in self.sorted_keys if h in self.ring]
+        self.nodes = [node for node in self.nodes if node not in removing]
+        for node in removing:
+            del self.weights[node]
+
+        self.last_movement = moved / self._space if self.sorted_keys else 1.0
+        return self.last_movement
+
+    def copy(self) -> "ConsistentHashRing":
+        """Get an independent snapshot of the ring."""
+        return ConsistentHashRing(
+            nodes=list(self.nodes),
+            replicas=self.replicas,
+            ring=dict(self.ring),
+            sorted_keys=list(self.sorted_keys),
+            weights=dict(self.weights),
+            hash_algorithm=self.hash_algorithm,
+            last_movement=self.last_movement,
+        )
 
     def get_node(self, key: str) -> Optional[str]:
         """Get node for key using consistent hashing."""
-        if not self.ring:
+        if not self.sorted_keys:
             return None
+        return self.ring[self.sorted_keys[self._find_index(self._hash(key))]]
 
-        hash_value = self._hash(key)
+    def get_nodes(self, key: str, count: int) -> List[str]:
+        """
+        Get up to ``count`` distinct nodes for key, walking the ring clockwise.
 
-        # Binary search for closest node
-        idx = self._binary_search(hash_value)
-        return self.ring[self.sorted_keys[idx]]
+        The first node is the one :meth:`get_node` returns.
+        """
+        if not self.sorted_keys:
+            return []
+
+        count = min(count, len(self.nodes))
+        idx = self._find_index(self._hash(key))
+        found: List[str] = []
+        for step in range(len(self.sorted_keys)):
+            node = self.ring[self.sorted_keys[(idx + step) % len(self.sorted_keys)]]
+            if node not in found:
+                found.append(node)
+                if len(found) == count:
+                    break
+        return found
 
     def _hash(self, key: str) -> int:
         """Hash key to integer."""
-        # MD5 used for consistent hashing distribution, not for security
-        return int(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest(), 16)  # nosec B324
+        return self._hash_fn(key)
 
-    def _binary_search(self, hash_value: int) -> int:
-        """Binary search for closest hash in ring."""
-        left, right = 0, len(self.sorted_keys) - 1
+    def _find_index(self, hash_value: int) -> int:
+        """Index of the first position at or after ``hash_value`` (wrapping)."""
+        idx = bisect.bisect_left(self.sorted_keys, hash_value)
+        return 0 if idx == len(self.sorted_keys) else idx
 
-        if hash_value > self.sorted_keys[-1]:
-            return 0
+    def _predecessor(self, keys: List[int], hash_value: int) -> int:
+        """Closest position strictly before ``hash_value`` (wrapping negative)."""
+        idx = bisect.bisect_left(keys, hash_value)
+        return keys[idx - 1] if idx else keys[-1] - self._space
 
-        while left < right:
-            mid = (left + right) // 2
-            if self.sorted_keys[mid] < hash_value:
-                left = mid + 1
-            else:
-                right = mid
-
-        return left
+    def movement_since(self, previous: "ConsistentHashRing") -> float:
+        """
+        Fraction of the key space whose owning node differs from ``previous``.
 
+        Only arcs that end at an added or removed position can change owner
+        (positions present in both rings bound identical arcs), so the cost
+        is proportional to the size of the change, not of the ring. Rings
+        with different hash algorithms share no positions and are reported
+        as a full move.
+        """
+        if previous.hash_algorithm != self.hash_algorithm:
+            return 1.0 if previous.sorted_keys or self.sorted_keys else 0.0
+
+        old_keys, old_ring = previous.sorted_keys, previous.ring
+        if not old_keys or not self.sorted_keys:
+            return 1.0 if old_keys or self.sorted_keys else 0.0
+
+        moved = 0
+        for point in old_ring.keys() ^ self.ring.keys():
+            old_idx = bisect.bisect_left(old_keys, point)
+            new_idx = bisect.bisect_left(self.sorted_keys, point)
+            old_owner = old_ring[old_keys[old_idx % len(old_keys)]]
+            new_owner = self.ring[self.sorted_keys[new_idx % len(self.sorted_keys)]]
+            if old_owner == new_owner:
+                continue
+            # The arc ending here starts at the closer predecessor of either ring
+            start = max(
+                self._predecessor(old_keys, point),
+                self._predecessor(self.sorted_keys, point),
+            )
+            moved += point - start
+        return moved / self._space
 
 class DistributedCache:
     """
@@ -190,17 +373,22 @@ class DistributedCache:
         key_prefix: str = "llm_cache",
         connection_timeout: int = 5,
         max_connections: int = 50,
+        hash_algorithm: HashAlgorithm = HashAlgorithm.MD5,
     ):
         """
         Initialize distributed cache.
 
         Args:
-            redis_cluster_nodes: List of Redis node configs
+            redis_cluster_nodes: List of Redis node configs (``host``,
+                ``port`` and an optional ring ``weight``)
             replication_config: Replication configuration
             sharding_strategy: Sharding strategy to use
             key_prefix: Prefix for all cache keys
             connection_timeout: Connection timeout in seconds
             max_connections: Max connections per node
+            hash_algorithm: Ring hash; every client of a cluster must agree.
+                MD5 keeps the placement of earlier releases; switch an
+                existing cluster with set_hash_algorithm()
         """
         self.redis_nodes = redis_cluster_nodes
         self.replication_config = replication_config or ReplicationConfig()
@@ -211,10 +399,15 @@ class DistributedCache:
 
         # Cluster state
         self.cluster_nodes: Dict[str, ClusterNode] = {}
-        self.hash_ring = ConsistentHashRing()
+        self.hash_ring = ConsistentHashRing(hash_algorithm=hash_algorithm)
         self._redis_clients: Dict[str, redis.Redis] = {}
+        # Ring as of the last rebalance, and clients of removed nodes that
+        # still hold data until rebalance_shards migrates it away
+        self._ring_before_change: Optional[ConsistentHashRing] = None
+        self._retired_clients: Dict[str, redis.Redis] = {}
         self._cluster_client: Optional[RedisCluster] = None
         self._locks: Dict[str, float] = {}  # Distributed locks
+        self._executor: Optional[ThreadPoolExecutor] = None
 
         # Initialize cluster
         self._initialize_cluster()
@@ -242,9 +435,14 @@ class DistributedCache:
             self._cluster_client.ping()
 
             # Initialize nodes in hash ring
+            self.hash_ring.add_nodes(
+                {
+                    f"{node['host']}:{node.get('port', 6379)}": node.get("weight", 1.0)
+                    for node in self.redis_nodes
+                }
+            )
             for node in self.redis_nodes:
                 node_id = f"{node['host']}:{node.get('port', 6379)}"
-                self.hash_ring.add_node(node_id)
 
                 # Create node entry
                 cluster_node = ClusterNode(
@@ -264,7 +462,12 @@ class DistributedCache:
 
     def _initialize_standalone(self) -> None:
         """Initialize standalone Redis connections as fallback."""
-        for node in self.redis_nodes:
+        self.hash_ring.add_nodes(self._connect_standalone(self.redis_nodes))
+
+    def _connect_standalone(self, nodes: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Connect standalone nodes; returns ring weights of those that answered."""
+        connected: Dict[str, float] = {}
+        for node in nodes:
             node_id = f"{node['host']}:{node.get('port', 6379)}"
 
             try:
@@ -279,7 +482,7 @@ class DistributedCache:
 
                 client.ping()
                 self._redis_clients[node_id] = client
-                self.hash_ring.add_node(node_id)
+                connected[node_id] = node.get("weight", 1.0)
 
                 # Create node entry
                 cluster_node = ClusterNode(
@@ -296,6 +499,168 @@ class DistributedCache:
             except Exception as e:
                 logger.error(f"Failed to connect to {node_id}: {e}")
 
+        return connected
+
+    def _snapshot_ring(self) -> None:
+        """Remember the pre-change ring so rebalancing knows what moved."""
+        if self._ring_before_change is None and self.hash_ring.nodes:
+            self._ring_before_change = self.hash_ring.copy()
+
+    def add_nodes(self, nodes: List[Dict[str, Any]]) -> float:
+        """
+        Add nodes to the cluster in one ring update.
+
+        Data is not moved until :meth:`rebalance_shards` runs.
+
+        Args:
+            nodes: Node configs (``host``, ``port``, optional ``weight``)
+
+        Returns:
+            Fraction of the key space whose primary moved
+        """
+        self._snapshot_ring()
+        if self._cluster_client:
+            weights = {
+                f"{node['host']}:{node.get('port', 6379)}": node.get("weight", 1.0)
+                for node in nodes
+            }
+            for node in nodes:
+                node_id = f"{node['host']}:{node.get('port', 6379)}"
+                self.cluster_nodes[node_id] = ClusterNode(
+                    node_id=node_id,
+                    host=node["host"],
+                    port=node.get("port", 6379),
+                    role=NodeRole.MASTER,
+                    status=NodeStatus.HEALTHY,
+                )
+        else:
+            weights = self._connect_standalone(nodes)
+
+        self.redis_nodes.extend(nodes)
+        movement = self.hash_ring.add_nodes(weights)
+        logger.info(f"Added {len(weights)} nodes, {movement:.1%} of keys moved")
+        return movement
+
+    def remove_nodes(self, node_ids: List[str]) -> float:
+        """
+        Remove nodes from the ring in one update.
+
+        Removed standalone nodes keep their connection until
+        :meth:`rebalance_shards` has migrated their keys.
+
+        Args:
+            node_ids: Node identifiers (``host:port``)
+
+        Returns:
+            Fraction of the key space whose primary moved
+        """
+        self._snapshot_ring()
+        movement = self.hash_ring.remove_nodes(node_ids)
+        for node_id in node_ids:
+            client = self._redis_clients.pop(node_id, None)
+            if client is not None:
+                self._retired_clients[node_id] = client
+            self.cluster_nodes.pop(node_id, None)
+        self.redis_nodes = [
+            node
+            for node in self.redis_nodes
+            if f"{node['host']}:{node.get('port', 6379)}" not in node_ids
+        ]
+
+        logger.info(f"Removed {len(node_ids)} nodes, {movement:.1%} of keys moved")
+        return movement
+
+    def set_hash_algorithm(self, algorithm: HashAlgorithm) -> None:
+        """
+        Rebuild the ring with another hash algorithm.
+
+        Nearly every key changes owner. Data stays where it is until
+        :meth:`rebalance_shards` moves it, and every client of the cluster
+        must switch at the same time.
+
+        Args:
+            algorithm: New ring hash
+        """
+        if algorithm == self.hash_ring.hash_algorithm:
+            return
+        self._snapshot_ring()
+        ring = ConsistentHashRing(
+            replicas=self.hash_ring.replicas, hash_algorithm=algorithm
+        )
+        if self.hash_ring.nodes:
+            ring.add_nodes(
+                {node: self.hash_ring.weights.get(node, 1.0)
+                 for node in self.hash_ring.nodes}
+            )
+        self.hash_ring = ring
+        logger.info(f"Ring hash switched to {algorithm.value}; rebalance to move keys")
+
+    def attach_client(
+        self, node_id: str, client: redis.Redis, weight: float = 1.0
+    ) -> float:
+        """
+        Register an already-connected client as a standalone node.
+
+        Useful for custom connection pools or in-process servers (for example
+        ``fakeredis`` in tests and benchmarks).
+
+        Args:
+            node_id: Node identifier in ``host:port`` form
+            client: Connected Redis client
+            weight: Relative share of the key space
+
+        Returns:
+            Fraction of the key space whose primary moved
+        """
+        host, _, port = node_id.rpartition(":")
+        self._snapshot_ring()
+        self._redis_clients[node_id] = client
+        movement = self.hash_ring.add_node(node_id, weight)
+        self.cluster_nodes[node_id] = ClusterNode(
+            node_id=node_id,
+            host=host or node_id,
+            port=int(port) if port.isdigit() else 6379,
+            role=NodeRole.MASTER,
+            status=NodeStatus.HEALTHY,
+        )
+        return movement
+
+    def get_replica_nodes(self, key: str) -> List[str]:
+        """
+        Get the nodes holding key: the primary followed by its replicas.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Up to ``replicas + 1`` distinct node IDs in ring order
+        """
+        return self.hash_ring.get_nodes(key, self.replication_config.replicas + 1)
+
+    def get_required_acks(
+        self, level: Optional[ConsistencyLevel] = None, replica_count: int = 0
+    ) -> int:
+        """
+        Get how many replicas must answer for a consistency level.
+
+        Args:
+            level: Consistency level (defaults to the configured one)
+            replica_count: Size of the replica set (defaults to replicas + 1
+                capped by the number of nodes)
+
+        Returns:
+            Required acknowledgements
+        """
+        level = level or self.replication_config.consistency_level
+        replica_count = replica_count or min(
+            self.replication_config.replicas + 1, max(len(self.hash_ring.nodes), 1)
+        )
+        if level == ConsistencyLevel.ONE:
+            return 1
+        if level == ConsistencyLevel.ALL:
+            return replica_count
+        return replica_count // 2 + 1
+
     def get_shard_for_key(self, key: str) -> int:
         """
         Determine shard for key based on sharding strategy.
@@ -350,10 +715,11 @@ class DistributedCache:
                 return True
 
             # Fallback to manual replication
-            node_id = self.hash_ring.get_node(key)
-            if not node_id or node_id not in self._redis_clients:
+            replica_nodes = self.get_replica_nodes(key)
+            if not replica_nodes or replica_nodes[0] not in self._redis_clients:
                 return False
 
+            node_id = replica_nodes[0]
             primary_client = self._redis_clients[node_id]
 
             if ttl:
@@ -363,19 +729,16 @@ class DistributedCache:
 
             # Replicate to replicas
             replicated = 1
-            for replica_node_id, client in self._redis_clients.items():
-                if (
-                    replica_node_id != node_id
-                    and replicated < self.replication_config.replicas + 1
-                ):
-                    try:
-                        if ttl:
-                            client.setex(prefixed_key, ttl, serialized)
-                        else:
-                            client.set(prefixed_key, serialized)
-                        replicated += 1
-                    except Exception as e:
-                        logger.warning(f"Replication to {replica_node_id} failed: {e}")
+            for replica_node_id in replica_nodes[1:]:
+                client = self._redis_clients[replica_node_id]
+                try:
+                    if ttl:
+                        client.setex(prefixed_key, ttl, serialized)
+                    else:
+                        client.set(prefixed_key, serialized)
+                    replicated += 1
+                except Exception as e:
+                    logger.warning(f"Replication to {replica_node_id} failed: {e}")
 
             logger.debug(f"Set key={key} with {replicated} replicas (ttl={ttl})")
             return replicated >= self.replication_config.quorum
@@ -432,6 +795,229 @@ class DistributedCache:
             logger.error(f"Error in get_replicated: {e}", exc_info=True)
             return None
 
+    def _fan_out(
+        self, calls: Dict[str, Callable[[], T]]
+    ) -> Dict[str, Tuple[Optional[T], Optional[Exception]]]:
+        """Run one callable per node concurrently; collect (result, error)."""
+        if not calls:
+            return {}
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(len(self._redis_clients), 1),
+                thread_name_prefix="distributed-cache",
+            )
+
+        futures = {node: self._executor.submit(call) for node, call in calls.items()}
+        results: Dict[str, Tuple[Optional[T], Optional[Exception]]] = {}
+        for node, future in futures.items():
+            try:
+                results[node] = (future.result(), None)
+            except Exception as e:
+                logger.warning(f"Bulk operation on {node} failed: {e}")
+                results[node] = (None, e)
+        return results
+
+    def _pipeline_set(
+        self, node_id: str, items: List[Tuple[str, bytes]], ttl: Optional[int]
+    ) -> List[Any]:
+        """Write items to one node in one round-trip (MSET, or pipelined SETEX)."""
+        client = self._redis_clients[node_id]
+        if not ttl:
+            return [client.mset(dict(items))] * len(items)
+
+        pipe = client.pipeline(transaction=False)
+        for prefixed_key, serialized in items:
+            pipe.setex(prefixed_key, ttl, serialized)
+        return pipe.execute()
+
+    def _node_mget(self, node_id: str, prefixed_keys: List[str]) -> List[Any]:
+        """Read keys from one node with a single MGET."""
+        return self._redis_clients[node_id].mget(prefixed_keys)
+
+    def mset_replicated(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        consistency: Optional[ConsistencyLevel] = None,
+    ) -> Dict[str, bool]:
+        """
+        Set many values with replication in one round-trip per node.
+
+        Keys are grouped by node via the hash ring; every node receives one
+        MSET (or one pipeline of SETEX when ``ttl`` is set) holding all keys
+        it is primary or replica for, and nodes are written concurrently.
+
+        Args:
+            items: Values by cache key
+            ttl: Time to live in seconds
+            consistency: Acks required per key (defaults to the configured
+                ``consistency_level``; QUORUM is a majority of the replica set)
+
+        Returns:
+            Whether each key reached the required acknowledgements
+        """
+        try:
+            serialized = {
+                key: (f"{self.key_prefix}:{key}", pickle.dumps(value))
+                for key, value in items.items()
+            }
+
+            if self._cluster_client:
+                pipe = self._cluster_client.pipeline()
+                for prefixed_key, data in serialized.values():
+                    if ttl:
+                        pipe.setex(prefixed_key, ttl, data)
+                    else:
+                        pipe.set(prefixed_key, data)
+                replies = pipe.execute(raise_on_error=False)
+                return {
+                    key: not isinstance(reply, Exception)
+                    for key, reply in zip(serialized, replies)
+                }
+
+            by_node: Dict[str, List[str]] = defaultdict(list)
+            required: Dict[str, int] = {}
+            for key in items:
+                nodes = self.get_replica_nodes(key)
+                required[key] = self.get_required_acks(consistency, len(nodes))
+                for node_id in nodes:
+                    by_node[node_id].append(key)
+
+            results = self._fan_out(
+                {
+                    node_id: (
+                        lambda n=node_id, ks=keys: self._pipeline_set(
+                            n, [serialized[k] for k in ks], ttl
+                        )
+                    )
+                    for node_id, keys in by_node.items()
+                    if node_id in self._redis_clients
+                }
+            )
+
+            acks: Counter = Counter()
+            for node_id, (replies, error) in results.items():
+                if error is None and replies is not None:
+                    for key, reply in zip(by_node[node_id], replies):
+                        if reply and not isinstance(reply, Exception):
+                            acks[key] += 1
+
+            stored = {
+                key: required[key] > 0 and acks[key] >= required[key] for key in items
+            }
+            logger.debug(
+                f"mset_replicated: {sum(stored.values())}/{len(items)} keys "
+                f"across {len(by_node)} nodes (ttl={ttl})"
+            )
+            return stored
+
+        except Exception as e:
+            logger.error(f"Error in mset_replicated: {e}", exc_info=True)
+            return {key: False for key in items}
+
+    def mget_replicated(
+        self,
+        keys: List[str],
+        consistency: ConsistencyLevel = ConsistencyLevel.ONE,
+    ) -> Dict[str, Any]:
+        """
+        Get many values with one MGET per node, fanned out concurrently.
+
+        With ``ONE`` each key is read from its primary; keys whose node is
+        down are retried on the next replica. ``QUORUM``/``ALL`` read that
+        many replicas per key, continuing down the replica set while the
+        answers disagree, and return the value that reached the required
+        votes (or the most common one), so a stale copy is outvoted.
+
+        Args:
+            keys: Cache keys
+            consistency: Replicas to read per key
+
+        Returns:
+            Values by key for keys that were found
+        """
+        try:
+            prefixed = {key: f"{self.key_prefix}:{key}" for key in keys}
+
+            if self._cluster_client:
+                values = self._cluster_client.mget_nonatomic(
+                    [prefixed[key] for key in keys]
+                )
+                return {
+                    key: pickle.loads(data)  # nosec B301 - controlled cache data
+                    for key, data in zip(keys, values)
+                    if data
+                }
+
+            replica_sets = {key: self.get_replica_nodes(key) for key in keys}
+            required = {
+                key: (
+                    self.get_required_acks(consistency, len(nodes)) if nodes else 0
+                )
+                for key, nodes in replica_sets.items()
+            }
+            votes: Dict[str, Counter] = defaultdict(Counter)
+            next_replica = {key: 0 for key in keys}
+            pending = [key for key in keys if required[key]]
+
+            def agreed(key: str) -> int:
+                return max(votes[key].values(), default=0)
+
+            while pending:
+                by_node: Dict[str, List[str]] = defaultdict(list)
+                for key in pending:
+                    nodes = replica_sets[key]
+                    wanted = required[key] - agreed(key)
+                    while wanted > 0 and next_replica[key] < len(nodes):
+                        by_node[nodes[next_replica[key]]].append(key)
+                        next_replica[key] += 1
+                        wanted -= 1
+
+                if not by_node:
+                    break
+
+                results = self._fan_out(
+                    {
+                        node_id: (
+                            lambda n=node_id, ks=node_keys: self._node_mget(
+                                n, [prefixed[k] for k in ks]
+                            )
+                        )
+                        for node_id, node_keys in by_node.items()
+                        if node_id in self._redis_clients
+                    }
+                )
+                for node_id, node_keys in by_node.items():
+                    values, error = results.get(node_id, (None, KeyError(node_id)))
+                    if error is None and values is not None:
+                        for key, data in zip(node_keys, values):
+                            votes[key][data] += 1
+
+                pending = [
+                    key
+                    for key in pending
+                    if agreed(key) < required[key]
+                    and next_replica[key] < len(replica_sets[key])
+                ]
+
+            found: Dict[str, Any] = {}
+            for key in keys:
+                answered = sum(votes[key].values())
+                if answered < required[key]:
+                    logger.warning(
+                        f"mget_replicated: only {answered}/{required[key]} "
+                        f"replicas answered for key={key}"
+                    )
+                    continue
+                data, _ = votes[key].most_common(1)[0]
+                if data:
+                    found[key] = pickle.loads(data)  # nosec B301 - controlled cache data
+            return found
+
+        except Exception as e:
+            logger.error(f"Error in mget_replicated: {e}", exc_info=True)
+            return {}
+
     def delete(self, key: str) -> bool:
         """
         Delete key from all replicas.
@@ -677,16 +1263,28 @@ class DistributedCache:
 
         return health
 
-    def rebalance_shards(self) -> Dict[str, Any]:
+    def rebalance_shards(self, batch_size: int = 500) -> Dict[str, Any]:
         """
-        Rebalance data across cluster nodes.
+        Migrate keys whose replica set changed since the last rebalance.
+
+        Every node (including removed ones still connected) is scanned once.
+        A key is handled by the first reachable node of its old replica set;
+        only keys whose replica set actually changed are copied (DUMP/RESTORE
+        with the remaining TTL) to their new holders and deleted from nodes
+        that no longer own them. Redis Cluster mode reshards on its own and
+        is skipped.
+
+        Args:
+            batch_size: Keys per SCAN batch and per pipeline
 
         Returns:
             Rebalancing report
         """
         report: Dict[str, Any] = {
             "status": "completed",
+            "keys_scanned": 0,
             "keys_moved": 0,
+            "movement_fraction": 0.0,
             "duration_seconds": 0,
             "errors": [],
         }
@@ -694,18 +1292,56 @@ class DistributedCache:
         try:
             start_time = time.time()
 
-            logger.info("Starting cluster rebalancing")
+            if self._cluster_client:
+                report["status"] = "skipped"
+                logger.info("Rebalancing is managed by Redis Cluster")
+                return report
 
-            # In production, this would:
-            # 1. Calculate optimal key distribution
-            # 2. Move keys between nodes
-            # 3. Update hash ring
-            # 4. Verify data consistency
+            old_ring = self._ring_before_change
+            if old_ring is None:
+                logger.info("Ring unchanged since last rebalance; nothing to move")
+                return report
 
-            # For now, log operation
-            logger.info("Rebalancing completed (no-op in current implementation)")
+            logger.info("Starting cluster rebalancing")
+            new_ring = self.hash_ring
+            report["movement_fraction"] = new_ring.movement_since(old_ring)
+            copies = self.replication_config.replicas + 1
+            clients = {**self._retired_clients, **self._redis_clients}
+            prefix = f"{self.key_prefix}:"
+
+            for source_id, source in clients.items():
+                batch: List[bytes] = []
+                try:
+                    for raw_key in source.scan_iter(
+                        match=f"{prefix}*", count=batch_size
+                    ):
+                        batch.append(raw_key)
+                        if len(batch) >= batch_size:
+                            self._migrate_batch(
+                                source_id, batch, old_ring, copies, clients, report
+                            )
+                            batch = []
+                    if batch:
+                        self._migrate_batch(
+                            source_id, batch, old_ring, copies, clients, report
+                        )
+                except Exception as e:
+                    logger.warning(f"Rebalance scan of {source_id} failed: {e}")
+                    report["errors"].append(f"{source_id}: {e}")
+
+            if not report["errors"]:
+                for client in self._retired_clients.values():
+                    client.close()
+                self._retired_clients = {}
+                self._ring_before_change = None
+            else:
+                report["status"] = "partial"
 
             report["duration_seconds"] = time.time() - start_time
+            logger.info(
+                f"Rebalancing moved {report['keys_moved']}/"
+                f"{report['keys_scanned']} scanned keys"
+            )
 
             return report
 
@@ -715,6 +1351,61 @@ class DistributedCache:
             report["errors"].append(str(e))
             return report
 
+    def _migrate_batch(
+        self,
+        source_id: str,
+        raw_keys: List[bytes],
+        old_ring: ConsistentHashRing,
+        copies: int,
+        clients: Dict[str, redis.Redis],
+        report: Dict[str, Any],
+    ) -> None:
+        """Move one scanned batch of keys whose replica set changed."""
+        prefix_len = len(self.key_prefix) + 1
+        moves: List[Tuple[bytes, List[str], List[str]]] = []
+        for raw_key in raw_keys:
+            report["keys_scanned"] += 1
+            key = raw_key.decode()[prefix_len:]
+            old_nodes = old_ring.get_nodes(key, copies)
+            owner = next((n for n in old_nodes if n in clients), None)
+            if owner != source_id:
+                # Another old holder handles it, or it is a stray copy
+                continue
+            new_nodes = self.hash_ring.get_nodes(key, copies)
+            if new_nodes == old_nodes:
+                continue
+            targets = [n for n in new_nodes if n not in old_nodes]
+            stale = [n for n in old_nodes if n not in new_nodes and n in clients]
+            moves.append((raw_key, targets, stale))
+
+        if not moves:
+            return
+
+        pipe = clients[source_id].pipeline(transaction=False)
+        for raw_key, _, _ in moves:
+            pipe.dump(raw_key)
+            pipe.pttl(raw_key)
+        replies = pipe.execute()
+
+        writes: Dict[str, Any] = {}
+        for i, (raw_key, targets, stale) in enumerate(moves):
+            payload, pttl = replies[2 * i], replies[2 * i + 1]
+            if payload is None:
+                continue  # Expired between SCAN and DUMP
+            for node_id in targets:
+                if node_id not in writes:
+                    writes[node_id] = clients[node_id].pipeline(transaction=False)
+                writes[node_id].restore(raw_key, max(pttl, 0), payload, replace=True)
+            for node_id in stale:
+                if node_id not in writes:
+                    writes[node_id] = clients[node_id].pipeline(transaction=False)
+                writes[node_id].delete(raw_key)
+            report["keys_moved"] += 1
+
+        # Copies land before stale holders (possibly the source) delete
+        for node_id in sorted(writes, key=lambda n: n == source_id):
+            writes[node_id].execute()
+
     def get_cluster_stats(self) -> Dict[str, Any]:
         """
         Get comprehensive cluster statistics.
@@ -760,6 +1451,10 @@ class DistributedCache:
             for client in self._redis_clients.values():
                 client.close()
 
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
             logger.info("Closed all Redis connections")
 
         except Exception as e:
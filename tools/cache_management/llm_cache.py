@@ -11,11 +11,13 @@ License: MIT
 import hashlib
 import json
 import logging
+import threading
 import time
+from collections import defaultdict
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 import diskcache
 import redis
@@ -24,6 +26,18 @@ from pydantic import BaseModel, Field, field_validator
 
 logger = logging.getLogger(__name__)
 
+# Redis keys holding the per-model and per-tag secondary index sets
+INDEX_KEY_PREFIX = "llm_cache:idx:"
+
+# Set a key's expiry only if it has none or a shorter one (EXPIRE NX/GT
+# without needing Redis 7)
+_EXTEND_EXPIRY_SCRIPT = """
+local ttl = redis.call('TTL', KEYS[1])
+if ttl == -1 or ttl < tonumber(ARGV[1]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+"""
+
 
 class CacheBackend(str, Enum):
     """Supported cache backend types."""
@@ -41,6 +55,14 @@ class EvictionPolicy(str, Enum):
     TTL = "ttl"  # Time To Live only
 
 
+# diskcache names its policies in full; TTL-only caches evict oldest-stored.
+_DISKCACHE_POLICIES = {
+    EvictionPolicy.LRU: "least-recently-used",
+    EvictionPolicy.LFU: "least-frequently-used",
+    EvictionPolicy.TTL: "least-recently-stored",
+}
+
+
 class CacheConfig(BaseModel):
     """Configuration for LLM cache."""
 
@@ -102,6 +124,7 @@ class CachedResponse(BaseModel):
     )
     token_count: Optional[int] = Field(default=None, description="Token count")
     model_name: Optional[str] = Field(default=None, description="Model name")
+    tags: List[str] = Field(default_factory=list, description="Invalidation tags")
     prompt_hash: str = Field(description="SHA256 hash of the prompt")
     hit_count: int = Field(default=0, description="Number of cache hits")
     created_at: str = Field(description="ISO 8601 timestamp")
@@ -142,6 +165,261 @@ class CacheStats(BaseModel):
     eviction_policy: str = Field(description="Eviction policy")
 
 
+class InvalidationProgress(BaseModel):
+    """Progress of a background pattern invalidation."""
+
+    pattern: str = Field(description="Pattern being invalidated")
+    total_keys: int = Field(default=0, description="Keyspace size when started")
+    examined: int = Field(
+        default=0, description="Keys examined so far (approximate for Redis)"
+    )
+    matched: int = Field(default=0, description="Keys that matched the pattern")
+    invalidated: int = Field(default=0, description="Keys actually deleted")
+    batches: int = Field(default=0, description="Batches processed")
+    done: bool = Field(default=False, description="Whether the job has finished")
+    cancelled: bool = Field(default=False, description="Whether it was cancelled")
+    error: Optional[str] = Field(default=None, description="Failure message")
+    started_at: float = Field(description="Unix timestamp of job start")
+    finished_at: Optional[float] = Field(default=None, description="Finish time")
+
+    @property
+    def fraction(self) -> float:
+        """Estimated completed fraction (0-1)."""
+        if self.done:
+            return 1.0
+        if self.total_keys <= 0:
+            return 0.0
+        return min(1.0, self.examined / self.total_keys)
+
+
+class InvalidationJob:
+    """
+    Incremental pattern invalidation running on a background thread.
+
+    Keys are enumerated one SCAN batch at a time and deleted with UNLINK, so
+    the server never blocks on a single large command and other clients keep
+    being served between batches.
+    """
+
+    def __init__(
+        self,
+        cache: "LLMCache",
+        pattern: str,
+        batch_size: int = 1000,
+        pause_seconds: float = 0.0,
+        on_progress: Optional[Callable[[InvalidationProgress], None]] = None,
+    ):
+        """
+        Initialize the job; call start() to run it.
+
+        Args:
+            cache: Cache to invalidate
+            pattern: Pattern to match (same semantics as LLMCache.invalidate)
+            batch_size: Keys requested per SCAN and deleted per UNLINK
+            pause_seconds: Sleep between batches to further limit load
+            on_progress: Called from the worker thread after every batch
+        """
+        self._cache = cache
+        self._batch_size = batch_size
+        self._pause_seconds = pause_seconds
+        self._on_progress = on_progress
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._progress = InvalidationProgress(pattern=pattern, started_at=time.time())
+        self._thread = threading.Thread(
+            target=self._run, name=f"llm-cache-invalidate:{pattern}", daemon=True
+        )
+
+    @property
+    def progress(self) -> InvalidationProgress:
+        """Snapshot of the current progress."""
+        with self._lock:
+            return self._progress.model_copy()
+
+    def start(self) -> "InvalidationJob":
+        """Start the worker thread."""
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Stop after the current batch."""
+        self._cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> InvalidationProgress:
+        """
+        Wait for the job to finish.
+
+        Args:
+            timeout: Maximum seconds to wait, None for no limit
+
+        Returns:
+            Progress snapshot when the job finished or the timeout elapsed
+        """
+        self._thread.join(timeout)
+        return self.progress
+
+    def _run(self) -> None:
+        """Scan, delete and report batch by batch."""
+        pattern = self._progress.pattern
+        try:
+            with self._lock:
+                self._progress.total_keys = self._cache._key_count()
+            for examined, keys in self._cache._scan_batches(
+                pattern, self._batch_size
+            ):
+                if self._cancel.is_set():
+                    break
+                deleted = self._cache._delete_keys(keys)
+                with self._lock:
+                    self._progress.examined += examined
+                    self._progress.matched += len(keys)
+                    self._progress.invalidated += deleted
+                    self._progress.batches += 1
+                self._report()
+                if self._pause_seconds > 0:
+                    self._cancel.wait(self._pause_seconds)
+        except Exception as e:
+            logger.error(f"Background invalidation of {pattern!r} failed: {e}")
+            with self._lock:
+                self._progress.error = str(e)
+        finally:
+            with self._lock:
+                self._progress.cancelled = self._cancel.is_set()
+                self._progress.done = True
+                self._progress.finished_at = time.time()
+            logger.info(
+                f"Background invalidation of {pattern!r} finished: "
+                f"{self._progress.invalidated} entries removed"
+            )
+            self._report()
+
+    def _report(self) -> None:
+        """Deliver a progress snapshot to the callback."""
+        if self._on_progress is None:
+            return
+        try:
+            self._on_progress(self.progress)
+        except Exception as e:
+            logger.warning(f"Invalidation progress callback failed: {e}")
+
+
+def _index_names(model_name: Optional[str], tags: List[str]) -> List[str]:
+    """Secondary index names an entry belongs to."""
+    names = [f"tag:{tag}" for tag in tags]
+    if model_name:
+        names.append(f"model:{model_name}")
+    return names
+
+
+def queue_index_updates(pipe: Any, cached_response: CachedResponse) -> None:
+    """
+    Queue the Redis secondary index writes for an entry on a pipeline.
+
+    Args:
+        pipe: Redis pipeline (sync or asyncio) the entry itself is written on
+        cached_response: Entry being stored
+    """
+    for name in _index_names(cached_response.model_name, cached_response.tags):
+        index_key = INDEX_KEY_PREFIX + name
+        pipe.sadd(index_key, cached_response.key)
+        if cached_response.ttl > 0:
+            # The expiry is only ever extended, so the set lives as long as
+            # its longest-lived member.
+            pipe.eval(_EXTEND_EXPIRY_SCRIPT, 1, index_key, cached_response.ttl)
+        else:
+            pipe.persist(index_key)
+
+
+def parse_redis_address(redis_url: Optional[str]) -> Tuple[str, int]:
+    """
+    Parse host and port from a ``redis://`` URL.
+
+    Args:
+        redis_url: Redis connection URL (credentials and db path are ignored)
+
+    Returns:
+        Tuple of (host, port), defaulting to localhost:6379
+    """
+    if not redis_url:
+        return "localhost", 6379
+    url = redis_url.replace("redis://", "")
+    if "@" in url:
+        url = url.split("@")[1]
+    if "/" in url:
+        url = url.split("/")[0]
+    if ":" in url:
+        host, port = url.split(":", 1)
+        return host, int(port)
+    return url, 6379
+
+
+def make_cache_key(
+    prompt: str,
+    model_params: Optional[Dict[str, Any]] = None,
+    include_model_params: bool = True,
+) -> str:
+    """
+    Generate SHA256 cache key from prompt and model parameters.
+
+    Args:
+        prompt: Input prompt text
+        model_params: Optional model parameters to include in key
+        include_model_params: Whether model parameters contribute to the key
+
+    Returns:
+        SHA256 hash string
+    """
+    key_data: Dict[str, Any] = {"prompt": prompt}
+    if include_model_params and model_params:
+        key_data["params"] = model_params
+
+    key_string = json.dumps(key_data, sort_keys=True)
+    return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+
+
+def make_cached_response(
+    cache_key: str,
+    prompt: str,
+    response: str,
+    ttl: int,
+    metadata: Optional[Dict[str, Any]] = None,
+    token_count: Optional[int] = None,
+    model_name: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+) -> CachedResponse:
+    """
+    Build a fresh CachedResponse for a prompt/response pair.
+
+    Args:
+        cache_key: Cache key the response is stored under
+        prompt: Input prompt text
+        response: LLM response text
+        ttl: Time-to-live in seconds (0 or less means no expiry)
+        metadata: Additional metadata to store
+        token_count: Token count for the response
+        model_name: Name of the model used
+        tags: Invalidation tags for the secondary index
+
+    Returns:
+        CachedResponse with creation and expiry timestamps filled in
+    """
+    now = time.time()
+    return CachedResponse(
+        key=cache_key,
+        value=response,
+        timestamp=now,
+        ttl=ttl,
+        metadata=metadata or {},
+        token_count=token_count,
+        model_name=model_name,
+        tags=list(tags or []),
+        prompt_hash=hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        hit_count=0,
+        created_at=datetime.fromtimestamp(now).isoformat(),
+        expires_at=datetime.fromtimestamp(now + ttl).isoformat() if ttl > 0 else None,
+    )
+
+
 class LLMCache:
     """
     LLM Cache Manager with multiple backend support.
@@ -172,6 +450,12 @@ class LLMCache:
         self._cache: Any = None
         self._stats_hits = 0
         self._stats_misses = 0
+        # Secondary index for the memory/disk backends (Redis keeps it in sets);
+        # the disk index is rebuilt from stored entries on first use.
+        self._index: Dict[str, Set[str]] = defaultdict(set)
+        self._index_loaded = config.backend != CacheBackend.DISK
+        self._index_additions = 0
+        self._prune_thread: Optional[threading.Thread] = None
         self._init_backend()
         logger.info(
             f"Initialized LLM cache with backend: {config.backend}, "
@@ -209,29 +493,11 @@ class LLMCache:
 
     def _parse_redis_host(self) -> str:
         """Parse Redis host from URL."""
-        if not self.config.redis_url:
-            return "localhost"
-        url = self.config.redis_url.replace("redis://", "")
-        if "@" in url:
-            url = url.split("@")[1]
-        if "/" in url:
-            url = url.split("/")[0]
-        if ":" in url:
-            return url.split(":")[0]
-        return url
+        return parse_redis_address(self.config.redis_url)[0]
 
     def _parse_redis_port(self) -> int:
         """Parse Redis port from URL."""
-        if not self.config.redis_url:
-            return 6379
-        url = self.config.redis_url.replace("redis://", "")
-        if "@" in url:
-            url = url.split("@")[1]
-        if "/" in url:
-            url = url.split("/")[0]
-        if ":" in url:
-            return int(url.split(":")[1])
-        return 6379
+        return parse_redis_address(self.config.redis_url)[1]
 
     def _init_memory_backend(self) -> None:
         """Initialize in-memory cache backend."""
@@ -260,7 +526,7 @@ class LLMCache:
             self._cache = diskcache.Cache(
                 directory=str(cache_dir),
                 size_limit=size_limit,
-                eviction_policy=self.config.eviction_policy.value,
+                eviction_policy=_DISKCACHE_POLICIES[self.config.eviction_policy],
             )
             logger.info(
                 f"Disk cache initialized at {cache_dir} with size limit: "
@@ -283,12 +549,7 @@ class LLMCache:
         Returns:
             SHA256 hash string
         """
-        key_data: Dict[str, Any] = {"prompt": prompt}
-        if self.config.include_model_params and model_params:
-            key_data["params"] = model_params
-
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+        return make_cache_key(prompt, model_params, self.config.include_model_params)
 
     def _generate_prompt_hash(self, prompt: str) -> str:
         """Generate SHA256 hash of just the prompt."""
@@ -303,10 +564,15 @@ class LLMCache:
         model_params: Optional[Dict[str, Any]] = None,
         token_count: Optional[int] = None,
         model_name: Optional[str] = None,
+        tags: Optional[List[str]] = None,
     ) -> bool:
         """
         Cache an LLM response with specified TTL.
 
+        The entry is also added to the secondary index of its model and of
+        each tag, so it can later be dropped with invalidate_model() or
+        invalidate_tag() without scanning the keyspace.
+
         Args:
             prompt: Input prompt text
             response: LLM response text
@@ -315,43 +581,51 @@ class LLMCache:
             model_params: Model parameters to include in cache key
             token_count: Token count for the response
             model_name: Name of the model used
+            tags: Invalidation tags for the entry
 
         Returns:
             True if cached successfully, False otherwise
         """
+        ttl_value = ttl if ttl is not None else self.config.ttl_seconds
         try:
-            cache_key = self._generate_cache_key(prompt, model_params)
-            prompt_hash = self._generate_prompt_hash(prompt)
-            ttl_value = ttl if ttl is not None else self.config.ttl_seconds
-
-            created_at = datetime.now().isoformat()
-            expires_at = (
-                datetime.fromtimestamp(time.time() + ttl_value).isoformat()
-                if ttl_value > 0
-                else None
-            )
-
-            cached_response = CachedResponse(
-                key=cache_key,
-                value=response,
-                timestamp=time.time(),
-                ttl=ttl_value,
-                metadata=metadata or {},
+            cached_response = make_cached_response(
+                self._generate_cache_key(prompt, model_params),
+                prompt,
+                response,
+                ttl_value,
+                metadata=metadata,
                 token_count=token_count,
                 model_name=model_name,
-                prompt_hash=prompt_hash,
-                hit_count=0,
-                created_at=created_at,
-                expires_at=expires_at,
+                tags=tags,
             )
+        except Exception as e:
+            logger.error(f"Failed to cache response: {e}")
+            return False
+        return self.store_response(cached_response)
+
+    def store_response(self, cached_response: CachedResponse) -> bool:
+        """
+        Write an already-built response under its own key and TTL.
 
+        Args:
+            cached_response: Response to store; ``key`` and ``ttl`` are used as-is
+
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        try:
+            cache_key = cached_response.key
+            ttl_value = cached_response.ttl
             serialized_data = json.dumps(cached_response.model_dump()).encode("utf-8")
 
             if self.config.backend == CacheBackend.REDIS:
+                pipe = self._cache.pipeline(transaction=False)
                 if ttl_value > 0:
-                    self._cache.setex(cache_key, ttl_value, serialized_data)
+                    pipe.setex(cache_key, ttl_value, serialized_data)
                 else:
-                    self._cache.set(cache_key, serialized_data)
+                    pipe.set(cache_key, serialized_data)
+                self._index_entry(cached_response, pipe)
+                pipe.execute()
             elif self.config.backend == CacheBackend.MEMORY:
                 if self.config.eviction_policy == EvictionPolicy.TTL:
                     self._cache[cache_key] = (
@@ -360,15 +634,17 @@ class LLMCache:
                     )
                 else:
                     self._cache[cache_key] = cached_response
+                self._index_entry(cached_response)
             elif self.config.backend == CacheBackend.DISK:
                 if ttl_value > 0:
                     self._cache.set(cache_key, cached_response, expire=ttl_value)
                 else:
                     self._cache.set(cache_key, cached_response)
+                self._index_entry(cached_response)
 
             logger.debug(
-                f"Cached response for prompt hash {prompt_hash[:16]}... "
-                f"with TTL {ttl_value}s"
+                f"Cached response for prompt hash "
+                f"{cached_response.prompt_hash[:16]}... with TTL {ttl_value}s"
             )
             return True
 
@@ -376,6 +652,113 @@ class LLMCache:
             logger.error(f"Failed to cache response: {e}")
             return False
 
+    def _index_entry(self, cached_response: CachedResponse, pipe: Any = None) -> None:
+        """Add an entry to its model and tag index sets."""
+        names = _index_names(cached_response.model_name, cached_response.tags)
+
+        if self.config.backend == CacheBackend.REDIS:
+            queue_index_updates(pipe, cached_response)
+            # Expired entries leave their keys behind in the sets, and every
+            # write pushes the sets' expiry forward; sweep them now and then.
+            self._index_additions += len(names)
+            if self._index_additions > 2 * max(self.config.max_entries, 1024):
+                self._index_additions = 0
+                self._start_index_prune()
+            return
+
+        if not names:
+            return
+        self._load_local_index()
+        for name in names:
+            self._index[name].add(cached_response.key)
+        self._index_additions += len(names)
+        if self._index_additions > 2 * max(self.config.max_entries, 1024):
+            self._prune_local_index()
+
+    def _load_local_index(self) -> None:
+        """Rebuild the disk backend's index from stored entries once."""
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+        for cache_key in self._cache.iterkeys():
+            cached_response = self._cache.get(cache_key)
+            if isinstance(cached_response, CachedResponse):
+                for name in _index_names(
+                    cached_response.model_name, cached_response.tags
+                ):
+                    self._index[name].add(cache_key)
+
+    def _prune_local_index(self) -> None:
+        """Drop index members whose entries were evicted or expired."""
+        for name in list(self._index):
+            live = {key for key in self._index[name] if key in self._cache}
+            if live:
+                self._index[name] = live
+            else:
+                del self._index[name]
+        self._index_additions = sum(len(keys) for keys in self._index.values())
+
+    def prune_index(self, batch_size: int = 1000) -> int:
+        """
+        Remove index members whose entries have expired or been deleted.
+
+        For Redis every index set is walked with SSCAN, members are checked
+        with pipelined EXISTS and dead ones removed with SREM, one batch at a
+        time. This also runs on a background thread after every
+        2 * max_entries index additions.
+
+        Args:
+            batch_size: Members checked per round trip
+
+        Returns:
+            Number of index members removed
+        """
+        try:
+            if self.config.backend != CacheBackend.REDIS:
+                self._load_local_index()
+                before = sum(len(keys) for keys in self._index.values())
+                self._prune_local_index()
+                return before - sum(len(keys) for keys in self._index.values())
+
+            removed = 0
+            for index_key in self._cache.scan_iter(
+                match=INDEX_KEY_PREFIX + "*", count=batch_size
+            ):
+                cursor = 0
+                while True:
+                    cursor, members = self._cache.sscan(
+                        index_key, cursor, count=batch_size
+                    )
+                    if members:
+                        pipe = self._cache.pipeline(transaction=False)
+                        for member in members:
+                            pipe.exists(member)
+                        dead = [
+                            member
+                            for member, alive in zip(members, pipe.execute())
+                            if not alive
+                        ]
+                        if dead:
+                            removed += self._cache.srem(index_key, *dead)
+                    if cursor == 0:
+                        break
+
+            logger.debug(f"Pruned {removed} expired members from index sets")
+            return removed
+
+        except Exception as e:
+            logger.error(f"Failed to prune index: {e}")
+            return 0
+
+    def _start_index_prune(self) -> None:
+        """Run prune_index() on a background thread unless one is running."""
+        if self._prune_thread is not None and self._prune_thread.is_alive():
+            return
+        self._prune_thread = threading.Thread(
+            target=self.prune_index, name="llm-cache-prune-index", daemon=True
+        )
+        self._prune_thread.start()
+
     def get(
         self, prompt: str, model_params: Optional[Dict[str, Any]] = None
     ) -> Optional[CachedResponse]:
@@ -425,7 +808,7 @@ class LLMCache:
                 return None
 
             if cached_response.is_expired():
-                self.invalidate(cache_key)
+                self._delete_keys([cache_key])
                 self._stats_misses += 1
                 return None
 
@@ -510,6 +893,10 @@ class LLMCache:
         """
         Invalidate cache entries matching pattern.
 
+        Keys are enumerated in SCAN-sized batches and deleted with UNLINK, so
+        Redis is never blocked by one large command. Use start_invalidation()
+        to run the same sweep on a background thread.
+
         Args:
             pattern: Pattern to match (for Redis: glob pattern, others: prefix)
 
@@ -517,30 +904,16 @@ class LLMCache:
             Number of entries invalidated
         """
         try:
-            count = 0
-
-            if self.config.backend == CacheBackend.REDIS:
-                cursor = 0
-                while True:
-                    cursor, keys = self._cache.scan(cursor, match=pattern, count=100)
-                    if keys:
-                        count += self._cache.delete(*keys)
-                    if cursor == 0:
-                        break
-
-            elif self.config.backend == CacheBackend.MEMORY:
-                keys_to_delete = [
-                    k for k in self._cache.keys() if k.startswith(pattern)
-                ]
-                for key in keys_to_delete:
-                    del self._cache[key]
-                    count += 1
-
-            elif self.config.backend == CacheBackend.DISK:
-                keys_to_delete = [k for k in self._cache.iterkeys() if pattern in k]
-                for key in keys_to_delete:
-                    del self._cache[key]
-                    count += 1
+            if self.config.backend == CacheBackend.REDIS and not any(
+                c in pattern for c in "*?["
+            ):
+                # An exact key needs no scan at all
+                count = self._delete_keys([pattern])
+            else:
+                count = sum(
+                    self._delete_keys(keys)
+                    for _, keys in self._scan_batches(pattern, 1000)
+                )
 
             logger.info(
                 f"Invalidated {count} cache entries matching pattern: {pattern}"
@@ -551,6 +924,157 @@ class LLMCache:
             logger.error(f"Failed to invalidate cache entries: {e}")
             return 0
 
+    def start_invalidation(
+        self,
+        pattern: str,
+        batch_size: int = 1000,
+        pause_seconds: float = 0.0,
+        on_progress: Optional[Callable[[InvalidationProgress], None]] = None,
+    ) -> InvalidationJob:
+        """
+        Invalidate entries matching pattern on a background thread.
+
+        Args:
+            pattern: Pattern to match (same semantics as invalidate())
+            batch_size: Keys requested per SCAN and deleted per UNLINK
+            pause_seconds: Sleep between batches to further limit load
+            on_progress: Called from the worker thread after every batch
+
+        Returns:
+            The running InvalidationJob
+        """
+        return InvalidationJob(
+            self, pattern, batch_size, pause_seconds, on_progress
+        ).start()
+
+    def invalidate_tag(self, tag: str, batch_size: int = 1000) -> int:
+        """
+        Invalidate every entry cached with the given tag.
+
+        Args:
+            tag: Tag passed to set()
+            batch_size: Members read and deleted per round trip
+
+        Returns:
+            Number of entries invalidated
+        """
+        return self._invalidate_index(f"tag:{tag}", batch_size)
+
+    def invalidate_model(self, model_name: str, batch_size: int = 1000) -> int:
+        """
+        Invalidate every entry cached for the given model.
+
+        Args:
+            model_name: Model name passed to set()
+            batch_size: Members read and deleted per round trip
+
+        Returns:
+            Number of entries invalidated
+        """
+        return self._invalidate_index(f"model:{model_name}", batch_size)
+
+    def get_keys_by_tag(self, tag: str) -> List[str]:
+        """
+        Get cache keys indexed under a tag.
+
+        Members may include entries that have since expired.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            List of cache keys
+        """
+        try:
+            if self.config.backend == CacheBackend.REDIS:
+                return [
+                    k.decode("utf-8")
+                    for k in self._cache.sscan_iter(INDEX_KEY_PREFIX + f"tag:{tag}")
+                ]
+            self._load_local_index()
+            return list(self._index.get(f"tag:{tag}", ()))
+
+        except Exception as e:
+            logger.error(f"Failed to get keys by tag: {e}")
+            return []
+
+    def _invalidate_index(self, name: str, batch_size: int) -> int:
+        """Delete the members of one secondary index and the index itself."""
+        try:
+            count = 0
+            if self.config.backend == CacheBackend.REDIS:
+                # SPOP drains the set a batch at a time, so each round trip is
+                # bounded and entries added meanwhile stay indexed until popped.
+                index_key = INDEX_KEY_PREFIX + name
+                while True:
+                    members = self._cache.spop(index_key, batch_size)
+                    if not members:
+                        break
+                    count += self._delete_keys(members)
+            else:
+                self._load_local_index()
+                count = self._delete_keys(list(self._index.pop(name, ())))
+
+            logger.info(f"Invalidated {count} cache entries indexed by {name}")
+            return count
+
+        except Exception as e:
+            logger.error(f"Failed to invalidate index {name}: {e}")
+            return 0
+
+    def _scan_batches(
+        self, pattern: str, batch_size: int
+    ) -> Iterator[Tuple[int, List[Any]]]:
+        """
+        Enumerate keys matching pattern one batch at a time.
+
+        Yields:
+            Tuples of (keys examined, matching keys) per batch; for Redis the
+            examined count is the SCAN COUNT hint
+        """
+        if self.config.backend == CacheBackend.REDIS:
+            prefix = INDEX_KEY_PREFIX.encode("utf-8")
+            cursor = 0
+            while True:
+                cursor, keys = self._cache.scan(cursor, match=pattern, count=batch_size)
+                yield batch_size, [k for k in keys if not k.startswith(prefix)]
+                if cursor == 0:
+                    break
+
+        elif self.config.backend == CacheBackend.MEMORY:
+            snapshot = list(self._cache.keys())
+            for i in range(0, len(snapshot), batch_size):
+                chunk = snapshot[i : i + batch_size]
+                yield len(chunk), [k for k in chunk if k.startswith(pattern)]
+
+        elif self.config.backend == CacheBackend.DISK:
+            chunk = []
+            for key in self._cache.iterkeys():
+                chunk.append(key)
+                if len(chunk) >= batch_size:
+                    yield len(chunk), [k for k in chunk if pattern in k]
+                    chunk = []
+            if chunk:
+                yield len(chunk), [k for k in chunk if pattern in k]
+
+    def _delete_keys(self, keys: List[Any]) -> int:
+        """Delete exact keys, returning how many existed."""
+        if not keys:
+            return 0
+        if self.config.backend == CacheBackend.REDIS:
+            return self._cache.unlink(*keys)
+        if self.config.backend == CacheBackend.MEMORY:
+            return sum(self._cache.pop(key, None) is not None for key in keys)
+        if self.config.backend == CacheBackend.DISK:
+            return sum(bool(self._cache.delete(key)) for key in keys)
+        return 0
+
+    def _key_count(self) -> int:
+        """Number of keys currently in the backend."""
+        if self.config.backend == CacheBackend.REDIS:
+            return self._cache.dbsize()
+        return len(self._cache)
+
     def clear(self) -> bool:
         """
         Clear all cache entries.
@@ -566,6 +1090,8 @@ class LLMCache:
             elif self.config.backend == CacheBackend.DISK:
                 self._cache.clear()
 
+            self._index.clear()
+            self._index_additions = 0
             self._stats_hits = 0
             self._stats_misses = 0
             logger.info("Cache cleared successfully")
@@ -654,12 +1180,8 @@ class LLMCache:
             keys: List[str] = []
 
             if self.config.backend == CacheBackend.REDIS:
-                cursor = 0
-                while True:
-                    cursor, batch = self._cache.scan(cursor, match=pattern, count=100)
+                for _, batch in self._scan_batches(pattern, 1000):
                     keys.extend([k.decode("utf-8") for k in batch])
-                    if cursor == 0:
-                        break
 
             elif self.config.backend == CacheBackend.MEMORY:
                 keys = list(self._cache.keys())
@@ -711,6 +1233,71 @@ class LLMCache:
             logger.error(f"Failed to get entry by key: {e}")
             return None
 
+    def get_entries_by_keys(
+        self, cache_keys: List[str]
+    ) -> Dict[str, CachedResponse]:
+        """
+        Get many cache entries by exact key in one backend round-trip.
+
+        Args:
+            cache_keys: Exact cache keys
+
+        Returns:
+            Mapping of found, unexpired keys to their CachedResponse
+        """
+        entries: Dict[str, CachedResponse] = {}
+        if not cache_keys:
+            return entries
+
+        try:
+            if self.config.backend == CacheBackend.REDIS:
+                for cache_key, data in zip(cache_keys, self._cache.mget(cache_keys)):
+                    if data is not None:
+                        entries[cache_key] = CachedResponse(
+                            **json.loads(data.decode("utf-8"))
+                        )
+
+            elif self.config.backend == CacheBackend.MEMORY:
+                now = time.time()
+                for cache_key in cache_keys:
+                    value = self._cache.get(cache_key)
+                    if value is None:
+                        continue
+                    if self.config.eviction_policy == EvictionPolicy.TTL:
+                        cached_response, expires_at = value
+                        if now > expires_at:
+                            continue
+                        value = cached_response
+                    entries[cache_key] = value
+
+            elif self.config.backend == CacheBackend.DISK:
+                for cache_key in cache_keys:
+                    cached_response = self._cache.get(cache_key)
+                    if cached_response is not None:
+                        entries[cache_key] = cached_response
+
+            return entries
+
+        except Exception as e:
+            logger.error(f"Failed to get entries by keys: {e}")
+            return entries
+
+    def delete_entries_by_keys(self, cache_keys: List[str]) -> int:
+        """
+        Delete many cache entries by exact key without scanning the keyspace.
+
+        Args:
+            cache_keys: Exact cache keys
+
+        Returns:
+            Number of entries deleted
+        """
+        try:
+            return self._delete_keys(list(cache_keys))
+        except Exception as e:
+            logger.error(f"Failed to delete entries by keys: {e}")
+            return 0
+
     def update_ttl(self, cache_key: str, new_ttl: int) -> bool:
         """
         Update TTL for a cached entry.
@@ -8,17 +8,40 @@ Author: devCrew_s1
 License: MIT
 """
 
+import base64
 import hashlib
+import heapq
 import logging
+import math
+import sys
 import time
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import uuid4
 
 import msgpack
-from pydantic import BaseModel, Field, field_validator
+import numpy as np
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+try:
+    from .llm_cache import make_cache_key
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from llm_cache import make_cache_key  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+# ToT trees are stored as a manifest entry plus, per written segment, one
+# skeleton entry (ids, parents, depths, scores, flags) and payload chunks
+# holding the thought and metadata columns of TOT_CHUNK_ROWS rows. Rows are
+# written in depth order, so shallow levels live in the first chunks.
+TOT_FORMAT = "tot-node-table"
+TOT_FORMAT_VERSION = 1
+TOT_CHUNK_ROWS = 256
+_FLAG_TERMINAL = 1
+_FLAG_VISITED = 2
+_BLOB_PREFIX = "b64:"
+
 
 class CoTStep(BaseModel):
     """Chain-of-Thought reasoning step."""
@@ -155,6 +178,101 @@ class ReasoningResult(BaseModel):
         return 0
 
 
+_TOT_NODES = TypeAdapter(Dict[str, ToTNode])
+
+
+class _ToTSkeleton:
+    """Structure of a stored ToT tree without thoughts or metadata."""
+
+    def __init__(self, segments: List[Dict[str, Any]]):
+        """
+        Merge decoded skeleton segments into flat row arrays.
+
+        Children are kept as CSR arrays (rows grouped by parent plus offsets)
+        rather than one list per row, so large trees load without allocating
+        a Python object per node.
+
+        Args:
+            segments: Decoded skeleton dictionaries in segment order
+        """
+        self.ids: List[str] = []
+        self.parents: List[Optional[str]] = []
+        self.depths: List[int] = []
+        self.scores: List[float] = []
+        self.flags: List[int] = []
+        self.timestamps: List[float] = []
+        self.segment_starts: List[int] = []
+        for segment in segments:
+            self.segment_starts.append(len(self.ids))
+            self.ids.extend(segment["ids"])
+            self.parents.extend(segment["parents"])
+            self.depths.extend(segment["depths"])
+            self.scores.extend(segment["scores"])
+            self.flags.extend(segment["flags"])
+            self.timestamps.extend(segment["timestamps"])
+        self.index = {node_id: i for i, node_id in enumerate(self.ids)}
+
+        parent_rows = np.fromiter(
+            (self.index.get(p, -1) if p is not None else -1 for p in self.parents),
+            dtype=np.int64,
+            count=len(self.ids),
+        )
+        counts = np.bincount(parent_rows[parent_rows >= 0], minlength=len(self.ids))
+        order = np.argsort(parent_rows, kind="stable")
+        self._child_rows = order[len(order) - int(counts.sum()) :]
+        self._child_starts = np.concatenate(([0], np.cumsum(counts)))
+
+    def select(
+        self,
+        root: int,
+        max_depth: Optional[int] = None,
+        top_k_paths: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Choose the rows of a (bounded) subtree or of its best paths.
+
+        Args:
+            root: Row of the subtree root
+            max_depth: Levels below ``root`` to include, None for all
+            top_k_paths: Keep only the paths to the k best-scored leaves
+
+        Returns:
+            Selected rows in storage order
+        """
+        levels = []
+        leaves = []
+        frontier = np.array([root], dtype=np.int64)
+        while frontier.size:
+            levels.append(frontier)
+            starts = self._child_starts[frontier]
+            counts = self._child_starts[frontier + 1] - starts
+            if max_depth is not None and len(levels) > max_depth:
+                leaves.append(frontier)
+                break
+            leaves.append(frontier[counts == 0])
+            # Gather every child range of the level in one vectorised step.
+            total = int(counts.sum())
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            frontier = self._child_rows[offsets + np.arange(total)]
+
+        if top_k_paths is None:
+            return np.sort(np.concatenate(levels)).tolist()
+
+        best = heapq.nlargest(
+            top_k_paths,
+            np.concatenate(leaves).tolist(),
+            key=lambda row: (self.scores[row], -row),
+        )
+        selected: Set[int] = set()
+        for row in best:
+            while row not in selected:
+                selected.add(row)
+                if row == root:
+                    break
+                row = self.index[self.parents[row]]  # type: ignore[index]
+        return sorted(selected)
+
+
 class ReasoningCache:
     """
     Specialized cache for Chain-of-Thought and Tree-of-Thoughts reasoning.
@@ -423,82 +541,87 @@ class ReasoningCache:
 
         try:
             cache_key = self._generate_cache_key(problem, ReasoningType.TOT)
-
-            reasoning_result = ReasoningResult(
-                problem=problem,
-                reasoning_type=ReasoningType.TOT,
-                tree_root=tree_root,
-                tree_nodes=tree_nodes,
-                solution=solution,
-                cache_key=cache_key,
-                total_steps=len(tree_nodes),
-                execution_time_ms=execution_time_ms,
-                metadata=metadata or {},
+            previous = self._load_tot_manifest(cache_key)
+
+            ordered, parents = self._tree_order(tree_root.node_id, tree_nodes)
+            # A fresh generation keeps readers of the previous manifest on
+            # consistent segments until the new manifest replaces it.
+            generation = uuid4().hex[:12]
+            segment = self._write_tot_segment(
+                cache_key, generation, 0, ordered, parents, ttl
             )
+            manifest = {
+                "format": TOT_FORMAT,
+                "version": TOT_FORMAT_VERSION,
+                "generation": generation,
+                "problem": problem,
+                "solution": solution,
+                "root_id": tree_root.node_id,
+                "metadata": metadata or {},
+                "execution_time_ms": execution_time_ms,
+                "timestamp": time.time(),
+                "total_nodes": len(ordered),
+                "max_depth": segment["max_depth"],
+                "segments": [segment],
+            }
+            self._write_tot_manifest(cache_key, manifest, problem, ttl)
 
-            serialized_data = self._serialize_reasoning(reasoning_result)
+            if previous is not None and previous[0].get("format") == TOT_FORMAT:
+                self._drop_entries(self._tot_segment_prompts(cache_key, previous[0]))
 
-            success = self._cache.set(
-                prompt=cache_key,
-                response=serialized_data.hex(),
-                ttl=ttl,
-                metadata={
-                    "reasoning_type": ReasoningType.TOT,
-                    "total_nodes": len(tree_nodes),
-                    "tree_depth": self._calculate_tree_depth(tree_root, tree_nodes),
-                    "problem_hash": self._generate_problem_hash(problem),
-                },
+            logger.info(
+                f"Cached ToT tree with {len(ordered)} nodes "
+                f"for problem hash {cache_key[:16]}..."
             )
-
-            if success:
-                logger.info(
-                    f"Cached ToT tree with {len(tree_nodes)} nodes "
-                    f"for problem hash {cache_key[:16]}..."
-                )
-                return cache_key
-            else:
-                raise ValueError("Failed to cache ToT tree")
+            return cache_key
 
         except Exception as e:
             logger.error(f"Failed to cache ToT tree: {e}")
             raise
 
     def get_tot_tree(
-        self, problem: str, include_metadata: bool = True
+        self,
+        problem: str,
+        include_metadata: bool = True,
+        max_depth: Optional[int] = None,
+        subtree_root_id: Optional[str] = None,
+        top_k_paths: Optional[int] = None,
     ) -> Optional[ReasoningResult]:
         """
-        Retrieve cached Tree-of-Thoughts reasoning tree.
+        Retrieve cached Tree-of-Thoughts reasoning tree, or part of it.
+
+        Only the tree skeleton and the payload chunks holding the selected
+        nodes are fetched, so bounded-depth and best-path reads of a large
+        tree cost a fraction of a full load. Children lists in the result
+        only reference returned nodes.
 
         Args:
             problem: Problem statement
             include_metadata: Whether to include metadata in result
+            max_depth: Levels below the subtree root to return, None for all
+            subtree_root_id: Node to root the returned tree at (default: root)
+            top_k_paths: Return only the paths to the k best-scored leaves
 
         Returns:
             ReasoningResult with ToT tree if found, None otherwise
         """
         try:
             cache_key = self._generate_cache_key(problem, ReasoningType.TOT)
-            cached_response = self._cache.get(cache_key)
+            loaded = self._load_tot_manifest(cache_key)
 
-            if cached_response is None:
+            if loaded is None:
                 logger.debug("No cached ToT tree found for problem")
                 return None
 
-            serialized_data = bytes.fromhex(cached_response.value)
-            reasoning_data = self._deserialize_reasoning(serialized_data)
-
-            reasoning_result = ReasoningResult(**reasoning_data)
-
-            if reasoning_result.tree_nodes:
-                reasoning_result.tree_nodes = {
-                    k: ToTNode(**v) if isinstance(v, dict) else v
-                    for k, v in reasoning_result.tree_nodes.items()
-                }
-
-            if reasoning_result.tree_root and isinstance(
-                reasoning_result.tree_root, dict
-            ):
-                reasoning_result.tree_root = ToTNode(**reasoning_result.tree_root)
+            data = loaded[0]
+            if data.get("format") == TOT_FORMAT:
+                reasoning_result = self._read_tot_tree(
+                    cache_key, data, max_depth, subtree_root_id, top_k_paths
+                )
+                if reasoning_result is None:
+                    return None
+            else:
+                reasoning_result = self._read_legacy_tot_tree(data)
 
             if not include_metadata:
                 reasoning_result.metadata = {}
@@ -513,6 +636,366 @@ class ReasoningCache:
             logger.error(f"Failed to retrieve ToT tree: {e}")
             return None
 
+    def cache_transpositions(
+        self,
+        problem: str,
+        table: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> str:
+        """
+        Cache a Tree-of-Thoughts transposition table for a problem.
+
+        The table maps normalized thoughts to evaluation scores ("scores")
+        and to the child thoughts generated from them ("expansions"), so a
+        later exploration of the same problem can skip those LLM calls.
+
+        Args:
+            problem: Problem statement
+            table: Transposition table as produced by
+                TranspositionTable.to_dict()
+            ttl: Time-to-live in seconds
+
+        Returns:
+            Cache key for the stored table
+        """
+        cache_key = self._generate_cache_key(
+            problem, ReasoningType.TOT, suffix="transpositions"
+        )
+        self._set_blob(
+            cache_key,
+            {
+                "scores": dict(table.get("scores", {})),
+                "expansions": dict(table.get("expansions", {})),
+            },
+            ttl,
+            metadata={
+                "reasoning_type": ReasoningType.TOT,
+                "problem_hash": self._generate_problem_hash(problem),
+            },
+        )
+        logger.debug(
+            f"Cached {len(table.get('scores', {}))} thought scores "
+            f"for problem hash {cache_key[:16]}..."
+        )
+        return cache_key
+
+    def get_transpositions(self, problem: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a cached Tree-of-Thoughts transposition table.
+
+        Args:
+            problem: Problem statement
+
+        Returns:
+            Dictionary with "scores" and "expansions" if found, None otherwise
+        """
+        try:
+            cache_key = self._generate_cache_key(
+                problem, ReasoningType.TOT, suffix="transpositions"
+            )
+            blobs = self._fetch_blobs([cache_key])
+            return blobs[0] if blobs is not None else None
+        except Exception as e:
+            logger.error(f"Failed to retrieve transposition table: {e}")
+            return None
+
+    def _read_legacy_tot_tree(self, reasoning_data: Dict[str, Any]) -> ReasoningResult:
+        """Rebuild a tree cached as one serialized ReasoningResult."""
+        reasoning_result = ReasoningResult(**reasoning_data)
+
+        if reasoning_result.tree_nodes:
+            reasoning_result.tree_nodes = {
+                k: ToTNode(**v) if isinstance(v, dict) else v
+                for k, v in reasoning_result.tree_nodes.items()
+            }
+
+        if reasoning_result.tree_root and isinstance(reasoning_result.tree_root, dict):
+            reasoning_result.tree_root = ToTNode(**reasoning_result.tree_root)
+
+        return reasoning_result
+
+    def _read_tot_tree(
+        self,
+        cache_key: str,
+        manifest: Dict[str, Any],
+        max_depth: Optional[int],
+        subtree_root_id: Optional[str],
+        top_k_paths: Optional[int],
+    ) -> Optional[ReasoningResult]:
+        """Assemble the selected part of a node-table tree."""
+        if manifest.get("version", 0) > TOT_FORMAT_VERSION:
+            logger.error(
+                f"ToT tree format version {manifest.get('version')} is newer "
+                f"than supported version {TOT_FORMAT_VERSION}"
+            )
+            return None
+
+        skeleton = self._load_tot_skeleton(cache_key, manifest)
+        if skeleton is None:
+            logger.warning("ToT tree segments missing or expired")
+            return None
+
+        root_id = subtree_root_id or manifest["root_id"]
+        root_row = skeleton.index.get(root_id)
+        if root_row is None:
+            logger.warning(f"Node {root_id} not found in cached ToT tree")
+            return None
+
+        rows = skeleton.select(root_row, max_depth, top_k_paths)
+        payload = self._load_tot_payload(cache_key, manifest, skeleton, rows)
+        if payload is None:
+            logger.warning("ToT tree payload chunks missing or expired")
+            return None
+
+        rows_by_id: Dict[str, Dict[str, Any]] = {}
+        for row, thought, node_metadata in zip(rows, *payload):
+            flags = skeleton.flags[row]
+            rows_by_id[skeleton.ids[row]] = {
+                "node_id": skeleton.ids[row],
+                "thought": thought,
+                "evaluation_score": skeleton.scores[row],
+                "children": [],
+                "parent_id": skeleton.parents[row],
+                "depth": skeleton.depths[row],
+                "metadata": node_metadata,
+                "is_terminal": bool(flags & _FLAG_TERMINAL),
+                "visited": bool(flags & _FLAG_VISITED),
+                "timestamp": skeleton.timestamps[row],
+            }
+        for row in rows:
+            parent = rows_by_id.get(skeleton.parents[row] or "")
+            if parent is not None and row != root_row:
+                parent["children"].append(skeleton.ids[row])
+        # One validation call for the whole table is cheaper than per node.
+        nodes = _TOT_NODES.validate_python(rows_by_id)
+
+        return ReasoningResult(
+            problem=manifest["problem"],
+            reasoning_type=ReasoningType.TOT,
+            tree_root=nodes[root_id],
+            tree_nodes=nodes,
+            solution=manifest["solution"],
+            cache_key=cache_key,
+            total_steps=manifest["total_nodes"],
+            execution_time_ms=manifest["execution_time_ms"],
+            metadata=manifest["metadata"],
+            timestamp=manifest["timestamp"],
+        )
+
+    def _tree_order(
+        self, root_id: str, tree_nodes: Dict[str, ToTNode]
+    ) -> Tuple[List[ToTNode], List[Optional[str]]]:
+        """
+        Order nodes breadth-first from the root.
+
+        Returns:
+            Tuple of (nodes, parent IDs); parents follow the children lists,
+            and nodes unreachable from the root keep their own parent_id
+        """
+        ordered: List[ToTNode] = []
+        parents: List[Optional[str]] = []
+        seen: Set[str] = {root_id}
+        frontier: List[Tuple[str, Optional[str]]] = [(root_id, None)]
+        while frontier:
+            next_frontier: List[Tuple[str, Optional[str]]] = []
+            for node_id, parent_id in frontier:
+                node = tree_nodes[node_id]
+                ordered.append(node)
+                parents.append(parent_id)
+                for child_id in node.children:
+                    if child_id in tree_nodes and child_id not in seen:
+                        seen.add(child_id)
+                        next_frontier.append((child_id, node_id))
+            frontier = next_frontier
+
+        for node_id, node in tree_nodes.items():
+            if node_id not in seen:
+                ordered.append(node)
+                parents.append(node.parent_id)
+        return ordered, parents
+
+    def _encode_blob(self, data: Any) -> str:
+        """Pack data as msgpack in a base64 string for the LLM cache."""
+        packed = msgpack.packb(data, use_bin_type=True)
+        return _BLOB_PREFIX + base64.b64encode(packed).decode("ascii")
+
+    def _decode_blob(self, value: str) -> Any:
+        """Unpack a cached string written by _encode_blob or as legacy hex."""
+        if value.startswith(_BLOB_PREFIX):
+            return self._deserialize_reasoning(
+                base64.b64decode(value[len(_BLOB_PREFIX) :])
+            )
+        return self._deserialize_reasoning(bytes.fromhex(value))
+
+    def _set_blob(
+        self,
+        prompt: str,
+        data: Any,
+        ttl: Optional[int],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store one internal entry, raising if the backend refuses it."""
+        if not self._cache.set(
+            prompt=prompt,
+            response=self._encode_blob(data),
+            ttl=ttl,
+            metadata=metadata,
+        ):
+            raise ValueError(f"Failed to cache {prompt}")
+
+    def _fetch_blobs(self, prompts: List[str]) -> Optional[List[Any]]:
+        """Fetch and decode several internal entries; None if any is missing."""
+        keys = [make_cache_key(prompt) for prompt in prompts]
+        entries = self._cache.get_entries_by_keys(keys)
+        if any(key not in entries for key in keys):
+            return None
+        return [self._decode_blob(entries[key].value) for key in keys]
+
+    def _drop_entries(self, prompts: Iterable[str]) -> int:
+        """Delete internal entries by the prompt they were stored under."""
+        return self._cache.delete_entries_by_keys(
+            [make_cache_key(prompt) for prompt in prompts]
+        )
+
+    def _load_tot_manifest(
+        self, cache_key: str
+    ) -> Optional[Tuple[Dict[str, Any], Any]]:
+        """Load a tree's manifest (or legacy result) and its cache entry."""
+        cached_response = self._cache.get(cache_key)
+        if cached_response is None:
+            return None
+        return self._decode_blob(cached_response.value), cached_response
+
+    def _write_tot_manifest(
+        self,
+        cache_key: str,
+        manifest: Dict[str, Any],
+        problem: str,
+        ttl: Optional[int],
+    ) -> None:
+        """Store the manifest that makes written segments visible."""
+        self._set_blob(
+            cache_key,
+            manifest,
+            ttl,
+            metadata={
+                "reasoning_type": ReasoningType.TOT,
+                "total_nodes": manifest["total_nodes"],
+                "tree_depth": manifest["max_depth"],
+                "problem_hash": self._generate_problem_hash(problem),
+            },
+        )
+
+    def _tot_segment_prompts(
+        self, cache_key: str, manifest: Dict[str, Any]
+    ) -> List[str]:
+        """Internal entry names of every skeleton and payload chunk."""
+        prompts = []
+        for segment_no, segment in enumerate(manifest["segments"]):
+            prefix = f"{cache_key}:{manifest['generation']}:s{segment_no}"
+            prompts.append(prefix)
+            prompts.extend(f"{prefix}:p{chunk}" for chunk in range(segment["chunks"]))
+        return prompts
+
+    def _write_tot_segment(
+        self,
+        cache_key: str,
+        generation: str,
+        segment_no: int,
+        nodes: List[ToTNode],
+        parents: List[Optional[str]],
+        ttl: Optional[int],
+    ) -> Dict[str, Any]:
+        """
+        Write one segment: a skeleton entry plus its payload chunks.
+
+        Returns:
+            Segment descriptor for the manifest
+        """
+        prefix = f"{cache_key}:{generation}:s{segment_no}"
+        skeleton = {
+            "ids": [node.node_id for node in nodes],
+            "parents": parents,
+            "depths": [node.depth for node in nodes],
+            "scores": [node.evaluation_score for node in nodes],
+            "flags": [
+                (_FLAG_TERMINAL if node.is_terminal else 0)
+                | (_FLAG_VISITED if node.visited else 0)
+                for node in nodes
+            ],
+            "timestamps": [node.timestamp for node in nodes],
+        }
+        chunks = 0
+        for start in range(0, len(nodes), TOT_CHUNK_ROWS):
+            block = nodes[start : start + TOT_CHUNK_ROWS]
+            columns = {
+                "thoughts": [node.thought for node in block],
+                "metadata": [node.metadata for node in block],
+            }
+            self._set_blob(f"{prefix}:p{chunks}", columns, ttl)
+            chunks += 1
+        self._set_blob(prefix, skeleton, ttl)
+        return {
+            "rows": len(nodes),
+            "chunks": chunks,
+            "max_depth": max(skeleton["depths"], default=0),
+        }
+
+    def _load_tot_skeleton(
+        self, cache_key: str, manifest: Dict[str, Any]
+    ) -> Optional[_ToTSkeleton]:
+        """Fetch every skeleton segment in one round trip."""
+        segments = self._fetch_blobs(
+            [
+                f"{cache_key}:{manifest['generation']}:s{segment_no}"
+                for segment_no in range(len(manifest["segments"]))
+            ]
+        )
+        return _ToTSkeleton(segments) if segments is not None else None
+
+    def _load_tot_payload(
+        self,
+        cache_key: str,
+        manifest: Dict[str, Any],
+        skeleton: _ToTSkeleton,
+        rows: List[int],
+    ) -> Optional[Tuple[List[str], List[Dict[str, Any]]]]:
+        """
+        Fetch only the payload chunks holding the given rows.
+
+        Returns:
+            Tuple of (thoughts, metadata) aligned with ``rows``, or None if
+            a chunk is missing
+        """
+        starts = np.asarray(skeleton.segment_starts, dtype=np.int64)
+        row_array = np.asarray(rows, dtype=np.int64)
+        segment_nos = np.searchsorted(starts, row_array, side="right") - 1
+        local_rows = row_array - starts[segment_nos]
+        locations = list(
+            zip(
+                segment_nos.tolist(),
+                (local_rows // TOT_CHUNK_ROWS).tolist(),
+                (local_rows % TOT_CHUNK_ROWS).tolist(),
+            )
+        )
+        wanted = sorted({(segment_no, chunk) for segment_no, chunk, _ in locations})
+        chunks = self._fetch_blobs(
+            [
+                f"{cache_key}:{manifest['generation']}:s{segment_no}:p{chunk}"
+                for segment_no, chunk in wanted
+            ]
+        )
+        if chunks is None:
+            return None
+        by_chunk = dict(zip(wanted, chunks))
+        thoughts: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        for segment_no, chunk, offset in locations:
+            columns = by_chunk[(segment_no, chunk)]
+            thoughts.append(columns["thoughts"][offset])
+            metadata.append(columns["metadata"][offset])
+        return thoughts, metadata
+
     def _calculate_tree_depth(self, root: ToTNode, nodes: Dict[str, ToTNode]) -> int:
         """
         Calculate the maximum depth of the ToT tree.
@@ -596,17 +1079,22 @@ class ReasoningCache:
         """
         count = 0
 
-        if reasoning_type == ReasoningType.COT:
-            cache_key = self._generate_cache_key(problem, ReasoningType.COT)
-            count += self._cache.invalidate(cache_key)
-        elif reasoning_type == ReasoningType.TOT:
-            cache_key = self._generate_cache_key(problem, ReasoningType.TOT)
-            count += self._cache.invalidate(cache_key)
-        else:
+        if reasoning_type in (None, ReasoningType.COT):
             cot_key = self._generate_cache_key(problem, ReasoningType.COT)
+            count += self._drop_entries([cot_key])
+        if reasoning_type in (None, ReasoningType.TOT):
             tot_key = self._generate_cache_key(problem, ReasoningType.TOT)
-            count += self._cache.invalidate(cot_key)
-            count += self._cache.invalidate(tot_key)
+            loaded = self._load_tot_manifest(tot_key)
+            if loaded is not None and loaded[0].get("format") == TOT_FORMAT:
+                self._drop_entries(self._tot_segment_prompts(tot_key, loaded[0]))
+            count += self._drop_entries([tot_key])
+            self._drop_entries(
+                [
+                    self._generate_cache_key(
+                        problem, ReasoningType.TOT, suffix="transpositions"
+                    )
+                ]
+            )
 
         logger.info(f"Invalidated {count} reasoning cache entries for problem")
         return count
@@ -724,6 +1212,14 @@ class ReasoningCache:
             True if successful, False otherwise
         """
         try:
+            cache_key = self._generate_cache_key(problem, ReasoningType.TOT)
+            loaded = self._load_tot_manifest(cache_key)
+            if loaded is not None and loaded[0].get("format") == TOT_FORMAT:
+                return self._append_tot_nodes(
+                    cache_key, loaded[0], loaded[1], parent_node_id, new_nodes, ttl
+                )
+
+            # Legacy single-entry trees are rewritten once in the new format.
             existing_result = self.get_tot_tree(problem)
             if (
                 existing_result is None
@@ -767,6 +1263,62 @@ class ReasoningCache:
             logger.error(f"Failed to expand ToT tree: {e}")
             return False
 
+    def _append_tot_nodes(
+        self,
+        cache_key: str,
+        manifest: Dict[str, Any],
+        manifest_response: Any,
+        parent_node_id: str,
+        new_nodes: List[ToTNode],
+        ttl: Optional[int],
+    ) -> bool:
+        """Append new nodes as a segment and rewrite only the manifest."""
+        skeleton = self._load_tot_skeleton(cache_key, manifest)
+        if skeleton is None:
+            logger.warning("ToT tree segments missing or expired")
+            return False
+
+        parent_row = skeleton.index.get(parent_node_id)
+        if parent_row is None:
+            logger.error(f"Parent node {parent_node_id} not found in tree")
+            return False
+
+        duplicates = [n.node_id for n in new_nodes if n.node_id in skeleton.index]
+        if duplicates:
+            logger.error(f"Nodes already in tree: {duplicates}")
+            return False
+
+        for node in new_nodes:
+            node.parent_id = parent_node_id
+            node.depth = skeleton.depths[parent_row] + 1
+
+        if ttl is None:
+            # New segments must not outlive or predecease the manifest.
+            remaining = manifest_response.time_until_expiry()
+            ttl = max(1, math.ceil(remaining)) if remaining is not None else 0
+        else:
+            for prompt in self._tot_segment_prompts(cache_key, manifest):
+                self._cache.update_ttl(make_cache_key(prompt), ttl)
+
+        segment = self._write_tot_segment(
+            cache_key,
+            manifest["generation"],
+            len(manifest["segments"]),
+            new_nodes,
+            [parent_node_id] * len(new_nodes),
+            ttl,
+        )
+        manifest["segments"].append(segment)
+        manifest["total_nodes"] += len(new_nodes)
+        manifest["max_depth"] = max(manifest["max_depth"], segment["max_depth"])
+        self._write_tot_manifest(cache_key, manifest, manifest["problem"], ttl)
+
+        logger.info(
+            f"Expanded ToT tree with {len(new_nodes)} new nodes "
+            f"under parent {parent_node_id}"
+        )
+        return True
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get reasoning cache statistics.
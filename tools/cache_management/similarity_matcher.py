@@ -8,19 +8,57 @@ Author: devCrew_s1
 License: MIT
 """
 
+import atexit
+import hashlib
 import json
 import logging
+import os
 import pickle
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
+
+import msgpack
 import numpy as np
 from pydantic import BaseModel, Field, field_validator
 from sentence_transformers import SentenceTransformer
 
+try:
+    from .ann_index import ANNBackend, ANNIndexConfig, PartitionedANNIndex
+except ImportError:
+    from ann_index import ANNBackend, ANNIndexConfig, PartitionedANNIndex
+
 logger = logging.getLogger(__name__)
 
+# On-disk index layout written by export_index / persistence
+INDEX_FORMAT = "devcrew-similarity-index"
+INDEX_FORMAT_VERSION = 1
+INDEX_MANIFEST = "manifest.json"
+INDEX_EMBEDDINGS = "embeddings.npy"
+INDEX_SCALES = "scales.npy"
+INDEX_NORMS = "norms.npy"
+INDEX_ENTRIES = "entries.msgpack"
+# Size and mtime of each file when its checksums last verified, so every
+# process mapping an index does not hash it again
+INDEX_VERIFIED = "verified.json"
+
 
 class EmbeddingModel(str, Enum):
     """Supported embedding models."""
@@ -40,6 +78,14 @@ class SimilarityMetric(str, Enum):
     EUCLIDEAN = "euclidean"
 
 
+class EmbeddingPrecision(str, Enum):
+    """Storage precision for the in-memory embedding matrix."""
+
+    FLOAT32 = "float32"  # Full precision
+    FLOAT16 = "float16"  # Half the memory, ~3 significant digits
+    INT8 = "int8"  # Quarter the memory, per-row scale quantization
+
+
 class SimilarityConfig(BaseModel):
     """Configuration for similarity matching."""
 
@@ -66,9 +112,45 @@ class SimilarityConfig(BaseModel):
     persistence_path: str = Field(
         default="./cache_embeddings", description="Path for embedding persistence"
     )
+    persistence_interval: float = Field(
+        default=5.0,
+        description=(
+            "Minimum seconds between index writes; later changes are written "
+            "by the next change after the interval, flush() or close() "
+            "(0 writes on every change)"
+        ),
+    )
     device: Optional[str] = Field(
         default=None, description="Device for model (cpu/cuda/mps)"
     )
+    ann_backend: ANNBackend = Field(
+        default=ANNBackend.IVF, description="Nearest-neighbour index backend"
+    )
+    ann_nlist: int = Field(default=256, description="IVF clusters per partition")
+    ann_nprobe: int = Field(default=8, description="IVF clusters probed per query")
+    embedding_precision: EmbeddingPrecision = Field(
+        default=EmbeddingPrecision.FLOAT32,
+        description="Storage precision of the embedding matrix",
+    )
+    compaction_ratio: float = Field(
+        default=0.25,
+        description="Compact the embedding matrix once this fraction is deleted",
+    )
+    embedding_memo_size: int = Field(
+        default=4096,
+        description="Embeddings memoized by prompt content hash (0 disables)",
+    )
+    batch_window_ms: float = Field(
+        default=0.0,
+        description=(
+            "Extra time to wait for concurrent generate_embedding calls to "
+            "join a batch; calls arriving during an encode always coalesce"
+        ),
+    )
+    enable_batching: bool = Field(
+        default=True,
+        description="Coalesce concurrent generate_embedding calls into batches",
+    )
 
     @field_validator("threshold")
     @classmethod
@@ -124,7 +206,10 @@ class EmbeddingIndex(BaseModel):
 
     cache_key: str = Field(description="Cache key")
     prompt: str = Field(description="Original prompt")
-    embedding: List[float] = Field(description="Embedding vector")
+    embedding: List[float] = Field(
+        default_factory=list,
+        description="Embedding vector (empty when held only by the EmbeddingStore)",
+    )
     prompt_hash: str = Field(description="Hash of prompt")
     timestamp: float = Field(description="Index timestamp")
     metadata: Dict[str, Any] = Field(
@@ -136,6 +221,708 @@ class EmbeddingIndex(BaseModel):
         return np.array(self.embedding, dtype=np.float32)
 
 
+class EmbeddingStore:
+    """
+    Growable, preallocated embedding matrix with tombstone deletion.
+
+    Rows are appended into spare capacity (doubling when full), so inserts do
+    not re-stack the matrix. Deletions only clear a liveness flag; once the
+    deleted fraction exceeds ``compaction_ratio`` the live rows are packed
+    back together. Embeddings may be stored as float16 or per-row scaled int8
+    to trade a little accuracy for memory.
+    """
+
+    _CHUNK_ROWS = 65536
+
+    def __init__(
+        self,
+        precision: EmbeddingPrecision = EmbeddingPrecision.FLOAT32,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            precision: Storage dtype for embeddings
+            initial_capacity: Rows to preallocate once the dimension is known
+            compaction_ratio: Deleted fraction that triggers compaction
+        """
+        self.precision = precision
+        self.compaction_ratio = compaction_ratio
+        self._initial_capacity = initial_capacity
+        self._clear_arrays()
+
+    def _clear_arrays(self) -> None:
+        """Reset all backing arrays."""
+        self._vectors: Optional[np.ndarray] = None
+        self._scales = np.empty(0, dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._keys: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+
+    def _ensure_capacity(self, dim: int, extra: int) -> None:
+        """Allocate or grow the backing arrays for ``extra`` more rows."""
+        needed = self._size + extra
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(self._initial_capacity, capacity * 2, needed)
+        vectors = np.empty((new_capacity, dim), dtype=self.precision.value)
+        scales = np.ones(new_capacity, dtype=np.float32)
+        norms = np.zeros(new_capacity, dtype=np.float32)
+        alive = np.zeros(new_capacity, dtype=bool)
+        if self._vectors is not None:
+            vectors[: self._size] = self._vectors[: self._size]
+            scales[: self._size] = self._scales[: self._size]
+            norms[: self._size] = self._norms[: self._size]
+            alive[: self._size] = self._alive[: self._size]
+        self._vectors, self._scales, self._norms, self._alive = (
+            vectors,
+            scales,
+            norms,
+            alive,
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        keys: List[str],
+        vectors: np.ndarray,
+        scales: np.ndarray,
+        norms: np.ndarray,
+        precision: EmbeddingPrecision,
+        compaction_ratio: float = 0.25,
+    ) -> "EmbeddingStore":
+        """
+        Wrap existing arrays without copying the embedding matrix.
+
+        ``vectors`` may be a read-only ``np.memmap``; it is copied into private
+        memory only on the first write that needs it.
+        """
+        store = cls(precision=precision, compaction_ratio=compaction_ratio)
+        if not keys:
+            return store
+        store._vectors = vectors
+        store._scales = np.array(scales, dtype=np.float32)
+        store._norms = np.array(norms, dtype=np.float32)
+        store._alive = np.ones(len(keys), dtype=bool)
+        store._keys = list(keys)
+        store._rows = {key: row for row, key in enumerate(keys)}
+        store._size = len(keys)
+        return store
+
+    def export_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Get (keys, vectors, scales, norms) for live rows only."""
+        self.compact()
+        if self._vectors is None:
+            return [], np.empty((0, 0), self.precision.value), self._scales, self._norms
+        return (
+            list(self._keys),  # type: ignore[arg-type]
+            self._vectors[: self._size],
+            self._scales[: self._size],
+            self._norms[: self._size],
+        )
+
+    def _make_writable(self) -> None:
+        """Copy a read-only (memory-mapped) matrix into private memory."""
+        if self._vectors is not None and not self._vectors.flags.writeable:
+            self._vectors = np.array(self._vectors)
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert float vectors to the storage dtype plus per-row scales."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.precision == EmbeddingPrecision.INT8:
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+            return quantized, scales.astype(np.float32)
+        return vectors.astype(self.precision.value), np.ones(
+            len(vectors), dtype=np.float32
+        )
+
+    def add(self, key: str, embedding: np.ndarray) -> None:
+        """Insert or overwrite the embedding for ``key``."""
+        self.add_batch([key], np.asarray(embedding).reshape(1, -1))
+
+    def add_batch(self, keys: List[str], embeddings: np.ndarray) -> None:
+        """Append embeddings, overwriting rows for keys already present."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        encoded, scales = self._encode(embeddings)
+        norms = np.linalg.norm(embeddings, axis=1)
+
+        new_positions: List[int] = []
+        seen: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is not None:
+                self._make_writable()
+                self._vectors[row] = encoded[i]  # type: ignore[index]
+                self._scales[row] = scales[i]
+                self._norms[row] = norms[i]
+            elif key in seen:
+                new_positions[seen[key]] = i
+            else:
+                seen[key] = len(new_positions)
+                new_positions.append(i)
+
+        if not new_positions:
+            return
+
+        self._ensure_capacity(embeddings.shape[1], len(new_positions))
+        start, end = self._size, self._size + len(new_positions)
+        self._vectors[start:end] = encoded[new_positions]  # type: ignore[index]
+        self._scales[start:end] = scales[new_positions]
+        self._norms[start:end] = norms[new_positions]
+        self._alive[start:end] = True
+        for offset, i in enumerate(new_positions):
+            self._keys.append(keys[i])
+            self._rows[keys[i]] = start + offset
+        self._size = end
+
+    def remove(self, key: str) -> bool:
+        """Tombstone ``key``; compacts when enough rows are dead."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+
+        self._alive[row] = False
+        self._keys[row] = None
+        if self._size and (self._size - len(self._rows)) / self._size > (
+            self.compaction_ratio
+        ):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Pack live rows together, dropping tombstones."""
+        if self._vectors is None or len(self._rows) == self._size:
+            return
+
+        self._make_writable()
+        live = np.flatnonzero(self._alive[: self._size])
+        count = len(live)
+        self._vectors[:count] = self._vectors[live]
+        self._scales[:count] = self._scales[live]
+        self._norms[:count] = self._norms[live]
+        self._alive[:count] = True
+        self._alive[count : self._size] = False
+        self._keys = [self._keys[i] for i in live]
+        self._rows = {key: row for row, key in enumerate(self._keys)}  # type: ignore
+        self._size = count
+
+    def clear(self) -> None:
+        """Remove every embedding and release the matrix."""
+        self._clear_arrays()
+
+    def dot(self, query: np.ndarray) -> np.ndarray:
+        """
+        Inner products between ``query`` and every populated row.
+
+        Dead rows are included; mask them with :attr:`alive`.
+        """
+        if self._vectors is None or self._size == 0:
+            return np.empty(0, dtype=np.float32)
+
+        query = np.asarray(query, dtype=np.float32)
+        if self.precision == EmbeddingPrecision.FLOAT32:
+            return self._vectors[: self._size] @ query
+
+        # Upcast in bounded chunks so quantized storage stays small
+        out = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, self._CHUNK_ROWS):
+            end = min(start + self._CHUNK_ROWS, self._size)
+            out[start:end] = self._vectors[start:end].astype(np.float32) @ query
+        return out * self._scales[: self._size]
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get the (dequantized) embedding for ``key``."""
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        return self._vectors[row].astype(np.float32) * self._scales[row]  # type: ignore
+
+    @property
+    def alive(self) -> np.ndarray:
+        """Liveness mask over populated rows."""
+        return self._alive[: self._size]
+
+    @property
+    def norms(self) -> np.ndarray:
+        """Original L2 norms of populated rows."""
+        return self._norms[: self._size]
+
+    @property
+    def keys(self) -> List[Optional[str]]:
+        """Keys by row (None for tombstones)."""
+        return self._keys
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension, 0 if nothing was stored yet."""
+        return 0 if self._vectors is None else self._vectors.shape[1]
+
+    @property
+    def tombstones(self) -> int:
+        """Number of deleted rows awaiting compaction."""
+        return self._size - len(self._rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the preallocated matrix."""
+        return 0 if self._vectors is None else int(self._vectors.nbytes)
+
+    def __len__(self) -> int:
+        """Get the number of live embeddings."""
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        """Check if a key has a live embedding."""
+        return key in self._rows
+
+
+class EmbeddingMemo:
+    """
+    Bounded LRU memo of embeddings keyed by a SHA256 of the input text.
+
+    Returned arrays are read-only so callers cannot corrupt cached vectors.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initialize the memo.
+
+        Args:
+            max_size: Maximum memoized embeddings (0 disables memoization)
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_key(text: str) -> str:
+        """Hash text content into a memo key."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Get a memoized embedding, refreshing its recency."""
+        if self.max_size <= 0:
+            return None
+        key = self.content_key(text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, text: str, embedding: np.ndarray) -> np.ndarray:
+        """Memoize an embedding, evicting the least recently used entry."""
+        if self.max_size <= 0:
+            return embedding
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+        key = self.content_key(text)
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return embedding
+
+    def clear(self) -> None:
+        """Drop every memoized embedding."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Get the number of memoized embeddings."""
+        return len(self._entries)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into batch encodes.
+
+    The first caller to find the encoder idle becomes the leader: it waits up
+    to ``window_ms`` (or until ``max_batch`` texts are queued), encodes every
+    queued text in one call and keeps draining requests that arrived during
+    the encode. Other callers block until their vector is ready. With a zero
+    window a lone caller is encoded immediately, so sequential use pays no
+    extra latency.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], np.ndarray],
+        window_ms: float = 0.0,
+        max_batch: int = 32,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            encode_batch: Function embedding a list of texts into a 2-D array
+            window_ms: Time the leader waits for more requests to join
+            max_batch: Maximum texts encoded per call
+        """
+        self._encode_batch = encode_batch
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_texts = 0
+        self._pending: List[Tuple[str, "Future[np.ndarray]"]] = []
+        self._busy = False
+        self._cond = threading.Condition()
+
+    def submit(self, text: str) -> np.ndarray:
+        """
+        Embed ``text``, sharing an encode call with concurrent submitters.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            Exception: Whatever the batch encode raised
+        """
+        future: "Future[np.ndarray]" = Future()
+        with self._cond:
+            self._pending.append((text, future))
+            leader = not self._busy
+            self._busy = True
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+        if leader:
+            self._lead()
+        return future.result()
+
+    def _lead(self) -> None:
+        """Encode queued batches until the queue is empty."""
+        with self._cond:
+            if self.window_ms > 0:
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.max_batch,
+                    timeout=self.window_ms / 1000,
+                )
+
+        while True:
+            with self._cond:
+                batch = self._pending[: self.max_batch]
+                del self._pending[: self.max_batch]
+                if not batch:
+                    self._busy = False
+                    return
+            self._run(batch)
+
+    def _run(self, batch: List[Tuple[str, "Future[np.ndarray]"]]) -> None:
+        """Encode one batch (deduplicated) and resolve its futures."""
+        unique = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = self._encode_batch(unique)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        rows = {text: i for i, text in enumerate(unique)}
+        for text, future in batch:
+            future.set_result(embeddings[rows[text]])
+        self.batches += 1
+        self.batched_texts += len(batch)
+
+
+def _file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Stream a file through SHA256."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _entry_row(entry: EmbeddingIndex) -> List[Any]:
+    """Flatten an index entry into its on-disk table row."""
+    return [
+        entry.cache_key,
+        entry.prompt,
+        entry.prompt_hash,
+        entry.timestamp,
+        entry.metadata,
+    ]
+
+
+class _LazyEntryTable(MutableMapping):
+    """
+    Insertion-ordered cache_key -> EmbeddingIndex mapping over raw table rows.
+
+    Rows loaded from disk are only turned into ``EmbeddingIndex`` models when
+    first accessed, which keeps index load time proportional to unpacking
+    the table rather than to pydantic model construction.
+    """
+
+    def __init__(self, rows: List[List[Any]]):
+        self._items: Dict[str, Any] = {row[0]: row for row in rows}
+
+    def row(self, key: str) -> List[Any]:
+        """Get the raw table row for ``key`` without materializing it."""
+        item = self._items[key]
+        return item if isinstance(item, list) else _entry_row(item)
+
+    def __getitem__(self, key: str) -> EmbeddingIndex:
+        item = self._items[key]
+        if isinstance(item, list):
+            item = EmbeddingIndex.model_construct(
+                cache_key=item[0],
+                prompt=item[1],
+                embedding=[],
+                prompt_hash=item[2],
+                timestamp=item[3],
+                metadata=item[4],
+            )
+            self._items[key] = item
+        return item
+
+    def __setitem__(self, key: str, value: EmbeddingIndex) -> None:
+        self._items[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._items[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+
+def write_index_files(
+    directory: Path,
+    entries: MutableMapping[str, EmbeddingIndex],
+    store: EmbeddingStore,
+    config: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Write an index in the versioned, memory-mappable on-disk format.
+
+    Layout (all files inside ``directory``):
+        manifest.json    format/version, shapes, dtype and SHA256 per file
+        embeddings.npy   [count, dim] matrix in the store's precision
+        scales.npy       per-row dequantization scales (float32)
+        norms.npy        per-row original L2 norms (float32)
+        entries.msgpack  [cache_key, prompt, prompt_hash, timestamp, metadata]
+                         rows in the same order as the matrix
+
+    Files are written to a uniquely named sibling directory and swapped in,
+    so concurrent writers never share staging files and readers that already
+    mapped the previous version keep a valid view. The last writer wins.
+
+    Args:
+        directory: Target directory
+        entries: Index metadata by cache key
+        store: Embedding store holding the vectors
+        config: Optional matcher configuration to record in the manifest
+    """
+    keys, vectors, scales, norms = store.export_arrays()
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(
+        tempfile.mkdtemp(prefix=directory.name + ".tmp-", dir=directory.parent)
+    )
+    # mkdtemp creates the directory owner-only; the index is shared
+    os.chmod(staging, 0o755)
+    try:
+        np.save(staging / INDEX_EMBEDDINGS, np.ascontiguousarray(vectors))
+        np.save(staging / INDEX_SCALES, scales)
+        np.save(staging / INDEX_NORMS, norms)
+        if isinstance(entries, _LazyEntryTable):
+            table = [entries.row(key) for key in keys]
+        else:
+            table = [_entry_row(entries[key]) for key in keys]
+        with open(staging / INDEX_ENTRIES, "wb") as f:
+            msgpack.pack(table, f, use_bin_type=True)
+
+        manifest = {
+            "format": INDEX_FORMAT,
+            "version": INDEX_FORMAT_VERSION,
+            "count": len(keys),
+            "dimension": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+            "precision": store.precision.value,
+            "created_at": time.time(),
+            "checksums": {
+                name: _file_sha256(staging / name)
+                for name in (
+                    INDEX_EMBEDDINGS,
+                    INDEX_SCALES,
+                    INDEX_NORMS,
+                    INDEX_ENTRIES,
+                )
+            },
+            "config": config or {},
+        }
+        with open(staging / INDEX_MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        # Checksums were just computed from these files
+        _record_verified(staging, manifest)
+        _swap_directory(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _swap_directory(staging: Path, directory: Path, attempts: int = 5) -> None:
+    """Replace ``directory`` with ``staging``, moving the old one aside first."""
+    for _ in range(attempts):
+        try:
+            os.replace(staging, directory)
+            return
+        except OSError:
+            if not directory.exists():
+                raise
+        # os.replace cannot overwrite a non-empty directory; another writer
+        # may swap in between, in which case this loops and retries.
+        retired = Path(
+            tempfile.mkdtemp(prefix=directory.name + ".old-", dir=directory.parent)
+        )
+        try:
+            os.replace(directory, retired / directory.name)
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(retired, ignore_errors=True)
+    shutil.rmtree(staging, ignore_errors=True)
+    raise OSError(f"Could not swap in index directory {directory}")
+
+
+def _file_stamps(directory: Path, names: Iterable[str]) -> Dict[str, List[int]]:
+    """Size and mtime of index files, to detect changes without hashing."""
+    stamps = {}
+    for name in names:
+        stat = (directory / name).stat()
+        stamps[name] = [stat.st_size, stat.st_mtime_ns]
+    return stamps
+
+
+def _verify_index_files(directory: Path, manifest: Dict[str, Any]) -> None:
+    """
+    Check every file against the manifest's SHA256, once per written index.
+
+    A successful check records the files' size and mtime; later loads of
+    the same unchanged files skip hashing.
+
+    Raises:
+        ValueError: If a checksum does not match
+    """
+    checksums = manifest["checksums"]
+    stamps = _file_stamps(directory, [INDEX_MANIFEST, *checksums])
+    try:
+        with open(directory / INDEX_VERIFIED, encoding="utf-8") as f:
+            if json.load(f) == stamps:
+                return
+    except (OSError, ValueError):
+        pass
+
+    for name, expected in checksums.items():
+        if _file_sha256(directory / name) != expected:
+            raise ValueError(f"Checksum mismatch for {directory / name}")
+    _record_verified(directory, manifest)
+
+
+def _record_verified(directory: Path, manifest: Dict[str, Any]) -> None:
+    """Record the stamps of files whose checksums match the manifest."""
+    try:
+        stamps = _file_stamps(directory, [INDEX_MANIFEST, *manifest["checksums"]])
+        fd, tmp_path = tempfile.mkstemp(prefix=INDEX_VERIFIED, dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(stamps, f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, directory / INDEX_VERIFIED)
+    except OSError as e:
+        # Read-only index directories are verified on every load
+        logger.debug(f"Could not record index verification: {e}")
+
+
+def read_index_files(
+    directory: Path,
+    verify_checksum: bool = True,
+    mmap: bool = True,
+    compaction_ratio: float = 0.25,
+) -> Tuple[MutableMapping[str, EmbeddingIndex], EmbeddingStore]:
+    """
+    Load an index written by :func:`write_index_files`.
+
+    With ``mmap`` the embedding matrix is opened read-only via ``np.load``
+    memory mapping, so forked or concurrent workers share one copy through
+    the page cache instead of each deserializing it into heap memory.
+
+    Args:
+        directory: Index directory
+        verify_checksum: Verify SHA256 of every file before loading (files
+            already verified unchanged are not hashed again)
+        mmap: Memory-map the embedding matrix instead of reading it
+        compaction_ratio: Compaction ratio for the returned store
+
+    Returns:
+        (entries by cache key, materialized lazily; embedding store)
+
+    Raises:
+        ValueError: If the format, version or a checksum does not match
+    """
+    directory = Path(directory)
+    with open(directory / INDEX_MANIFEST, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != INDEX_FORMAT:
+        raise ValueError(f"Not a similarity index: {directory}")
+    if manifest.get("version") != INDEX_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported index version {manifest.get('version')} "
+            f"(expected {INDEX_FORMAT_VERSION})"
+        )
+
+    if verify_checksum:
+        _verify_index_files(directory, manifest)
+
+    vectors = np.load(directory / INDEX_EMBEDDINGS, mmap_mode="r" if mmap else None)
+    scales = np.load(directory / INDEX_SCALES)
+    norms = np.load(directory / INDEX_NORMS)
+    with open(directory / INDEX_ENTRIES, "rb") as f:
+        table = msgpack.unpack(f, raw=False)
+
+    if len(table) != manifest["count"] or len(vectors) != manifest["count"]:
+        raise ValueError(f"Index row count does not match manifest: {directory}")
+
+    entries = _LazyEntryTable(table)
+    store = EmbeddingStore.from_arrays(
+        [row[0] for row in table],
+        vectors,
+        scales,
+        norms,
+        EmbeddingPrecision(manifest["precision"]),
+        compaction_ratio=compaction_ratio,
+    )
+    return entries, store
+
+
+def _flush_at_exit(ref: "weakref.ref[SimilarityMatcher]") -> None:
+    """Write a still-live matcher's pending index changes at interpreter exit."""
+    matcher = ref()
+    if matcher is not None:
+        matcher.flush()
+
+
 class SimilarityMatcher:
     """
     Semantic similarity matcher for fuzzy cache lookups.
@@ -153,13 +940,17 @@ class SimilarityMatcher:
         ...     print(f"{match.similarity_score:.2f}: {match.prompt}")
     """
 
-    def __init__(self, config: SimilarityConfig, cache: Any):
+    def __init__(
+        self, config: SimilarityConfig, cache: Any, model: Optional[Any] = None
+    ):
         """
         Initialize similarity matcher with embedding model.
 
         Args:
             config: Similarity matching configuration
             cache: LLM cache instance
+            model: Pre-loaded encoder with a SentenceTransformer-compatible
+                ``encode``; loaded from ``config.model_name`` when omitted
 
         Raises:
             ValueError: If cache is invalid
@@ -170,14 +961,27 @@ class SimilarityMatcher:
 
         self.config = config
         self._cache = cache
-        self._model: Optional[SentenceTransformer] = None
-        self._embedding_index: Dict[str, EmbeddingIndex] = {}
-        self._embeddings_array: Optional[np.ndarray] = None
-        self._cache_keys_list: List[str] = []
+        self._model: Optional[SentenceTransformer] = model
+        self._embedding_index: MutableMapping[str, EmbeddingIndex] = {}
+        self._store = EmbeddingStore(
+            precision=config.embedding_precision,
+            compaction_ratio=config.compaction_ratio,
+        )
+        self._memo = EmbeddingMemo(config.embedding_memo_size)
+        self._batcher = EmbeddingBatcher(
+            self._encode_texts,
+            window_ms=config.batch_window_ms,
+            max_batch=config.batch_size,
+        )
 
-        self._init_model()
+        self._dirty = False
+        self._last_saved = float("-inf")
+
+        if self._model is None:
+            self._init_model()
         if config.enable_persistence:
             self._load_persistence()
+            atexit.register(_flush_at_exit, weakref.ref(self))
 
         logger.info(
             f"Initialized similarity matcher with model: {config.model_name}, "
@@ -219,8 +1023,17 @@ class SimilarityMatcher:
                 persistence_dir.mkdir(parents=True, exist_ok=True)
                 return
 
+            index_dir = persistence_dir / "index"
             index_file = persistence_dir / "embedding_index.pkl"
-            if index_file.exists():
+            if (index_dir / INDEX_MANIFEST).exists():
+                self._embedding_index, self._store = read_index_files(
+                    index_dir, compaction_ratio=self.config.compaction_ratio
+                )
+                logger.info(
+                    f"Loaded {len(self._embedding_index)} embeddings from disk"
+                )
+            elif index_file.exists():
+                # Legacy pickle written by earlier versions
                 with open(index_file, "rb") as f:
                     persisted_data = pickle.load(f)  # nosec B301 - controlled embeddings data
                     self._embedding_index = {
@@ -243,25 +1056,91 @@ class SimilarityMatcher:
             persistence_dir = Path(self.config.persistence_path)
             persistence_dir.mkdir(parents=True, exist_ok=True)
 
-            index_file = persistence_dir / "embedding_index.pkl"
-            with open(index_file, "wb") as f:
-                pickle.dump(
-                    {k: v.model_dump() for k, v in self._embedding_index.items()}, f
-                )
+            write_index_files(
+                persistence_dir / "index", self._embedding_index, self._store
+            )
+            legacy_file = persistence_dir / "embedding_index.pkl"
+            if legacy_file.exists():
+                legacy_file.unlink()
 
             logger.debug(f"Saved {len(self._embedding_index)} embeddings to disk")
         except Exception as e:
             logger.warning(f"Failed to save embeddings: {e}")
 
+    def _mark_dirty(self) -> None:
+        """Record an index change, writing it at most once per interval."""
+        if not self.config.enable_persistence:
+            return
+        self._dirty = True
+        if time.monotonic() - self._last_saved >= self.config.persistence_interval:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Write pending index changes to disk.
+
+        Returns:
+            True if there were changes to write
+        """
+        if not self._dirty:
+            return False
+        self._dirty = False
+        self._last_saved = time.monotonic()
+        self._save_persistence()
+        return True
+
+    def close(self) -> None:
+        """Write pending index changes; the matcher stays usable."""
+        self.flush()
+
+    def __enter__(self) -> "SimilarityMatcher":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit."""
+        self.close()
+
+    def create_ann_index(self) -> PartitionedANNIndex:
+        """
+        Create a model-partitioned nearest-neighbour index for this matcher.
+
+        Returns:
+            Empty index configured from ``ann_backend``/``ann_nlist``/``ann_nprobe``
+        """
+        return PartitionedANNIndex(
+            ANNIndexConfig(
+                backend=self.config.ann_backend,
+                nlist=self.config.ann_nlist,
+                nprobe=self.config.ann_nprobe,
+            )
+        )
+
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Run the model over ``texts`` and return a 2-D float array."""
+        embeddings = self._model.encode(  # type: ignore[union-attr]
+            texts,
+            batch_size=self.config.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self.config.normalize_embeddings,
+        )
+
+        if not isinstance(embeddings, np.ndarray):
+            embeddings = np.array(embeddings, dtype=np.float32)
+        return embeddings.reshape(len(texts), -1)
+
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding vector for text.
 
+        Repeated texts are served from the content-hash memo. Misses go
+        through the batcher, so concurrent callers share one model call.
+
         Args:
             text: Input text to embed
 
         Returns:
-            Embedding vector as numpy array
+            Embedding vector as numpy array (read-only when memoized)
 
         Raises:
             RuntimeError: If embedding generation fails
@@ -269,18 +1148,18 @@ class SimilarityMatcher:
         if self._model is None:
             raise RuntimeError("Model not initialized")
 
-        try:
-            embedding = self._model.encode(
-                text,
-                convert_to_numpy=True,
-                normalize_embeddings=self.config.normalize_embeddings,
-            )
+        embedding = self._memo.get(text)
+        if embedding is not None:
+            return embedding
 
-            if not isinstance(embedding, np.ndarray):
-                embedding = np.array(embedding, dtype=np.float32)
+        try:
+            if self.config.enable_batching:
+                embedding = self._batcher.submit(text)
+            else:
+                embedding = self._encode_texts([text])[0]
 
             logger.debug(f"Generated embedding with shape: {embedding.shape}")
-            return embedding
+            return self._memo.put(text, embedding)
 
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
@@ -290,6 +1169,8 @@ class SimilarityMatcher:
         """
         Generate embeddings for multiple texts in batch.
 
+        Only texts missing from the memo are sent to the model.
+
         Args:
             texts: List of input texts
 
@@ -303,18 +1184,24 @@ class SimilarityMatcher:
             raise RuntimeError("Model not initialized")
 
         try:
-            embeddings = self._model.encode(
-                texts,
-                batch_size=self.config.batch_size,
-                convert_to_numpy=True,
-                normalize_embeddings=self.config.normalize_embeddings,
+            cached = [self._memo.get(text) for text in texts]
+            missing = list(
+                dict.fromkeys(t for t, e in zip(texts, cached) if e is None)
+            )
+            computed: Dict[str, np.ndarray] = {}
+            if missing:
+                for text, embedding in zip(missing, self._encode_texts(missing)):
+                    computed[text] = self._memo.put(text, embedding)
+
+            if not texts:
+                return np.empty((0, self.get_embedding_dimension()), np.float32)
+            embeddings = np.vstack(
+                [e if e is not None else computed[t] for t, e in zip(texts, cached)]
             )
-
-            if not isinstance(embeddings, np.ndarray):
-                embeddings = np.array(embeddings, dtype=np.float32)
 
             logger.debug(
-                f"Generated {len(texts)} embeddings with shape: {embeddings.shape}"
+                f"Generated {len(missing)} of {len(texts)} embeddings "
+                f"with shape: {embeddings.shape}"
             )
             return embeddings
 
@@ -411,6 +1298,32 @@ class SimilarityMatcher:
 
         return similarities
 
+    def _similarities_from_dot(
+        self, dots: np.ndarray, norms: np.ndarray, query_emb: np.ndarray
+    ) -> np.ndarray:
+        """
+        Apply the configured metric to precomputed inner products.
+
+        Mirrors :meth:`compute_similarity_batch` but works from stored norms so
+        quantized matrices never need to be materialized as float32.
+        """
+        query_norm = float(np.linalg.norm(query_emb))
+
+        if self.config.metric == SimilarityMetric.COSINE:
+            if self.config.normalize_embeddings:
+                return dots
+            return dots / (norms * query_norm + 1e-10)
+
+        if self.config.metric == SimilarityMetric.DOT_PRODUCT:
+            return (dots / (norms * query_norm + 1e-10) + 1) / 2
+
+        if self.config.metric == SimilarityMetric.EUCLIDEAN:
+            squared = np.maximum(norms**2 + query_norm**2 - 2 * dots, 0.0)
+            max_distance = np.sqrt(2 * (1 - (-1)))
+            return 1 - (np.sqrt(squared) / max_distance)
+
+        return dots
+
     def index_prompt(
         self,
         prompt: str,
@@ -440,22 +1353,19 @@ class SimilarityMatcher:
 
             embedding = self.generate_embedding(prompt)
 
-            import time
-
+            # The store owns the vector; the entry only keeps metadata
             index_entry = EmbeddingIndex(
                 cache_key=cache_key,
                 prompt=prompt,
-                embedding=embedding.tolist(),
                 prompt_hash=prompt_hash,
                 timestamp=time.time(),
                 metadata=metadata or {},
             )
 
             self._embedding_index[cache_key] = index_entry
-            self._rebuild_embeddings_array()
+            self._store.add(cache_key, embedding)
 
-            if self.config.enable_persistence:
-                self._save_persistence()
+            self._mark_dirty()
 
             logger.debug(f"Indexed prompt with cache key: {cache_key[:16]}...")
             return True
@@ -489,10 +1399,10 @@ class SimilarityMatcher:
             prompts = [p for p, _, _, _ in new_prompts]
             embeddings = self.generate_embeddings_batch(prompts)
 
-            import time
-
             current_time = time.time()
             indexed_count = 0
+            indexed_keys: List[str] = []
+            indexed_rows: List[int] = []
 
             for i, (prompt, cache_key, prompt_hash, metadata) in enumerate(new_prompts):
                 if len(self._embedding_index) >= self.config.max_cache_embeddings:
@@ -501,19 +1411,28 @@ class SimilarityMatcher:
                 index_entry = EmbeddingIndex(
                     cache_key=cache_key,
                     prompt=prompt,
-                    embedding=embeddings[i].tolist(),
                     prompt_hash=prompt_hash,
                     timestamp=current_time,
                     metadata=metadata or {},
                 )
 
                 self._embedding_index[cache_key] = index_entry
+                indexed_keys.append(cache_key)
+                indexed_rows.append(i)
                 indexed_count += 1
 
-            self._rebuild_embeddings_array()
+            # Entries evicted to make room within this batch are not stored
+            live = [
+                n
+                for n, key in enumerate(indexed_keys)
+                if key in self._embedding_index
+            ]
+            self._store.add_batch(
+                [indexed_keys[n] for n in live],
+                embeddings[[indexed_rows[n] for n in live]],
+            )
 
-            if self.config.enable_persistence:
-                self._save_persistence()
+            self._mark_dirty()
 
             logger.info(f"Batch indexed {indexed_count} prompts")
             return indexed_count
@@ -527,30 +1446,30 @@ class SimilarityMatcher:
         if not self._embedding_index:
             return
 
-        oldest_key = min(
-            self._embedding_index.keys(),
-            key=lambda k: self._embedding_index[k].timestamp,
-        )
+        # The index dict keeps insertion order, which is timestamp order
+        oldest_key = next(iter(self._embedding_index))
         del self._embedding_index[oldest_key]
+        self._store.remove(oldest_key)
         logger.debug(f"Evicted oldest embedding: {oldest_key[:16]}...")
 
     def _rebuild_embeddings_array(self) -> None:
-        """Rebuild the embeddings array and keys list for efficient search."""
+        """Rebuild the embedding store from the index after a bulk load."""
+        self._store.clear()
         if not self._embedding_index:
-            self._embeddings_array = None
-            self._cache_keys_list = []
             return
 
-        self._cache_keys_list = list(self._embedding_index.keys())
-        embeddings_list = [
-            self._embedding_index[key].get_embedding_array()
-            for key in self._cache_keys_list
-        ]
-        self._embeddings_array = np.vstack(embeddings_list)
-
-        logger.debug(
-            f"Rebuilt embeddings array with shape: {self._embeddings_array.shape}"
+        keys = list(self._embedding_index.keys())
+        self._store.add_batch(
+            keys,
+            np.vstack(
+                [self._embedding_index[key].get_embedding_array() for key in keys]
+            ),
         )
+        # Drop the per-entry lists now that the store holds the vectors
+        for entry in self._embedding_index.values():
+            entry.embedding = []
+
+        logger.debug(f"Rebuilt embedding store with {len(keys)} rows")
 
     def find_similar(
         self,
@@ -569,7 +1488,7 @@ class SimilarityMatcher:
         Returns:
             List of SimilarMatch objects, sorted by similarity (descending)
         """
-        if self._embeddings_array is None or len(self._cache_keys_list) == 0:
+        if len(self._store) == 0:
             logger.debug("No embeddings in index")
             return []
 
@@ -579,11 +1498,22 @@ class SimilarityMatcher:
 
             query_embedding = self.generate_embedding(prompt)
 
-            similarities = self.compute_similarity_batch(
-                query_embedding, self._embeddings_array
+            similarities = self._similarities_from_dot(
+                self._store.dot(query_embedding), self._store.norms, query_embedding
             )
+            similarities = np.where(self._store.alive, similarities, -np.inf)
+
+            # Partial selection of the top-k, then sort only those k
+            k = min(k, len(self._store))
+            top_indices = np.argpartition(-similarities, k - 1)[:k]
+            top_indices = top_indices[np.argsort(-similarities[top_indices])]
 
-            top_indices = np.argsort(similarities)[::-1][:k]
+            candidate_keys = [
+                self._store.keys[idx]
+                for idx in top_indices
+                if similarities[idx] >= thresh
+            ]
+            cached_responses = self._cache.get_entries_by_keys(candidate_keys)
 
             matches: List[SimilarMatch] = []
             for rank, idx in enumerate(top_indices, start=1):
@@ -592,10 +1522,10 @@ class SimilarityMatcher:
                 if similarity < thresh:
                     continue
 
-                cache_key = self._cache_keys_list[idx]
+                cache_key = self._store.keys[idx]
                 index_entry = self._embedding_index[cache_key]
 
-                cached_response = self._cache.get_entry_by_key(cache_key)
+                cached_response = cached_responses.get(cache_key)
                 if cached_response is None:
                     logger.warning(
                         f"Cache entry not found for key: {cache_key[:16]}..."
@@ -669,10 +1599,9 @@ class SimilarityMatcher:
         """
         if cache_key in self._embedding_index:
             del self._embedding_index[cache_key]
-            self._rebuild_embeddings_array()
+            self._store.remove(cache_key)
 
-            if self.config.enable_persistence:
-                self._save_persistence()
+            self._mark_dirty()
 
             logger.debug(f"Removed from index: {cache_key[:16]}...")
             return True
@@ -681,11 +1610,9 @@ class SimilarityMatcher:
     def clear_index(self) -> None:
         """Clear all embeddings from the index."""
         self._embedding_index.clear()
-        self._embeddings_array = None
-        self._cache_keys_list = []
+        self._store.clear()
 
-        if self.config.enable_persistence:
-            self._save_persistence()
+        self._mark_dirty()
 
         logger.info("Cleared similarity index")
 
@@ -708,9 +1635,8 @@ class SimilarityMatcher:
                 self.remove_from_index(key)
 
             if removed_keys:
-                self._rebuild_embeddings_array()
-                if self.config.enable_persistence:
-                    self._save_persistence()
+                self._store.compact()
+                self._mark_dirty()
 
             logger.info(
                 f"Synchronized index, removed {len(removed_keys)} stale entries"
@@ -734,15 +1660,19 @@ class SimilarityMatcher:
             "utilization": len(self._embedding_index)
             / self.config.max_cache_embeddings,
             "model_name": self.config.model_name.value,
-            "embedding_dimension": (
-                self._embeddings_array.shape[1]
-                if self._embeddings_array is not None
-                else 0
-            ),
+            "embedding_dimension": self._store.dimension,
+            "embedding_precision": self._store.precision.value,
+            "matrix_bytes": self._store.nbytes,
+            "tombstones": self._store.tombstones,
             "similarity_metric": self.config.metric.value,
             "threshold": self.config.threshold,
             "top_k": self.config.top_k,
             "persistence_enabled": self.config.enable_persistence,
+            "memo_size": len(self._memo),
+            "memo_hits": self._memo.hits,
+            "memo_misses": self._memo.misses,
+            "encode_batches": self._batcher.batches,
+            "batched_texts": self._batcher.batched_texts,
         }
 
         if self._embedding_index:
@@ -754,22 +1684,38 @@ class SimilarityMatcher:
 
     def export_index(self, filepath: str) -> bool:
         """
-        Export index to JSON file.
+        Export index to disk.
+
+        Paths ending in ``.json`` use the legacy JSON format. Any other path
+        is written as a directory in the versioned binary format (see
+        :func:`write_index_files`), which :meth:`import_index` can
+        memory-map without deserializing the embeddings.
 
         Args:
-            filepath: Path to export file
+            filepath: Export directory, or ``*.json`` file
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            export_data = {
-                "config": self.config.model_dump(),
-                "index": {k: v.model_dump() for k, v in self._embedding_index.items()},
-            }
-
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2)
+            if Path(filepath).suffix.lower() == ".json":
+                export_data = {
+                    "config": self.config.model_dump(),
+                    "index": {
+                        k: {**v.model_dump(), "embedding": self._store.get(k).tolist()}
+                        for k, v in self._embedding_index.items()
+                    },
+                }
+
+                with open(filepath, "w", encoding="utf-8") as f:
+                    json.dump(export_data, f, indent=2)
+            else:
+                write_index_files(
+                    Path(filepath),
+                    self._embedding_index,
+                    self._store,
+                    config=self.config.model_dump(mode="json"),
+                )
 
             logger.info(f"Exported index to {filepath}")
             return True
@@ -778,29 +1724,50 @@ class SimilarityMatcher:
             logger.error(f"Failed to export index: {e}")
             return False
 
-    def import_index(self, filepath: str) -> bool:
+    def import_index(self, filepath: str, verify_checksum: bool = True) -> bool:
         """
-        Import index from JSON file.
+        Import index from disk.
+
+        Binary index directories are memory-mapped read-only, so workers
+        importing the same export share its pages; the matrix is only copied
+        on the first write that modifies existing rows. Importing one does
+        not rewrite it into the persistence directory; that happens on the
+        next change to the index. Legacy JSON files are still accepted.
 
         Args:
-            filepath: Path to import file
+            filepath: Index directory or JSON file
+            verify_checksum: Verify file checksums of a binary index
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            with open(filepath, encoding="utf-8") as f:
-                import_data = json.load(f)
+            path = Path(filepath)
+            binary = (path / INDEX_MANIFEST).exists()
+            if binary:
+                self._embedding_index, self._store = read_index_files(
+                    path,
+                    verify_checksum=verify_checksum,
+                    compaction_ratio=self.config.compaction_ratio,
+                )
+                if self._store.precision != self.config.embedding_precision:
+                    logger.warning(
+                        f"Imported index uses {self._store.precision.value} "
+                        f"embeddings, configured {self.config.embedding_precision.value}"
+                    )
+            else:
+                with open(filepath, encoding="utf-8") as f:
+                    import_data = json.load(f)
 
-            index_data = import_data.get("index", {})
-            self._embedding_index = {
-                k: EmbeddingIndex(**v) for k, v in index_data.items()
-            }
+                index_data = import_data.get("index", {})
+                self._embedding_index = {
+                    k: EmbeddingIndex(**v) for k, v in index_data.items()
+                }
 
-            self._rebuild_embeddings_array()
+                self._rebuild_embeddings_array()
 
-            if self.config.enable_persistence:
-                self._save_persistence()
+            if not binary:
+                self._mark_dirty()
 
             logger.info(
                 f"Imported {len(self._embedding_index)} entries from {filepath}"
@@ -846,8 +1813,8 @@ class SimilarityMatcher:
 
     def get_embedding_dimension(self) -> int:
         """Get the embedding dimension of the current model."""
-        if self._embeddings_array is not None:
-            return self._embeddings_array.shape[1]
+        if self._store.dimension:
+            return self._store.dimension
         test_emb = self.generate_embedding("test")
         return test_emb.shape[0]
 
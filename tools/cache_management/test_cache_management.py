@@ -12,12 +12,17 @@ Protocol Coverage:
 """
 
 import asyncio
+import hashlib
 import json
+import pickle
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 from unittest.mock import patch
 
+import fakeredis
+import numpy as np
 import pytest
 from click.testing import CliRunner
 
@@ -97,17 +102,36 @@ class MockSentenceTransformer:
 
 
 # Import modules after mocks are defined
+from ann_index import ANNBackend, ANNIndexConfig, PartitionedANNIndex
+from async_llm_cache import AsyncLLMCache
 from cache_cli import cli
-from cache_manager import CacheManager, CacheStats, CacheWarmer, EvictionPolicy
-from distributed_cache import DistributedCache, ReplicationConfig, ShardingStrategy
+from cache_manager import (
+    AdmissionMode,
+    CacheManager,
+    CacheStats,
+    CacheWarmer,
+    EvictionPolicy,
+)
+from distributed_cache import (
+    ConsistencyLevel,
+    ConsistentHashRing,
+    DistributedCache,
+    HashAlgorithm,
+    ReplicationConfig,
+    ShardingStrategy,
+)
 from llm_cache import CacheBackend, CacheConfig, CachedResponse, LLMCache
 from metrics import MetricsCollector
 from reasoning_cache import CoTStep, ReasoningCache, ReasoningResult, ToTNode
 from similarity_matcher import (
+    EmbeddingBatcher,
     EmbeddingModel,
+    EmbeddingPrecision,
+    EmbeddingStore,
     SimilarityConfig,
     SimilarityMatcher,
     SimilarMatch,
+    write_index_files,
 )
 
 
@@ -503,6 +527,241 @@ class TestLLMCache:
         assert deleted >= 5
 
 
+class TestAsyncLLMCache:
+    """Test suite for AsyncLLMCache."""
+
+    @pytest.fixture
+    def counting_loader(self):
+        """Provide a slow loader factory that counts upstream calls."""
+        calls = []
+
+        def make(value="answer", error=None):
+            async def loader():
+                calls.append(value)
+                await asyncio.sleep(0.05)
+                if error is not None:
+                    raise error
+                return value
+
+            return loader
+
+        return make, calls
+
+    @pytest.mark.asyncio
+    async def test_single_flight_loads_once(self, counting_loader):
+        """Test concurrent misses on one key trigger a single loader call."""
+        make, calls = counting_loader
+        cache = AsyncLLMCache(CacheConfig(backend=CacheBackend.MEMORY))
+
+        results = await asyncio.gather(
+            *[cache.get_or_set("same prompt", make()) for _ in range(100)],
+            *[cache.get_or_set(f"prompt {i}", make()) for i in range(5)],
+        )
+
+        assert len(calls) == 6
+        assert {r.value for r in results} == {"answer"}
+        assert cache.get_flight_stats()["coalesced"] == 99
+        assert (await cache.get("same prompt")).value == "answer"
+        await cache.get_or_set("same prompt", make())
+        assert len(calls) == 6
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_loader_error_reaches_all_waiters(self, counting_loader):
+        """Test a failed load is shared by waiters and nothing is cached."""
+        make, calls = counting_loader
+        cache = AsyncLLMCache(CacheConfig(backend=CacheBackend.MEMORY))
+
+        results = await asyncio.gather(
+            *[
+                cache.get_or_set("p", make(error=RuntimeError("upstream down")))
+                for _ in range(10)
+            ],
+            return_exceptions=True,
+        )
+
+        assert len(calls) == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not await cache.exists("p")
+        assert (await cache.get_or_set("p", make("retry"))).value == "retry"
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over_load(self, counting_loader):
+        """Test waiters retry when the caller running the loader is cancelled."""
+        make, calls = counting_loader
+        cache = AsyncLLMCache(CacheConfig(backend=CacheBackend.MEMORY))
+
+        leader = asyncio.create_task(cache.get_or_set("p", make("first")))
+        await asyncio.sleep(0.01)
+        waiters = [
+            asyncio.create_task(cache.get_or_set("p", make("second")))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        results = await asyncio.gather(*waiters)
+        assert leader.cancelled()
+        assert {r.value for r in results} == {"second"}
+        assert calls == ["first", "second"]
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_matches_sync_cache(self, counting_loader):
+        """Test Redis entries are interchangeable with the sync LLMCache."""
+        make, calls = counting_loader
+        server = fakeredis.FakeServer()
+        config = CacheConfig(backend=CacheBackend.REDIS, ttl_seconds=60)
+        cache = AsyncLLMCache(
+            config, redis_client=fakeredis.FakeAsyncRedis(server=server)
+        )
+
+        assert await cache.set("q", "a", model_params={"temperature": 0.2})
+        assert await cache.exists("q", {"temperature": 0.2})
+        assert not await cache.exists("q")
+        hit = await cache.get("q", {"temperature": 0.2})
+        assert hit.value == "a" and hit.hit_count == 1
+
+        with patch(
+            "llm_cache.redis.Redis",
+            lambda **kwargs: fakeredis.FakeRedis(server=server),
+        ):
+            sync_cache = LLMCache(config)
+        assert sync_cache.get("q", {"temperature": 0.2}).hit_count == 2
+        assert 0 < sync_cache._cache.ttl(hit.key) <= 60
+
+        results = await asyncio.gather(
+            *[cache.get_or_set("r", make()) for _ in range(20)]
+        )
+        assert len(calls) == 1 and results[0].value == "answer"
+        assert await cache.invalidate("*") == 2
+        assert not await cache.exists("r")
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_disk_backend_runs_off_loop(self, tmp_path, counting_loader):
+        """Test the disk backend round-trips through the executor."""
+        make, calls = counting_loader
+        cache = AsyncLLMCache(
+            CacheConfig(backend=CacheBackend.DISK, disk_cache_dir=str(tmp_path))
+        )
+
+        await asyncio.gather(*[cache.get_or_set("d", make()) for _ in range(10)])
+        assert len(calls) == 1
+        assert (await cache.get("d")).value == "answer"
+        assert (await cache.get_stats()).total_entries == 1
+        await cache.close()
+
+
+class TestLLMCacheInvalidation:
+    """Test suite for indexed and background invalidation."""
+
+    @pytest.fixture
+    def redis_cache(self):
+        """Provide an LLMCache on a fakeredis server."""
+        server = fakeredis.FakeServer()
+        with patch(
+            "llm_cache.redis.Redis",
+            lambda **kwargs: fakeredis.FakeRedis(server=server),
+        ):
+            cache = LLMCache(CacheConfig(backend=CacheBackend.REDIS, ttl_seconds=60))
+        yield cache
+        cache.close()
+
+    def test_tag_and_model_index_on_redis(self, redis_cache):
+        """Test tag/model invalidation removes exactly the indexed entries."""
+        redis_cache.set("a", "1", model_name="gpt-4", tags=["docs"])
+        redis_cache.set("b", "2", model_name="gpt-4")
+        redis_cache.set("c", "3", model_name="claude", tags=["docs", "v2"], ttl=300)
+
+        assert len(redis_cache.get_all_keys()) == 3
+        assert 60 < redis_cache._cache.ttl("llm_cache:idx:tag:docs") <= 300
+        assert sorted(redis_cache.get_keys_by_tag("docs")) == sorted(
+            [redis_cache._generate_cache_key(p) for p in ("a", "c")]
+        )
+
+        assert redis_cache.invalidate_tag("docs") == 2
+        assert [redis_cache.exists(p) for p in "abc"] == [False, True, False]
+        assert not redis_cache._cache.exists("llm_cache:idx:tag:docs")
+        # "a" is already gone, so only "b" counts
+        assert redis_cache.invalidate_model("gpt-4") == 1
+        assert redis_cache.get_all_keys() == []
+        assert redis_cache.invalidate_tag("missing") == 0
+
+    def test_prune_index_on_redis(self, redis_cache):
+        """Test index sets drop members whose entries are gone."""
+        for i in range(5):
+            redis_cache.set(f"p{i}", "r", model_name="m", tags=["t"])
+        redis_cache._cache.delete(
+            *[redis_cache._generate_cache_key(p) for p in ("p0", "p1")]
+        )
+
+        assert redis_cache.prune_index(batch_size=2) == 4
+        assert redis_cache._cache.scard("llm_cache:idx:tag:t") == 3
+        assert redis_cache._cache.scard("llm_cache:idx:model:m") == 3
+        assert redis_cache.invalidate_tag("t") == 3
+
+    def test_index_expiry_on_redis_6(self):
+        """Test index sets are written and only extended without EXPIRE NX/GT."""
+        server = fakeredis.FakeServer(version=(6, 2))
+        with patch(
+            "llm_cache.redis.Redis",
+            lambda **kwargs: fakeredis.FakeRedis(server=server),
+        ):
+            cache = LLMCache(CacheConfig(backend=CacheBackend.REDIS, ttl_seconds=60))
+
+        assert cache.set("long", "1", tags=["t"], ttl=300)
+        assert cache.set("short", "2", tags=["t"], ttl=30)
+        assert 60 < cache._cache.ttl("llm_cache:idx:tag:t") <= 300
+        assert cache.invalidate_tag("t") == 2
+        cache.close()
+
+    def test_local_index_survives_disk_reopen(self, tmp_path):
+        """Test memory and disk backends index tags and models too."""
+        memory = LLMCache(CacheConfig(backend=CacheBackend.MEMORY))
+        memory.set("a", "1", tags=["t"])
+        memory.set("b", "2", model_name="m")
+        assert memory.invalidate_tag("t") == 1
+        assert memory.invalidate_model("m") == 1
+        assert memory.get_all_keys() == []
+
+        config = CacheConfig(backend=CacheBackend.DISK, disk_cache_dir=str(tmp_path))
+        with LLMCache(config) as disk:
+            disk.set("a", "1", tags=["t"])
+            disk.set("b", "2")
+        with LLMCache(config) as reopened:
+            assert reopened.invalidate_tag("t") == 1
+            assert not reopened.exists("a") and reopened.exists("b")
+
+    def test_background_invalidation_reports_progress(self, redis_cache):
+        """Test the SCAN job deletes matches batch by batch while reads work."""
+        pipe = redis_cache._cache.pipeline()
+        for i in range(2000):
+            pipe.set(f"stale:{i}", "x")
+        pipe.execute()
+        redis_cache.set("keep", "value", tags=["t"])
+
+        updates = []
+        job = redis_cache.start_invalidation(
+            "stale:*", batch_size=200, on_progress=updates.append
+        )
+        assert redis_cache.get("keep").value == "value"
+        final = job.wait(timeout=10)
+
+        assert final.done and not final.cancelled and final.error is None
+        assert final.invalidated == final.matched == 2000
+        assert final.total_keys == 2002
+        assert final.fraction == 1.0
+        assert len(updates) >= 10
+        assert [u.invalidated for u in updates] == sorted(u.invalidated for u in updates)
+        assert redis_cache.get_all_keys() == [redis_cache._generate_cache_key("keep")]
+
+        job = redis_cache.start_invalidation("*", batch_size=1, pause_seconds=1)
+        job.cancel()
+        assert job.wait(timeout=5).cancelled
+
+
 # ReasoningCache Tests
 class TestReasoningCache:
     """Test suite for ReasoningCache."""
@@ -912,6 +1171,153 @@ class TestReasoningCache:
         assert stats["total_entries"] >= 5
 
 
+class TestToTNodeTable:
+    """Test suite for node-table storage of ToT trees."""
+
+    @pytest.fixture
+    def tot_cache(self):
+        """Provide a reasoning cache over an in-memory LLM cache."""
+        return ReasoningCache(LLMCache(CacheConfig(backend=CacheBackend.MEMORY)))
+
+    @staticmethod
+    def build_tree(branching=3, depth=4):
+        """Build a complete tree whose scores favour the last child."""
+        nodes = {"root": ToTNode(node_id="root", thought="root", evaluation_score=0.5)}
+        level = ["root"]
+        for d in range(1, depth + 1):
+            next_level = []
+            for parent_id in level:
+                for i in range(branching):
+                    node_id = f"{parent_id}.{i}"
+                    nodes[node_id] = ToTNode(
+                        node_id=node_id,
+                        thought=f"thought {node_id}",
+                        evaluation_score=nodes[parent_id].evaluation_score / 2
+                        + i / (2 * branching),
+                        parent_id=parent_id,
+                        depth=d,
+                        metadata={"i": i},
+                        is_terminal=d == depth,
+                    )
+                    nodes[parent_id].add_child(node_id)
+                    next_level.append(node_id)
+            level = next_level
+        return nodes
+
+    def test_round_trip(self, tot_cache):
+        """Full reads reproduce every node and child order."""
+        nodes = self.build_tree()
+        tot_cache.cache_tot_tree("p", nodes["root"], nodes, solution="s")
+
+        result = tot_cache.get_tot_tree("p")
+
+        assert result.solution == "s"
+        assert result.total_steps == len(nodes) == len(result.tree_nodes)
+        for node_id, node in nodes.items():
+            loaded = result.tree_nodes[node_id]
+            assert loaded.model_dump() == node.model_dump()
+
+    def test_partial_reads(self, tot_cache):
+        """Depth, subtree and top-k reads return only the selected nodes."""
+        nodes = self.build_tree()
+        tot_cache.cache_tot_tree("p", nodes["root"], nodes)
+
+        shallow = tot_cache.get_tot_tree("p", max_depth=1)
+        assert set(shallow.tree_nodes) == {"root", "root.0", "root.1", "root.2"}
+        assert shallow.tree_root.children == ["root.0", "root.1", "root.2"]
+        assert shallow.tree_nodes["root.0"].children == []
+
+        subtree = tot_cache.get_tot_tree("p", subtree_root_id="root.1", max_depth=1)
+        assert subtree.tree_root.node_id == "root.1"
+        assert set(subtree.tree_nodes) == {"root.1", "root.1.0", "root.1.1", "root.1.2"}
+
+        best = tot_cache.get_tot_tree("p", top_k_paths=1)
+        assert list(best.tree_nodes) == [
+            "root",
+            "root.2",
+            "root.2.2",
+            "root.2.2.2",
+            "root.2.2.2.2",
+        ]
+        assert best.total_steps == len(nodes)
+
+        assert tot_cache.get_tot_tree("p", subtree_root_id="missing") is None
+
+    def test_expand_appends_without_rewrite(self, tot_cache):
+        """Expansion writes a new segment and leaves existing ones alone."""
+        nodes = self.build_tree()
+        tot_cache.cache_tot_tree("p", nodes["root"], nodes, ttl=3600)
+        llm_cache = tot_cache._cache
+        before = {key: llm_cache._cache[key] for key in llm_cache.get_all_keys()}
+
+        new_nodes = [
+            ToTNode(node_id=f"new{i}", thought=f"new {i}", evaluation_score=0.1)
+            for i in range(2)
+        ]
+        assert tot_cache.expand_tot_tree("p", "root.0.0", new_nodes)
+        stray = ToTNode(thought="x", evaluation_score=0.1)
+        assert not tot_cache.expand_tot_tree("p", "missing", [stray])
+        duplicate = ToTNode(node_id="root.1", thought="x", evaluation_score=0.1)
+        assert not tot_cache.expand_tot_tree("p", "root", [duplicate])
+
+        after = llm_cache.get_all_keys()
+        cache_key = tot_cache._generate_cache_key("p", "tot")
+        manifest_key = llm_cache._generate_cache_key(cache_key)
+        changed = [
+            k for k in after if k not in before or llm_cache._cache[k] is not before[k]
+        ]
+        # Only the manifest plus the new segment's skeleton and chunk.
+        assert manifest_key in changed and len(changed) == 3
+
+        result = tot_cache.get_tot_tree("p")
+        assert result.total_steps == len(nodes) + 2
+        assert result.tree_nodes["root.0.0"].children[-2:] == ["new0", "new1"]
+        assert result.tree_nodes["new1"].depth == 3
+        assert result.tree_nodes["new1"].parent_id == "root.0.0"
+
+        assert tot_cache.invalidate("p", "tot") == 1
+        assert llm_cache.get_all_keys() == []
+
+    def test_legacy_entries_still_load(self, tot_cache):
+        """Trees cached as one serialized result remain readable and expandable."""
+        nodes = self.build_tree(branching=2, depth=2)
+        cache_key = tot_cache._generate_cache_key("p", "tot")
+        legacy = ReasoningResult(
+            problem="p",
+            reasoning_type="tot",
+            tree_root=nodes["root"],
+            tree_nodes=nodes,
+            solution="old",
+            cache_key=cache_key,
+        )
+        tot_cache._cache.set(
+            prompt=cache_key, response=tot_cache._serialize_reasoning(legacy).hex()
+        )
+
+        assert set(tot_cache.get_tot_tree("p").tree_nodes) == set(nodes)
+        new_node = ToTNode(node_id="n", thought="n", evaluation_score=0.1)
+        assert tot_cache.expand_tot_tree("p", "root.1", [new_node])
+        result = tot_cache.get_tot_tree("p", top_k_paths=1)
+        assert result.solution == "old"
+        assert "n" in tot_cache.get_tot_tree("p").tree_nodes
+
+    def test_transpositions_round_trip(self, tot_cache):
+        """Transposition tables persist per problem and go with invalidation."""
+        table = {
+            "scores": {"split by bounded context": 0.8, "rewrite it": 0.2},
+            "expansions": {"1:split by bounded context": ["a", "b", "c"]},
+        }
+        assert tot_cache.get_transpositions("p") is None
+
+        tot_cache.cache_transpositions("p", table, ttl=3600)
+
+        assert tot_cache.get_transpositions("p") == table
+        assert tot_cache.get_transpositions("other") is None
+
+        tot_cache.invalidate("p", "tot")
+        assert tot_cache.get_transpositions("p") is None
+
+
 # SimilarityMatcher Tests
 class TestSimilarityMatcher:
     """Test suite for SimilarityMatcher."""
@@ -1490,6 +1896,763 @@ class TestCacheManager:
         assert retrieved_reasoning is not None
 
 
+# CacheManager Eviction Bookkeeping Tests
+class TestCacheManagerEviction:
+    """Test suite for CacheManager O(1) eviction bookkeeping."""
+
+    def test_lru_evicts_least_recently_used(self):
+        """Test LRU evicts entries in access order."""
+        manager = CacheManager(eviction_policy=EvictionPolicy.LRU)
+        for i in range(4):
+            manager.put(f"prompt {i}", f"response {i}")
+
+        manager.orchestrate_get("prompt 0", use_fuzzy=False)
+        assert manager.enforce_eviction_policy() == 1
+
+        assert manager.orchestrate_get("prompt 1", use_fuzzy=False) is None
+        assert manager.orchestrate_get("prompt 0", use_fuzzy=False) == "response 0"
+
+    def test_lfu_evicts_least_frequently_used(self):
+        """Test LFU evicts the lowest-frequency bucket first."""
+        manager = CacheManager(eviction_policy=EvictionPolicy.LFU)
+        for i in range(4):
+            manager.put(f"prompt {i}", f"response {i}")
+        for i in (0, 1, 3):
+            manager.orchestrate_get(f"prompt {i}", use_fuzzy=False)
+
+        assert manager.enforce_eviction_policy() == 1
+        assert manager.orchestrate_get("prompt 2", use_fuzzy=False) is None
+        assert manager.orchestrate_get("prompt 3", use_fuzzy=False) == "response 3"
+
+    def test_random_eviction_key_slots(self):
+        """Test the dense key list stays consistent through removals."""
+        manager = CacheManager(eviction_policy=EvictionPolicy.RANDOM)
+        for i in range(50):
+            manager.put(f"prompt {i}", f"response {i}")
+        manager.put("prompt 7", "replaced")
+        manager._remove_entry(manager._generate_key("prompt 3", "gpt-3.5-turbo"))
+
+        assert manager.enforce_eviction_policy() == 12
+        assert sorted(manager._keys) == sorted(manager._entries)
+        assert all(
+            manager._keys[slot] == key for key, slot in manager._key_slots.items()
+        )
+        assert manager._next_victim(EvictionPolicy.RANDOM) in manager._entries
+
+    def test_ttl_eviction_uses_expiry_heap(self):
+        """Test TTL victims come from the heap, skipping replaced entries."""
+        manager = CacheManager(eviction_policy=EvictionPolicy.TTL)
+        manager.put("short", "a", ttl=10)
+        manager.put("long", "b", ttl=1000)
+        manager.put("fresh", "c", ttl=10)
+        manager.put("fresh", "d", ttl=1000)  # the ttl=10 heap item goes stale
+
+        with patch("time.time", return_value=time.time() + 100):
+            assert manager._next_victim(EvictionPolicy.TTL) == (
+                manager._generate_key("short", "gpt-3.5-turbo")
+            )
+            assert manager._evict_expired() == 1
+            # Nothing else expired: fall back to LRU order
+            assert manager._next_victim(EvictionPolicy.TTL) == (
+                manager._generate_key("long", "gpt-3.5-turbo")
+            )
+        assert len(manager._entries) == 2
+
+    def test_running_byte_counter(self):
+        """Test memory usage tracks puts, replacements and removals."""
+        manager = CacheManager()
+        manager.put("a", "x" * 100)
+        manager.put("b", "y" * 100)
+        manager.put("a", "x" * 300)
+        expected = sum(e.size_bytes for e in manager._entries.values())
+        assert manager._total_bytes == expected
+        assert len(manager._access_order) == 2
+
+        manager.batch_invalidate([".*"])
+        assert manager._total_bytes == 0
+        assert manager.get_stats().memory_usage_mb == 0.0
+
+    def test_batch_invalidate_mixed_patterns(self):
+        """Test patterns with inline flags and groups are not merged."""
+        manager = CacheManager()
+        keys = []
+        for i in range(6):
+            manager.put(f"prompt {i}", "v")
+            keys.append(manager._generate_key(f"prompt {i}", "gpt-3.5-turbo"))
+        assert sorted(manager._entries) == sorted(keys)
+
+        removed = manager.batch_invalidate([
+            f"^{keys[0][:12]}",
+            f"(?i)^{keys[1][:12].upper()}",
+            f"^(?P<prefix>{keys[2][:12]})",
+            f"^(?P<prefix>{keys[3][:12]})",
+            f"^({keys[4][:12]})",
+        ])
+        assert removed == 5
+        assert list(manager._entries) == [keys[5]]
+
+    def test_byte_budget_admission(self):
+        """Test byte-budget admission evicts only what the entry needs."""
+        entry_size = CacheManager()._estimate_size("x" * 1000)
+        manager = CacheManager(
+            max_memory_mb=(entry_size * 10) / (1024 * 1024),
+            admission_mode=AdmissionMode.BYTE_BUDGET,
+        )
+        for i in range(10):
+            assert manager.put(f"prompt {i}", "x" * 1000)
+
+        assert manager.put("prompt 10", "x" * 1000)
+        assert manager.get_stats().entry_count == 10
+        assert manager.get_stats().eviction_count == 1
+        assert manager.orchestrate_get("prompt 0", use_fuzzy=False) is None
+
+        assert not manager.put("too big", "x" * (entry_size * 20))
+
+        # An oversize replacement keeps the entry it would have replaced
+        assert not manager.put("prompt 5", "x" * (entry_size * 20))
+        assert manager.orchestrate_get("prompt 5", use_fuzzy=False) == "x" * 1000
+        assert manager.get_stats().entry_count == 10
+
+
+def keyword_embedding(text: str, normalize: bool = False) -> np.ndarray:
+    """Hash each word into a 64-dim bag-of-words count vector."""
+    vector = np.zeros(64, dtype=np.float32)
+    for word in text.lower().replace("?", "").split():
+        digest = hashlib.md5(  # nosec B324
+            word.encode(), usedforsecurity=False
+        ).digest()
+        vector[digest[0] % 64] += 1.0
+    if normalize and vector.any():
+        vector /= np.linalg.norm(vector)
+    return vector
+
+
+class KeywordEncoder:
+    """SentenceTransformer stand-in producing bag-of-words embeddings."""
+
+    def __init__(self, model_name: str, device: Optional[str] = None) -> None:
+        """Initialize encoder."""
+        self.model_name = model_name
+        self.calls = 0
+
+    def encode(self, texts, normalize_embeddings: bool = True, **kwargs):
+        """Encode one text or a list of texts."""
+        self.calls += 1
+        if isinstance(texts, str):
+            return keyword_embedding(texts, normalize_embeddings)
+        return np.vstack([keyword_embedding(t, normalize_embeddings) for t in texts])
+
+
+class KeywordMatcher:
+    """Similarity matcher stand-in with bag-of-words embeddings."""
+
+    def __init__(self, backend=None) -> None:
+        """Initialize with an optional ANN backend."""
+        self.backend = backend or ANNBackend.EXACT
+
+    def create_ann_index(self) -> PartitionedANNIndex:
+        """Create the fuzzy lookup index."""
+        return PartitionedANNIndex(ANNIndexConfig(backend=self.backend))
+
+    def generate_embedding(self, text: str) -> np.ndarray:
+        """Embed text with bag-of-words hashing."""
+        return keyword_embedding(text)
+
+
+@pytest.fixture
+def keyword_matcher():
+    """Provide a SimilarityMatcher over an in-memory LLMCache."""
+
+    def build(**config_overrides):
+        cache = LLMCache(CacheConfig())
+        config = SimilarityConfig(enable_persistence=False, **config_overrides)
+        with patch("similarity_matcher.SentenceTransformer", KeywordEncoder):
+            return SimilarityMatcher(config, cache), cache
+
+    return build
+
+
+# Embedding Store Tests
+class TestEmbeddingStore:
+    """Test suite for the matcher's preallocated embedding store."""
+
+    def test_inserts_grow_without_restacking(self):
+        """Test capacity doubles and rows stay addressable."""
+        store = EmbeddingStore(initial_capacity=4)
+        for i in range(10):
+            store.add(f"k{i}", np.full(8, i, dtype=np.float32))
+
+        assert len(store) == 10
+        assert store._vectors.shape[0] == 16
+        assert np.allclose(store.get("k7"), 7)
+
+    def test_tombstones_and_compaction(self):
+        """Test deletes tombstone rows until the compaction ratio is hit."""
+        store = EmbeddingStore(initial_capacity=8, compaction_ratio=0.5)
+        for i in range(8):
+            store.add(f"k{i}", np.eye(8, dtype=np.float32)[i])
+
+        store.remove("k0")
+        assert store.tombstones == 1
+        assert not store.alive[0]
+
+        for i in range(1, 5):
+            store.remove(f"k{i}")
+        assert store.tombstones == 0
+        assert store.keys == ["k5", "k6", "k7"]
+        assert np.argmax(store.dot(np.eye(8, dtype=np.float32)[6])) == 1
+
+    @pytest.mark.parametrize("precision", list(EmbeddingPrecision))
+    def test_quantized_dot_products(self, precision):
+        """Test float16/int8 storage approximates float32 inner products."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((20, 32)).astype(np.float32)
+        store = EmbeddingStore(precision=precision)
+        store.add_batch([f"k{i}" for i in range(20)], vectors)
+
+        query = vectors[3]
+        assert np.allclose(store.dot(query), vectors @ query, rtol=0.05, atol=0.5)
+        assert np.argmax(store.dot(query)) == 3
+
+    def test_find_similar_uses_store_and_batch_lookup(self, keyword_matcher):
+        """Test find_similar ranks via the store and skips removed keys."""
+        matcher, cache = keyword_matcher(threshold=0.5)
+        for prompt in ["what is python", "what is rust", "bake a cake"]:
+            cache.set(prompt, f"answer: {prompt}")
+            key = cache._generate_cache_key(prompt)
+            matcher.index_prompt(prompt, key, cache._generate_prompt_hash(prompt))
+
+        matches = matcher.find_similar("what is python?", top_k=2)
+        assert matches[0].prompt == "what is python"
+        assert matches[0].response == "answer: what is python"
+
+        matcher.remove_from_index(matches[0].cache_key)
+        remaining = matcher.find_similar("what is python?", top_k=3)
+        assert all(m.prompt != "what is python" for m in remaining)
+        assert matcher.get_index_stats()["embedding_dimension"] == 64
+
+    def test_get_entries_by_keys(self):
+        """Test batched entry lookup returns only present keys."""
+        cache = LLMCache(CacheConfig())
+        cache.set("a", "1")
+        cache.set("b", "2")
+        keys = [cache._generate_cache_key(p) for p in ("a", "b")]
+
+        entries = cache.get_entries_by_keys(keys + ["missing"])
+        assert {entries[k].value for k in keys} == {"1", "2"}
+        assert "missing" not in entries
+
+
+# Embedding Memo and Batching Tests
+class TestEmbeddingBatching:
+    """Test suite for embedding memoization and micro-batching."""
+
+    def test_memo_skips_repeated_encodes(self, keyword_matcher):
+        """Test repeated prompts are served from the content-hash memo."""
+        matcher, _ = keyword_matcher(embedding_memo_size=2)
+        first = matcher.generate_embedding("what is python")
+        again = matcher.generate_embedding("what is python")
+
+        assert matcher._model.calls == 1
+        assert again is first
+        assert not again.flags.writeable
+
+        matcher.generate_embedding("what is rust")
+        matcher.generate_embedding("bake a cake")
+        matcher.generate_embedding("what is python")
+        assert matcher._model.calls == 4
+        assert matcher.get_index_stats()["memo_size"] == 2
+
+    def test_batch_generation_only_encodes_misses(self, keyword_matcher):
+        """Test generate_embeddings_batch reuses memoized rows."""
+        matcher, _ = keyword_matcher()
+        matcher.generate_embedding("what is python")
+
+        embeddings = matcher.generate_embeddings_batch(
+            ["what is python", "bake a cake", "bake a cake"]
+        )
+        assert embeddings.shape == (3, 64)
+        assert np.allclose(embeddings[1], embeddings[2])
+        assert matcher._memo.hits >= 1
+        assert len(matcher._memo) == 2
+
+    def test_concurrent_calls_coalesce(self):
+        """Test calls arriving during an encode share the next batch."""
+        started, release = threading.Event(), threading.Event()
+        batches: List[List[str]] = []
+
+        def encode_batch(texts):
+            batches.append(list(texts))
+            if len(batches) == 1:
+                started.set()
+                release.wait(5)
+            return np.vstack([keyword_embedding(t) for t in texts])
+
+        batcher = EmbeddingBatcher(encode_batch, max_batch=8)
+        results: Dict[str, np.ndarray] = {}
+
+        def submit(text, slot):
+            results[slot] = batcher.submit(text)
+
+        leader = threading.Thread(target=submit, args=("a", "a"))
+        leader.start()
+        assert started.wait(5)
+        followers = [
+            threading.Thread(target=submit, args=(text, f"{text}{i}"))
+            for i, text in enumerate(["b", "c", "b"])
+        ]
+        for thread in followers:
+            thread.start()
+        while len(batcher._pending) < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        assert batches == [["a"], ["b", "c"]]
+        assert np.allclose(results["b0"], keyword_embedding("b"))
+        assert np.allclose(results["b2"], results["b0"])
+        assert batcher.batched_texts == 4
+
+    def test_batch_errors_reach_every_caller(self):
+        """Test an encode failure is raised to the submitting caller."""
+
+        def encode_batch(texts):
+            raise ValueError("model unavailable")
+
+        batcher = EmbeddingBatcher(encode_batch)
+        with pytest.raises(ValueError):
+            batcher.submit("a")
+        assert not batcher._busy
+
+
+# Index Persistence Tests
+class TestIndexPersistence:
+    """Test suite for the memory-mappable on-disk similarity index."""
+
+    PROMPTS = ["what is python", "what is rust", "bake a cake"]
+
+    def _populate(self, matcher, cache):
+        for prompt in self.PROMPTS:
+            cache.set(prompt, f"answer: {prompt}")
+            matcher.index_prompt(
+                prompt,
+                cache._generate_cache_key(prompt),
+                cache._generate_prompt_hash(prompt),
+                {"source": "test"},
+            )
+
+    def test_binary_round_trip_is_memory_mapped(self, keyword_matcher, tmp_path):
+        """Test import maps the matrix read-only and copies on first write."""
+        matcher, cache = keyword_matcher(threshold=0.5)
+        self._populate(matcher, cache)
+        export_dir = tmp_path / "index"
+        assert matcher.export_index(str(export_dir))
+
+        manifest = json.loads((export_dir / "manifest.json").read_text())
+        assert manifest["version"] == 1
+        assert manifest["count"] == 3
+
+        loaded, _ = keyword_matcher(threshold=0.5)
+        loaded._cache = cache
+        assert loaded.import_index(str(export_dir))
+        assert isinstance(loaded._store._vectors, np.memmap)
+        assert not loaded._store._vectors.flags.writeable
+        assert loaded.find_similar("what is python?")[0].prompt == "what is python"
+        assert loaded._embedding_index[cache._generate_cache_key("bake a cake")]
+        assert (
+            loaded._embedding_index[cache._generate_cache_key("what is rust")]
+            .metadata["source"]
+            == "test"
+        )
+
+        loaded.index_prompt("new prompt", "new-key", "new-hash")
+        assert loaded._store._vectors.flags.writeable
+        assert np.load(export_dir / "embeddings.npy").shape[0] == 3
+
+    def test_checksum_mismatch_rejected(self, keyword_matcher, tmp_path):
+        """Test a corrupted embedding block fails verification."""
+        matcher, cache = keyword_matcher()
+        self._populate(matcher, cache)
+        export_dir = tmp_path / "index"
+        matcher.export_index(str(export_dir))
+
+        embeddings = export_dir / "embeddings.npy"
+        data = bytearray(embeddings.read_bytes())
+        data[-1] ^= 0xFF
+        embeddings.write_bytes(bytes(data))
+
+        assert not matcher.import_index(str(export_dir))
+        assert matcher.import_index(str(export_dir), verify_checksum=False)
+        assert len(matcher) == 3
+
+    def test_import_verifies_once_without_rewrite(self, keyword_matcher, tmp_path):
+        """Test re-imports skip hashing and never rewrite the persisted copy."""
+        matcher, cache = keyword_matcher(threshold=0.5)
+        self._populate(matcher, cache)
+        export_dir = tmp_path / "export" / "index"
+        assert matcher.export_index(str(export_dir))
+        assert matcher.export_index(str(export_dir))
+        assert sorted(p.name for p in export_dir.parent.iterdir()) == ["index"]
+
+        persist_dir = tmp_path / "persist"
+        config = SimilarityConfig(threshold=0.5, persistence_path=str(persist_dir))
+        with patch("similarity_matcher.SentenceTransformer", KeywordEncoder):
+            worker = SimilarityMatcher(config, cache)
+        with patch(
+            "similarity_matcher._file_sha256", side_effect=AssertionError("hashed")
+        ):
+            assert worker.import_index(str(export_dir))
+        assert len(worker) == 3
+        assert not (persist_dir / "index").exists()
+
+        worker.index_prompt("new prompt", "new-key", "new-hash")
+        assert (persist_dir / "index" / "manifest.json").exists()
+
+    def test_persistence_is_debounced(self, tmp_path):
+        """Test bursts of index changes share one write until flushed."""
+        cache = LLMCache(CacheConfig())
+        config = SimilarityConfig(
+            threshold=0.5, persistence_path=str(tmp_path), persistence_interval=60
+        )
+        with patch("similarity_matcher.SentenceTransformer", KeywordEncoder):
+            matcher = SimilarityMatcher(config, cache)
+            with patch(
+                "similarity_matcher.write_index_files", wraps=write_index_files
+            ) as write:
+                self._populate(matcher, cache)
+                matcher.remove_from_index(cache._generate_cache_key("bake a cake"))
+                assert write.call_count == 1
+                with matcher:
+                    pass
+                assert write.call_count == 2
+                assert not matcher.flush()
+
+            reloaded = SimilarityMatcher(config, cache)
+        assert len(reloaded) == 2
+
+    def test_legacy_json_export(self, keyword_matcher, tmp_path):
+        """Test .json paths keep the legacy format with embeddings inline."""
+        matcher, cache = keyword_matcher(threshold=0.5)
+        self._populate(matcher, cache)
+        export_file = tmp_path / "index.json"
+        assert matcher.export_index(str(export_file))
+
+        data = json.loads(export_file.read_text())
+        assert all(len(entry["embedding"]) == 64 for entry in data["index"].values())
+
+        matcher.clear_index()
+        assert matcher.import_index(str(export_file))
+        assert matcher.find_similar("bake a cake")[0].prompt == "bake a cake"
+
+    def test_persistence_reload(self, tmp_path):
+        """Test persisted indexes reload, including the legacy pickle."""
+        cache = LLMCache(CacheConfig())
+        config = SimilarityConfig(threshold=0.5, persistence_path=str(tmp_path))
+        with patch("similarity_matcher.SentenceTransformer", KeywordEncoder):
+            matcher = SimilarityMatcher(config, cache)
+            self._populate(matcher, cache)
+            assert (tmp_path / "index" / "manifest.json").exists()
+            assert matcher.flush()
+
+            reloaded = SimilarityMatcher(config, cache)
+            assert len(reloaded) == 3
+
+            legacy_dir = tmp_path / "legacy"
+            legacy_dir.mkdir()
+            key = cache._generate_cache_key("bake a cake")
+            legacy = {
+                key: {
+                    "cache_key": key,
+                    "prompt": "bake a cake",
+                    "embedding": keyword_embedding("bake a cake", True).tolist(),
+                    "prompt_hash": "hash",
+                    "timestamp": time.time(),
+                    "metadata": {},
+                }
+            }
+            with open(legacy_dir / "embedding_index.pkl", "wb") as f:
+                pickle.dump(legacy, f)
+            legacy_matcher = SimilarityMatcher(
+                SimilarityConfig(threshold=0.5, persistence_path=str(legacy_dir)),
+                cache,
+            )
+
+        assert legacy_matcher.find_similar("bake a cake")[0].cache_key == key
+        assert legacy_matcher._embedding_index[key].embedding == []
+
+
+# ANN Index Tests
+class TestANNIndex:
+    """Test suite for the partitioned nearest-neighbour index."""
+
+    def _vectors(self, count, dim=32, seed=0):
+        rng = np.random.default_rng(seed)
+        vectors = rng.standard_normal((count, dim)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def test_exact_search_and_remove(self):
+        """Test exact backend returns the query itself first."""
+        index = PartitionedANNIndex(ANNIndexConfig(backend=ANNBackend.EXACT))
+        vectors = self._vectors(50)
+        for i, vector in enumerate(vectors):
+            index.add(f"k{i}", vector, partition="gpt-4")
+
+        assert index.search(vectors[7], partition="gpt-4")[0][0] == "k7"
+        assert index.remove("k7")
+        assert "k7" not in index
+        assert index.search(vectors[7], partition="gpt-4")[0][0] != "k7"
+        assert len(index) == 49
+
+    def test_partitions_are_isolated(self):
+        """Test lookups never cross model partitions."""
+        index = PartitionedANNIndex(ANNIndexConfig(backend=ANNBackend.EXACT))
+        vector = self._vectors(1)[0]
+        index.add("a", vector, partition="gpt-4")
+
+        assert index.search(vector, partition="claude") == []
+        index.add("a", vector, partition="claude")
+        assert index.get_stats()["partitions"] == {"gpt-4": 0, "claude": 1}
+
+    def test_ivf_trains_incrementally(self):
+        """Test IVF trains once enough vectors arrive and keeps recall."""
+        config = ANNIndexConfig(backend=ANNBackend.IVF, nlist=8, nprobe=8)
+        index = PartitionedANNIndex(config)
+        vectors = self._vectors(400)
+        for i, vector in enumerate(vectors):
+            index.add(f"k{i}", vector, partition="m")
+
+        assert index._partitions["m"].is_trained
+        for i in (0, 123, 399):
+            assert index.search(vectors[i], partition="m")[0][0] == f"k{i}"
+        assert index.remove("k123")
+        assert len(index) == 399
+
+    def test_cache_manager_fuzzy_hit(self):
+        """Test orchestrate_get falls back to the nearest cached prompt."""
+        manager = CacheManager(similarity_matcher=KeywordMatcher())
+        manager.put("what is the capital of france", "Paris", model_name="gpt-4")
+        manager.put("how do magnets work", "Physics", model_name="gpt-4")
+
+        result = manager.orchestrate_get(
+            "what is the capital of france?!",
+            model_name="gpt-4",
+            similarity_threshold=0.8,
+        )
+        assert result == "Paris"
+        assert manager.get_stats().fuzzy_hit_count == 1
+
+        # Other models never match, evicted entries leave the index
+        missed = manager.orchestrate_get(
+            "what is the capital of france?!", model_name="claude"
+        )
+        assert missed is None
+        manager.batch_invalidate([".*"])
+        assert len(manager._similarity_index) == 0
+
+
+# Consistent Hash Ring Tests
+class TestConsistentHashRing:
+    """Test suite for the bisect-based consistent hash ring."""
+
+    KEYS = [f"key{i}" for i in range(20000)]
+
+    def _owners(self, ring):
+        return [ring.get_node(key) for key in self.KEYS]
+
+    @pytest.mark.parametrize("algorithm", list(HashAlgorithm))
+    def test_movement_fraction_matches_keys(self, algorithm):
+        """Test reported movement matches the share of keys that moved."""
+        if algorithm == HashAlgorithm.XXH3:
+            pytest.importorskip("xxhash")
+        ring = ConsistentHashRing(hash_algorithm=algorithm)
+        assert ring.add_nodes([f"node{i}" for i in range(4)]) == 1.0
+
+        before = self._owners(ring)
+        snapshot = ring.copy()
+        added = ring.add_nodes(["node4", "node5"])
+        after = self._owners(ring)
+        observed = sum(b != a for b, a in zip(before, after)) / len(self.KEYS)
+
+        assert added == pytest.approx(observed, abs=0.02)
+        assert ring.movement_since(snapshot) == pytest.approx(added)
+        assert all(b == a or a in ("node4", "node5") for b, a in zip(before, after))
+
+        removed = ring.remove_nodes(["node0", "node1"])
+        final = self._owners(ring)
+        observed = sum(a != f for a, f in zip(after, final)) / len(self.KEYS)
+        assert removed == pytest.approx(observed, abs=0.02)
+        assert "node0" not in set(final)
+        assert len(ring.sorted_keys) == len(ring.ring) == 400
+
+    def test_weighted_nodes(self):
+        """Test virtual nodes and key share scale with weight."""
+        ring = ConsistentHashRing()
+        ring.add_nodes({"small": 1.0, "large": 3.0})
+
+        owners = self._owners(ring)
+        share = owners.count("large") / len(owners)
+        assert 0.65 < share < 0.85
+        assert len(ring.sorted_keys) == 400
+        with pytest.raises(ValueError):
+            ring.add_node("broken", weight=0)
+
+    def test_get_nodes_walks_ring(self):
+        """Test replica sets are distinct and start at the primary."""
+        ring = ConsistentHashRing()
+        ring.add_nodes(["a", "b", "c"])
+
+        for key in self.KEYS[:100]:
+            nodes = ring.get_nodes(key, 5)
+            assert nodes[0] == ring.get_node(key)
+            assert sorted(nodes) == ["a", "b", "c"]
+
+    def test_rebalance_moves_only_changed_keys(self):
+        """Test rebalance_shards copies moved keys and drops stale copies."""
+        cache = DistributedCache([], replication_config=ReplicationConfig(replicas=1))
+        servers = {
+            f"node{i}:6379": fakeredis.FakeRedis(server=fakeredis.FakeServer())
+            for i in range(4)
+        }
+        for node_id in list(servers)[:3]:
+            cache.attach_client(node_id, servers[node_id])
+        cache.rebalance_shards()
+        items = {f"key{i}": i for i in range(300)}
+        cache.mset_replicated(items, ttl=600)
+
+        old_sets = {key: cache.get_replica_nodes(key) for key in items}
+        movement = cache.attach_client("node3:6379", servers["node3:6379"])
+        cache.remove_nodes(["node0:6379"])
+        changed = sum(cache.get_replica_nodes(k) != old_sets[k] for k in items)
+
+        report = cache.rebalance_shards()
+        assert 0 < movement < 0.5
+        assert report["status"] == "completed"
+        assert report["keys_moved"] == changed < len(items)
+        for key in items:
+            holders = {
+                node
+                for node, client in servers.items()
+                if client.exists(f"llm_cache:{key}")
+            }
+            assert holders == set(cache.get_replica_nodes(key))
+        assert cache.mget_replicated(list(items)) == items
+        assert cache.rebalance_shards()["keys_scanned"] == 0
+        cache.close()
+
+    def test_default_hash_keeps_md5_placement(self):
+        """Test the default ring places keys exactly as the MD5 ring did."""
+        ring = ConsistentHashRing()
+        ring.add_nodes(["node0", "node1", "node2"])
+        assert ring.hash_algorithm == HashAlgorithm.MD5
+
+        def md5(value):
+            return int(hashlib.md5(value.encode()).hexdigest(), 16)
+
+        positions = sorted(
+            (md5(f"{node}:{i}"), node) for node in ring.nodes for i in range(100)
+        )
+        for key in self.KEYS[:500]:
+            expected = next(
+                (node for pos, node in positions if pos >= md5(key)), positions[0][1]
+            )
+            assert ring.get_node(key) == expected
+
+    def test_switch_hash_algorithm_and_rebalance(self):
+        """Test switching the ring hash migrates keys on rebalance."""
+        cache = DistributedCache([], replication_config=ReplicationConfig(replicas=0))
+        servers = {
+            f"node{i}:6379": fakeredis.FakeRedis(server=fakeredis.FakeServer())
+            for i in range(3)
+        }
+        for node_id, server in servers.items():
+            cache.attach_client(node_id, server)
+        cache.rebalance_shards()
+        items = {f"key{i}": i for i in range(200)}
+        cache.mset_replicated(items, ttl=600)
+
+        cache.set_hash_algorithm(HashAlgorithm.BLAKE2B)
+        report = cache.rebalance_shards()
+        assert report["status"] == "completed"
+        assert report["movement_fraction"] == 1.0
+        assert 0 < report["keys_moved"] < len(items)
+        assert cache.mget_replicated(list(items)) == items
+        cache.close()
+
+
+# DistributedCache Bulk Replication Tests
+class TestDistributedBulkReplication:
+    """Test suite for pipelined bulk replication."""
+
+    @pytest.fixture
+    def cluster(self):
+        """Provide a 4-node standalone cluster backed by fakeredis."""
+        cache = DistributedCache([], replication_config=ReplicationConfig(replicas=2))
+        servers = {}
+        for i in range(4):
+            node_id = f"node{i}:6379"
+            servers[node_id] = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+            cache.attach_client(node_id, servers[node_id])
+        yield cache, servers
+        cache.close()
+
+    def test_mset_writes_every_replica(self, cluster):
+        """Test each key lands on exactly its primary and replicas."""
+        cache, servers = cluster
+        items = {f"key{i}": {"n": i} for i in range(200)}
+
+        stored = cache.mset_replicated(items, ttl=60)
+        assert all(stored.values())
+
+        for key in ("key0", "key123"):
+            holders = {
+                node
+                for node, client in servers.items()
+                if client.exists(f"llm_cache:{key}")
+            }
+            assert holders == set(cache.get_replica_nodes(key))
+            assert len(holders) == 3
+        assert cache.mget_replicated(list(items) + ["missing"]) == items
+
+    def test_read_one_fails_over_and_quorum_outvotes(self, cluster):
+        """Test reads survive a dead primary and stale replicas."""
+        cache, servers = cluster
+        cache.mset_replicated({"a": 1, "b": 2})
+
+        primary = cache.get_replica_nodes("a")[0]
+        servers[primary].set("llm_cache:a", pickle.dumps(99))
+        assert cache.mget_replicated(["a"], ConsistencyLevel.QUORUM) == {"a": 1}
+
+        class DownNode:
+            def mget(self, keys):
+                raise ConnectionError("node down")
+
+        cache._redis_clients[primary] = DownNode()
+        assert cache.mget_replicated(["a", "b"]) == {"a": 1, "b": 2}
+
+    def test_write_consistency_levels(self, cluster):
+        """Test ALL fails when a replica is down while QUORUM succeeds."""
+        cache, _ = cluster
+        assert cache.get_required_acks(ConsistencyLevel.ONE) == 1
+        assert cache.get_required_acks(ConsistencyLevel.QUORUM) == 2
+        assert cache.get_required_acks(ConsistencyLevel.ALL) == 3
+
+        node = cache.get_replica_nodes("k")[1]
+
+        class DownNode:
+            def pipeline(self, transaction=True):
+                raise ConnectionError("node down")
+
+            def mset(self, mapping):
+                raise ConnectionError("node down")
+
+        cache._redis_clients[node] = DownNode()
+        assert cache.mset_replicated({"k": 1}) == {"k": True}
+        assert cache.mset_replicated({"k": 1}, consistency=ConsistencyLevel.ALL) == {
+            "k": False
+        }
+
+
 # DistributedCache Tests
 class TestDistributedCache:
     """Test suite for DistributedCache."""
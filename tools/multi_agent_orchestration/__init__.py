@@ -6,7 +6,7 @@ workflows with intelligent task delegation, resource management, and
 hub-and-spoke coordination patterns.
 
 Core Components:
-    - Task Orchestrator: Prefect-based workflow coordination
+    - Task Orchestrator: Concurrent DAG workflow coordination
     - Delegation Manager: Capability-based task routing
     - Workflow Engine: Sequential, parallel, and conditional execution
     - Resource Allocator: Agent resource management
@@ -34,13 +34,14 @@ from .hub_spoke_coordinator import HubAgent, HubSpokeCoordinator, SpokeAgent
 from .resource_allocator import (Priority, ResourceAllocator, ResourceLimits,
                                  ResourceReservation, ResourceUsage,
                                  TaskAllocation)
-from .task_orchestrator import Task, TaskOrchestrator, Workflow
+from .task_orchestrator import FailureMode, Task, TaskOrchestrator, Workflow
 from .workflow_engine import WorkflowEngine, WorkflowStatus
 
 __all__ = [
     "TaskOrchestrator",
     "Workflow",
     "Task",
+    "FailureMode",
     "DelegationManager",
     "AgentCapability",
     "TaskRequest",
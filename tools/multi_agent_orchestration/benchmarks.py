@@ -0,0 +1,1169 @@
+"""
+Micro-benchmarks for the Multi-Agent Orchestration Platform.
+
+Each benchmark returns a list of result dictionaries so it can be driven
+from tests or notebooks; running the module prints the results as tables.
+
+Examples:
+    python benchmarks.py dag -s 10000
+    python benchmarks.py dag -s 10000 --shape wide --shape deep -c 32
+    python benchmarks.py delegation -n 100 -n 1000 -n 10000
+    python benchmarks.py batch -t 100 -t 500 -n 1000
+    python benchmarks.py handoff -t 10 -t 100 -t 1000
+    python benchmarks.py allocator -n 100 -n 1000 -n 10000
+    python benchmarks.py conditions -e 1000000
+    python benchmarks.py parallel -t 1000 --context-mb 10 -c 16 -c 64
+    python benchmarks.py resume -s 1000 -s 5000 -s 10000
+
+Author: devCrew_s1
+License: MIT
+"""
+
+import gc
+import json
+import logging
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from unittest.mock import patch
+
+import click
+from tabulate import tabulate
+
+try:
+    from .delegation_manager import (
+        AgentCapability,
+        AgentMatch,
+        DelegationManager,
+        TaskRequest,
+    )
+    from .handoff_manager import AgentContext, HandoffManager
+    from .resource_allocator import ResourceAllocator
+    from .task_orchestrator import Task, TaskOrchestrator, TaskStatus, Workflow
+    from .workflow_engine import CheckpointLog, WorkflowEngine
+except ImportError:
+    # Fallback for direct execution
+    sys.path.insert(0, str(Path(__file__).parent))
+    from delegation_manager import (
+        AgentCapability,
+        AgentMatch,
+        DelegationManager,
+        TaskRequest,
+    )
+    from handoff_manager import AgentContext, HandoffManager
+    from resource_allocator import ResourceAllocator
+    from task_orchestrator import Task, TaskOrchestrator, TaskStatus, Workflow
+    from workflow_engine import CheckpointLog, WorkflowEngine
+
+# Layers per DAG shape as a function of task count: "wide" is two broad
+# layers, "deep" is a long chain of narrow layers, "layered" sits in between.
+DAG_SHAPES: Dict[str, Callable[[int], int]] = {
+    "wide": lambda size: 2,
+    "layered": lambda size: max(1, int(size**0.5)),
+    "deep": lambda size: max(1, size // 4),
+}
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    """Run ``func`` once and return the elapsed wall-clock seconds."""
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def synthetic_workflow(
+    size: int, layers: int, fan_in: int = 3, seed: int = 0
+) -> Workflow:
+    """
+    Build a layered DAG with ``size`` tasks spread over ``layers`` levels.
+
+    Every task outside the first layer depends on up to ``fan_in`` random
+    tasks from the previous layer, so the critical path is ``layers`` long.
+
+    Args:
+        size: Number of tasks
+        layers: Number of dependency levels
+        fan_in: Maximum dependencies per task
+        seed: Random seed for reproducible graphs
+
+    Returns:
+        Workflow with all tasks pending
+    """
+    rng = random.Random(seed)
+    per_layer = max(1, size // layers)
+    tasks: List[Task] = []
+    previous: List[str] = []
+    current: List[str] = []
+
+    for i in range(size):
+        if i % per_layer == 0 and current:
+            previous, current = current, []
+        depends_on = (
+            rng.sample(previous, min(fan_in, len(previous))) if previous else []
+        )
+        task_id = f"task-{i}"
+        tasks.append(Task(task_id=task_id, agent_type="bench", depends_on=depends_on))
+        current.append(task_id)
+
+    return Workflow(workflow_id=f"bench-{size}-{layers}", name="bench", tasks=tasks)
+
+
+def _reset(workflow: Workflow) -> None:
+    """Return every task in ``workflow`` to PENDING for another run."""
+    for task in workflow.tasks:
+        task.status = TaskStatus.PENDING
+        task.output = None
+        task.error = None
+    workflow.tasks_completed = 0
+    workflow.tasks_failed = 0
+
+
+def _serial_ready_scan(workflow: Workflow) -> None:
+    """Schedule ``workflow`` the old way: rescan for ready tasks each round."""
+    remaining = len(workflow.tasks)
+    while remaining:
+        ready = workflow.get_ready_tasks()
+        for task in ready:
+            task.status = TaskStatus.COMPLETED
+        remaining -= len(ready)
+
+
+def benchmark_dag(
+    sizes: Sequence[int] = (10_000,),
+    shapes: Sequence[str] = tuple(DAG_SHAPES),
+    max_concurrency: int = 16,
+    task_ms: float = 0.0,
+    scan_max_work: int = 2_000_000,
+) -> List[Dict[str, Any]]:
+    """
+    Measure TaskOrchestrator scheduling on synthetic DAGs.
+
+    The DAG scheduler runs every task through execute_workflow(); with
+    ``task_ms`` set, each task sleeps that long on the thread pool so the
+    effect of concurrent dispatch is visible. The serial ready-scan baseline
+    only measures scheduling (repeated get_ready_tasks()); it costs about
+    tasks * layers and is skipped above ``scan_max_work``.
+
+    Args:
+        sizes: Task counts to benchmark
+        shapes: DAG shapes from DAG_SHAPES
+        max_concurrency: Orchestrator concurrency limit
+        task_ms: Simulated work per task in milliseconds
+        scan_max_work: Largest tasks * layers product for the baseline
+
+    Returns:
+        One result dictionary per size and shape
+    """
+    results: List[Dict[str, Any]] = []
+
+    for size in sizes:
+        for shape in shapes:
+            layers = DAG_SHAPES[shape](size)
+            workflow = synthetic_workflow(size, layers)
+            orchestrator = TaskOrchestrator(max_concurrency=max_concurrency)
+            orchestrator.create_workflow(workflow)
+
+            def run(task: Task, previous_results: Dict[str, Any]) -> Dict[str, Any]:
+                if task_ms:
+                    time.sleep(task_ms / 1000)
+                return {}
+
+            orchestrator._execute_task = run  # type: ignore[method-assign]
+
+            validate_s = _timed(workflow.validate_dependencies)
+            dag_s = _timed(lambda: orchestrator.execute_workflow(workflow.workflow_id))
+            assert workflow.tasks_completed == size
+
+            scan_s = None
+            if size * layers <= scan_max_work:
+                _reset(workflow)
+                scan_s = _timed(lambda: _serial_ready_scan(workflow))
+
+            results.append(
+                {
+                    "tasks": size,
+                    "shape": shape,
+                    "layers": layers,
+                    "edges": sum(len(t.depends_on) for t in workflow.tasks),
+                    "validate_ms": round(validate_s * 1000, 1),
+                    "dag_run_s": round(dag_s, 3),
+                    "tasks_per_s": round(size / dag_s) if dag_s else None,
+                    "ready_scan_s": round(scan_s, 3) if scan_s is not None else "-",
+                }
+            )
+
+    return results
+
+
+def _delegation_manager(redis_url: Optional[str]) -> DelegationManager:
+    """
+    Create a DelegationManager on ``redis_url``, or on in-process fakeredis.
+
+    fakeredis runs every command in Python, so absolute latencies are far
+    above a real Redis; the ratio between lookup strategies is what counts.
+    """
+    if redis_url:
+        return DelegationManager(redis_url=redis_url)
+
+    import fakeredis
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    with patch("redis.from_url", return_value=client):
+        return DelegationManager()
+
+
+def _scan_find_best_agent(
+    manager: DelegationManager, task_request: TaskRequest
+) -> Optional[AgentMatch]:
+    """Select an agent the pre-index way: one GET pair per registered agent."""
+    client = manager.redis_client
+    index_key = (
+        f"{manager.AGENT_TYPE_INDEX}{task_request.required_agent_type}"
+        if task_request.required_agent_type
+        else manager.AGENT_INDEX_KEY
+    )
+    matches: List[AgentMatch] = []
+    for agent_id in client.smembers(index_key):
+        agent_data = client.get(f"{manager.AGENT_PREFIX}{agent_id}")
+        if not agent_data:
+            continue
+        agent = AgentCapability.model_validate_json(agent_data)
+        current_load = int(client.get(f"{manager.AGENT_LOAD_PREFIX}{agent_id}") or 0)
+        if not agent.available or current_load >= agent.max_concurrent_tasks:
+            continue
+        score, matched, missing = manager._calculate_capability_score(
+            agent.capabilities, task_request.required_capabilities
+        )
+        if score:
+            matches.append(
+                AgentMatch(
+                    agent_id=agent_id,
+                    agent_type=agent.agent_type,
+                    score=score,
+                    current_load=current_load,
+                    max_load=agent.max_concurrent_tasks,
+                    priority_weight=agent.priority_weight,
+                )
+            )
+    return max(matches, key=lambda m: m.effective_score, default=None)
+
+
+def benchmark_delegation(
+    fleet_sizes: Sequence[int] = (100, 1_000, 10_000),
+    queries: int = 50,
+    capabilities: int = 40,
+    redis_url: Optional[str] = None,
+    scan_max: int = 10_000,
+    scan_queries: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Measure find_best_agent latency against fleet size.
+
+    Each agent gets 3-6 of ``capabilities`` random skills, a random type out
+    of eight, a random load and priority. Queries ask for 2-3 skills, half of
+    them restricted to a type. The per-agent scan baseline runs the first
+    ``scan_queries`` queries and is skipped for fleets above ``scan_max``.
+
+    Args:
+        fleet_sizes: Numbers of registered agents
+        queries: Timed find_best_agent calls per fleet size
+        capabilities: Size of the capability vocabulary
+        redis_url: Redis to run against; in-process fakeredis by default
+        scan_max: Largest fleet for the per-agent scan baseline
+        scan_queries: Queries timed for the per-agent scan baseline
+
+    Returns:
+        One result dictionary per fleet size with mean latencies in ms
+    """
+    rng = random.Random(0)
+    skills = [f"skill-{i}" for i in range(capabilities)]
+    types = [f"type-{i}" for i in range(8)]
+    results: List[Dict[str, Any]] = []
+
+    for size in fleet_sizes:
+        manager = _delegation_manager(redis_url)
+        manager.reset()
+        for i in range(size):
+            manager.register_agent(
+                agent_id=f"agent-{i}",
+                agent_type=rng.choice(types),
+                capabilities=rng.sample(skills, rng.randint(3, 6)),
+                max_concurrent_tasks=4,
+                priority_weight=rng.randint(1, 100),
+            )
+            manager.set_agent_load(f"agent-{i}", rng.randint(0, 4))
+
+        requests = [
+            TaskRequest(
+                task_id=f"task-{q}",
+                task_type="bench",
+                required_capabilities=rng.sample(skills, rng.randint(2, 3)),
+                required_agent_type=rng.choice(types) if q % 2 else None,
+            )
+            for q in range(queries)
+        ]
+
+        found: List[Optional[AgentMatch]] = []
+        expected: List[Optional[AgentMatch]] = []
+        scan_requests = requests[:scan_queries]
+
+        indexed_s = _timed(
+            lambda: found.extend(manager.find_best_agent(r) for r in requests)
+        )
+        row: Dict[str, Any] = {
+            "agents": size,
+            "indexed_ms": round(indexed_s / queries * 1000, 2),
+            "scan_ms": "-",
+            "speedup": "-",
+        }
+        if size <= scan_max:
+            scan_s = _timed(
+                lambda: expected.extend(
+                    _scan_find_best_agent(manager, r) for r in scan_requests
+                )
+            )
+            scan_ms = scan_s / len(scan_requests) * 1000
+            row["scan_ms"] = round(scan_ms, 2)
+            row["speedup"] = round(scan_ms / row["indexed_ms"], 1)
+            # Both paths must agree on the best achievable score
+            for best, reference in zip(found, expected):
+                assert (best is None) == (reference is None)
+                if best and reference:
+                    assert (
+                        abs(best.effective_score - reference.effective_score)
+                        < 1e-9
+                    )
+
+        manager.reset()
+        manager.close()
+        results.append(row)
+
+    return results
+
+
+def benchmark_batch(
+    burst_sizes: Sequence[int] = (100, 500),
+    agents: int = 1_000,
+    capabilities: int = 40,
+    redis_url: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compare greedy per-task delegation with delegate_batch on a task burst.
+
+    The same fleet and burst are delegated twice: once with find_best_agent
+    plus delegate_task per task, once with a single delegate_batch call.
+    Agents have 2 slots each and a random priority; tasks ask for 1-2
+    skills and a quarter of them are high priority.
+
+    Args:
+        burst_sizes: Tasks per burst
+        agents: Registered agents
+        capabilities: Size of the capability vocabulary
+        redis_url: Redis to run against; in-process fakeredis by default
+
+    Returns:
+        One result dictionary per burst size and strategy
+    """
+    skills = [f"skill-{i}" for i in range(capabilities)]
+    results: List[Dict[str, Any]] = []
+
+    for burst in burst_sizes:
+        rng = random.Random(burst)
+        fleet = [
+            (f"agent-{i}", rng.sample(skills, rng.randint(2, 5)), rng.randint(1, 100))
+            for i in range(agents)
+        ]
+        tasks = [
+            TaskRequest(
+                task_id=f"task-{t}",
+                task_type="bench",
+                required_capabilities=rng.sample(skills, rng.randint(1, 2)),
+                priority="high" if t % 4 == 0 else "medium",
+            )
+            for t in range(burst)
+        ]
+
+        for strategy in ("greedy", "batch"):
+            manager = _delegation_manager(redis_url)
+            manager.reset()
+            for agent_id, agent_skills, priority_weight in fleet:
+                manager.register_agent(
+                    agent_id=agent_id,
+                    agent_type="bench",
+                    capabilities=agent_skills,
+                    max_concurrent_tasks=2,
+                    priority_weight=priority_weight,
+                )
+
+            delegations: List[Dict[str, Any]] = []
+
+            def greedy() -> None:
+                for task in tasks:
+                    match = manager.find_best_agent(task)
+                    if match:
+                        delegations.append(manager.delegate_task(task, match))
+
+            def batch() -> None:
+                delegations.extend(manager.delegate_batch(tasks)["delegations"])
+
+            elapsed = _timed(greedy if strategy == "greedy" else batch)
+            by_id = {d["task_id"]: d for d in delegations}
+            results.append(
+                {
+                    "tasks": burst,
+                    "strategy": strategy,
+                    "elapsed_ms": round(elapsed * 1000, 1),
+                    "placed": len(delegations),
+                    "high_placed": sum(
+                        1 for t in tasks if t.priority == "high" and t.task_id in by_id
+                    ),
+                    "full_match": sum(d["match_score"] == 1.0 for d in delegations),
+                    "total_score": round(
+                        sum(d["effective_score"] for d in delegations), 2
+                    ),
+                    "agents_full": sum(
+                        d["agent_load"] == d["max_load"] for d in delegations
+                    ),
+                }
+            )
+            manager.reset()
+            manager.close()
+
+    return results
+
+
+def synthetic_conversation(turns: int, seed: int = 0) -> List[Dict[str, str]]:
+    """
+    Build a conversation of ``turns`` user/assistant pairs.
+
+    Messages are 20-80 words drawn from a 2,000-word vocabulary, which
+    compresses roughly like English prose rather than like repeated text.
+
+    Args:
+        turns: Number of user/assistant exchanges
+        seed: Random seed for reproducible text
+
+    Returns:
+        Conversation history with 2 * ``turns`` entries
+    """
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 9)))
+        for _ in range(2_000)
+    ]
+    conversation = []
+    for _ in range(turns):
+        for role in ("user", "assistant"):
+            words = rng.choices(vocabulary, k=rng.randint(20, 80))
+            conversation.append({"role": role, "content": " ".join(words)})
+    return conversation
+
+
+def benchmark_handoff(
+    turn_counts: Sequence[int] = (10, 100, 1_000),
+    repeats: int = 20,
+    redis_url: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compare the JSON context path with the binary codec and delta transfer.
+
+    For each conversation length the context is encoded with
+    serialize_context() (JSON) and pack_context() (msgpack/zstd). It is then
+    handed from agent A to B, one new exchange is appended, and it is handed
+    on from B to C; ``delta_bytes`` is what that second transfer wrote.
+
+    Args:
+        turn_counts: Conversation lengths in user/assistant exchanges
+        repeats: Encode/decode iterations averaged per measurement
+        redis_url: Redis to run against; in-process fakeredis by default
+
+    Returns:
+        One result dictionary per conversation length
+    """
+    if redis_url:
+        import redis
+
+        client = redis.from_url(redis_url)
+    else:
+        import fakeredis
+
+        client = fakeredis.FakeRedis()
+
+    results: List[Dict[str, Any]] = []
+    for turns in turn_counts:
+        manager = HandoffManager(redis_client=client)
+        context = AgentContext(
+            agent_id="agent-a",
+            agent_type="bench",
+            conversation_history=synthetic_conversation(turns),
+            state={"tests_passing": True, "coverage": 87.5},
+        )
+
+        def mean_ms(func: Callable[[], Any]) -> float:
+            elapsed = _timed(lambda: [func() for _ in range(repeats)])
+            return round(elapsed * 1000 / repeats, 3)
+
+        json_data = manager.serialize_context(context)
+        packed = manager.pack_context(context)
+
+        manager.transfer_context("agent-a", "agent-b", context)
+        context.conversation_history.extend(synthetic_conversation(1, seed=turns))
+        start = time.perf_counter()
+        manager.transfer_context("agent-b", "agent-c", context)
+        delta_ms = (time.perf_counter() - start) * 1000
+        delta = json.loads(client.get(f"{manager.METADATA_PREFIX}agent-c"))
+
+        receiver = HandoffManager(redis_client=client)
+        start = time.perf_counter()
+        received = receiver.get_transferred_context("agent-c")
+        load_ms = (time.perf_counter() - start) * 1000
+        assert received == context
+
+        results.append(
+            {
+                "turns": turns,
+                "json_bytes": len(json_data.encode("utf-8")),
+                "packed_bytes": len(packed),
+                "delta_bytes": delta["context_bytes"],
+                "json_ser_ms": mean_ms(lambda: manager.serialize_context(context)),
+                "json_de_ms": mean_ms(lambda: manager.deserialize_context(json_data)),
+                "pack_ms": mean_ms(lambda: manager.pack_context(context)),
+                "unpack_ms": mean_ms(lambda: manager.unpack_context(packed)),
+                "delta_transfer_ms": round(delta_ms, 3),
+                "cold_load_ms": round(load_ms, 3),
+            }
+        )
+        client.delete(*client.keys("handoff:*"))
+
+    return results
+
+
+def _scan_available_agents(
+    allocator: ResourceAllocator, cpu: float, memory: float
+) -> List[str]:
+    """List available agents the pre-ledger way: SCAN plus reads per agent."""
+    available = []
+    for key in allocator.redis_client.scan_iter(match="agent:*:usage", count=100):
+        usage = allocator.get_agent_usage(key.split(":")[1])
+        if (
+            usage.cpu_available >= cpu
+            and usage.memory_available >= memory
+            and usage.tasks_available > 0
+        ):
+            available.append(usage.agent_id)
+    return available
+
+
+def benchmark_allocator(
+    fleet_sizes: Sequence[int] = (100, 1_000, 10_000),
+    operations: int = 200,
+    queries: int = 20,
+    redis_url: Optional[str] = None,
+    scan_max: int = 10_000,
+    scan_queries: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Measure ResourceAllocator queries against fleet size.
+
+    Each agent gets limits and one running task. The timed loop allocates
+    and releases ``operations`` tasks. Each timed availability query follows
+    an untimed allocation, so the ledger always has an event to apply. The
+    SCAN-based baseline runs ``scan_queries`` queries and is skipped for
+    fleets above ``scan_max``.
+
+    Args:
+        fleet_sizes: Numbers of agents with resource limits
+        operations: Timed allocate/release pairs per fleet size
+        queries: Timed get_available_agents calls per fleet size
+        redis_url: Redis to run against; in-process fakeredis by default
+        scan_max: Largest fleet for the SCAN baseline
+        scan_queries: Queries timed for the SCAN baseline
+
+    Returns:
+        One result dictionary per fleet size with mean latencies in ms
+    """
+    rng = random.Random(0)
+    results: List[Dict[str, Any]] = []
+
+    for size in fleet_sizes:
+        if redis_url:
+            allocator = ResourceAllocator(redis_url=redis_url)
+        else:
+            import fakeredis
+
+            client = fakeredis.FakeRedis(decode_responses=True)
+            with patch("redis.from_url", return_value=client):
+                allocator = ResourceAllocator()
+        allocator.redis_client.flushdb()
+
+        for i in range(size):
+            allocator.set_agent_limits(f"agent-{i}", 4.0, 8192.0, 4)
+            allocator.allocate_resources(
+                f"agent-{i}", rng.choice([1.0, 2.0, 3.5]), 1024.0, f"seed-{i}"
+            )
+        build_s = _timed(allocator.ledger.rebuild)
+
+        agents = [f"agent-{rng.randrange(size)}" for _ in range(operations)]
+
+        def churn() -> None:
+            for n, agent_id in enumerate(agents):
+                allocator.allocate_resources(agent_id, 0.5, 256.0, f"bench-{n}")
+                allocator.release_resources(agent_id, f"bench-{n}")
+
+        churn_s = _timed(churn)
+
+        found: List[List[str]] = []
+        query_s = 0.0
+        for n in range(queries):
+            allocator.allocate_resources(agents[n], 0.5, 256.0, f"query-{n}")
+            start = time.perf_counter()
+            found.append(allocator.get_available_agents(1.0, 1024.0))
+            query_s += time.perf_counter() - start
+        row: Dict[str, Any] = {
+            "agents": size,
+            "ledger_build_ms": round(build_s * 1000, 1),
+            "alloc_release_ms": round(churn_s / operations * 1000, 3),
+            "ledger_query_ms": round(query_s / queries * 1000, 3),
+            "scan_query_ms": "-",
+            "speedup": "-",
+            "deadlock_check_ms": round(_timed(allocator.detect_deadlocks) * 1000, 3),
+        }
+        if size <= scan_max:
+            expected: List[List[str]] = []
+            scan_s = _timed(
+                lambda: expected.extend(
+                    _scan_available_agents(allocator, 1.0, 1024.0)
+                    for _ in range(scan_queries)
+                )
+            )
+            scan_ms = scan_s / scan_queries * 1000
+            row["scan_query_ms"] = round(scan_ms, 1)
+            row["speedup"] = round(scan_ms / row["ledger_query_ms"])
+            assert sorted(expected[-1]) == sorted(found[-1])
+
+        allocator.redis_client.flushdb()
+        allocator.close()
+        results.append(row)
+
+    return results
+
+
+# Representative ConditionalBranch expressions and a context they run on
+CONDITIONS = (
+    "tests_passing",
+    "coverage >= 80 and status == completed",
+    "not blocked and (severity == critical or labels contains hotfix)",
+    "result.coverage > 90 or owner in [alice, bob] and retries < 3",
+)
+CONDITION_CONTEXT: Dict[str, Any] = {
+    "tests_passing": True,
+    "coverage": 85.5,
+    "status": "completed",
+    "blocked": False,
+    "severity": "major",
+    "labels": "bug,hotfix",
+    "result": {"coverage": 88.0},
+    "owner": "carol",
+    "retries": 1,
+}
+
+
+def _resolve_value(expr: str, context: Dict[str, Any]) -> Any:
+    """Resolve an operand the pre-compiler way."""
+    if (expr.startswith('"') and expr.endswith('"')) or (
+        expr.startswith("'") and expr.endswith("'")
+    ):
+        return expr[1:-1]
+    try:
+        if "." in expr:
+            return float(expr)
+        return int(expr)
+    except ValueError:
+        pass
+    if expr.lower() == "true":
+        return True
+    if expr.lower() == "false":
+        return False
+    if expr.lower() == "none":
+        return None
+    if expr.startswith("[") and expr.endswith("]"):
+        try:
+            return json.loads(expr)
+        except json.JSONDecodeError:
+            pass
+    if "." in expr:
+        value: Any = context
+        for part in expr.split("."):
+            if isinstance(value, dict):
+                value = value.get(part)
+            else:
+                return None
+        return value
+    return context.get(expr, expr)
+
+
+def _interpret_condition(condition_expr: str, context: Dict[str, Any]) -> bool:
+    """Evaluate a condition the pre-compiler way: re-parse on every call."""
+    if " and " in condition_expr.lower():
+        parts = re.split(r"\s+and\s+", condition_expr, flags=re.IGNORECASE)
+        return all(_interpret_condition(p.strip(), context) for p in parts)
+    if " or " in condition_expr.lower():
+        parts = re.split(r"\s+or\s+", condition_expr, flags=re.IGNORECASE)
+        return any(_interpret_condition(p.strip(), context) for p in parts)
+    if condition_expr.strip().lower().startswith("not "):
+        return not _interpret_condition(condition_expr.strip()[4:].strip(), context)
+    operators = [
+        (">=", lambda a, b: a >= b),
+        ("<=", lambda a, b: a <= b),
+        ("==", lambda a, b: a == b),
+        ("!=", lambda a, b: a != b),
+        (">", lambda a, b: a > b),
+        ("<", lambda a, b: a < b),
+    ]
+    for op, func in operators:
+        if op in condition_expr:
+            left, right = condition_expr.split(op, 1)
+            return func(
+                _resolve_value(left.strip(), context),
+                _resolve_value(right.strip(), context),
+            )
+    if " contains " in condition_expr.lower():
+        parts = re.split(r"\s+contains\s+", condition_expr, flags=re.IGNORECASE)
+        return _resolve_value(parts[1].strip(), context) in str(
+            _resolve_value(parts[0].strip(), context)
+        )
+    if " in " in condition_expr.lower():
+        parts = re.split(r"\s+in\s+", condition_expr, flags=re.IGNORECASE)
+        left_val = _resolve_value(parts[0].strip(), context)
+        right_val = _resolve_value(parts[1].strip(), context)
+        if isinstance(right_val, (list, set, tuple)):
+            return left_val in right_val
+        return left_val in str(right_val)
+    if condition_expr.strip().lower() in ("true", "false"):
+        return condition_expr.strip().lower() == "true"
+    return bool(_resolve_value(condition_expr.strip(), context))
+
+
+def benchmark_conditions(evaluations: int = 1_000_000) -> List[Dict[str, Any]]:
+    """
+    Compare compiled condition evaluation with re-parsing on every call.
+
+    ``evaluations`` calls are split evenly over CONDITIONS. The compiled
+    path is WorkflowEngine.evaluate_condition(); the baseline re-implements
+    the previous string-splitting evaluator. The baseline splits on ``and``
+    before ``or`` and has no parentheses, so the two paths are only checked
+    for agreement on expressions that do not mix the two.
+
+    Args:
+        evaluations: Total evaluations per strategy
+
+    Returns:
+        One result dictionary per expression
+    """
+    import fakeredis
+
+    with patch("redis.from_url", return_value=fakeredis.FakeRedis()):
+        engine = WorkflowEngine()
+
+    per_expr = max(1, evaluations // len(CONDITIONS))
+    results: List[Dict[str, Any]] = []
+    for expr in CONDITIONS:
+        compiled = engine.evaluate_condition(expr, CONDITION_CONTEXT)
+        legacy = _interpret_condition(expr, CONDITION_CONTEXT)
+        if " or " not in expr or " and " not in expr:
+            assert compiled == legacy
+
+        legacy_s = _timed(
+            lambda: [
+                _interpret_condition(expr, CONDITION_CONTEXT) for _ in range(per_expr)
+            ]
+        )
+        compiled_s = _timed(
+            lambda: [
+                engine.evaluate_condition(expr, CONDITION_CONTEXT)
+                for _ in range(per_expr)
+            ]
+        )
+        results.append(
+            {
+                "expression": expr,
+                "evaluations": per_expr,
+                "reparse_us": round(legacy_s / per_expr * 1e6, 2),
+                "compiled_us": round(compiled_s / per_expr * 1e6, 2),
+                "speedup": round(legacy_s / compiled_s, 1),
+                "result": compiled,
+            }
+        )
+
+    return results
+
+
+def shared_context(megabytes: int) -> Dict[str, str]:
+    """Build a context of roughly ``megabytes`` MB spread over 1 KB values."""
+    return {f"key-{i:06d}": "x" * 1024 for i in range(megabytes * 1024)}
+
+
+def _copy_per_task(
+    tasks: List[Task],
+    context: Dict[str, Any],
+    run: Callable[[Task], Dict[str, Any]],
+) -> None:
+    """
+    Previous parallel mode: submit every task at once, each with its own
+    context copy so tasks cannot see each other's writes.
+    """
+
+    def execute(task: Task) -> Dict[str, Any]:
+        task.input_data["context"] = dict(context)
+        return run(task)
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        for future in [executor.submit(execute, task) for task in tasks]:
+            future.result()
+
+
+def benchmark_parallel(
+    tasks: int = 1_000,
+    context_mb: int = 10,
+    concurrency: Sequence[int] = (16, 64),
+    task_ms: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """
+    Compare bounded copy-on-write parallel execution with unbounded copies.
+
+    The baseline submits all tasks at once with a private shallow copy of
+    the shared context per task (a deep copy of 10 MB per task would not
+    fit in memory at 1k tasks). The bounded mode runs
+    WorkflowEngine.execute_parallel, which overlays the shared context
+    instead of copying it. Peak memory is measured with tracemalloc on a
+    separate run and excludes the shared context itself.
+
+    Args:
+        tasks: Tasks per run
+        context_mb: Size of the shared context in MB
+        concurrency: max_concurrency values for the bounded mode
+        task_ms: Simulated work per task in milliseconds
+
+    Returns:
+        One result dictionary per execution mode
+    """
+    import fakeredis
+
+    with patch("redis.from_url", return_value=fakeredis.FakeRedis()):
+        engine = WorkflowEngine()
+    context = shared_context(context_mb)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def run(task: Task) -> Dict[str, Any]:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        task.input_data["context"][task.task_id] = "done"
+        time.sleep(task_ms / 1000)
+        with lock:
+            in_flight[0] -= 1
+        return {"task_id": task.task_id}
+
+    engine._execute_single_task = run
+
+    modes: List[tuple] = [
+        (
+            "copy per task, unbounded",
+            None,
+            lambda batch: _copy_per_task(batch, context, run),
+        )
+    ]
+    for limit in concurrency:
+        modes.append(
+            (
+                "copy-on-write, bounded",
+                limit,
+                lambda batch, limit=limit: engine.execute_parallel(
+                    batch, context, max_concurrency=limit
+                ),
+            )
+        )
+
+    results: List[Dict[str, Any]] = []
+    for mode, limit, execute in modes:
+        batch = [Task(task_id=f"task-{i}", agent_type="bench") for i in range(tasks)]
+        in_flight[:] = [0, 0]
+        elapsed = _timed(lambda: execute(batch))
+        assert all(t.status == TaskStatus.COMPLETED for t in batch) or limit is None
+
+        # Memory is measured on a second run; tracing slows the timed one.
+        batch = [Task(task_id=f"task-{i}", agent_type="bench") for i in range(tasks)]
+        gc.collect()
+        tracemalloc.start()
+        execute(batch)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(context) == context_mb * 1024
+        results.append(
+            {
+                "mode": mode,
+                "tasks": tasks,
+                "context_mb": context_mb,
+                "max_concurrency": limit or tasks,
+                "peak_in_flight": in_flight[1],
+                "elapsed_s": round(elapsed, 3),
+                "peak_alloc_mb": round(peak / 2**20, 1),
+            }
+        )
+        del batch
+
+    return results
+
+
+def benchmark_resume(
+    sizes: Sequence[int] = (1_000, 5_000, 10_000),
+    task_ms: float = 1.0,
+    max_concurrency: int = 16,
+) -> List[Dict[str, Any]]:
+    """
+    Measure resuming a fully checkpointed workflow on a fresh engine.
+
+    Each size is a layered synthetic workflow. The baseline re-runs every
+    task, which is what a restarted engine had to do without checkpoints.
+    The resume paths call execute_workflow() on a new engine over the
+    checkpoint database: once after the compaction that ends a run, and
+    once with every completion still in the uncompacted log tail, as
+    after a crash.
+
+    Args:
+        sizes: Completed tasks per workflow
+        task_ms: Simulated work per task in milliseconds
+        max_concurrency: Engine concurrency limit
+
+    Returns:
+        One result dictionary per size
+    """
+    import fakeredis
+
+    def run(task: Task) -> Dict[str, Any]:
+        time.sleep(task_ms / 1000)
+        return {"task_id": task.task_id, "summary": "ok" * 32}
+
+    def engine(path: Optional[str]) -> WorkflowEngine:
+        with patch("redis.from_url", return_value=fakeredis.FakeRedis()):
+            instance = WorkflowEngine(
+                max_concurrency=max_concurrency, checkpoint_path=path
+            )
+        instance._execute_single_task = run  # type: ignore[method-assign]
+        return instance
+
+    def execute(instance: WorkflowEngine, size: int) -> str:
+        workflow = synthetic_workflow(size, max(1, int(size**0.5)))
+        instance.workflows[workflow.workflow_id] = workflow
+        instance.execute_workflow(workflow.workflow_id)
+        return workflow.workflow_id
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            compacted = str(Path(tmp) / f"compacted-{size}.db")
+            tail = str(Path(tmp) / f"tail-{size}.db")
+
+            rerun_s = _timed(lambda: execute(engine(None), size))
+            start = time.perf_counter()
+            workflow_id = execute(engine(compacted), size)
+            checkpointed_s = time.perf_counter() - start
+
+            # Copy the completions into a log that never compacts
+            source = CheckpointLog(compacted)
+            log = CheckpointLog(tail, compact_threshold=size + 1)
+            for task_id, entry in source.load(workflow_id).items():
+                log.append(
+                    workflow_id,
+                    Task(task_id=task_id, agent_type="bench", output=entry["output"]),
+                )
+            source.close()
+            log.close()
+
+            resume_compacted_s = _timed(lambda: execute(engine(compacted), size))
+            resume_tail_s = _timed(lambda: execute(engine(tail), size))
+            results.append(
+                {
+                    "completed_tasks": size,
+                    "rerun_s": round(rerun_s, 3),
+                    "checkpointed_run_s": round(checkpointed_s, 3),
+                    "resume_compacted_ms": round(resume_compacted_s * 1000, 1),
+                    "resume_tail_ms": round(resume_tail_s * 1000, 1),
+                    "speedup": round(rerun_s / resume_compacted_s, 1),
+                }
+            )
+
+    return results
+
+
+def print_results(title: str, results: List[Dict[str, Any]]) -> None:
+    """Print benchmark results as a table."""
+    if not results:
+        click.echo(f"{title}: no results")
+        return
+    click.echo(f"\n{title}")
+    click.echo(tabulate(results, headers="keys", tablefmt="github"))
+
+
+@click.group()
+def cli() -> None:
+    """Micro-benchmarks for the Multi-Agent Orchestration Platform."""
+    logging.basicConfig(level=logging.ERROR)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=(10_000,),
+    help="Tasks per workflow",
+)
+@click.option(
+    "--shape",
+    type=click.Choice(list(DAG_SHAPES)),
+    multiple=True,
+    default=tuple(DAG_SHAPES),
+    help="DAG shapes to compare",
+)
+@click.option("--concurrency", "-c", type=int, default=16, help="Max concurrency")
+@click.option("--task-ms", type=float, default=0.0, help="Simulated work per task")
+def dag(
+    sizes: Sequence[int], shape: Sequence[str], concurrency: int, task_ms: float
+) -> None:
+    """Benchmark DAG scheduling against the serial ready-task rescan."""
+    results = benchmark_dag(sizes, shape, concurrency, task_ms)
+    print_results("TaskOrchestrator DAG scheduling", results)
+
+
+@cli.command()
+@click.option(
+    "--agents",
+    "-n",
+    type=int,
+    multiple=True,
+    default=(100, 1_000, 10_000),
+    help="Registered agents",
+)
+@click.option("--queries", "-q", type=int, default=50, help="Timed lookups")
+@click.option("--redis-url", default=None, help="Redis URL (default: fakeredis)")
+def delegation(agents: Sequence[int], queries: int, redis_url: Optional[str]) -> None:
+    """Benchmark indexed find_best_agent against a per-agent scan."""
+    results = benchmark_delegation(agents, queries, redis_url=redis_url)
+    print_results("DelegationManager.find_best_agent", results)
+
+
+@cli.command()
+@click.option(
+    "--tasks",
+    "-t",
+    type=int,
+    multiple=True,
+    default=(100, 500),
+    help="Tasks per burst",
+)
+@click.option("--agents", "-n", type=int, default=1_000, help="Registered agents")
+@click.option("--redis-url", default=None, help="Redis URL (default: fakeredis)")
+def batch(tasks: Sequence[int], agents: int, redis_url: Optional[str]) -> None:
+    """Benchmark greedy per-task delegation against delegate_batch."""
+    results = benchmark_batch(tasks, agents, redis_url=redis_url)
+    print_results("DelegationManager burst delegation", results)
+
+
+@cli.command()
+@click.option(
+    "--turns",
+    "-t",
+    type=int,
+    multiple=True,
+    default=(10, 100, 1_000),
+    help="Conversation exchanges per context",
+)
+@click.option("--repeats", "-r", type=int, default=20, help="Timed iterations")
+@click.option("--redis-url", default=None, help="Redis URL (default: fakeredis)")
+def handoff(turns: Sequence[int], repeats: int, redis_url: Optional[str]) -> None:
+    """Benchmark JSON context handoff against the binary delta codec."""
+    results = benchmark_handoff(turns, repeats, redis_url=redis_url)
+    print_results("HandoffManager context transfer", results)
+
+
+@cli.command()
+@click.option(
+    "--agents",
+    "-n",
+    type=int,
+    multiple=True,
+    default=(100, 1_000, 10_000),
+    help="Agents with resource limits",
+)
+@click.option("--operations", "-o", type=int, default=200, help="Timed allocations")
+@click.option("--redis-url", default=None, help="Redis URL (default: fakeredis)")
+def allocator(agents: Sequence[int], operations: int, redis_url: Optional[str]) -> None:
+    """Benchmark ledger-backed availability queries against a key scan."""
+    results = benchmark_allocator(agents, operations, redis_url=redis_url)
+    print_results("ResourceAllocator availability and allocation", results)
+
+
+@cli.command()
+@click.option(
+    "--evaluations",
+    "-e",
+    type=int,
+    default=1_000_000,
+    help="Evaluations per strategy, split over the expressions",
+)
+def conditions(evaluations: int) -> None:
+    """Benchmark compiled conditions against re-parsing each evaluation."""
+    results = benchmark_conditions(evaluations)
+    print_results("WorkflowEngine.evaluate_condition", results)
+
+
+@cli.command()
+@click.option("--tasks", "-t", type=int, default=1_000, help="Tasks per run")
+@click.option("--context-mb", type=int, default=10, help="Shared context size")
+@click.option(
+    "--concurrency",
+    "-c",
+    type=int,
+    multiple=True,
+    default=(16, 64),
+    help="Bounded max_concurrency",
+)
+@click.option("--task-ms", type=float, default=1.0, help="Simulated work per task")
+def parallel(
+    tasks: int, context_mb: int, concurrency: Sequence[int], task_ms: float
+) -> None:
+    """Benchmark bounded copy-on-write execution against unbounded copies."""
+    results = benchmark_parallel(tasks, context_mb, concurrency, task_ms)
+    print_results("WorkflowEngine.execute_parallel", results)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    "-s",
+    type=int,
+    multiple=True,
+    default=(1_000, 5_000, 10_000),
+    help="Completed tasks per workflow",
+)
+@click.option("--task-ms", type=float, default=1.0, help="Simulated work per task")
+@click.option("--concurrency", "-c", type=int, default=16, help="Max concurrency")
+def resume(sizes: Sequence[int], task_ms: float, concurrency: int) -> None:
+    """Benchmark checkpoint resume against re-running the workflow."""
+    results = benchmark_resume(sizes, task_ms, concurrency)
+    print_results("WorkflowEngine checkpoint resume", results)
+
+
+if __name__ == "__main__":
+    cli()
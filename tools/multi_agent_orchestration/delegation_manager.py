@@ -6,14 +6,21 @@ balancing with Redis-based agent registry and health monitoring.
 """
 
 import logging
+import uuid
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import redis
 from pydantic import BaseModel, Field, field_validator
 from redis.exceptions import ConnectionError as RedisConnectionError
-from redis.exceptions import RedisError
+from redis.exceptions import RedisError, WatchError
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
 
 logger = logging.getLogger(__name__)
 
@@ -245,24 +252,145 @@ class AgentMatch(BaseModel):
         if not self.available or self.current_load >= self.max_load:
             return 0.0
 
-        # Base score from capability matching
-        base_score = self.score
+        # Weighted combination: 50% capability match, the rest from load
+        # balancing and priority weight
+        effective = self.score * CAPABILITY_WEIGHT + dispatch_score(
+            self.current_load, self.max_load, self.priority_weight
+        )
 
-        # Load factor: prefer agents with lower load
-        # Normalize load to 0-1 range (inverted so lower load = higher score)
-        load_factor = 1.0 - (self.current_load / self.max_load)
+        return min(1.0, max(0.0, effective))
 
-        # Priority factor: normalize priority weight to 0-1 range
-        priority_factor = self.priority_weight / 100.0
 
-        # Weighted combination
-        effective = (
-            base_score * 0.5  # 50% capability match
-            + load_factor * 0.3  # 30% load balancing
-            + priority_factor * 0.2  # 20% priority weight
-        )
+# Share of the effective score that comes from capability matching.
+CAPABILITY_WEIGHT = 0.5
 
-        return min(1.0, max(0.0, effective))
+
+def dispatch_score(current_load: int, max_load: int, priority_weight: int) -> float:
+    """
+    Calculate the load and priority part of an agent's effective score.
+
+    Args:
+        current_load: Current number of active tasks
+        max_load: Maximum concurrent tasks
+        priority_weight: Agent priority weight (1-100)
+
+    Returns:
+        Score in the range 0.0 to 0.5
+    """
+    # Load factor: prefer agents with lower load
+    # Normalize load to 0-1 range (inverted so lower load = higher score)
+    load_factor = 1.0 - (current_load / max_load)
+
+    # Priority factor: normalize priority weight to 0-1 range
+    priority_factor = priority_weight / 100.0
+
+    return load_factor * 0.3 + priority_factor * 0.2  # 30% load, 20% priority
+
+
+# Relative value of placing a task of each priority in delegate_batch().
+TASK_PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 1.0,
+    TaskPriority.MEDIUM: 2.0,
+    TaskPriority.HIGH: 4.0,
+}
+
+
+def _hungarian(cost: np.ndarray) -> np.ndarray:
+    """
+    Solve a rectangular min-cost assignment with the Hungarian algorithm.
+
+    Shortest augmenting path with row/column potentials, O(n^2 m), with
+    the inner column scan vectorized. Rows whose cheapest column is not
+    contested are assigned up front, so only conflicts are augmented.
+    Used when scipy is not installed.
+
+    Args:
+        cost: Cost matrix of shape (n, m) with n <= m
+
+    Returns:
+        Column assigned to each row
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)  # row (1-based) owning column j
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    # Row reduction keeps the duals feasible and every row minimum tight
+    u[1:] = cost.min(axis=1)
+    assigned = np.zeros(n + 1, dtype=bool)
+    for row, col in enumerate(np.argmin(cost, axis=1) + 1, start=1):
+        if owner[col] == 0:
+            owner[col] = row
+            assigned[row] = True
+
+    for row in np.flatnonzero(~assigned[1:]) + 1:
+        owner[0] = row
+        j0 = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used[1:]
+            slack = cost[i0 - 1] - u[i0] - v[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = j0
+            j1 = int(np.argmin(np.where(free, min_slack[1:], np.inf))) + 1
+            delta = min_slack[j1]
+            used_cols = np.flatnonzero(used)
+            u[owner[used_cols]] += delta
+            v[used_cols] -= delta
+            min_slack[1:][free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    assignment = np.empty(n, dtype=np.int64)
+    cols = np.flatnonzero(owner[1:])
+    assignment[owner[1:][cols] - 1] = cols
+    return assignment
+
+
+def max_weight_assignment(benefit: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Pick at most one column per row and row per column maximizing benefit.
+
+    Entries that are not positive are never assigned, so a row may stay
+    unassigned. Uses scipy's linear_sum_assignment when available.
+
+    Args:
+        benefit: Benefit matrix of shape (rows, columns)
+
+    Returns:
+        (row, column) pairs of the assignment
+    """
+    if benefit.size == 0:
+        return []
+
+    # Every positive entry beats leaving its row unassigned; non-positive
+    # entries cost as much as an empty pairing.
+    cost = -np.maximum(benefit, 0.0)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(cost)
+    else:
+        rows, cols = np.arange(cost.shape[0]), _hungarian(cost)
+
+    if transposed:
+        rows, cols = cols, rows
+    return [
+        (int(r), int(c)) for r, c in zip(rows, cols) if benefit[r, c] > 0.0
+    ]
 
 
 class DelegationManager:
@@ -271,6 +399,12 @@ class DelegationManager:
 
     Manages agent registry, capability matching, load balancing,
     and task delegation with Redis-based persistence.
+
+    Candidate selection is index-driven: each capability has a set of the
+    agents offering it, and dispatch ZSETs (one overall, one per agent type)
+    score every available agent with spare capacity by load and priority.
+    find_best_agent() combines them server-side and only fetches the top
+    few finalists, so a lookup takes two round trips at any fleet size.
     """
 
     # Redis key prefixes
@@ -278,12 +412,19 @@ class DelegationManager:
     AGENT_LOAD_PREFIX = "agent:load:"
     AGENT_INDEX_KEY = "agents:index"
     AGENT_TYPE_INDEX = "agents:type:"
+    CAPABILITY_INDEX = "agents:capability:"
+    DISPATCH_INDEX_KEY = "agents:dispatch"
+    DISPATCH_TYPE_INDEX = "agents:dispatch:type:"
+    MATCH_SCRATCH_PREFIX = "agents:match:"
     TASK_QUEUE_PREFIX = "task:queue:"
 
     # Agent TTL settings
     AGENT_TTL_SECONDS = 300  # 5 minutes
     AGENT_HEARTBEAT_INTERVAL = 60  # 1 minute
 
+    # Top-ranked candidates re-checked against live agent data per lookup
+    FINALIST_POOL_SIZE = 8
+
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379",
@@ -375,8 +516,15 @@ class DelegationManager:
             agent_data = agent_cap.model_dump_json()
             agent_key = f"{self.AGENT_PREFIX}{agent_id}"
 
+            # Re-registration may change type or capabilities
+            previous_data = self.redis_client.get(agent_key)
+
             # Store agent data with TTL
             pipeline = self.redis_client.pipeline()
+            if previous_data:
+                self._unindex_agent(
+                    pipeline, AgentCapability.model_validate_json(previous_data)
+                )
             pipeline.setex(
                 agent_key,
                 self.AGENT_TTL_SECONDS,
@@ -394,6 +542,11 @@ class DelegationManager:
             load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
             pipeline.set(load_key, 0)
 
+            # Add to capability and dispatch indices
+            for capability in set(agent_cap.capabilities):
+                pipeline.sadd(f"{self.CAPABILITY_INDEX}{capability}", agent_id)
+            self._update_dispatch_index(pipeline, agent_cap, 0)
+
             pipeline.execute()
 
             logger.info(
@@ -447,6 +600,7 @@ class DelegationManager:
 
             type_index_key = f"{self.AGENT_TYPE_INDEX}{agent.agent_type}"
             pipeline.srem(type_index_key, agent_id)
+            self._unindex_agent(pipeline, agent)
 
             # Remove load counter
             load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
@@ -461,6 +615,212 @@ class DelegationManager:
             logger.error(f"Failed to deregister agent {agent_id}: {e}")
             raise
 
+    def _update_dispatch_index(
+        self,
+        pipeline: Any,
+        agent: AgentCapability,
+        current_load: int,
+    ) -> None:
+        """
+        Queue a dispatch index update for an agent on a pipeline.
+
+        Agents that are unavailable or at capacity are removed, so they
+        never surface as candidates.
+
+        Args:
+            pipeline: Redis pipeline to queue commands on
+            agent: Agent descriptor
+            current_load: Agent's current number of active tasks
+        """
+        type_key = f"{self.DISPATCH_TYPE_INDEX}{agent.agent_type}"
+
+        if not agent.available or current_load >= agent.max_concurrent_tasks:
+            pipeline.zrem(self.DISPATCH_INDEX_KEY, agent.agent_id)
+            pipeline.zrem(type_key, agent.agent_id)
+            return
+
+        mapping = {
+            agent.agent_id: dispatch_score(
+                current_load, agent.max_concurrent_tasks, agent.priority_weight
+            )
+        }
+        pipeline.zadd(self.DISPATCH_INDEX_KEY, mapping)
+        pipeline.zadd(type_key, mapping)
+
+    def _change_load(self, agent_id: str, update: Callable[[int], int]) -> int:
+        """
+        Change an agent's load and dispatch score in one transaction.
+
+        The load and agent data are WATCHed, so a concurrent change between
+        reading the load and indexing the new score retries instead of
+        leaving the dispatch index with another caller's stale load.
+
+        Args:
+            agent_id: Agent identifier
+            update: Maps the current load to the new load
+
+        Returns:
+            The new load
+        """
+        agent_key = f"{self.AGENT_PREFIX}{agent_id}"
+        load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
+
+        def apply(pipeline: Any) -> int:
+            agent_data, raw_load = pipeline.mget(agent_key, load_key)
+            current_load = int(raw_load or 0)
+            new_load = update(current_load)
+            pipeline.multi()
+            if new_load != current_load:
+                # INCRBY keeps any TTL on the counter, unlike SET
+                pipeline.incrby(load_key, new_load - current_load)
+            if agent_data:
+                self._update_dispatch_index(
+                    pipeline, AgentCapability.model_validate_json(agent_data), new_load
+                )
+            return new_load
+
+        return self.redis_client.transaction(
+            apply, agent_key, load_key, value_from_callable=True
+        )
+
+    def _unindex_agent(self, pipeline: Any, agent: AgentCapability) -> None:
+        """
+        Queue removal of an agent from capability and dispatch indices.
+
+        Args:
+            pipeline: Redis pipeline to queue commands on
+            agent: Agent descriptor as it was indexed
+        """
+        for capability in set(agent.capabilities):
+            pipeline.srem(f"{self.CAPABILITY_INDEX}{capability}", agent.agent_id)
+        pipeline.zrem(self.DISPATCH_INDEX_KEY, agent.agent_id)
+        pipeline.zrem(f"{self.DISPATCH_TYPE_INDEX}{agent.agent_type}", agent.agent_id)
+
+    def _drop_stale_agents(
+        self,
+        agent_ids: Iterable[str],
+        dispatch_keys: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Remove agents whose data has expired from the indices.
+
+        Their capabilities and type are no longer known, so every capability
+        and dispatch index is scanned. With dispatch_keys, only those
+        dispatch ZSETs are touched, which is enough to stop the agents being
+        ranked; cleanup_expired_agents() removes the rest later.
+
+        Args:
+            agent_ids: Expired agent identifiers
+            dispatch_keys: Only remove from these dispatch ZSETs
+        """
+        agent_ids = list(agent_ids)
+        if not agent_ids:
+            return
+
+        set_keys: List[str] = []
+        if dispatch_keys is None:
+            dispatch_keys = [self.DISPATCH_INDEX_KEY] + list(
+                self.redis_client.scan_iter(f"{self.DISPATCH_TYPE_INDEX}*")
+            )
+            set_keys = list(self.redis_client.scan_iter(f"{self.CAPABILITY_INDEX}*"))
+
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in dispatch_keys:
+            pipeline.zrem(key, *agent_ids)
+        for key in set_keys:
+            pipeline.srem(key, *agent_ids)
+        pipeline.execute()
+
+    def _rank_candidates(
+        self,
+        required_capabilities: List[str],
+        agent_type: Optional[str],
+        count: int,
+    ) -> List[str]:
+        """
+        Rank candidate agents server-side by estimated effective score.
+
+        Capability sets are unioned with weights so each agent scores its
+        share of matched capabilities, then intersected with a dispatch
+        ZSET to add its load and priority score. Runs as one MULTI/EXEC.
+
+        Args:
+            required_capabilities: Normalized required capabilities
+            agent_type: Restrict to this agent type
+            count: Number of top candidates to return
+
+        Returns:
+            Agent IDs, best first
+        """
+        weight = CAPABILITY_WEIGHT / len(required_capabilities)
+        dispatch_key = (
+            f"{self.DISPATCH_TYPE_INDEX}{agent_type}"
+            if agent_type
+            else self.DISPATCH_INDEX_KEY
+        )
+        scratch = f"{self.MATCH_SCRATCH_PREFIX}{uuid.uuid4().hex}"
+        matched_key, ranked_key = f"{scratch}:matched", f"{scratch}:ranked"
+
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.zunionstore(
+            matched_key,
+            {f"{self.CAPABILITY_INDEX}{cap}": weight for cap in required_capabilities},
+        )
+        pipeline.zinterstore(ranked_key, {matched_key: 1, dispatch_key: 1})
+        pipeline.zrevrange(ranked_key, 0, count - 1)
+        pipeline.delete(matched_key, ranked_key)
+        return pipeline.execute()[2]
+
+    def rebuild_indices(self) -> int:
+        """
+        Rebuild capability and dispatch indices from the agent registry.
+
+        Needed once for registries created before the indices existed.
+
+        Returns:
+            Number of agents indexed
+
+        Raises:
+            RedisError: If Redis operation fails
+        """
+        try:
+            agent_ids = sorted(self.redis_client.smembers(self.AGENT_INDEX_KEY))
+            values = self.redis_client.mget(
+                [f"{self.AGENT_PREFIX}{aid}" for aid in agent_ids]
+                + [f"{self.AGENT_LOAD_PREFIX}{aid}" for aid in agent_ids]
+            )
+            agent_values = values[: len(agent_ids)]
+            load_values = values[len(agent_ids) :]
+
+            pipeline = self.redis_client.pipeline()
+            for pattern in (
+                f"{self.CAPABILITY_INDEX}*",
+                f"{self.DISPATCH_TYPE_INDEX}*",
+            ):
+                for key in self.redis_client.scan_iter(pattern):
+                    pipeline.delete(key)
+            pipeline.delete(self.DISPATCH_INDEX_KEY)
+
+            indexed = 0
+            for agent_data, load in zip(agent_values, load_values):
+                if not agent_data:
+                    continue
+                agent = AgentCapability.model_validate_json(agent_data)
+                for capability in set(agent.capabilities):
+                    pipeline.sadd(
+                        f"{self.CAPABILITY_INDEX}{capability}", agent.agent_id
+                    )
+                self._update_dispatch_index(pipeline, agent, int(load or 0))
+                indexed += 1
+
+            pipeline.execute()
+            logger.info(f"Rebuilt delegation indices for {indexed} agents")
+            return indexed
+
+        except RedisError as e:
+            logger.error(f"Failed to rebuild delegation indices: {e}")
+            raise
+
     def _calculate_capability_score(
         self,
         agent_capabilities: List[str],
@@ -511,6 +871,9 @@ class DelegationManager:
         Find the best agent for a task request.
 
         Considers capability matching, load balancing, and agent priority.
+        Candidates are ranked server-side from the capability and dispatch
+        indices; only the top FINALIST_POOL_SIZE (plus any excluded agents)
+        are fetched and re-scored from live data.
 
         Args:
             task_request: Task delegation request
@@ -522,73 +885,99 @@ class DelegationManager:
             RedisError: If Redis operation fails
         """
         try:
-            # Get candidate agents
-            # fmt: off
-            if task_request.required_agent_type:
-                # Filter by specific agent type
-                type_index = (
-                    f"{self.AGENT_TYPE_INDEX}"
-                    f"{task_request.required_agent_type}"
-                )
-                candidate_ids = self.redis_client.smembers(type_index)
-            else:
-                # Get all agents
-                candidate_ids = self.redis_client.smembers(
-                    self.AGENT_INDEX_KEY
-                )
-            # fmt: on
+            required = sorted(set(task_request.required_capabilities))
+            agent_type = task_request.required_agent_type
+            exclude_set = set(task_request.exclude_agents)
+            pool_size = self.FINALIST_POOL_SIZE + len(exclude_set)
+            matches: List[AgentMatch] = []
 
-            if not candidate_ids:
-                logger.warning("No agents available for task delegation")
+            # Index scores can lag a concurrent load change, so finalists are
+            # re-scored from live data; widen the pool only if none survive.
+            while True:
+                ranked = self._rank_candidates(required, agent_type, pool_size)
+                finalists = [aid for aid in ranked if aid not in exclude_set]
+                matches = self._score_finalists(finalists, required, agent_type)
+                if matches or len(ranked) < pool_size:
+                    break
+                pool_size *= 2
+
+            if not matches:
+                logger.warning(
+                    f"No suitable agent found for task {task_request.task_id}"
+                )
                 return None
 
-            # Filter excluded agents
-            exclude_set = set(task_request.exclude_agents)
-            candidate_ids = {aid for aid in candidate_ids if aid not in exclude_set}
+            # Sort by effective score (descending)
+            matches.sort(key=lambda m: m.effective_score, reverse=True)
 
-            if not candidate_ids:
-                logger.warning("All available agents are excluded")
-                return None
+            best_match = matches[0]
 
-            # Score each candidate
-            matches: List[AgentMatch] = []
+            logger.info(
+                f"Selected agent {best_match.agent_id} for task "
+                f"{task_request.task_id} "
+                f"(score: {best_match.effective_score:.3f})"
+            )
 
-            for agent_id in candidate_ids:
-                agent_key = f"{self.AGENT_PREFIX}{agent_id}"
-                agent_data = self.redis_client.get(agent_key)
+            return best_match
 
-                if not agent_data:
-                    # Agent expired, remove from index
-                    self.redis_client.srem(self.AGENT_INDEX_KEY, agent_id)
-                    continue
+        except RedisError as e:
+            logger.error(f"Failed to find best agent: {e}")
+            raise
 
-                # Parse agent data
-                agent = AgentCapability.model_validate_json(agent_data)
+    def _score_finalists(
+        self,
+        agent_ids: List[str],
+        required_capabilities: List[str],
+        agent_type: Optional[str],
+    ) -> List[AgentMatch]:
+        """
+        Score candidate agents from live agent data fetched in one MGET.
 
-                # Skip unavailable agents
-                if not agent.available:
-                    continue
+        Args:
+            agent_ids: Candidate agent identifiers
+            required_capabilities: Normalized required capabilities
+            agent_type: Agent type the candidates were ranked under
 
-                # Get current load
-                load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
-                current_load = int(self.redis_client.get(load_key) or 0)
+        Returns:
+            Matches for agents that are available, have capacity and match
+            at least one capability
+        """
+        if not agent_ids:
+            return []
 
-                # Skip agents at capacity
-                if current_load >= agent.max_concurrent_tasks:
-                    continue
+        values = self.redis_client.mget(
+            [f"{self.AGENT_PREFIX}{aid}" for aid in agent_ids]
+            + [f"{self.AGENT_LOAD_PREFIX}{aid}" for aid in agent_ids]
+        )
+        matches: List[AgentMatch] = []
+        expired: List[str] = []
 
-                # Calculate capability score
-                score, matched, missing = self._calculate_capability_score(
-                    agent.capabilities,
-                    task_request.required_capabilities,
-                )
+        for agent_id, agent_data, load in zip(
+            agent_ids, values[: len(agent_ids)], values[len(agent_ids) :]
+        ):
+            if not agent_data:
+                expired.append(agent_id)
+                continue
 
-                # Skip agents with no matching capabilities
-                if score == 0.0:
-                    continue
+            agent = AgentCapability.model_validate_json(agent_data)
+            current_load = int(load or 0)
+
+            # Skip unavailable agents and agents at capacity
+            if not agent.available or current_load >= agent.max_concurrent_tasks:
+                continue
+
+            # Calculate capability score
+            score, matched, missing = self._calculate_capability_score(
+                agent.capabilities,
+                required_capabilities,
+            )
 
-                # Create match result
-                match = AgentMatch(
+            # Skip agents with no matching capabilities
+            if score == 0.0:
+                continue
+
+            matches.append(
+                AgentMatch(
                     agent_id=agent_id,
                     agent_type=agent.agent_type,
                     score=score,
@@ -599,31 +988,16 @@ class DelegationManager:
                     available=agent.available,
                     priority_weight=agent.priority_weight,
                 )
-
-                matches.append(match)
-
-            if not matches:
-                logger.warning(
-                    f"No suitable agent found for task {task_request.task_id}"
-                )
-                return None
-
-            # Sort by effective score (descending)
-            matches.sort(key=lambda m: m.effective_score, reverse=True)
-
-            best_match = matches[0]
-
-            logger.info(
-                f"Selected agent {best_match.agent_id} for task "
-                f"{task_request.task_id} "
-                f"(score: {best_match.effective_score:.3f})"
             )
 
-            return best_match
+        if expired:
+            # Agent expired, stop ranking it until cleanup_expired_agents()
+            dispatch_keys = [self.DISPATCH_INDEX_KEY]
+            if agent_type:
+                dispatch_keys.append(f"{self.DISPATCH_TYPE_INDEX}{agent_type}")
+            self._drop_stale_agents(expired, dispatch_keys)
 
-        except RedisError as e:
-            logger.error(f"Failed to find best agent: {e}")
-            raise
+        return matches
 
     def find_agent(
         self,
@@ -689,27 +1063,11 @@ class DelegationManager:
                 )
 
             # Increment agent load
-            load_key = f"{self.AGENT_LOAD_PREFIX}{agent_match.agent_id}"
-            new_load = self.redis_client.incr(load_key)
-
-            # Record delegation timestamp
-            delegation_time = datetime.now(timezone.utc)
-
-            delegation_result = {
-                "task_id": task_request.task_id,
-                "agent_id": agent_match.agent_id,
-                "agent_type": agent_match.agent_type,
-                "delegated_at": delegation_time.isoformat(),
-                "match_score": agent_match.score,
-                "effective_score": agent_match.effective_score,
-                "agent_load": new_load,
-                "max_load": agent_match.max_load,
-                "matched_capabilities": agent_match.matched_capabilities,
-                "missing_capabilities": agent_match.missing_capabilities,
-                "estimated_duration": task_request.estimated_duration,
-                "timeout": task_request.timeout,
-                "priority": task_request.priority.value,
-            }
+            new_load = self._change_load(agent_match.agent_id, lambda load: load + 1)
+
+            delegation_result = self._delegation_record(
+                task_request, agent_match, new_load
+            )
 
             logger.info(
                 f"Delegated task {task_request.task_id} to agent "
@@ -727,6 +1085,274 @@ class DelegationManager:
             logger.error(f"Failed to delegate task: {e}")
             raise
 
+    @staticmethod
+    def _delegation_record(
+        task_request: TaskRequest,
+        agent_match: AgentMatch,
+        new_load: int,
+    ) -> Dict[str, Any]:
+        """Build the delegation details returned for one delegated task."""
+        return {
+            "task_id": task_request.task_id,
+            "agent_id": agent_match.agent_id,
+            "agent_type": agent_match.agent_type,
+            "delegated_at": datetime.now(timezone.utc).isoformat(),
+            "match_score": agent_match.score,
+            "effective_score": agent_match.effective_score,
+            "agent_load": new_load,
+            "max_load": agent_match.max_load,
+            "matched_capabilities": agent_match.matched_capabilities,
+            "missing_capabilities": agent_match.missing_capabilities,
+            "estimated_duration": task_request.estimated_duration,
+            "timeout": task_request.timeout,
+            "priority": task_request.priority.value,
+        }
+
+    def delegate_batch(
+        self,
+        task_requests: List[TaskRequest],
+        max_retries: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        Delegate a batch of tasks with one global assignment.
+
+        Instead of picking the best agent per task in turn, every free
+        capacity slot of every candidate agent becomes a column of a benefit
+        matrix: the task's effective_score on that agent at the load it
+        would have after filling the slot, weighted by task priority.
+        Capability, agent type and exclusion constraints mask entries out.
+        A min-cost assignment over the matrix spreads the burst across the
+        fleet and gives scarce capacity to high-priority tasks first.
+
+        Capacity is reserved for all assigned tasks in one MULTI/EXEC that
+        WATCHes the chosen agents; if any of them changed meanwhile, the
+        batch is re-planned.
+
+        Args:
+            task_requests: Tasks to delegate
+            max_retries: Re-plans allowed after concurrent agent changes
+
+        Returns:
+            Dictionary with "delegations" (details per assigned task, as
+            returned by delegate_task), "unassigned" task IDs and
+            "total_score" (sum of effective scores)
+
+        Raises:
+            ValueError: If task IDs are duplicated
+            RedisError: If Redis operation fails, including WatchError when
+                retries are exhausted
+        """
+        task_ids = [task.task_id for task in task_requests]
+        if len(set(task_ids)) != len(task_ids):
+            raise ValueError("Task IDs in a batch must be unique")
+
+        try:
+            for attempt in range(max_retries + 1):
+                plan = self._plan_batch(task_requests)
+                try:
+                    self._reserve_batch(plan)
+                    break
+                except WatchError:
+                    if attempt == max_retries:
+                        raise
+                    logger.info("Agents changed during batch delegation, re-planning")
+
+            delegations = [
+                self._delegation_record(task_requests[t], match, match.current_load + 1)
+                for t, match in plan["matches"]
+            ]
+            assigned = {task_requests[t].task_id for t, _ in plan["matches"]}
+            unassigned = [tid for tid in task_ids if tid not in assigned]
+
+            logger.info(
+                f"Delegated {len(delegations)} of {len(task_requests)} tasks "
+                f"in batch ({len(unassigned)} unassigned)"
+            )
+            return {
+                "delegations": delegations,
+                "unassigned": unassigned,
+                "total_score": sum(d["effective_score"] for d in delegations),
+            }
+
+        except RedisError as e:
+            logger.error(f"Failed to delegate batch: {e}")
+            raise
+
+    def _plan_batch(self, task_requests: List[TaskRequest]) -> Dict[str, Any]:
+        """
+        Compute the assignment for delegate_batch() from live agent data.
+
+        Returns:
+            Plan with "matches" ((task index, AgentMatch) pairs, AgentMatch
+            carrying the load before that task), "agents" (AgentCapability
+            by ID), "loads" (current load by ID) and "counts" (tasks
+            assigned per agent ID)
+        """
+        plan: Dict[str, Any] = {"matches": [], "agents": {}, "loads": {}, "counts": {}}
+        if not task_requests:
+            return plan
+
+        vocabulary = sorted(
+            {cap for task in task_requests for cap in task.required_capabilities}
+        )
+        cap_column = {cap: c for c, cap in enumerate(vocabulary)}
+
+        # Candidates: agents with any required capability and spare capacity
+        scratch = f"{self.MATCH_SCRATCH_PREFIX}{uuid.uuid4().hex}"
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.zunionstore(
+            scratch, [f"{self.CAPABILITY_INDEX}{cap}" for cap in vocabulary]
+        )
+        pipeline.zinterstore(scratch, {scratch: 0, self.DISPATCH_INDEX_KEY: 0})
+        pipeline.zrange(scratch, 0, -1)
+        pipeline.delete(scratch)
+        candidate_ids = pipeline.execute()[2]
+        if not candidate_ids:
+            return plan
+
+        values = self.redis_client.mget(
+            [f"{self.AGENT_PREFIX}{aid}" for aid in candidate_ids]
+            + [f"{self.AGENT_LOAD_PREFIX}{aid}" for aid in candidate_ids]
+        )
+        agents: List[AgentCapability] = []
+        loads: List[int] = []
+        for agent_data, load in zip(
+            values[: len(candidate_ids)], values[len(candidate_ids) :]
+        ):
+            if not agent_data:
+                continue
+            agent = AgentCapability.model_validate_json(agent_data)
+            current_load = int(load or 0)
+            if agent.available and current_load < agent.max_concurrent_tasks:
+                agents.append(agent)
+                loads.append(current_load)
+        if not agents:
+            return plan
+
+        # Capability match score per (task, agent)
+        required = np.zeros((len(task_requests), len(vocabulary)))
+        for t, task in enumerate(task_requests):
+            required[t, [cap_column[c] for c in task.required_capabilities]] = 1
+        offered = np.zeros((len(agents), len(vocabulary)))
+        for a, agent in enumerate(agents):
+            columns = [cap_column[c] for c in agent.capabilities if c in cap_column]
+            offered[a, columns] = 1
+        score = (required @ offered.T) / required.sum(axis=1, keepdims=True)
+
+        feasible = score > 0.0
+        agent_types = np.array([agent.agent_type for agent in agents])
+        agent_index = {agent.agent_id: a for a, agent in enumerate(agents)}
+        for t, task in enumerate(task_requests):
+            if task.required_agent_type:
+                feasible[t] &= agent_types == task.required_agent_type
+            for agent_id in task.exclude_agents:
+                if agent_id in agent_index:
+                    feasible[t, agent_index[agent_id]] = False
+
+        load = np.array(loads, dtype=float)
+        capacity = np.array([a.max_concurrent_tasks for a in agents], dtype=float)
+        priority = np.array([a.priority_weight for a in agents], dtype=float)
+        weight = np.array([TASK_PRIORITY_WEIGHTS[t.priority] for t in task_requests])
+
+        # Only a task's best len(tasks) agents can matter: the other tasks
+        # occupy at most len(tasks) - 1 of them, leaving one free.
+        first_slot = np.where(
+            feasible,
+            score * CAPABILITY_WEIGHT + dispatch_score(load, capacity, priority),
+            0.0,
+        )
+        n_tasks = len(task_requests)
+        if len(agents) > n_tasks:
+            top = np.argpartition(-first_slot, n_tasks - 1, axis=1)[:, :n_tasks]
+            kept = np.unique(top[np.take_along_axis(first_slot, top, axis=1) > 0])
+        else:
+            kept = np.flatnonzero((first_slot > 0).any(axis=0))
+        if kept.size == 0:
+            return plan
+
+        # One column per free slot; slot k is taken at load + k
+        free = np.minimum(capacity[kept] - load[kept], n_tasks).astype(np.int64)
+        slot_agent = np.repeat(kept, free)
+        slot_start = np.repeat(np.cumsum(free) - free, free)
+        slot_offset = np.arange(slot_agent.size) - slot_start
+        slot_dispatch = dispatch_score(
+            load[slot_agent] + slot_offset, capacity[slot_agent], priority[slot_agent]
+        )
+        effective = score[:, slot_agent] * CAPABILITY_WEIGHT + slot_dispatch
+        benefit = np.where(feasible[:, slot_agent], effective * weight[:, None], 0.0)
+
+        assignment = sorted(
+            max_weight_assignment(benefit), key=lambda pair: slot_offset[pair[1]]
+        )
+
+        # Number tasks on each agent in slot order so reported loads match
+        for t, slot in assignment:
+            agent = agents[slot_agent[slot]]
+            count = plan["counts"].get(agent.agent_id, 0)
+            matched, missing = self._calculate_capability_score(
+                agent.capabilities, task_requests[t].required_capabilities
+            )[1:]
+            plan["matches"].append(
+                (
+                    t,
+                    AgentMatch(
+                        agent_id=agent.agent_id,
+                        agent_type=agent.agent_type,
+                        score=float(score[t, slot_agent[slot]]),
+                        matched_capabilities=matched,
+                        missing_capabilities=missing,
+                        current_load=loads[slot_agent[slot]] + count,
+                        max_load=agent.max_concurrent_tasks,
+                        available=agent.available,
+                        priority_weight=agent.priority_weight,
+                    ),
+                )
+            )
+            plan["counts"][agent.agent_id] = count + 1
+            plan["agents"][agent.agent_id] = agent
+            plan["loads"][agent.agent_id] = loads[slot_agent[slot]]
+
+        plan["matches"].sort(key=lambda pair: pair[0])
+        return plan
+
+    def _reserve_batch(self, plan: Dict[str, Any]) -> None:
+        """
+        Reserve capacity for a batch plan in one optimistic transaction.
+
+        Raises:
+            WatchError: If a chosen agent's data or load changed since the
+                plan was computed
+        """
+        agent_ids = sorted(plan["counts"])
+        if not agent_ids:
+            return
+
+        agent_keys = [f"{self.AGENT_PREFIX}{aid}" for aid in agent_ids]
+        load_keys = [f"{self.AGENT_LOAD_PREFIX}{aid}" for aid in agent_ids]
+
+        with self.redis_client.pipeline() as pipeline:
+            pipeline.watch(*agent_keys, *load_keys)
+            values = pipeline.mget(agent_keys + load_keys)
+            for a, agent_id in enumerate(agent_ids):
+                live_agent = values[a]
+                live_load = int(values[len(agent_ids) + a] or 0)
+                if (
+                    not live_agent
+                    or AgentCapability.model_validate_json(live_agent)
+                    != plan["agents"][agent_id]
+                    or live_load != plan["loads"][agent_id]
+                ):
+                    raise WatchError(f"Agent {agent_id} changed during planning")
+
+            pipeline.multi()
+            for agent_id, load_key in zip(agent_ids, load_keys):
+                new_load = plan["loads"][agent_id] + plan["counts"][agent_id]
+                pipeline.incrby(load_key, plan["counts"][agent_id])
+                self._update_dispatch_index(
+                    pipeline, plan["agents"][agent_id], new_load
+                )
+            pipeline.execute()
+
     def complete_task(
         self,
         agent_id: str,
@@ -746,11 +1372,14 @@ class DelegationManager:
             RedisError: If Redis operation fails
         """
         try:
-            load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
-            current_load = int(self.redis_client.get(load_key) or 0)
+            current_load = int(
+                self.redis_client.get(f"{self.AGENT_LOAD_PREFIX}{agent_id}") or 0
+            )
 
             if current_load > 0:
-                new_load = self.redis_client.decr(load_key)
+                # Re-checked inside the transaction, so concurrent completions
+                # never take the load below zero
+                new_load = self._change_load(agent_id, lambda load: max(load - 1, 0))
                 logger.info(
                     f"Task {task_id} completed on agent {agent_id} "
                     f"(load: {new_load})"
@@ -854,11 +1483,17 @@ class DelegationManager:
 
             # Update agent data preserving TTL
             ttl = self.redis_client.ttl(agent_key)
-            self.redis_client.setex(
+            load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
+            current_load = int(self.redis_client.get(load_key) or 0)
+
+            pipeline = self.redis_client.pipeline()
+            pipeline.setex(
                 agent_key,
                 max(ttl, self.AGENT_TTL_SECONDS),
                 agent.model_dump_json(),
             )
+            self._update_dispatch_index(pipeline, agent, current_load)
+            pipeline.execute()
 
             logger.info(f"Set agent {agent_id} availability to {available}")
             return True
@@ -890,8 +1525,7 @@ class DelegationManager:
             raise ValueError("Active tasks cannot be negative")
 
         try:
-            load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
-            self.redis_client.set(load_key, active_tasks)
+            self._change_load(agent_id, lambda load: active_tasks)
 
             logger.debug(f"Set agent {agent_id} load to {active_tasks}")
             return True
@@ -1066,6 +1700,7 @@ class DelegationManager:
         """
         try:
             agent_ids = self.redis_client.smembers(self.AGENT_INDEX_KEY)
+            expired: List[str] = []
             cleaned = 0
 
             for agent_id in agent_ids:
@@ -1084,9 +1719,12 @@ class DelegationManager:
                     load_key = f"{self.AGENT_LOAD_PREFIX}{agent_id}"
                     self.redis_client.delete(load_key)
 
+                    expired.append(agent_id)
                     cleaned += 1
                     logger.info(f"Cleaned up expired agent {agent_id}")
 
+            self._drop_stale_agents(expired)
+
             if cleaned > 0:
                 logger.info(f"Cleaned up {cleaned} expired agents")
 
@@ -1124,10 +1762,15 @@ class DelegationManager:
             # Delete indices
             pipeline.delete(self.AGENT_INDEX_KEY)
 
-            # Delete all type indices
-            type_indices = self.redis_client.keys(f"{self.AGENT_TYPE_INDEX}*")
-            for type_index in type_indices:
-                pipeline.delete(type_index)
+            # Delete all type, capability and dispatch indices
+            pipeline.delete(self.DISPATCH_INDEX_KEY)
+            for pattern in (
+                f"{self.AGENT_TYPE_INDEX}*",
+                f"{self.CAPABILITY_INDEX}*",
+                f"{self.DISPATCH_TYPE_INDEX}*",
+            ):
+                for index_key in self.redis_client.keys(pattern):
+                    pipeline.delete(index_key)
 
             # Delete all task queues
             task_queues = self.redis_client.keys(f"{self.TASK_QUEUE_PREFIX}*")
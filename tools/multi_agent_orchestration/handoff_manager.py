@@ -7,16 +7,102 @@ and audit trail for multi-agent orchestration workflows.
 Issue #46: Multi-Agent Orchestration Platform - Handoff Manager
 """
 
+import hashlib
 import json
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+import msgpack
 import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 from pydantic import BaseModel, Field, field_validator
-from redis import Redis
+from redis import ConnectionPool, Redis
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# One-byte frame headers for binary payloads. Legacy JSON contexts start
+# with "{" and are still accepted on read.
+FRAME_MSGPACK = b"\x01"
+FRAME_ZSTD = b"\x02"
+
+# Payloads below this size are not worth a zstd frame
+COMPRESS_MIN_BYTES = 256
+ZSTD_LEVEL = 3
+
+
+def encode_payload(value: Any) -> bytes:
+    """
+    Encode a value as a framed msgpack payload.
+
+    The payload is zstd-compressed when zstandard is installed and the
+    packed value is at least COMPRESS_MIN_BYTES long.
+
+    Args:
+        value: msgpack-serializable value
+
+    Returns:
+        Frame header followed by the (compressed) msgpack bytes
+
+    Raises:
+        ValueError: If the value cannot be packed
+    """
+    try:
+        packed = msgpack.packb(value, use_bin_type=True)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"Failed to pack payload: {e}") from e
+    return _frame(packed)
+
+
+def _frame(packed: bytes) -> bytes:
+    """Add a frame header to msgpack bytes, compressing when worthwhile."""
+    if zstandard is not None and len(packed) >= COMPRESS_MIN_BYTES:
+        return FRAME_ZSTD + zstandard.compress(packed, ZSTD_LEVEL)
+    return FRAME_MSGPACK + packed
+
+
+def decode_payload(data: bytes) -> Any:
+    """
+    Decode a payload produced by encode_payload().
+
+    Args:
+        data: Framed payload
+
+    Returns:
+        Unpacked value
+
+    Raises:
+        ValueError: If the frame is unknown or corrupt
+    """
+    return _unpack(_unframe(data))
+
+
+def _unframe(data: bytes) -> bytes:
+    """Strip the frame header, decompressing to the original msgpack bytes."""
+    header, body = data[:1], data[1:]
+    if header == FRAME_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is required to decode this payload")
+        try:
+            return zstandard.decompress(body)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Failed to decompress payload: {e}") from e
+    if header != FRAME_MSGPACK:
+        raise ValueError(f"Unknown payload frame: {header!r}")
+    return body
+
+
+def _unpack(packed: bytes) -> Any:
+    """Unpack msgpack bytes, raising ValueError when they are corrupt."""
+    try:
+        return msgpack.unpackb(packed, raw=False)
+    except ValueError as e:
+        raise ValueError(f"Failed to unpack payload: {e}") from e
 
 
 class AgentContext(BaseModel):
@@ -160,8 +246,20 @@ class HandoffManager:
 
     Handles context serialization, transfer, validation, rollback,
     and maintains an audit trail of all handoffs.
+
+    Transferred contexts are stored in Redis as a compact msgpack manifest
+    plus content-addressed conversation chunks. Chunks already in Redis are
+    only referenced by hash, so a repeated handoff of a growing conversation
+    ships the new turns rather than the whole history.
     """
 
+    CONTEXT_PREFIX = "handoff:context:"
+    METADATA_PREFIX = "handoff:metadata:"
+    CHUNK_PREFIX = "handoff:chunk:"
+    CONTEXT_TTL = 3600  # 1 hour
+    CHUNK_ENTRIES = 32  # Conversation entries per chunk
+    CHUNK_CACHE_SIZE = 1024  # Packed chunks kept in memory
+
     def __init__(
         self,
         redis_client: Optional[Redis] = None,
@@ -187,10 +285,32 @@ class HandoffManager:
         self.postgres_config = postgres_config
         self.pg_pool: Optional[pool.SimpleConnectionPool] = None
 
+        # Binary payloads need a client that does not decode responses
+        self._binary_client = (
+            self._binary_redis(redis_client) if redis_client else None
+        )
+        # Chunks are immutable by hash, so cached copies never go stale. The
+        # packed bytes are kept so callers mutating a stored or loaded
+        # conversation cannot change what later loads return.
+        self._chunk_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
         # Initialize PostgreSQL connection pool
         if postgres_config:
             self._initialize_postgres()
 
+    @staticmethod
+    def _binary_redis(client: Redis) -> Redis:
+        """Return ``client``, or a non-decoding client on the same server."""
+        connection_pool = client.connection_pool
+        if not connection_pool.connection_kwargs.get("decode_responses"):
+            return client
+        kwargs = {**connection_pool.connection_kwargs, "decode_responses": False}
+        return Redis(
+            connection_pool=ConnectionPool(
+                connection_class=connection_pool.connection_class, **kwargs
+            )
+        )
+
     def _initialize_postgres(self) -> None:
         """Initialize PostgreSQL connection pool and create tables."""
         if not self.postgres_config:
@@ -378,6 +498,196 @@ class HandoffManager:
         except (json.JSONDecodeError, TypeError, ValueError) as e:
             raise ValueError(f"Failed to deserialize context: {e}") from e
 
+    def pack_context(self, context: AgentContext) -> bytes:
+        """
+        Serialize agent context to a compact binary payload.
+
+        Uses msgpack, compressed with zstd when zstandard is installed.
+        The whole context, conversation included, goes in one payload; see
+        transfer_context() for the chunked form used between agents.
+
+        Args:
+            context: AgentContext object
+
+        Returns:
+            Framed binary payload
+
+        Raises:
+            ValueError: If serialization fails
+        """
+        fields = self._context_fields(context)
+        fields["conversation_history"] = context.conversation_history
+        return encode_payload(fields)
+
+    def unpack_context(self, data: bytes) -> AgentContext:
+        """
+        Deserialize agent context from a pack_context() payload.
+
+        Args:
+            data: Framed binary payload
+
+        Returns:
+            AgentContext object
+
+        Raises:
+            ValueError: If deserialization fails
+        """
+        fields = decode_payload(data)
+        try:
+            return self._build_context(fields, fields.pop("conversation_history", []))
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Failed to deserialize context: {e}") from e
+
+    @staticmethod
+    def _context_fields(context: AgentContext) -> Dict[str, Any]:
+        """Return the context fields other than conversation history."""
+        return {
+            "agent_id": context.agent_id,
+            "agent_type": context.agent_type,
+            "files_created": context.files_created,
+            "files_modified": context.files_modified,
+            "state": context.state,
+            "metadata": context.metadata,
+            "created_at": context.created_at.isoformat(),
+        }
+
+    @staticmethod
+    def _build_context(
+        fields: Dict[str, Any], conversation: List[Dict[str, str]]
+    ) -> AgentContext:
+        """Rebuild an AgentContext from _context_fields() output."""
+        fields["created_at"] = datetime.fromisoformat(fields["created_at"])
+        return AgentContext(conversation_history=conversation, **fields)
+
+    def _chunk_conversation(
+        self, conversation: List[Dict[str, str]]
+    ) -> List[Tuple[str, bytes]]:
+        """
+        Split conversation history into content-addressed chunks.
+
+        Chunks hold CHUNK_ENTRIES consecutive entries, so an append-only
+        conversation keeps the digests of all but its last chunk.
+
+        Args:
+            conversation: Conversation history
+
+        Returns:
+            List of (digest, msgpack bytes) in conversation order
+
+        Raises:
+            ValueError: If an entry cannot be packed
+        """
+        chunks = []
+        for start in range(0, len(conversation), self.CHUNK_ENTRIES):
+            entries = conversation[start : start + self.CHUNK_ENTRIES]
+            try:
+                packed = msgpack.packb(entries, use_bin_type=True)
+            except (TypeError, ValueError, OverflowError) as e:
+                raise ValueError(f"Failed to pack conversation: {e}") from e
+            digest = hashlib.blake2b(packed, digest_size=16).hexdigest()
+            chunks.append((digest, packed))
+            self._cache_chunk(digest, packed)
+        return chunks
+
+    def _cache_chunk(self, digest: str, packed: bytes) -> None:
+        """Remember packed chunk entries, evicting the oldest when full."""
+        self._chunk_cache[digest] = packed
+        self._chunk_cache.move_to_end(digest)
+        if len(self._chunk_cache) > self.CHUNK_CACHE_SIZE:
+            self._chunk_cache.popitem(last=False)
+
+    def _store_context(self, agent_id: str, context: AgentContext) -> int:
+        """
+        Store ``context`` for ``agent_id`` as a manifest plus chunks.
+
+        The first round trip refreshes the TTL of every referenced chunk;
+        EXPIRE answers 0 for chunks Redis does not have, and only those are
+        written in the second round trip together with the manifest.
+
+        Args:
+            agent_id: Agent the context is stored for
+            context: Agent context
+
+        Returns:
+            Payload bytes written to Redis
+
+        Raises:
+            ValueError: If serialization fails
+        """
+        client = self._binary_client
+        chunks = self._chunk_conversation(context.conversation_history)
+        manifest = self._context_fields(context)
+        manifest["conversation_chunks"] = [digest for digest, _ in chunks]
+        payload = encode_payload(manifest)
+        unique = dict(chunks)
+
+        pipe = client.pipeline(transaction=False)
+        for digest in unique:
+            pipe.expire(f"{self.CHUNK_PREFIX}{digest}", self.CONTEXT_TTL)
+        refreshed = pipe.execute() if unique else []
+
+        written = len(payload)
+        pipe = client.pipeline(transaction=False)
+        for (digest, packed), present in zip(unique.items(), refreshed):
+            if not present:
+                # Only chunks Redis lacks are compressed and sent
+                chunk = _frame(packed)
+                pipe.setex(f"{self.CHUNK_PREFIX}{digest}", self.CONTEXT_TTL, chunk)
+                written += len(chunk)
+        pipe.setex(f"{self.CONTEXT_PREFIX}{agent_id}", self.CONTEXT_TTL, payload)
+        pipe.execute()
+        return written
+
+    def _load_context(self, agent_id: str) -> Optional[AgentContext]:
+        """
+        Load a context stored by _store_context() or the legacy JSON path.
+
+        Chunks found in the in-memory cache are not fetched again; every
+        load unpacks fresh entries, so the returned history is never shared.
+
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            AgentContext, or None if the context or one of its chunks expired
+
+        Raises:
+            ValueError: If the stored payload is corrupt
+        """
+        client = self._binary_client
+        data = client.get(f"{self.CONTEXT_PREFIX}{agent_id}")
+        if not data:
+            return None
+        if data[:1] == b"{":
+            return self.deserialize_context(data.decode("utf-8"))
+
+        manifest = decode_payload(data)
+        digests = manifest.pop("conversation_chunks", [])
+        chunks: Dict[str, bytes] = {}
+        missing = []
+        for digest in dict.fromkeys(digests):
+            if digest in self._chunk_cache:
+                self._chunk_cache.move_to_end(digest)
+                chunks[digest] = self._chunk_cache[digest]
+            else:
+                missing.append(digest)
+        if missing:
+            payloads = client.mget([f"{self.CHUNK_PREFIX}{d}" for d in missing])
+            for digest, chunk in zip(missing, payloads):
+                if chunk is None:
+                    return None
+                chunks[digest] = _unframe(chunk)
+                self._cache_chunk(digest, chunks[digest])
+
+        conversation: List[Dict[str, str]] = []
+        for digest in digests:
+            # Repeated digests unpack separately and share no entries
+            conversation.extend(_unpack(chunks[digest]))
+        try:
+            return self._build_context(manifest, conversation)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Failed to deserialize context: {e}") from e
+
     def validate_preconditions(
         self, context: AgentContext, preconditions: List[HandoffPrecondition]
     ) -> Tuple[bool, List[str]]:
@@ -561,6 +871,10 @@ class HandoffManager:
         """
         Transfer context from source to target agent via Redis.
 
+        Conversation chunks already stored by an earlier transfer are
+        referenced by hash instead of being sent again. The payload bytes
+        written are recorded as ``context_bytes`` in the handoff metadata.
+
         Args:
             source_agent_id: Source agent identifier
             target_agent_id: Target agent identifier
@@ -574,27 +888,20 @@ class HandoffManager:
             return False
 
         try:
-            # Serialize context
-            serialized_context = self.serialize_context(context)
-
-            # Store in Redis with target agent key
-            context_key = f"handoff:context:{target_agent_id}"
-            self.redis_client.setex(
-                context_key,
-                3600,  # 1 hour expiration
-                serialized_context,
-            )
+            # Store manifest and any chunks Redis does not already hold
+            context_bytes = self._store_context(target_agent_id, context)
 
             # Store metadata for tracking
-            metadata_key = f"handoff:metadata:{target_agent_id}"
+            metadata_key = f"{self.METADATA_PREFIX}{target_agent_id}"
             metadata = {
                 "source_agent_id": source_agent_id,
                 "target_agent_id": target_agent_id,
                 "transferred_at": datetime.now(timezone.utc).isoformat(),
+                "context_bytes": context_bytes,
             }
             self.redis_client.setex(
                 metadata_key,
-                3600,
+                self.CONTEXT_TTL,
                 json.dumps(metadata),
             )
 
@@ -617,13 +924,7 @@ class HandoffManager:
             return None
 
         try:
-            context_key = f"handoff:context:{agent_id}"
-            serialized_context = self.redis_client.get(context_key)
-
-            if not serialized_context:
-                return None
-
-            return self.deserialize_context(serialized_context.decode("utf-8"))
+            return self._load_context(agent_id)
 
         except Exception:
             return None
@@ -662,8 +963,8 @@ class HandoffManager:
 
                 # Remove context from Redis
                 if self.redis_client and target_agent_id:
-                    context_key = f"handoff:context:{target_agent_id}"
-                    metadata_key = f"handoff:metadata:{target_agent_id}"
+                    context_key = f"{self.CONTEXT_PREFIX}{target_agent_id}"
+                    metadata_key = f"{self.METADATA_PREFIX}{target_agent_id}"
                     self.redis_client.delete(context_key)
                     self.redis_client.delete(metadata_key)
 
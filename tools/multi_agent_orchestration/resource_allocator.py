@@ -6,10 +6,11 @@ distributed state tracking, priority-based allocation, and deadlock detection.
 """
 
 import json
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import redis
 from pydantic import BaseModel, Field, field_validator
@@ -25,6 +26,16 @@ class Priority(str, Enum):
     HIGH = "high"
 
 
+# Preemption order; Priority values are strings and do not sort by urgency
+PRIORITY_RANK = {Priority.LOW: 0, Priority.MEDIUM: 1, Priority.HIGH: 2}
+
+# Every state-changing script appends the agent's resulting usage to this
+# stream, numbered by the sequence counter so followers can detect gaps.
+EVENT_STREAM_KEY = "resource:events"
+EVENT_SEQUENCE_KEY = "resource:events:seq"
+WAITS_KEY = "resource:waits"
+
+
 class ResourceLimits(BaseModel):
     """Resource limits for an agent."""
 
@@ -131,13 +142,32 @@ class TaskAllocation(BaseModel):
     preemptible: bool = Field(default=True, description="Whether task can be preempted")
 
 
+# Shared Lua helper: append a ledger event with the agent's full usage hash
+EMIT_EVENT_LUA = """
+local function emit_event(kind, agent_id, task_id, extra)
+    local seq = redis.call('INCR', 'resource:events:seq')
+    local fields = {'seq', seq, 'type', kind, 'agent', agent_id, 'task', task_id}
+    local usage = redis.call('HGETALL', 'agent:' .. agent_id .. ':usage')
+    for i = 1, #usage do
+        fields[#fields + 1] = usage[i]
+    end
+    for i = 1, #extra do
+        fields[#fields + 1] = extra[i]
+    end
+    redis.call(
+        'XADD', 'resource:events', 'MAXLEN', '~', 10000, '*', unpack(fields)
+    )
+end
+"""
+
 # Lua script for atomic check-and-allocate operation
-ALLOCATE_RESOURCES_SCRIPT = """
+ALLOCATE_RESOURCES_SCRIPT = EMIT_EVENT_LUA + """
 local agent_id = ARGV[1]
 local cpu = tonumber(ARGV[2])
 local memory = tonumber(ARGV[3])
 local task_id = ARGV[4]
 local priority = ARGV[5]
+local wait = ARGV[7] == "1"
 
 local usage_key = "agent:" .. agent_id .. ":usage"
 local tasks_key = "agent:" .. agent_id .. ":tasks"
@@ -158,16 +188,22 @@ local memory_limit = usage_map['memory_limit'] or 0
 local max_tasks = usage_map['max_tasks'] or 0
 
 -- Check if resources are available
+local reason = nil
 if (cpu_used + cpu) > cpu_limit then
-    return {0, "insufficient_cpu"}
-end
-
-if (memory_used + memory) > memory_limit then
-    return {0, "insufficient_memory"}
+    reason = "insufficient_cpu"
+elseif (memory_used + memory) > memory_limit then
+    reason = "insufficient_memory"
+elseif active_tasks >= max_tasks then
+    reason = "max_tasks_reached"
 end
 
-if active_tasks >= max_tasks then
-    return {0, "max_tasks_reached"}
+if reason then
+    -- Record the task as waiting on this agent for deadlock detection
+    if wait then
+        redis.call('HSET', 'resource:waits', task_id, agent_id)
+        emit_event('wait', agent_id, task_id, {})
+    end
+    return {0, reason}
 end
 
 -- Allocate resources
@@ -186,12 +222,17 @@ local allocation = {
     allocated_at = tonumber(ARGV[6])
 }
 redis.call('HSET', allocations_key, task_id, cjson.encode(allocation))
+redis.call('HDEL', 'resource:waits', task_id)
+emit_event(
+    'allocate', agent_id, task_id,
+    {'cpu', cpu, 'memory', memory, 'priority', priority}
+)
 
 return {1, "success"}
 """
 
 # Lua script for atomic resource release
-RELEASE_RESOURCES_SCRIPT = """
+RELEASE_RESOURCES_SCRIPT = EMIT_EVENT_LUA + """
 local agent_id = ARGV[1]
 local task_id = ARGV[2]
 
@@ -232,12 +273,13 @@ redis.call('HSET', usage_key, 'memory_used', math.max(0, memory_used - memory))
 redis.call('HSET', usage_key, 'active_tasks', math.max(0, active_tasks - 1))
 redis.call('SREM', tasks_key, task_id)
 redis.call('HDEL', allocations_key, task_id)
+emit_event('release', agent_id, task_id, {})
 
 return {1, "success"}
 """
 
 # Lua script for atomic reservation creation
-CREATE_RESERVATION_SCRIPT = """
+CREATE_RESERVATION_SCRIPT = EMIT_EVENT_LUA + """
 local agent_id = ARGV[1]
 local cpu = tonumber(ARGV[2])
 local memory = tonumber(ARGV[3])
@@ -289,10 +331,407 @@ redis.call(
 -- Update usage to include reservation
 redis.call('HSET', usage_key, 'cpu_used', cpu_used + cpu)
 redis.call('HSET', usage_key, 'memory_used', memory_used + memory)
+emit_event('usage', agent_id, '', {})
 
 return {1, reservation_id}
 """
 
+# Lua script for setting limits and resetting usage
+SET_LIMITS_SCRIPT = EMIT_EVENT_LUA + """
+local agent_id = ARGV[1]
+
+redis.call(
+    'HSET', 'agent:' .. agent_id .. ':usage',
+    'cpu_limit', ARGV[2],
+    'memory_limit', ARGV[3],
+    'max_tasks', ARGV[4],
+    'cpu_used', 0,
+    'memory_used', 0,
+    'active_tasks', 0
+)
+emit_event('usage', agent_id, '', {})
+
+return {1, "success"}
+"""
+
+# Lua script for returning an expired reservation's resources
+EXPIRE_RESERVATION_SCRIPT = EMIT_EVENT_LUA + """
+local agent_id = ARGV[1]
+local reservation_id = ARGV[2]
+
+local usage_key = "agent:" .. agent_id .. ":usage"
+local reservations_key = "agent:" .. agent_id .. ":reservations"
+
+redis.call('ZREM', 'reservation:expiry', agent_id .. ":" .. reservation_id)
+
+local reservation_json = redis.call('HGET', reservations_key, reservation_id)
+if not reservation_json then
+    return {0, "reservation_not_found"}
+end
+
+local reservation = cjson.decode(reservation_json)
+redis.call(
+    'HINCRBYFLOAT', usage_key, 'cpu_used', -tonumber(reservation.cpu_reserved)
+)
+redis.call(
+    'HINCRBYFLOAT', usage_key, 'memory_used',
+    -tonumber(reservation.memory_reserved)
+)
+redis.call('HDEL', reservations_key, reservation_id)
+emit_event('usage', agent_id, '', {})
+
+return {1, "success"}
+"""
+
+# Lua script for withdrawing a task's wait on an agent
+CANCEL_WAIT_SCRIPT = EMIT_EVENT_LUA + """
+local task_id = ARGV[1]
+
+local agent_id = redis.call('HGET', 'resource:waits', task_id)
+if not agent_id then
+    return {0, "not_waiting"}
+end
+
+redis.call('HDEL', 'resource:waits', task_id)
+emit_event('unwait', agent_id, task_id, {})
+
+return {1, "success"}
+"""
+
+
+def _stream_id(entry_id: str) -> Tuple[int, int]:
+    """Parse a Redis stream entry ID into a comparable tuple."""
+    millis, _, sequence = entry_id.partition("-")
+    return int(millis), int(sequence or 0)
+
+
+class ResourceLedger:
+    """
+    In-process mirror of agent usage, allocations and waits.
+
+    The ledger is built once from Redis and then follows the event stream
+    written by the allocator's Lua scripts, so availability queries are
+    answered from memory. Usage events carry absolute values and events are
+    applied in sequence order; a sequence gap (stream trimmed past the
+    ledger, or Redis reset) triggers a rebuild.
+
+    It also maintains an agent-level wait-for graph: an edge A -> B exists
+    while some task holds resources on agent A and waits for agent B.
+    Cycles are detected as edges are added and re-checked as edges go
+    away, instead of rescanning every agent.
+    """
+
+    EVENT_BATCH = 1000
+
+    def __init__(self, redis_client: redis.Redis):
+        """
+        Initialize an empty ledger; it is built on the first catch_up().
+
+        Args:
+            redis_client: Redis client with decoded responses
+        """
+        self.redis_client = redis_client
+        self._lock = threading.RLock()
+        self._last_id: Optional[str] = None
+        self._last_seq = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        """Clear all mirrored state."""
+        self._usage: Dict[str, Dict[str, float]] = {}
+        self._allocations: Dict[str, Dict[str, Tuple[float, float, Priority]]] = {}
+        self._holdings: Dict[str, Set[str]] = {}
+        self._waits: Dict[str, str] = {}
+        self._edges: Dict[str, Dict[str, int]] = {}
+        self._reverse_edges: Dict[str, Set[str]] = {}
+        self._deadlocked: Set[str] = set()
+
+    def catch_up(self, block_ms: Optional[int] = None) -> int:
+        """
+        Apply stream events written since the last call.
+
+        Args:
+            block_ms: Wait up to this long for the first new event
+
+        Returns:
+            Number of events applied
+
+        Raises:
+            RedisError: If Redis operation fails
+        """
+        with self._lock:
+            if self._last_id is None:
+                self._rebuild()
+
+        applied = 0
+        while True:
+            response = self.redis_client.xread(
+                {EVENT_STREAM_KEY: self._last_id},
+                count=self.EVENT_BATCH,
+                block=block_ms,
+            )
+            entries = response[0][1] if response else []
+            with self._lock:
+                for entry_id, fields in entries:
+                    if _stream_id(entry_id) <= _stream_id(self._last_id):
+                        continue  # Already applied by a concurrent caller
+                    seq = int(fields["seq"])
+                    if seq != self._last_seq + 1:
+                        self._rebuild()
+                        return applied
+                    self._apply(fields)
+                    self._last_id = entry_id
+                    self._last_seq = seq
+                    applied += 1
+            if len(entries) < self.EVENT_BATCH:
+                return applied
+            block_ms = None
+
+    def rebuild(self) -> None:
+        """
+        Rebuild the ledger from Redis.
+
+        Raises:
+            RedisError: If Redis operation fails
+        """
+        with self._lock:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Load a snapshot of all agents; later events replay on top of it."""
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.get(EVENT_SEQUENCE_KEY)
+        pipe.xrevrange(EVENT_STREAM_KEY, count=1)
+        pipe.hgetall(WAITS_KEY)
+        seq, tail, waits = pipe.execute()
+
+        self._reset()
+        cursor = 0
+        while True:
+            cursor, keys = self.redis_client.scan(
+                cursor, match="agent:*:usage", count=500
+            )
+            agent_ids = [key.split(":")[1] for key in keys]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for agent_id in agent_ids:
+                pipe.hgetall(f"agent:{agent_id}:usage")
+                pipe.hgetall(f"agent:{agent_id}:allocations")
+            replies = pipe.execute()
+            for agent_id, usage, allocations in zip(
+                agent_ids, replies[::2], replies[1::2]
+            ):
+                if not usage:
+                    continue
+                self._set_usage(agent_id, usage)
+                for task_id, alloc_data in allocations.items():
+                    allocation = json.loads(alloc_data)
+                    self._add_holding(
+                        task_id,
+                        agent_id,
+                        float(allocation["cpu_allocated"]),
+                        float(allocation["memory_allocated"]),
+                        Priority(allocation["priority"]),
+                    )
+            if cursor == 0:
+                break
+
+        for task_id, agent_id in waits.items():
+            self._set_wait(task_id, agent_id)
+
+        self._last_id = tail[0][0] if tail else "0-0"
+        self._last_seq = int(seq or 0)
+
+    def _apply(self, event: Dict[str, str]) -> None:
+        """Apply one stream event to the mirrored state."""
+        kind = event["type"]
+        agent_id = event["agent"]
+        task_id = event["task"]
+
+        if "cpu_limit" in event:
+            self._set_usage(agent_id, event)
+
+        if kind == "allocate":
+            self._set_wait(task_id, None)
+            self._add_holding(
+                task_id,
+                agent_id,
+                float(event["cpu"]),
+                float(event["memory"]),
+                Priority(event["priority"]),
+            )
+        elif kind == "release":
+            self._remove_holding(task_id, agent_id)
+        elif kind == "wait":
+            self._set_wait(task_id, agent_id)
+        elif kind == "unwait":
+            self._set_wait(task_id, None)
+
+    def _set_usage(self, agent_id: str, usage: Dict[str, Any]) -> None:
+        """Replace an agent's usage figures."""
+        self._usage[agent_id] = {
+            field: float(usage.get(field, 0))
+            for field in (
+                "cpu_used",
+                "memory_used",
+                "active_tasks",
+                "cpu_limit",
+                "memory_limit",
+                "max_tasks",
+            )
+        }
+
+    def _add_holding(
+        self,
+        task_id: str,
+        agent_id: str,
+        cpu: float,
+        memory: float,
+        priority: Priority,
+    ) -> None:
+        """Record that ``task_id`` holds resources on ``agent_id``."""
+        self._allocations.setdefault(agent_id, {})[task_id] = (cpu, memory, priority)
+        holdings = self._holdings.setdefault(task_id, set())
+        if agent_id in holdings:
+            return
+        holdings.add(agent_id)
+        waiting_on = self._waits.get(task_id)
+        if waiting_on:
+            self._add_edge(agent_id, waiting_on)
+
+    def _remove_holding(self, task_id: str, agent_id: str) -> None:
+        """Record that ``task_id`` released its resources on ``agent_id``."""
+        self._allocations.get(agent_id, {}).pop(task_id, None)
+        holdings = self._holdings.get(task_id)
+        if not holdings or agent_id not in holdings:
+            return
+        holdings.discard(agent_id)
+        if not holdings:
+            del self._holdings[task_id]
+        waiting_on = self._waits.get(task_id)
+        if waiting_on:
+            self._remove_edge(agent_id, waiting_on)
+
+    def _set_wait(self, task_id: str, agent_id: Optional[str]) -> None:
+        """Point ``task_id``'s wait at ``agent_id``, or clear it with None."""
+        previous = self._waits.get(task_id)
+        if previous == agent_id:
+            return
+        holdings = self._holdings.get(task_id, set())
+        if previous:
+            del self._waits[task_id]
+            for holder in holdings:
+                self._remove_edge(holder, previous)
+        if agent_id:
+            self._waits[task_id] = agent_id
+            for holder in holdings:
+                self._add_edge(holder, agent_id)
+
+    def _add_edge(self, source: str, target: str) -> None:
+        """Add a wait-for edge and mark any cycle it closes."""
+        if source == target:
+            return  # Waiting on an agent the task already uses is not a cycle
+        targets = self._edges.setdefault(source, {})
+        targets[target] = targets.get(target, 0) + 1
+        if targets[target] > 1:
+            return
+        self._reverse_edges.setdefault(target, set()).add(source)
+
+        # The new edge closes a cycle iff ``target`` reaches ``source``; the
+        # agents on such cycles are those reachable from ``target`` that can
+        # also reach ``source``.
+        downstream = self._reachable(target, self._edges)
+        if source in downstream:
+            upstream = self._reachable(source, self._reverse_edges)
+            self._deadlocked |= downstream & upstream
+
+    def _remove_edge(self, source: str, target: str) -> None:
+        """Drop a wait-for edge and re-check agents it may have deadlocked."""
+        if source == target:
+            return
+        targets = self._edges.get(source, {})
+        if target not in targets:
+            return
+        targets[target] -= 1
+        if targets[target] > 0:
+            return
+        del targets[target]
+        self._reverse_edges[target].discard(source)
+        if source in self._deadlocked and target in self._deadlocked:
+            # Cycles only pass through deadlocked agents, so re-check those
+            self._deadlocked = {
+                agent
+                for agent in self._deadlocked
+                if agent in self._reachable(agent, self._edges, include_start=False)
+            }
+
+    @staticmethod
+    def _reachable(
+        start: str, graph: Dict[str, Any], include_start: bool = True
+    ) -> Set[str]:
+        """Return the agents reachable from ``start`` in ``graph``."""
+        seen: Set[str] = {start} if include_start else set()
+        stack = [start]
+        while stack:
+            for neighbor in graph.get(stack.pop(), ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return seen
+
+    def usage(self, agent_id: str) -> Optional[ResourceUsage]:
+        """
+        Get an agent's mirrored usage.
+
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            ResourceUsage, or None if the agent is unknown
+        """
+        with self._lock:
+            usage = self._usage.get(agent_id)
+            if usage is None:
+                return None
+            return ResourceUsage(
+                agent_id=agent_id,
+                cpu_used=usage["cpu_used"],
+                memory_used=usage["memory_used"],
+                active_tasks=int(usage["active_tasks"]),
+                task_ids=list(self._allocations.get(agent_id, {})),
+                cpu_limit=usage["cpu_limit"],
+                memory_limit=usage["memory_limit"],
+                max_tasks=int(usage["max_tasks"]),
+            )
+
+    def has_capacity(self, agent_id: str, cpu: float, memory: float) -> bool:
+        """Check whether an agent has room for one more task of this size."""
+        with self._lock:
+            usage = self._usage.get(agent_id)
+            return usage is not None and (
+                usage["cpu_limit"] - usage["cpu_used"] >= cpu
+                and usage["memory_limit"] - usage["memory_used"] >= memory
+                and usage["active_tasks"] < usage["max_tasks"]
+            )
+
+    def available_agents(self, cpu: float, memory: float) -> List[str]:
+        """Return agents with room for one more task of this size."""
+        with self._lock:
+            return [
+                agent_id
+                for agent_id in self._usage
+                if self.has_capacity(agent_id, cpu, memory)
+            ]
+
+    def allocations(self, agent_id: str) -> Dict[str, Tuple[float, float, Priority]]:
+        """Return ``{task_id: (cpu, memory, priority)}`` held on an agent."""
+        with self._lock:
+            return dict(self._allocations.get(agent_id, {}))
+
+    def deadlocked_agents(self) -> List[str]:
+        """Return the agents on a wait-for cycle, sorted."""
+        with self._lock:
+            return sorted(self._deadlocked)
+
 
 class ResourceAllocator:
     """
@@ -301,6 +740,11 @@ class ResourceAllocator:
     Manages CPU, memory, and task slot allocation across agents with
     Redis-backed distributed state, atomic operations, priority-based
     allocation, and deadlock detection.
+
+    Every change is made by a Lua script in one round trip and published to
+    the ``resource:events`` stream. Availability and deadlock queries are
+    answered from an in-process ResourceLedger that follows that stream,
+    either on demand or continuously via start_event_listener().
     """
 
     def __init__(
@@ -344,9 +788,92 @@ class ResourceAllocator:
             self.reserve_script = self.redis_client.register_script(
                 CREATE_RESERVATION_SCRIPT
             )
+            self.set_limits_script = self.redis_client.register_script(
+                SET_LIMITS_SCRIPT
+            )
+            self.expire_reservation_script = self.redis_client.register_script(
+                EXPIRE_RESERVATION_SCRIPT
+            )
+            self.cancel_wait_script = self.redis_client.register_script(
+                CANCEL_WAIT_SCRIPT
+            )
         except RedisError as e:
             raise RuntimeError(f"Failed to register Lua scripts: {str(e)}") from e
 
+        self.ledger = ResourceLedger(self.redis_client)
+        self._listener: Optional[threading.Thread] = None
+        self._listener_stop = threading.Event()
+        # Scripts this allocator has run, and how many of them the ledger
+        # is known to have applied; see _sync_ledger()
+        self._write_lock = threading.Lock()
+        self._writes = 0
+        self._synced_writes = 0
+
+    def start_event_listener(self, block_ms: int = 1000) -> None:
+        """
+        Keep the ledger current from a background thread.
+
+        While the listener runs, availability and deadlock queries are
+        served from memory without contacting Redis, except right after a
+        change made through this allocator: the next query then applies
+        pending events itself, so callers always see their own changes.
+        Changes made by other processes show up as the listener applies
+        them. Without the listener, each query first applies pending events
+        with one non-blocking read.
+
+        Args:
+            block_ms: How long each stream read waits for new events
+        """
+        if self._listener and self._listener.is_alive():
+            return
+
+        self.ledger.catch_up()
+        self._listener_stop.clear()
+
+        def follow() -> None:
+            while not self._listener_stop.is_set():
+                try:
+                    self.ledger.catch_up(block_ms=block_ms)
+                except RedisError:
+                    self._listener_stop.wait(block_ms / 1000)
+
+        self._listener = threading.Thread(
+            target=follow, name="resource-ledger", daemon=True
+        )
+        self._listener.start()
+
+    def stop_event_listener(self) -> None:
+        """Stop the background ledger listener, if running."""
+        self._listener_stop.set()
+        if self._listener:
+            self._listener.join()
+            self._listener = None
+
+    def _run_script(self, script: Any, keys: List[str], args: List[Any]) -> Any:
+        """Run a state-changing Lua script and note it for _sync_ledger()."""
+        try:
+            return script(keys=keys, args=args)
+        finally:
+            with self._write_lock:
+                self._writes += 1
+
+    def _sync_ledger(self) -> None:
+        """
+        Apply pending events unless the listener already applied them.
+
+        The listener may lag behind this allocator's own scripts, so after
+        any of them ran, one non-blocking catch-up covers their events.
+        """
+        with self._write_lock:
+            writes = self._writes
+            current = writes == self._synced_writes
+        if current and self._listener and self._listener.is_alive():
+            return
+
+        self.ledger.catch_up()
+        with self._write_lock:
+            self._synced_writes = max(self._synced_writes, writes)
+
     def set_agent_limits(
         self,
         agent_id: str,
@@ -383,26 +910,12 @@ class ResourceAllocator:
 
         try:
             # Store limits and initialize usage
-            usage_key = f"agent:{agent_id}:usage"
-            self.redis_client.hset(
-                usage_key,
-                mapping={
-                    "cpu_limit": limits.cpu_cores,
-                    "memory_limit": limits.memory_mb,
-                    "max_tasks": limits.max_tasks,
-                    "cpu_used": 0.0,
-                    "memory_used": 0.0,
-                    "active_tasks": 0,
-                },
+            result = self._run_script(
+                self.set_limits_script,
+                keys=[],
+                args=[agent_id, limits.cpu_cores, limits.memory_mb, limits.max_tasks],
             )
-
-            # Initialize task set
-            tasks_key = f"agent:{agent_id}:tasks"
-            if not self.redis_client.exists(tasks_key):
-                self.redis_client.sadd(tasks_key, "__init__")
-                self.redis_client.srem(tasks_key, "__init__")
-
-            return True
+            return result[0] == 1
 
         except RedisError as e:
             raise RedisError(
@@ -461,16 +974,23 @@ class ResourceAllocator:
         memory: float,
         task_id: str,
         priority: Priority = Priority.MEDIUM,
+        wait: bool = False,
     ) -> bool:
         """
         Allocate resources to a task atomically.
 
+        The check, the allocation and the ledger event happen in one Lua
+        script call. With ``wait``, a failed allocation records the task as
+        waiting for this agent until it is allocated here or cancel_wait()
+        is called; detect_deadlocks() uses these waits.
+
         Args:
             agent_id: Agent identifier
             cpu: CPU cores to allocate
             memory: Memory in MB to allocate
             task_id: Task identifier
             priority: Task priority (for preemption logic)
+            wait: Whether the task waits for this agent if allocation fails
 
         Returns:
             True if allocation successful, False otherwise
@@ -488,7 +1008,8 @@ class ResourceAllocator:
         try:
             # Execute atomic allocation script
             allocated_at = int(datetime.now(timezone.utc).timestamp())
-            result = self.allocate_script(
+            result = self._run_script(
+                self.allocate_script,
                 keys=[],
                 args=[
                     agent_id,
@@ -497,6 +1018,7 @@ class ResourceAllocator:
                     task_id,
                     priority.value,
                     allocated_at,
+                    int(wait),
                 ],
             )
 
@@ -513,7 +1035,8 @@ class ResourceAllocator:
                     )
                     if preempted:
                         # Retry allocation after preemption
-                        result = self.allocate_script(
+                        result = self._run_script(
+                            self.allocate_script,
                             keys=[],
                             args=[
                                 agent_id,
@@ -522,6 +1045,7 @@ class ResourceAllocator:
                                 task_id,
                                 priority.value,
                                 allocated_at,
+                                int(wait),
                             ],
                         )
                         return result[0] == 1
@@ -553,7 +1077,9 @@ class ResourceAllocator:
 
         try:
             # Execute atomic release script
-            result = self.release_script(keys=[], args=[agent_id, task_id])
+            result = self._run_script(
+                self.release_script, keys=[], args=[agent_id, task_id]
+            )
             return result[0] == 1
 
         except RedisError as e:
@@ -561,6 +1087,32 @@ class ResourceAllocator:
                 f"Failed to release resources for task {task_id}: {str(e)}"
             ) from e
 
+    def cancel_wait(self, task_id: str) -> bool:
+        """
+        Withdraw a task's wait registered by allocate_resources(wait=True).
+
+        Args:
+            task_id: Task identifier
+
+        Returns:
+            True if the task was waiting
+
+        Raises:
+            ValueError: If task_id is empty
+            RedisError: If Redis operation fails
+        """
+        if not task_id:
+            raise ValueError("Task ID cannot be empty")
+
+        try:
+            result = self._run_script(self.cancel_wait_script, keys=[], args=[task_id])
+            return result[0] == 1
+
+        except RedisError as e:
+            raise RedisError(
+                f"Failed to cancel wait for task {task_id}: {str(e)}"
+            ) from e
+
     def reserve_resources(
         self,
         agent_id: str,
@@ -606,7 +1158,8 @@ class ResourceAllocator:
             expires_at = created_at + timedelta(seconds=duration)
 
             # Execute atomic reservation script
-            result = self.reserve_script(
+            result = self._run_script(
+                self.reserve_script,
                 keys=[],
                 args=[
                     agent_id,
@@ -648,29 +1201,30 @@ class ResourceAllocator:
         """
         Check if agent has sufficient available resources.
 
+        Answered from the resource ledger.
+
         Args:
             agent_id: Agent identifier
             cpu: Required CPU cores
             memory: Required memory in MB
 
         Returns:
-            True if resources are available
+            True if resources are available, False if not or agent unknown
 
         Raises:
-            ValueError: If agent not found
+            ValueError: If agent_id is empty
+            RedisError: If syncing the ledger fails
         """
         if not agent_id:
             raise ValueError("Agent ID cannot be empty")
 
         try:
-            usage = self.get_agent_usage(agent_id)
-            return (
-                usage.cpu_available >= cpu
-                and usage.memory_available >= memory
-                and usage.tasks_available > 0
-            )
-        except ValueError:
-            return False
+            self._sync_ledger()
+            return self.ledger.has_capacity(agent_id, cpu, memory)
+        except RedisError as e:
+            raise RedisError(
+                f"Failed to check availability for agent {agent_id}: {str(e)}"
+            ) from e
 
     def get_available_agents(
         self, cpu_required: float, memory_required: float
@@ -678,6 +1232,8 @@ class ResourceAllocator:
         """
         Get list of agents with sufficient available resources.
 
+        Answered from the resource ledger without scanning Redis.
+
         Args:
             cpu_required: Required CPU cores
             memory_required: Required memory in MB
@@ -692,32 +1248,8 @@ class ResourceAllocator:
             raise ValueError("CPU and memory requirements must be positive")
 
         try:
-            available_agents = []
-
-            # Scan for all agent usage keys
-            cursor = 0
-            while True:
-                cursor, keys = self.redis_client.scan(
-                    cursor, match="agent:*:usage", count=100
-                )
-
-                for key in keys:
-                    # Extract agent_id from key
-                    agent_id = key.split(":")[1]
-
-                    try:
-                        if self.check_availability(
-                            agent_id, cpu_required, memory_required
-                        ):
-                            available_agents.append(agent_id)
-                    except ValueError:
-                        # Agent not found or invalid, skip
-                        continue
-
-                if cursor == 0:
-                    break
-
-            return available_agents
+            self._sync_ledger()
+            return self.ledger.available_agents(cpu_required, memory_required)
 
         except RedisError as e:
             raise RedisError(f"Failed to get available agents: {str(e)}") from e
@@ -744,29 +1276,12 @@ class ResourceAllocator:
 
             for item in expired:
                 agent_id, reservation_id = item.split(":", 1)
-                reservations_key = f"agent:{agent_id}:reservations"
-
-                # Get reservation data
-                reservation_data = self.redis_client.hget(
-                    reservations_key, reservation_id
+                result = self._run_script(
+                    self.expire_reservation_script,
+                    keys=[], args=[agent_id, reservation_id]
                 )
-                if not reservation_data:
-                    continue
-
-                reservation = json.loads(reservation_data)
-                cpu = float(reservation["cpu_reserved"])
-                memory = float(reservation["memory_reserved"])
-
-                # Release reserved resources
-                usage_key = f"agent:{agent_id}:usage"
-                pipe = self.redis_client.pipeline()
-                pipe.hincrbyfloat(usage_key, "cpu_used", -cpu)
-                pipe.hincrbyfloat(usage_key, "memory_used", -memory)
-                pipe.hdel(reservations_key, reservation_id)
-                pipe.zrem(expiry_key, item)
-                pipe.execute()
-
-                cleaned += 1
+                if result[0] == 1:
+                    cleaned += 1
 
             return cleaned
 
@@ -777,91 +1292,20 @@ class ResourceAllocator:
         """
         Detect potential deadlocks in resource allocation.
 
-        Detects circular wait conditions where tasks are waiting for
-        resources held by other tasks in a cycle.
+        Detects circular wait conditions: agent A waits for agent B when a
+        task holding resources on A waits (allocate_resources(wait=True))
+        for B. The resource ledger maintains this wait-for graph as events
+        arrive, so no agent state is scanned here.
 
         Returns:
-            List of agent IDs involved in potential deadlocks
+            Sorted list of agent IDs on a wait-for cycle
 
         Raises:
             RedisError: If Redis operation fails
         """
         try:
-            deadlocked_agents = []
-
-            # Scan for all agents
-            cursor = 0
-            agent_ids = set()
-
-            while True:
-                cursor, keys = self.redis_client.scan(
-                    cursor, match="agent:*:usage", count=100
-                )
-                for key in keys:
-                    agent_id = key.split(":")[1]
-                    agent_ids.add(agent_id)
-
-                if cursor == 0:
-                    break
-
-            # Build wait-for graph
-            wait_for_graph: Dict[str, Set[str]] = {}
-
-            for agent_id in agent_ids:
-                try:
-                    usage = self.get_agent_usage(agent_id)
-
-                    # Agent is deadlock candidate if at max tasks
-                    # but has pending work
-                    if usage.tasks_available == 0:
-                        # Check for waiting tasks
-                        # (would be in queue in real impl)
-                        queue_key = f"agent:{agent_id}:queue"
-                        queue_length = self.redis_client.llen(queue_key)
-
-                        if queue_length > 0:
-                            # This agent has no slots but has waiting
-                            # tasks. In a real implementation, check if
-                            # waiting tasks depend on other agents that
-                            # are also blocked
-                            wait_for_graph[agent_id] = set()
-
-                            # Check allocations for inter-agent dependencies
-                            allocations_key = f"agent:{agent_id}:allocations"
-                            allocations = self.redis_client.hgetall(allocations_key)
-
-                            for alloc_data in allocations.values():
-                                _ = json.loads(alloc_data)
-                                # In real impl, check if task waits
-                                # for other agents. This is a
-                                # simplified detection
-
-                except ValueError:
-                    continue
-
-            # Detect cycles using DFS
-            def has_cycle(node: str, visited: Set[str], rec_stack: Set[str]) -> bool:
-                visited.add(node)
-                rec_stack.add(node)
-
-                for neighbor in wait_for_graph.get(node, []):
-                    if neighbor not in visited:
-                        if has_cycle(neighbor, visited, rec_stack):
-                            return True
-                    elif neighbor in rec_stack:
-                        return True
-
-                rec_stack.remove(node)
-                return False
-
-            visited: Set[str] = set()
-            for agent_id in wait_for_graph:
-                if agent_id not in visited:
-                    rec_stack: Set[str] = set()
-                    if has_cycle(agent_id, visited, rec_stack):
-                        deadlocked_agents.append(agent_id)
-
-            return deadlocked_agents
+            self._sync_ledger()
+            return self.ledger.deadlocked_agents()
 
         except RedisError as e:
             raise RedisError(f"Failed to detect deadlocks: {str(e)}") from e
@@ -886,29 +1330,19 @@ class ResourceAllocator:
             True if preemption successful and resources freed
         """
         try:
-            allocations_key = f"agent:{agent_id}:allocations"
-            allocations = self.redis_client.hgetall(allocations_key)
+            self._sync_ledger()
 
             # Find preemptible tasks (lower priority)
-            preemptible: List[Tuple[str, float, float, Priority]] = []
-
-            for task_id, alloc_data in allocations.items():
-                allocation = json.loads(alloc_data)
-                task_priority = Priority(allocation["priority"])
-
-                # Only preempt lower priority tasks
-                if task_priority.value < priority.value:
-                    preemptible.append(
-                        (
-                            task_id,
-                            float(allocation["cpu_allocated"]),
-                            float(allocation["memory_allocated"]),
-                            task_priority,
-                        )
-                    )
+            preemptible: List[Tuple[str, float, float, Priority]] = [
+                (task_id, cpu, memory, task_priority)
+                for task_id, (cpu, memory, task_priority) in self.ledger.allocations(
+                    agent_id
+                ).items()
+                if PRIORITY_RANK[task_priority] < PRIORITY_RANK[priority]
+            ]
 
             # Sort by priority (lowest first) and try to preempt
-            preemptible.sort(key=lambda x: x[3].value)
+            preemptible.sort(key=lambda x: PRIORITY_RANK[x[3]])
 
             cpu_freed = 0.0
             memory_freed = 0.0
@@ -977,7 +1411,8 @@ class ResourceAllocator:
             ) from e
 
     def close(self) -> None:
-        """Close Redis connection."""
+        """Stop the ledger listener and close the Redis connection."""
+        self.stop_event_listener()
         try:
             if self.redis_client:
                 self.redis_client.close()
@@ -1,20 +1,29 @@
 """
-Task Orchestrator - Prefect-based workflow coordination.
+Task Orchestrator - DAG-scheduled workflow coordination.
 
 Coordinates multi-agent workflows with dependency management, parallel execution,
 and state transitions.
 """
 
+import asyncio
+import heapq
+import inspect
 import json
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
-from prefect import flow, get_run_logger
-from prefect.task_runners import ConcurrentTaskRunner
 from pydantic import BaseModel, Field, field_validator
 
+logger = logging.getLogger(__name__)
+
+# Ready tasks are dispatched highest priority first, then in definition order.
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
 
 class TaskStatus(str, Enum):
     """Task execution status."""
@@ -36,6 +45,13 @@ class WorkflowStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class FailureMode(str, Enum):
+    """How a workflow reacts to a failed task."""
+
+    FAIL_FAST = "fail_fast"
+    CONTINUE = "continue"
+
+
 class Task(BaseModel):
     """Task definition for multi-agent workflows."""
 
@@ -122,41 +138,118 @@ class Workflow(BaseModel):
         1. Status is PENDING
         2. All dependencies are completed
         """
-        ready = []
-        for task in self.tasks:
-            if task.status != TaskStatus.PENDING:
-                continue
+        status_by_id = {task.task_id: task.status for task in self.tasks}
+        return [
+            task
+            for task in self.tasks
+            if task.status == TaskStatus.PENDING
+            and all(
+                status_by_id.get(dep_id) == TaskStatus.COMPLETED
+                for dep_id in task.depends_on
+            )
+        ]
 
-            # Check if all dependencies are completed
-            deps_completed = True
+    def get_dependents(self) -> Dict[str, List[str]]:
+        """Map each task ID to the IDs of tasks that depend on it."""
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for task in self.tasks:
             for dep_id in task.depends_on:
-                dep_task = self.get_task(dep_id)
-                if not dep_task or dep_task.status != TaskStatus.COMPLETED:
-                    deps_completed = False
-                    break
+                dependents[dep_id].append(task.task_id)
+        return dependents
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """
+        Find a dependency cycle using Kahn's algorithm.
+
+        Returns:
+            Task IDs forming a cycle (first ID repeated at the end), or None
+            if the dependency graph is acyclic
+        """
+        task_ids = {task.task_id for task in self.tasks}
+        in_degree = {
+            task.task_id: sum(dep in task_ids for dep in task.depends_on)
+            for task in self.tasks
+        }
+        dependents = self.get_dependents()
+        queue = [task_id for task_id, degree in in_degree.items() if degree == 0]
+        while queue:
+            for dependent in dependents.get(queue.pop(), []):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        blocked = {task_id for task_id, degree in in_degree.items() if degree > 0}
+        if not blocked:
+            return None
+
+        # Every blocked task has a blocked dependency; follow them until one
+        # repeats to report a concrete cycle.
+        depends_on = {task.task_id: task.depends_on for task in self.tasks}
+        path: List[str] = []
+        seen: Dict[str, int] = {}
+        node = min(blocked)
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(dep for dep in depends_on[node] if dep in blocked)
+        return path[seen[node] :] + [node]
+
+    def validate_dependencies(self) -> None:
+        """
+        Check that task IDs are unique and dependencies form a DAG.
 
-            if deps_completed:
-                ready.append(task)
+        Raises:
+            ValueError: If a task ID is duplicated, a dependency is unknown,
+                or dependencies are circular
+        """
+        task_ids: Set[str] = set()
+        for task in self.tasks:
+            if task.task_id in task_ids:
+                raise ValueError(f"Duplicate task ID: {task.task_id}")
+            task_ids.add(task.task_id)
 
-        return ready
+        for task in self.tasks:
+            for dep_id in task.depends_on:
+                if dep_id not in task_ids:
+                    raise ValueError(
+                        f"Task {task.task_id} depends on unknown task {dep_id}"
+                    )
+
+        cycle = self.find_cycle()
+        if cycle:
+            raise ValueError(
+                f"Workflow has circular dependency: {' -> '.join(cycle)}"
+            )
 
 
 class TaskOrchestrator:
     """
-    Orchestrate multi-agent workflows using Prefect.
+    Orchestrate multi-agent workflows on a concurrent DAG scheduler.
 
     Manages workflow execution, task scheduling, dependency resolution,
     and state transitions.
     """
 
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        max_concurrency: int = 8,
+        failure_mode: FailureMode = FailureMode.FAIL_FAST,
+    ):
         """
         Initialize the task orchestrator.
 
         Args:
             redis_url: Redis connection URL for state storage
+            max_concurrency: Maximum tasks executing at once
+            failure_mode: Default reaction to a failed task
         """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         self.redis_url = redis_url
+        self.max_concurrency = max_concurrency
+        self.failure_mode = failure_mode
         self.workflows: Dict[str, Workflow] = {}
 
     @staticmethod
@@ -171,7 +264,8 @@ class TaskOrchestrator:
             Parsed Workflow object
 
         Raises:
-            ValueError: If file format is invalid
+            ValueError: If file format is invalid or task dependencies are
+                unknown or circular
         """
         with open(file_path, "r", encoding="utf-8") as f:
             if file_path.endswith(".yaml") or file_path.endswith(".yml"):
@@ -207,6 +301,7 @@ class TaskOrchestrator:
             tasks=tasks,
             notification=workflow_data.get("notification"),
         )
+        workflow.validate_dependencies()
 
         return workflow
 
@@ -223,26 +318,90 @@ class TaskOrchestrator:
         self.workflows[workflow.workflow_id] = workflow
         return workflow.workflow_id
 
-    @flow(
-        name="multi_agent_workflow",
-        task_runner=ConcurrentTaskRunner(),
-    )
-    def execute_workflow(self, workflow_id: str) -> Dict[str, Any]:
+    def execute_workflow(
+        self,
+        workflow_id: str,
+        failure_mode: Optional[FailureMode] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
-        Execute a workflow using Prefect.
+        Execute a workflow, running independent tasks concurrently.
+
+        Blocking wrapper around execute_workflow_async(). Async callers must
+        await execute_workflow_async() directly: this method runs its own
+        event loop and refuses to start inside a running one.
 
         Args:
             workflow_id: ID of workflow to execute
+            failure_mode: Override of the orchestrator's failure mode
+            max_concurrency: Override of the orchestrator's concurrency limit
 
         Returns:
             Workflow execution result
+
+        Raises:
+            ValueError: If the workflow is not found
+            RuntimeError: If task dependencies are unknown or circular, or if
+                called from a running event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "execute_workflow() cannot run inside an event loop; "
+                "use 'await execute_workflow_async(...)' instead"
+            )
+        return asyncio.run(
+            self.execute_workflow_async(workflow_id, failure_mode, max_concurrency)
+        )
+
+    async def execute_workflow_async(
+        self,
+        workflow_id: str,
+        failure_mode: Optional[FailureMode] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute a workflow on a dependency-counting DAG scheduler.
+
+        Each task tracks how many of its dependencies are unfinished; when
+        that count reaches zero it is dispatched, so scheduling costs
+        O(tasks + dependencies) overall. Up to max_concurrency tasks run at
+        once, synchronous task bodies on a thread pool, each bounded by its
+        own timeout.
+
+        With FAIL_FAST the first failure cancels everything not yet finished
+        and is re-raised. With CONTINUE the dependents of a failed task are
+        cancelled, independent branches keep running, and the workflow
+        finishes as FAILED without raising.
+
+        Args:
+            workflow_id: ID of workflow to execute
+            failure_mode: Override of the orchestrator's failure mode
+            max_concurrency: Override of the orchestrator's concurrency limit
+
+        Returns:
+            Workflow execution result
+
+        Raises:
+            ValueError: If the workflow is not found
+            RuntimeError: If task dependencies are unknown or circular
         """
-        logger = get_run_logger()
         workflow = self.workflows.get(workflow_id)
 
         if not workflow:
             raise ValueError(f"Workflow {workflow_id} not found")
 
+        try:
+            workflow.validate_dependencies()
+        except ValueError as e:
+            raise RuntimeError(str(e)) from e
+
+        failure_mode = failure_mode or self.failure_mode
+        max_concurrency = max_concurrency or self.max_concurrency
+
         logger.info(f"Starting workflow: {workflow.name} ({workflow_id})")
 
         # Update workflow status
@@ -250,83 +409,212 @@ class TaskOrchestrator:
         workflow.started_at = datetime.now(timezone.utc)
 
         try:
-            # Execute tasks based on dependencies
-            task_results = {}
-            completed_tasks = set()
-
-            while len(completed_tasks) < len(workflow.tasks):
-                # Get ready tasks
-                ready_tasks = workflow.get_ready_tasks()
-
-                if not ready_tasks:
-                    # Check if there are still pending tasks
-                    pending = [
-                        t for t in workflow.tasks if t.status == TaskStatus.PENDING
-                    ]
-                    if pending:
-                        raise RuntimeError(
-                            "Workflow has pending tasks but none are ready "
-                            "(possible circular dependency)"
-                        )
-                    break
+            first_error = await self._run_dag(workflow, failure_mode, max_concurrency)
+        except BaseException:
+            workflow.status = WorkflowStatus.FAILED
+            workflow.completed_at = datetime.now(timezone.utc)
+            raise
+
+        workflow.completed_at = datetime.now(timezone.utc)
+        if first_error is None:
+            workflow.status = WorkflowStatus.COMPLETED
+        else:
+            logger.error(f"Workflow {workflow_id} failed: {str(first_error)}")
+            workflow.status = WorkflowStatus.FAILED
+            if failure_mode == FailureMode.FAIL_FAST:
+                raise first_error
+
+        duration = (
+            (workflow.completed_at - workflow.started_at).total_seconds()
+            if workflow.completed_at and workflow.started_at
+            else 0
+        )
+
+        return {
+            "workflow_id": workflow.workflow_id,
+            "status": workflow.status.value,
+            "started_at": (
+                workflow.started_at.isoformat() if workflow.started_at else None
+            ),
+            "completed_at": (
+                workflow.completed_at.isoformat() if workflow.completed_at else None
+            ),
+            "duration_seconds": duration,
+            "tasks_completed": workflow.tasks_completed,
+            "tasks_failed": workflow.tasks_failed,
+            "tasks_cancelled": sum(
+                t.status == TaskStatus.CANCELLED for t in workflow.tasks
+            ),
+        }
+
+    async def _run_dag(
+        self, workflow: Workflow, failure_mode: FailureMode, max_concurrency: int
+    ) -> Optional[BaseException]:
+        """
+        Dispatch pending tasks as their dependencies complete.
+
+        Tasks already COMPLETED count as satisfied dependencies; tasks in any
+        other non-pending state block their dependents.
 
-                # Execute ready tasks
-                for task in ready_tasks:
-                    logger.info(f"Executing task: {task.task_id}")
+        Returns:
+            The first task error, or None if every task completed
+        """
+        tasks = {task.task_id: task for task in workflow.tasks}
+        dependents = workflow.get_dependents()
+        task_results: Dict[str, Any] = {
+            task.task_id: task.output
+            for task in workflow.tasks
+            if task.status == TaskStatus.COMPLETED
+        }
+        waiting = {
+            task.task_id: sum(
+                tasks[dep].status != TaskStatus.COMPLETED for dep in task.depends_on
+            )
+            for task in workflow.tasks
+            if task.status == TaskStatus.PENDING
+        }
+        ready: List[Tuple[int, int, str]] = []
+        order = {task.task_id: i for i, task in enumerate(workflow.tasks)}
+
+        def make_ready(task_id: str) -> None:
+            rank = PRIORITY_RANK.get(tasks[task_id].priority, 1)
+            heapq.heappush(ready, (rank, order[task_id], task_id))
+
+        def cancel_pending(task_ids: List[str]) -> None:
+            # Iterative walk: dependents of a blocked task are blocked too.
+            stack = list(task_ids)
+            while stack:
+                task_id = stack.pop()
+                if waiting.pop(task_id, None) is None:
+                    continue
+                tasks[task_id].status = TaskStatus.CANCELLED
+                tasks[task_id].completed_at = datetime.now(timezone.utc)
+                stack.extend(dependents.get(task_id, []))
+
+        for task_id, count in waiting.items():
+            if count == 0:
+                make_ready(task_id)
+        cancel_pending(
+            [
+                dependent
+                for task in workflow.tasks
+                if task.status not in (TaskStatus.PENDING, TaskStatus.COMPLETED)
+                for dependent in dependents.get(task.task_id, [])
+            ]
+        )
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix=f"wf-{workflow.workflow_id}"
+        )
+        running: Dict[asyncio.Future, str] = {}
+        # Executor calls whose task timed out but whose thread is still busy;
+        # they hold a worker, so they count against max_concurrency.
+        stragglers: Set[asyncio.Future] = set()
+        first_error: Optional[BaseException] = None
+
+        try:
+            while ready or running:
+                while ready and len(running) + len(stragglers) < max_concurrency:
+                    task_id = heapq.heappop(ready)[2]
+                    if task_id not in waiting:
+                        continue
+                    del waiting[task_id]
+                    task = tasks[task_id]
+                    logger.info(f"Executing task: {task_id}")
                     task.status = TaskStatus.RUNNING
                     task.started_at = datetime.now(timezone.utc)
-
-                    try:
-                        # Execute task (placeholder - actual execution delegated)
-                        result = self._execute_task(task, task_results)
-                        task.output = result
+                    future = asyncio.ensure_future(
+                        self._run_task(
+                            task, task_results, loop, executor, stragglers
+                        )
+                    )
+                    running[future] = task_id
+
+                done, _ = await asyncio.wait(
+                    set(running) | stragglers, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    if future in stragglers:
+                        # The worker is free again; the result is discarded.
+                        stragglers.discard(future)
+                        if not future.cancelled():
+                            future.exception()
+                        continue
+                    task = tasks[running.pop(future)]
+                    task.completed_at = datetime.now(timezone.utc)
+                    error = future.exception()
+                    if error is None:
+                        task.output = future.result()
                         task.status = TaskStatus.COMPLETED
-                        task.completed_at = datetime.now(timezone.utc)
+                        task_results[task.task_id] = task.output
                         workflow.tasks_completed += 1
-                        completed_tasks.add(task.task_id)
-                        task_results[task.task_id] = result
                         logger.info(f"Task {task.task_id} completed successfully")
+                        for dependent in dependents.get(task.task_id, []):
+                            if dependent in waiting:
+                                waiting[dependent] -= 1
+                                if waiting[dependent] == 0:
+                                    make_ready(dependent)
+                        continue
+
+                    logger.error(f"Task {task.task_id} failed: {str(error)}")
+                    task.status = TaskStatus.FAILED
+                    task.error = str(error) or type(error).__name__
+                    workflow.tasks_failed += 1
+                    first_error = first_error or error
+                    cancel_pending(dependents.get(task.task_id, []))
+
+                if first_error is not None and failure_mode == FailureMode.FAIL_FAST:
+                    cancel_pending(list(waiting))
+                    for future, task_id in running.items():
+                        future.cancel()
+                        tasks[task_id].status = TaskStatus.CANCELLED
+                        tasks[task_id].completed_at = datetime.now(timezone.utc)
+                    running.clear()
+                    break
+        finally:
+            for future in running:
+                future.cancel()
+            # Threads already running a task finish in the background.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return first_error
+
+    async def _run_task(
+        self,
+        task: Task,
+        task_results: Dict[str, Any],
+        loop: asyncio.AbstractEventLoop,
+        executor: ThreadPoolExecutor,
+        stragglers: Set[asyncio.Future],
+    ) -> Dict[str, Any]:
+        """
+        Run one task body within its timeout.
 
-                    except Exception as e:
-                        logger.error(f"Task {task.task_id} failed: {str(e)}")
-                        task.status = TaskStatus.FAILED
-                        task.error = str(e)
-                        task.completed_at = datetime.now(timezone.utc)
-                        workflow.tasks_failed += 1
-                        completed_tasks.add(task.task_id)
-
-                        # Optionally stop workflow on task failure
-                        raise
-
-            # Workflow completed successfully
-            workflow.status = WorkflowStatus.COMPLETED
-            workflow.completed_at = datetime.now(timezone.utc)
+        Coroutine implementations of _execute_task are awaited directly and
+        cancelled on timeout. Synchronous ones run on the executor; a thread
+        cannot be interrupted, so on timeout its call is added to stragglers
+        and keeps its worker until the body returns.
 
-            duration = (
-                (workflow.completed_at - workflow.started_at).total_seconds()
-                if workflow.completed_at and workflow.started_at
-                else 0
+        Raises:
+            TimeoutError: If the task exceeds task.timeout seconds
+        """
+        if inspect.iscoroutinefunction(self._execute_task):
+            call = self._execute_task(task, task_results)
+            waiter = call
+        else:
+            call = loop.run_in_executor(
+                executor, self._execute_task, task, task_results
             )
-
-            return {
-                "workflow_id": workflow.workflow_id,
-                "status": workflow.status.value,
-                "started_at": (
-                    workflow.started_at.isoformat() if workflow.started_at else None
-                ),
-                "completed_at": (
-                    workflow.completed_at.isoformat() if workflow.completed_at else None
-                ),
-                "duration_seconds": duration,
-                "tasks_completed": workflow.tasks_completed,
-                "tasks_failed": workflow.tasks_failed,
-            }
-
-        except Exception as e:
-            logger.error(f"Workflow {workflow_id} failed: {str(e)}")
-            workflow.status = WorkflowStatus.FAILED
-            workflow.completed_at = datetime.now(timezone.utc)
-            raise
+            waiter = asyncio.shield(call)
+        try:
+            return await asyncio.wait_for(waiter, timeout=task.timeout)
+        except asyncio.TimeoutError:
+            if waiter is not call and not call.done():
+                stragglers.add(call)
+            raise TimeoutError(
+                f"Task {task.task_id} timed out after {task.timeout}s"
+            ) from None
 
     def _execute_task(
         self, task: Task, previous_results: Dict[str, Any]
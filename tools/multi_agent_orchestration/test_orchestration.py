@@ -7,8 +7,10 @@ HandoffManager, WorkflowEngine, HubSpokeCoordinator, and CLI components.
 Issue #46: Multi-Agent Orchestration Platform - Test Suite
 """
 
+import asyncio
 import json
 import tempfile
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -31,6 +33,8 @@ from delegation_manager import (
     RetryPolicy,
     TaskPriority,
     TaskRequest,
+    dispatch_score,
+    max_weight_assignment,
 )
 from handoff_manager import (
     AgentContext,
@@ -50,6 +54,7 @@ from hub_spoke_coordinator import (
 from orchestration_cli import cli
 from resource_allocator import Priority, ResourceAllocator, ResourceUsage, TaskAllocation
 from task_orchestrator import (
+    FailureMode,
     Task,
     TaskOrchestrator,
     TaskStatus,
@@ -58,11 +63,13 @@ from task_orchestrator import (
 )
 from workflow_engine import (
     BugFixWorkflow,
+    CheckpointLog,
     ConditionalBranch,
     ExecutionMode,
     FeatureDevelopmentWorkflow,
     TDDWorkflow,
     WorkflowEngine,
+    compile_condition,
 )
 
 
@@ -100,9 +107,7 @@ def mock_postgres():
 @pytest.fixture
 def task_orchestrator(redis_client):
     """Provide a TaskOrchestrator instance with fake Redis."""
-    with patch("task_orchestrator.TaskOrchestrator.redis_url", "redis://localhost:6379"):
-        orchestrator = TaskOrchestrator()
-        yield orchestrator
+    yield TaskOrchestrator(redis_url="redis://localhost:6379")
 
 
 @pytest.fixture
@@ -127,6 +132,15 @@ def resource_allocator(redis_client):
         yield allocator
 
 
+@pytest.fixture
+def lua_allocator(redis_client):
+    """Provide a ResourceAllocator running its Lua scripts on fake Redis."""
+    with patch("redis.from_url", return_value=redis_client):
+        allocator = ResourceAllocator()
+        yield allocator
+        allocator.stop_event_listener()
+
+
 @pytest.fixture
 def handoff_manager(redis_client, mock_postgres):
     """Provide a HandoffManager instance with fake Redis and mocked PostgreSQL."""
@@ -353,6 +367,185 @@ class TestTaskOrchestrator:
         assert len(ready_tasks) == 1
         assert ready_tasks[0].task_id == "A"
 
+    def test_parse_workflow_definition_rejects_cycles(self, tmp_path):
+        """Test that circular or unknown dependencies fail at parse time."""
+        workflow_def = {
+            "workflow": {
+                "id": "cyclic",
+                "name": "Cyclic",
+                "tasks": [
+                    {"task_id": "A", "agent_type": "t", "depends_on": ["B"]},
+                    {"task_id": "B", "agent_type": "t", "depends_on": ["C"]},
+                    {"task_id": "C", "agent_type": "t", "depends_on": ["B"]},
+                ],
+            }
+        }
+        json_file = tmp_path / "workflow.json"
+        json_file.write_text(json.dumps(workflow_def))
+
+        with pytest.raises(ValueError, match="circular dependency: B -> C -> B"):
+            TaskOrchestrator.parse_workflow_definition(str(json_file))
+
+        workflow_def["workflow"]["tasks"][2]["depends_on"] = ["missing"]
+        json_file.write_text(json.dumps(workflow_def))
+        with pytest.raises(ValueError, match="unknown task missing"):
+            TaskOrchestrator.parse_workflow_definition(str(json_file))
+
+    def test_execute_workflow_runs_ready_tasks_concurrently(self):
+        """Test that independent tasks run in parallel up to the limit."""
+        orchestrator = TaskOrchestrator(max_concurrency=4)
+        workflow = Workflow(
+            workflow_id="wide",
+            name="Wide",
+            tasks=[Task(task_id="root", agent_type="t")]
+            + [
+                Task(task_id=f"leaf-{i}", agent_type="t", depends_on=["root"])
+                for i in range(12)
+            ]
+            + [
+                Task(
+                    task_id="join",
+                    agent_type="t",
+                    depends_on=[f"leaf-{i}" for i in range(12)],
+                )
+            ],
+        )
+        orchestrator.create_workflow(workflow)
+        active: List[str] = []
+        peak = []
+        order = []
+
+        def run(task, previous_results):
+            active.append(task.task_id)
+            peak.append(len(active))
+            time.sleep(0.05)
+            active.remove(task.task_id)
+            order.append(task.task_id)
+            return {"seen": sorted(previous_results)}
+
+        with patch.object(orchestrator, "_execute_task", side_effect=run):
+            start = time.perf_counter()
+            result = orchestrator.execute_workflow("wide")
+            elapsed = time.perf_counter() - start
+
+        assert result["status"] == "completed"
+        assert result["tasks_completed"] == 14
+        assert max(peak) == 4
+        assert elapsed < 14 * 0.05
+        assert order[0] == "root" and order[-1] == "join"
+        assert len(workflow.get_task("join").output["seen"]) == 13
+
+    def test_execute_workflow_continue_on_error(self):
+        """Test that CONTINUE skips only dependents of a failed task."""
+        orchestrator = TaskOrchestrator(failure_mode=FailureMode.CONTINUE)
+        workflow = Workflow(
+            workflow_id="branches",
+            name="Branches",
+            tasks=[
+                Task(task_id="bad", agent_type="t"),
+                Task(task_id="after-bad", agent_type="t", depends_on=["bad"]),
+                Task(task_id="good", agent_type="t"),
+                Task(task_id="after-good", agent_type="t", depends_on=["good"]),
+                Task(task_id="slow", agent_type="t", timeout=1),
+            ],
+        )
+        orchestrator.create_workflow(workflow)
+
+        def run(task, previous_results):
+            if task.task_id == "bad":
+                raise RuntimeError("boom")
+            if task.task_id == "slow":
+                time.sleep(1.5)
+            return {}
+
+        with patch.object(orchestrator, "_execute_task", side_effect=run):
+            result = orchestrator.execute_workflow("branches")
+
+        statuses = {t.task_id: t.status for t in workflow.tasks}
+        assert result["status"] == "failed"
+        assert result["tasks_completed"] == 2
+        assert result["tasks_failed"] == 2
+        assert result["tasks_cancelled"] == 1
+        assert statuses["after-bad"] == TaskStatus.CANCELLED
+        assert statuses["after-good"] == TaskStatus.COMPLETED
+        assert "timed out" in workflow.get_task("slow").error
+
+    def test_execute_workflow_fail_fast_cancels_remaining(self):
+        """Test that FAIL_FAST stops dispatching after the first failure."""
+        orchestrator = TaskOrchestrator(max_concurrency=1)
+        workflow = Workflow(
+            workflow_id="fail-fast",
+            name="Fail fast",
+            tasks=[
+                Task(task_id="bad", agent_type="t", priority="high"),
+                Task(task_id="other", agent_type="t"),
+                Task(task_id="later", agent_type="t", depends_on=["other"]),
+            ],
+        )
+        orchestrator.create_workflow(workflow)
+
+        with patch.object(
+            orchestrator, "_execute_task", side_effect=RuntimeError("boom")
+        ):
+            with pytest.raises(RuntimeError, match="boom"):
+                orchestrator.execute_workflow("fail-fast")
+
+        assert workflow.status == WorkflowStatus.FAILED
+        assert workflow.get_task("bad").status == TaskStatus.FAILED
+        assert workflow.get_task("other").status == TaskStatus.CANCELLED
+        assert workflow.get_task("later").status == TaskStatus.CANCELLED
+
+    def test_execute_workflow_timed_out_thread_holds_its_slot(self):
+        """Test that a task queued after a timeout gets its full timeout."""
+        orchestrator = TaskOrchestrator(
+            max_concurrency=1, failure_mode=FailureMode.CONTINUE
+        )
+        workflow = Workflow(
+            workflow_id="stuck",
+            name="Stuck",
+            tasks=[
+                Task(task_id="slow", agent_type="t", priority="high", timeout=1),
+                Task(task_id="next", agent_type="t", timeout=1),
+            ],
+        )
+        orchestrator.create_workflow(workflow)
+        active: List[str] = []
+        peak = []
+
+        def run(task, previous_results):
+            active.append(task.task_id)
+            peak.append(len(active))
+            time.sleep(1.6 if task.task_id == "slow" else 0.6)
+            active.remove(task.task_id)
+            return {}
+
+        with patch.object(orchestrator, "_execute_task", side_effect=run):
+            result = orchestrator.execute_workflow("stuck")
+
+        assert "timed out" in workflow.get_task("slow").error
+        assert workflow.get_task("next").status == TaskStatus.COMPLETED
+        assert result["tasks_completed"] == 1
+        assert max(peak) == 1
+
+    def test_execute_workflow_inside_event_loop(self):
+        """Test that async callers are pointed at execute_workflow_async."""
+        orchestrator = TaskOrchestrator()
+        workflow = Workflow(
+            workflow_id="async",
+            name="Async",
+            tasks=[Task(task_id="only", agent_type="t")],
+        )
+        orchestrator.create_workflow(workflow)
+
+        async def call_sync():
+            orchestrator.execute_workflow("async")
+
+        with pytest.raises(RuntimeError, match="execute_workflow_async"):
+            asyncio.run(call_sync())
+
+        result = asyncio.run(orchestrator.execute_workflow_async("async"))
+        assert result["status"] == "completed"
+
 
 # ============================================================================
 # DELEGATION MANAGER TESTS
@@ -635,6 +828,261 @@ class TestDelegationManager:
         current_load = int(delegation_manager.redis_client.get(load_key))
         assert current_load == 1
 
+    def test_load_change_retries_on_concurrent_update(self, delegation_manager):
+        """Test the dispatch score tracks the live load under races."""
+        delegation_manager.register_agent(
+            agent_id="agent-1",
+            agent_type="test",
+            capabilities=["python"],
+            max_concurrent_tasks=5,
+        )
+        delegation_manager.set_agent_load("agent-1", 2)
+        load_key = f"{delegation_manager.AGENT_LOAD_PREFIX}agent-1"
+        update_index = delegation_manager._update_dispatch_index
+        raced = []
+
+        def racing_update(pipeline, agent, current_load):
+            if not raced:
+                # Another worker delegates between the read and the write
+                raced.append(current_load)
+                delegation_manager.redis_client.incr(load_key)
+            update_index(pipeline, agent, current_load)
+
+        with patch.object(
+            delegation_manager, "_update_dispatch_index", side_effect=racing_update
+        ):
+            assert delegation_manager.complete_task("agent-1", "task-001")
+
+        assert raced == [1]
+        assert int(delegation_manager.redis_client.get(load_key)) == 2
+        score = delegation_manager.redis_client.zscore(
+            delegation_manager.DISPATCH_INDEX_KEY, "agent-1"
+        )
+        assert score == pytest.approx(dispatch_score(2, 5, 10))
+
+    def test_indexed_matching_agrees_with_full_scan(self, delegation_manager):
+        """Test that index-ranked matches equal scoring every agent."""
+        capabilities = ["python", "fastapi", "redis", "react", "sql"]
+        for i in range(60):
+            delegation_manager.register_agent(
+                agent_id=f"agent-{i:02d}",
+                agent_type="backend" if i % 2 else "frontend",
+                capabilities=capabilities[i % 3 : i % 3 + 1 + i % 4],
+                max_concurrent_tasks=3,
+                priority_weight=1 + (i * 7) % 100,
+            )
+            delegation_manager.set_agent_load(f"agent-{i:02d}", i % 4)
+
+        task = TaskRequest(
+            task_id="task-001",
+            task_type="implement",
+            required_capabilities=["python", "redis", "sql"],
+            required_agent_type="backend",
+            exclude_agents=["agent-33"],
+        )
+        expected = []
+        for status in delegation_manager.list_agents(filter_type="backend"):
+            if status["agent_id"] in task.exclude_agents:
+                continue
+            score, _, _ = delegation_manager._calculate_capability_score(
+                status["capabilities"], task.required_capabilities
+            )
+            if score and status["has_capacity"]:
+                expected.append(
+                    AgentMatch(
+                        agent_id=status["agent_id"],
+                        agent_type=status["agent_type"],
+                        score=score,
+                        current_load=status["current_load"],
+                        max_load=status["max_concurrent_tasks"],
+                        priority_weight=status["priority_weight"],
+                    ).effective_score
+                )
+
+        match = delegation_manager.find_best_agent(task)
+
+        assert match.agent_type == "backend"
+        assert match.agent_id != "agent-33"
+        assert match.effective_score == pytest.approx(max(expected))
+
+        # Filling the best agent moves it out of the dispatch index
+        delegation_manager.delegate_task(task, match)
+        delegation_manager.set_agent_load(match.agent_id, 3)
+        assert delegation_manager.find_best_agent(task).agent_id != match.agent_id
+
+    def test_indices_follow_registration_changes(self, delegation_manager):
+        """Test that re-registration, expiry and rebuild keep indices exact."""
+        delegation_manager.register_agent(
+            agent_id="agent-1", agent_type="test", capabilities=["python"]
+        )
+        delegation_manager.register_agent(
+            agent_id="agent-1", agent_type="test", capabilities=["react"]
+        )
+        assert delegation_manager.find_agent(["python"]) is None
+        assert delegation_manager.find_agent(["react"]).agent_id == "agent-1"
+
+        # An expired agent is skipped, then purged by cleanup
+        delegation_manager.register_agent(
+            agent_id="agent-2", agent_type="test", capabilities=["react"],
+            priority_weight=90,
+        )
+        delegation_manager.redis_client.delete(
+            f"{delegation_manager.AGENT_PREFIX}agent-2"
+        )
+        assert delegation_manager.find_agent(["react"]).agent_id == "agent-1"
+        assert delegation_manager.cleanup_expired_agents() == 1
+        capability_key = f"{delegation_manager.CAPABILITY_INDEX}react"
+        assert delegation_manager.redis_client.smembers(capability_key) == {
+            "agent-1"
+        }
+
+        # Indices can be rebuilt from the registry alone
+        delegation_manager.redis_client.delete(
+            capability_key, delegation_manager.DISPATCH_INDEX_KEY
+        )
+        assert delegation_manager.find_agent(["react"]) is None
+        assert delegation_manager.rebuild_indices() == 1
+        assert delegation_manager.find_agent(["react"]).agent_id == "agent-1"
+
+    def test_delegate_batch_beats_greedy_assignment(self, delegation_manager):
+        """Test that batch delegation places tasks greedy routing cannot."""
+        delegation_manager.register_agent(
+            agent_id="generalist",
+            agent_type="engineer",
+            capabilities=["python", "react"],
+            max_concurrent_tasks=1,
+            priority_weight=90,
+        )
+        delegation_manager.register_agent(
+            agent_id="specialist",
+            agent_type="engineer",
+            capabilities=["python"],
+            max_concurrent_tasks=1,
+            priority_weight=10,
+        )
+        tasks = [
+            TaskRequest(
+                task_id="backend", task_type="t", required_capabilities=["python"]
+            ),
+            TaskRequest(
+                task_id="frontend", task_type="t", required_capabilities=["react"]
+            ),
+            TaskRequest(
+                task_id="extra",
+                task_type="t",
+                required_capabilities=["python"],
+                priority=TaskPriority.LOW,
+            ),
+        ]
+
+        # Greedy routing gives the generalist to the first python task
+        assert delegation_manager.find_best_agent(tasks[0]).agent_id == "generalist"
+
+        result = delegation_manager.delegate_batch(tasks)
+
+        placed = {d["task_id"]: d["agent_id"] for d in result["delegations"]}
+        assert placed == {"backend": "specialist", "frontend": "generalist"}
+        assert result["unassigned"] == ["extra"]
+        for agent_id in ("generalist", "specialist"):
+            status = delegation_manager.get_agent_status(agent_id)
+            assert status["current_load"] == 1
+        assert delegation_manager.find_best_agent(tasks[2]) is None
+
+    def test_delegate_batch_spreads_load_by_priority(self, delegation_manager):
+        """Test capacity, type and exclusion limits and task priorities."""
+        for i in range(3):
+            delegation_manager.register_agent(
+                agent_id=f"agent-{i}",
+                agent_type="backend",
+                capabilities=["python"],
+                max_concurrent_tasks=2,
+            )
+        delegation_manager.register_agent(
+            agent_id="other-type",
+            agent_type="frontend",
+            capabilities=["python"],
+            max_concurrent_tasks=10,
+        )
+        tasks = [
+            TaskRequest(
+                task_id=f"task-{i}",
+                task_type="t",
+                required_capabilities=["python"],
+                required_agent_type="backend",
+                priority=TaskPriority.HIGH if i >= 4 else TaskPriority.LOW,
+                exclude_agents=["agent-0"] if i == 7 else [],
+            )
+            for i in range(8)
+        ]
+
+        result = delegation_manager.delegate_batch(tasks)
+
+        placed = {d["task_id"]: d["agent_id"] for d in result["delegations"]}
+        assert len(placed) == 6
+        assert {f"task-{i}" for i in range(4, 8)} <= set(placed)
+        assert placed["task-7"] != "agent-0"
+        assert "other-type" not in placed.values()
+        assert sorted(d["agent_load"] for d in result["delegations"]) == [
+            1, 1, 1, 2, 2, 2
+        ]
+        assert result["total_score"] == pytest.approx(
+            sum(d["effective_score"] for d in result["delegations"])
+        )
+
+    def test_delegate_batch_replans_after_concurrent_change(self, delegation_manager):
+        """Test that a load change between planning and reserving re-plans."""
+        for agent_id in ("agent-1", "agent-2"):
+            delegation_manager.register_agent(
+                agent_id=agent_id,
+                agent_type="test",
+                capabilities=["python"],
+                max_concurrent_tasks=1,
+            )
+        task = TaskRequest(
+            task_id="t1", task_type="t", required_capabilities=["python"]
+        )
+        plan_batch = delegation_manager._plan_batch
+        plans = []
+
+        def racing_plan(task_requests):
+            plan = plan_batch(task_requests)
+            if not plans:
+                # Another delegation fills the planned agent first
+                delegation_manager.set_agent_load(next(iter(plan["counts"])), 1)
+            plans.append(plan)
+            return plan
+
+        with patch.object(delegation_manager, "_plan_batch", side_effect=racing_plan):
+            result = delegation_manager.delegate_batch([task])
+
+        assert len(plans) == 2
+        first = next(iter(plans[0]["counts"]))
+        assert result["delegations"][0]["agent_id"] != first
+        assert result["delegations"][0]["agent_load"] == 1
+
+    def test_max_weight_assignment_without_scipy(self):
+        """Test the built-in Hungarian solver against exhaustive search."""
+        import itertools
+
+        import delegation_manager as dm
+        import numpy as np
+
+        rng = np.random.default_rng(7)
+        with patch.object(dm, "linear_sum_assignment", None):
+            for _ in range(50):
+                rows, cols = rng.integers(1, 6, size=2)
+                benefit = rng.random((rows, cols)) - 0.3
+                pairs = max_weight_assignment(benefit)
+                assert len({r for r, _ in pairs}) == len(pairs)
+                assert len({c for _, c in pairs}) == len(pairs)
+                best = max(
+                    sum(max(benefit[r, c], 0.0) for r, c in enumerate(choice) if c >= 0)
+                    for choice in itertools.product(range(-1, cols), repeat=rows)
+                    if len({c for c in choice if c >= 0})
+                    == sum(c >= 0 for c in choice)
+                )
+                assert sum(benefit[r, c] for r, c in pairs) == pytest.approx(best)
+
     def test_get_statistics(self, delegation_manager):
         """Test getting delegation manager statistics."""
         delegation_manager.register_agent(
@@ -891,6 +1339,129 @@ class TestResourceAllocator:
 
         assert isinstance(deadlocks, list)
 
+    def test_ledger_follows_allocations_without_scanning(
+        self, lua_allocator, redis_client
+    ):
+        """Test availability is served from the event-driven ledger."""
+        for agent_id in ("agent-1", "agent-2"):
+            lua_allocator.set_agent_limits(agent_id, 2.0, 4096.0, 2)
+        assert sorted(lua_allocator.get_available_agents(1.0, 1024.0)) == [
+            "agent-1",
+            "agent-2",
+        ]
+
+        # After the initial build, queries only read the event stream
+        with patch.object(redis_client, "scan", side_effect=AssertionError):
+            assert lua_allocator.allocate_resources("agent-1", 1.5, 1024.0, "t1")
+            assert lua_allocator.get_available_agents(1.0, 1024.0) == ["agent-2"]
+            assert not lua_allocator.check_availability("agent-1", 1.0, 1024.0)
+
+            # Changes made by another allocator reach this one's ledger
+            with patch("redis.from_url", return_value=redis_client):
+                other = ResourceAllocator()
+            assert other.release_resources("agent-1", "t1")
+            assert lua_allocator.check_availability("agent-1", 1.0, 1024.0)
+
+        usage = lua_allocator.ledger.usage("agent-1")
+        assert usage.cpu_used == 0.0
+        assert usage.active_tasks == 0
+
+    def test_ledger_rebuilds_after_missed_events(self, lua_allocator, redis_client):
+        """Test a sequence gap makes the ledger reload from Redis."""
+        lua_allocator.set_agent_limits("agent-1", 2.0, 4096.0, 2)
+        assert lua_allocator.get_available_agents(1.0, 1024.0) == ["agent-1"]
+
+        lua_allocator.allocate_resources("agent-1", 1.5, 1024.0, "t1")
+        # Simulate the stream being trimmed past this ledger
+        redis_client.delete("resource:events")
+        lua_allocator.allocate_resources("agent-1", 0.1, 64.0, "t2")
+
+        assert lua_allocator.get_available_agents(1.0, 1024.0) == []
+        assert sorted(lua_allocator.ledger.usage("agent-1").task_ids) == ["t1", "t2"]
+
+    def test_detect_deadlocks_on_wait_cycle(self, lua_allocator):
+        """Test circular waits between agents are reported and cleared."""
+        for agent_id in ("agent-a", "agent-b", "agent-c"):
+            lua_allocator.set_agent_limits(agent_id, 1.0, 1024.0, 1)
+        lua_allocator.allocate_resources("agent-a", 1.0, 512.0, "t1")
+        lua_allocator.allocate_resources("agent-b", 1.0, 512.0, "t2")
+        lua_allocator.allocate_resources("agent-c", 1.0, 512.0, "t3")
+
+        # t1 holds A and waits for B; t3 holds C and waits for A
+        assert not lua_allocator.allocate_resources(
+            "agent-b", 1.0, 512.0, "t1", wait=True
+        )
+        assert not lua_allocator.allocate_resources(
+            "agent-a", 1.0, 512.0, "t3", wait=True
+        )
+        assert lua_allocator.detect_deadlocks() == []
+
+        # t2 holds B and waits for C: A -> B -> C -> A
+        lua_allocator.allocate_resources("agent-c", 1.0, 512.0, "t2", wait=True)
+        assert lua_allocator.detect_deadlocks() == ["agent-a", "agent-b", "agent-c"]
+
+        # A fresh ledger rebuilt from Redis sees the same cycle
+        lua_allocator.ledger.rebuild()
+        assert lua_allocator.detect_deadlocks() == ["agent-a", "agent-b", "agent-c"]
+
+        assert lua_allocator.cancel_wait("t2")
+        assert lua_allocator.detect_deadlocks() == []
+        assert not lua_allocator.cancel_wait("t2")
+
+    def test_preemption_frees_lower_priority_tasks(self, lua_allocator):
+        """Test a high priority task preempts low priority allocations."""
+        lua_allocator.set_agent_limits("agent-1", 2.0, 4096.0, 3)
+        lua_allocator.allocate_resources(
+            "agent-1", 1.5, 1024.0, "low-task", priority=Priority.LOW
+        )
+
+        assert lua_allocator.allocate_resources(
+            "agent-1", 1.0, 1024.0, "urgent-task", priority=Priority.HIGH
+        )
+        assert lua_allocator.get_allocation("agent-1", "low-task") is None
+        assert lua_allocator.redis_client.lrange("agent:agent-1:queue", 0, -1) == [
+            "low-task"
+        ]
+
+    def test_event_listener_keeps_ledger_current(self, lua_allocator, redis_client):
+        """Test the background listener applies events as they arrive."""
+        lua_allocator.set_agent_limits("agent-1", 2.0, 4096.0, 1)
+        lua_allocator.start_event_listener(block_ms=50)
+
+        with patch("redis.from_url", return_value=redis_client):
+            other = ResourceAllocator()
+        other.allocate_resources("agent-1", 1.0, 1024.0, "t1")
+
+        deadline = time.time() + 5
+        while lua_allocator.ledger.has_capacity("agent-1", 1.0, 1024.0):
+            assert time.time() < deadline
+            time.sleep(0.01)
+        assert lua_allocator.get_available_agents(1.0, 1024.0) == []
+
+
+    def test_queries_see_own_changes_while_listening(self, lua_allocator):
+        """Test a lagging listener never hides this allocator's own changes."""
+        lua_allocator.set_agent_limits("agent-1", 2.0, 4096.0, 1)
+        assert lua_allocator.check_availability("agent-1", 1.0, 1024.0)
+
+        # A listener that never applies anything stands in for one that lags
+        stop = threading.Event()
+        lua_allocator._listener = threading.Thread(target=stop.wait, daemon=True)
+        lua_allocator._listener.start()
+        try:
+            assert lua_allocator.allocate_resources("agent-1", 1.0, 1024.0, "t1")
+            assert not lua_allocator.check_availability("agent-1", 1.0, 1024.0)
+
+            # Without new changes of its own, queries stay off Redis
+            with patch.object(lua_allocator.ledger, "catch_up") as catch_up:
+                assert lua_allocator.get_available_agents(1.0, 1024.0) == []
+            catch_up.assert_not_called()
+
+            assert lua_allocator.release_resources("agent-1", "t1")
+            assert lua_allocator.get_available_agents(1.0, 1024.0) == ["agent-1"]
+        finally:
+            stop.set()
+            lua_allocator._listener = None
 
 # ============================================================================
 # HANDOFF MANAGER TESTS
@@ -1071,6 +1642,98 @@ class TestHandoffManager:
         assert retrieved is not None
         assert retrieved.agent_id == context.agent_id
 
+    def test_pack_unpack_context(self, handoff_manager):
+        """Test the binary codec round-trips a context."""
+        context = AgentContext(
+            agent_id="agent-1",
+            agent_type="test",
+            conversation_history=[
+                {"role": "user", "content": f"Step {i} " * 20} for i in range(50)
+            ],
+            files_created=["a.py"],
+            state={"coverage": 91.5, "tests_passing": True},
+        )
+
+        packed = handoff_manager.pack_context(context)
+        unpacked = handoff_manager.unpack_context(packed)
+
+        assert unpacked == context
+        assert len(packed) < len(handoff_manager.serialize_context(context))
+
+        with pytest.raises(ValueError):
+            handoff_manager.unpack_context(b"\x09garbage")
+
+    def test_transfer_context_ships_only_delta(self, handoff_manager, redis_client):
+        """Test repeated transfers reference unchanged chunks by hash."""
+        chunk = HandoffManager.CHUNK_ENTRIES
+        conversation = [
+            {"role": "user", "content": f"message {i}"} for i in range(3 * chunk)
+        ]
+        context = AgentContext(
+            agent_id="agent-1",
+            agent_type="test",
+            conversation_history=list(conversation),
+        )
+
+        assert handoff_manager.transfer_context("agent-1", "agent-2", context)
+        first = json.loads(redis_client.get("handoff:metadata:agent-2"))
+        assert len(redis_client.keys("handoff:chunk:*")) == 3
+
+        context.conversation_history.append({"role": "assistant", "content": "done"})
+        assert handoff_manager.transfer_context("agent-2", "agent-3", context)
+        second = json.loads(redis_client.get("handoff:metadata:agent-3"))
+
+        # Only the manifest and the new fourth chunk are written
+        assert len(redis_client.keys("handoff:chunk:*")) == 4
+        assert second["context_bytes"] < first["context_bytes"] / 2
+
+        # A fresh manager with an empty chunk cache reads from Redis
+        receiver = HandoffManager(redis_client=redis_client)
+        retrieved = receiver.get_transferred_context("agent-3")
+        assert retrieved.conversation_history == context.conversation_history
+        assert receiver.get_transferred_context("agent-2").conversation_history == (
+            conversation
+        )
+
+        # Contexts whose chunks expired are reported as missing
+        redis_client.delete(*redis_client.keys("handoff:chunk:*"))
+        assert HandoffManager(redis_client=redis_client).get_transferred_context(
+            "agent-3"
+        ) is None
+
+    def test_chunk_cache_isolated_from_callers(self, handoff_manager):
+        """Test mutating stored or loaded histories never leaks into the cache."""
+        conversation = [{"role": "user", "content": "original"}]
+        context = AgentContext(
+            agent_id="agent-1", agent_type="test", conversation_history=conversation
+        )
+        assert handoff_manager.transfer_context("agent-1", "agent-2", context)
+
+        conversation[0]["content"] = "edited by sender"
+        loaded = handoff_manager.get_transferred_context("agent-2")
+        assert loaded.conversation_history == [{"role": "user", "content": "original"}]
+
+        loaded.conversation_history[0]["content"] = "edited by receiver"
+        again = handoff_manager.get_transferred_context("agent-2")
+        assert again.conversation_history[0]["content"] == "original"
+
+    def test_get_transferred_context_reads_legacy_json(
+        self, handoff_manager, redis_client
+    ):
+        """Test contexts stored by the JSON path are still readable."""
+        context = AgentContext(
+            agent_id="agent-1",
+            agent_type="test",
+            conversation_history=[{"role": "user", "content": "Hello"}],
+        )
+        redis_client.set(
+            "handoff:context:agent-2", handoff_manager.serialize_context(context)
+        )
+
+        retrieved = handoff_manager.get_transferred_context("agent-2")
+
+        assert retrieved == context
+
     def test_rollback(self, handoff_manager, mock_postgres):
         """Test rolling back a handoff."""
         # Setup mock cursor to return handoff data
@@ -1191,6 +1854,86 @@ class TestWorkflowEngine:
         for task in tasks:
             assert task.status == TaskStatus.COMPLETED
 
+    def test_execute_parallel_bounded_copy_on_write(self, workflow_engine):
+        """Test the concurrency ceiling and per-task context overlays."""
+        shared = {"payload": "x" * 1024}
+        active: List[str] = []
+        peak = []
+        seen = []
+
+        def run(task):
+            ctx = task.input_data["context"]
+            active.append(task.task_id)
+            peak.append(len(active))
+            ctx["mine"] = task.task_id
+            seen.append((ctx["payload"] is shared["payload"], ctx["mine"]))
+            time.sleep(0.02)
+            active.remove(task.task_id)
+            return {"task_id": task.task_id}
+
+        tasks = [Task(task_id=f"task-{i}", agent_type="test") for i in range(12)]
+        with patch.object(workflow_engine, "_execute_single_task", side_effect=run):
+            results = workflow_engine.execute_parallel(
+                tasks, shared, max_concurrency=3
+            )
+
+        assert [r["task_id"] for r in results] == [t.task_id for t in tasks]
+        assert max(peak) == 3
+        assert all(same for same, _ in seen)
+        assert sorted(mine for _, mine in seen) == sorted(t.task_id for t in tasks)
+        assert shared == {"payload": "x" * 1024}
+        assert all("context" not in t.input_data for t in tasks)
+
+    def test_execute_parallel_fail_fast(self, workflow_engine):
+        """Test that a failure cancels the rest of a parallel batch."""
+
+        def run(task):
+            if task.task_id == "bad":
+                raise RuntimeError("boom")
+            time.sleep(0.2)
+            return {}
+
+        tasks = [Task(task_id="bad", agent_type="test")] + [
+            Task(task_id=f"task-{i}", agent_type="test") for i in range(5)
+        ]
+        with patch.object(workflow_engine, "_execute_single_task", side_effect=run):
+            with pytest.raises(RuntimeError, match="boom"):
+                workflow_engine.execute_parallel(tasks, max_concurrency=2)
+
+        statuses = [t.status for t in tasks]
+        assert statuses[0] == TaskStatus.FAILED
+        assert statuses.count(TaskStatus.CANCELLED) == 5
+
+    def test_stream_parallel_yields_and_cancels(self, workflow_engine):
+        """Test streaming results in completion order with cancellation."""
+        delays = {"slow": 1.0, "fast": 0.01, "medium": 0.1}
+
+        def run(task):
+            time.sleep(delays[task.task_id])
+            return {"task_id": task.task_id}
+
+        async def consume():
+            tasks = iter(Task(task_id=t, agent_type="test") for t in delays)
+            finished = []
+            async for task in workflow_engine.stream_parallel(tasks):
+                finished.append((task.task_id, task.status))
+                if task.task_id == "fast":
+                    assert workflow_engine.cancel_task("slow")
+                    assert not workflow_engine.cancel_task("fast")
+            return finished
+
+        with patch.object(workflow_engine, "_execute_single_task", side_effect=run):
+            start = time.perf_counter()
+            finished = asyncio.run(consume())
+            elapsed = time.perf_counter() - start
+
+        assert finished == [
+            ("fast", TaskStatus.COMPLETED),
+            ("slow", TaskStatus.CANCELLED),
+            ("medium", TaskStatus.COMPLETED),
+        ]
+        assert elapsed < 1.0
+
     def test_execute_conditional_true_branch(self, workflow_engine):
         """Test conditional execution taking true branch."""
         if_tasks = [Task(task_id="if-task-1", agent_type="test")]
@@ -1247,6 +1990,94 @@ class TestWorkflowEngine:
         assert workflow_engine.evaluate_condition("not c", context) is True
         assert workflow_engine.evaluate_condition("a and c", context) is False
 
+    def test_evaluate_condition_precedence(self, workflow_engine):
+        """Test compiled conditions follow and/or/not precedence."""
+        context = {"a": True, "b": False, "c": False, "result": {"coverage": 91.5}}
+
+        assert workflow_engine.evaluate_condition("a or b and c", context) is True
+        assert workflow_engine.evaluate_condition("(a or b) and c", context) is False
+        assert workflow_engine.evaluate_condition("not b and a", context) is True
+        assert workflow_engine.evaluate_condition(
+            "result.coverage >= 90 and status == 'done'", {**context, "status": "done"}
+        )
+
+    def test_evaluate_condition_membership(self, workflow_engine):
+        """Test contains/in operators and their negations."""
+        context = {"labels": "bug,hotfix", "owner": "bob", "name": "John Smith"}
+
+        assert workflow_engine.evaluate_condition("labels contains hotfix", context)
+        assert workflow_engine.evaluate_condition(
+            "labels not contains feature", context
+        )
+        assert workflow_engine.evaluate_condition('owner in ["alice", "bob"]', context)
+        assert workflow_engine.evaluate_condition("owner not in [1, 2]", context)
+        assert workflow_engine.evaluate_condition("name == John Smith", context)
+
+    def test_evaluate_condition_bare_punctuated_values(self, workflow_engine):
+        """Test unquoted values may contain "!" and "=" outside operators."""
+        context = {"msg": "Hello!", "url": "http://x?a=b", "n": 3}
+
+        assert workflow_engine.evaluate_condition("msg == Hello!", context)
+        assert workflow_engine.evaluate_condition("url == http://x?a=b", context)
+        assert workflow_engine.evaluate_condition("msg != Hello", context)
+        assert workflow_engine.evaluate_condition("n!=4 and n==3", context)
+        assert ConditionalBranch(condition_expr="url == http://x?a=b")
+        assert ConditionalBranch(condition_expr="msg == Hello!")
+
+        with pytest.raises(ValueError):
+            compile_condition("n = 3")
+        with pytest.raises(ValidationError):
+            ConditionalBranch(condition_expr="n = 3")
+
+    def test_evaluate_condition_keywords_inside_values(self, workflow_engine):
+        """Test bare multi-word values may contain and/or/not/in."""
+        context = {"msg": "please sign in", "status": "sign in"}
+
+        assert workflow_engine.evaluate_condition("msg contains sign in", context)
+        assert workflow_engine.evaluate_condition("status == sign in", context)
+        assert workflow_engine.evaluate_condition(
+            "stage == not started", {"stage": "not started"}
+        )
+        assert workflow_engine.evaluate_condition(
+            "status == Done Or Not", {"status": "Done Or Not"}
+        )
+        assert not workflow_engine.evaluate_condition(
+            "status == Done Or Not", {"status": "Done"}
+        )
+        for expr in (
+            "msg contains sign in",
+            "status == sign in",
+            "stage == not started",
+            "status == Done Or Not",
+        ):
+            assert ConditionalBranch(condition_expr=expr)
+
+        # Keywords that start a valid continuation keep their meaning
+        assert workflow_engine.evaluate_condition(
+            "status == sign in or msg contains please", {**context, "status": "x"}
+        )
+        assert workflow_engine.evaluate_condition(
+            "status not in [1, 2] and not done", {**context, "done": False}
+        )
+
+        # Malformed expressions surface as RuntimeError, per the contract
+        with pytest.raises(RuntimeError):
+            workflow_engine.evaluate_condition("(status == x", context)
+
+    def test_compile_condition_caches_and_validates(self):
+        """Test conditions compile once and syntax errors surface early."""
+        compiled = compile_condition("x > 1 and y")
+        assert compile_condition("x > 1 and y") is compiled
+        assert compiled({"x": 2, "y": True}) is True
+
+        # Short-circuiting skips the comparison that would raise
+        assert compile_condition("x or y > 1")({"x": True, "y": "text"}) is True
+
+        with pytest.raises(ValueError):
+            compile_condition("(x > 1")
+        with pytest.raises(ValidationError):
+            ConditionalBranch(condition_expr="x ==")
+
     def test_pause_resume_workflow(self, workflow_engine):
         """Test pausing and resuming workflow."""
         workflow = Workflow(
@@ -1265,6 +2096,109 @@ class TestWorkflowEngine:
         success = workflow_engine.resume_workflow(workflow.workflow_id)
         assert success is True
 
+    def test_execute_workflow_resumes_from_checkpoint(self, redis_client, tmp_path):
+        """Test that a restarted engine skips checkpointed tasks."""
+        db = str(tmp_path / "checkpoints.db")
+
+        def chain() -> Workflow:
+            return Workflow(
+                workflow_id="wf-resume",
+                name="Resume",
+                tasks=[
+                    Task(task_id="a", agent_type="test"),
+                    Task(task_id="b", agent_type="test", depends_on=["a"]),
+                    Task(task_id="c", agent_type="test", depends_on=["a"]),
+                    Task(task_id="d", agent_type="test", depends_on=["b", "c"]),
+                ],
+            )
+
+        calls: List[str] = []
+
+        def run(task):
+            calls.append(task.task_id)
+            if task.task_id == "d" and calls.count("d") == 1:
+                raise RuntimeError("flaky")
+            return {"by": task.task_id}
+
+        for attempt in range(2):
+            with patch("redis.from_url", return_value=redis_client):
+                engine = WorkflowEngine(checkpoint_path=db)
+            engine.workflows["wf-resume"] = chain()
+            with patch.object(engine, "_execute_single_task", side_effect=run):
+                if attempt == 0:
+                    with pytest.raises(RuntimeError, match="flaky"):
+                        engine.execute_workflow("wf-resume")
+                else:
+                    state = engine.execute_workflow("wf-resume")
+            engine.checkpoints.close()
+
+        assert sorted(calls[:3]) == ["a", "b", "c"] and calls[3:] == ["d", "d"]
+        assert state["status"] == "completed"
+        assert state["tasks_completed"] == 4
+        assert state["tasks"][1]["output"] == {"by": "b"}
+
+    def test_pause_stops_dispatch_and_resume_continues(self, redis_client, tmp_path):
+        """Test pausing mid-run and resuming on a fresh engine."""
+        db = str(tmp_path / "checkpoints.db")
+        tasks = [Task(task_id=f"task-{i}", agent_type="test") for i in range(6)]
+        with patch("redis.from_url", return_value=redis_client):
+            engine = WorkflowEngine(max_concurrency=1, checkpoint_path=db)
+        engine.workflows["wf-pause"] = Workflow(
+            workflow_id="wf-pause", name="Pause", tasks=tasks
+        )
+
+        def run(task):
+            if task.task_id == "task-1":
+                assert engine.pause_workflow("wf-pause")
+            return {}
+
+        with patch.object(engine, "_execute_single_task", side_effect=run):
+            state = engine.execute_workflow("wf-pause")
+
+        assert state["status"] == "running"
+        assert state["tasks_completed"] == 2
+
+        with patch("redis.from_url", return_value=redis_client):
+            restarted = WorkflowEngine(checkpoint_path=db)
+        restarted.workflows["wf-pause"] = Workflow(
+            workflow_id="wf-pause",
+            name="Pause",
+            tasks=[Task(task_id=f"task-{i}", agent_type="test") for i in range(6)],
+        )
+        assert restarted.resume_workflow("wf-pause") is True
+        assert restarted.workflows["wf-pause"].tasks_completed == 2
+
+        calls: List[str] = []
+        with patch.object(
+            restarted,
+            "_execute_single_task",
+            side_effect=lambda task: calls.append(task.task_id) or {},
+        ):
+            state = restarted.execute_workflow("wf-pause")
+
+        assert state["status"] == "completed"
+        assert sorted(calls) == [f"task-{i}" for i in range(2, 6)]
+
+    def test_checkpoint_log_compaction(self, tmp_path):
+        """Test that compaction keeps the latest entry per task."""
+        log = CheckpointLog(str(tmp_path / "log.db"), compact_threshold=3)
+        for i, task_id in enumerate(["a", "b", "a", "c"]):
+            task = Task(task_id=task_id, agent_type="test", output={"run": i})
+            log.append("wf", task)
+
+        assert log.load("wf")["a"]["output"] == {"run": 2}
+        # The third append folded the log; only "c" is left in the tail
+        assert log.compact("wf") == 1
+        assert log.compact("wf") == 0
+        assert {k: v["output"] for k, v in log.load("wf").items()} == {
+            "a": {"run": 2},
+            "b": {"run": 1},
+            "c": {"run": 3},
+        }
+        log.delete("wf")
+        assert log.load("wf") == {}
+        log.close()
+
     def test_dynamic_task_generation(self, workflow_engine):
         """Test generating tasks dynamically."""
 
@@ -7,21 +7,32 @@ and reusable workflow templates for common development patterns
 (TDD, feature development, bug fixing).
 """
 
+import asyncio
+import inspect
 import json
+import logging
 import re
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from functools import lru_cache, reduce
+from types import MappingProxyType
+from typing import (Any, AsyncIterator, Callable, Dict, Iterable, List,
+                    Mapping, Optional, Set, Tuple, Union)
 
 import redis
 from prefect import flow, get_run_logger
-from prefect import task as prefect_task
 from prefect.task_runners import ConcurrentTaskRunner
 from pydantic import BaseModel, Field, field_validator
 
-from task_orchestrator import (Task, TaskOrchestrator, TaskStatus, Workflow,
-                               WorkflowStatus)
+from task_orchestrator import (FailureMode, Task, TaskOrchestrator, TaskStatus,
+                               Workflow, WorkflowStatus)
+
+logger = logging.getLogger(__name__)
 
 
 class ExecutionMode(str, Enum):
@@ -51,6 +62,278 @@ class ConditionalOperator(str, Enum):
     NOT = "not"
 
 
+ConditionFunc = Callable[[Dict[str, Any]], Any]
+
+# Tokens of a condition expression, tried in order: quoted string, JSON
+# list, comparison operator, parenthesis, then any other run of characters.
+# Words keep a "!" or "=" that does not start "!=" or "==", so bare values
+# such as ``Hello!`` or ``http://x?a=b`` need no quotes.
+_CONDITION_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+        |(?P<list>\[[^\]]*\])
+        |(?P<op>>=|<=|==|!=|>|<)
+        |(?P<paren>[()])
+        |(?P<word>(?:[^\s()<>=!]|[!=](?!=))+)
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+    "contains": lambda a, b: b in str(a),
+    "not_contains": lambda a, b: b not in str(a),
+    "in": lambda a, b: a in b if isinstance(b, (list, set, tuple)) else a in str(b),
+    "not_in": lambda a, b: not _COMPARISONS["in"](a, b),
+}
+
+_KEYWORDS = {"and", "or", "not", "in", "contains", "not_in", "not_contains"}
+
+
+def _both(left: ConditionFunc, right: ConditionFunc) -> ConditionFunc:
+    """Short-circuiting ``and`` of two compiled conditions."""
+    return lambda ctx: left(ctx) and right(ctx)
+
+
+def _either(left: ConditionFunc, right: ConditionFunc) -> ConditionFunc:
+    """Short-circuiting ``or`` of two compiled conditions."""
+    return lambda ctx: left(ctx) or right(ctx)
+
+
+class _ConditionParser:
+    """
+    Recursive-descent parser turning a condition into nested closures.
+
+    Precedence from loosest to tightest: ``or``, ``and``, ``not``, then
+    comparisons (==, !=, >, <, >=, <=, contains, in, not in and their
+    ``not_`` forms). Parentheses group. An operand is a literal (quoted
+    string, number, true/false/none, JSON list) or a context reference,
+    where dotted names walk nested dicts and an unknown plain name stands
+    for itself as a string.
+    """
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        self.tokens: List[Tuple[str, str, int, int]] = []
+        position = 0
+        while position < len(expr):
+            match = _CONDITION_TOKEN.match(expr, position)
+            if not match:
+                if expr[position:].strip():
+                    raise ValueError(f"Unexpected character at {position}")
+                break
+            group = kind = match.lastgroup
+            text = match.group(group)
+            if kind == "word" and not text.strip("!="):
+                # A lone "=" is almost always a mistyped "=="
+                raise ValueError(f"Unexpected '{text}' at {match.start(group)}")
+            if kind == "word" and text.lower() in _KEYWORDS:
+                kind = "keyword"
+                text = text.lower()
+            self.tokens.append((kind, text, match.start(group), match.end(group)))
+            position = match.end()
+        self.index = 0
+
+    def parse(self) -> ConditionFunc:
+        """Parse the whole expression."""
+        if not self.tokens:
+            raise ValueError("Condition expression cannot be empty")
+        node = self._or()
+        if self.index < len(self.tokens):
+            raise ValueError(f"Unexpected '{self.tokens[self.index][1]}'")
+        return node
+
+    def _peek(self) -> Tuple[str, str]:
+        """Return the next token's kind and text without consuming it."""
+        if self.index < len(self.tokens):
+            kind, text, _, _ = self.tokens[self.index]
+            return kind, text
+        return "", ""
+
+    def _accept(self, kind: str, text: Optional[str] = None) -> bool:
+        """Consume the next token if it matches."""
+        if self._peek()[0] == kind and text in (None, self._peek()[1]):
+            self.index += 1
+            return True
+        return False
+
+    def _or(self) -> ConditionFunc:
+        """Parse ``and``-terms joined by ``or``."""
+        operands = [self._and()]
+        while self._accept("keyword", "or"):
+            operands.append(self._and())
+        return reduce(_either, operands)
+
+    def _and(self) -> ConditionFunc:
+        """Parse ``not``-terms joined by ``and``."""
+        operands = [self._not()]
+        while self._accept("keyword", "and"):
+            operands.append(self._not())
+        return reduce(_both, operands)
+
+    def _not(self) -> ConditionFunc:
+        """Parse an optionally negated comparison."""
+        if self._accept("keyword", "not"):
+            operand = self._not()
+            return lambda ctx: not operand(ctx)
+        return self._comparison()
+
+    def _comparison(self) -> ConditionFunc:
+        """Parse ``operand [comparison operand]``."""
+        left = self._primary()
+        operator = self._comparison_operator()
+        if operator is None:
+            return left
+        compare = _COMPARISONS[operator]
+        right = self._primary(right_operand=True)
+        return lambda ctx: compare(left(ctx), right(ctx))
+
+    def _comparison_operator(self) -> Optional[str]:
+        """Consume a comparison operator, if one comes next."""
+        kind, text = self._peek()
+        if kind == "op" or text in ("contains", "in", "not_in", "not_contains"):
+            self.index += 1
+            return text
+        if text == "not" and self.index + 1 < len(self.tokens):
+            following = self.tokens[self.index + 1][1]
+            if following in ("in", "contains"):
+                self.index += 2
+                return f"not_{following}"
+        return None
+
+    def _primary(self, right_operand: bool = False) -> ConditionFunc:
+        """
+        Parse a parenthesized expression or an operand.
+
+        Adjacent words form one operand, as in ``name == John Smith``.
+        A keyword joins the operand too unless it starts a valid
+        continuation, so ``msg contains sign in`` and
+        ``stage == not started`` compare against multi-word values.
+        """
+        if self._accept("paren", "("):
+            node = self._or()
+            if not self._accept("paren", ")"):
+                raise ValueError("Missing ')'")
+            return node
+
+        start = self.index
+        while True:
+            kind, _ = self._peek()
+            if kind in ("string", "list", "word"):
+                self.index += 1
+            elif kind == "keyword" and (
+                (right_operand and self.index == start)
+                or (self.index > start and not self._continues(right_operand))
+            ):
+                self.index += 1
+            else:
+                break
+        if self.index == start:
+            kind, text = self._peek()
+            raise ValueError(f"Expected a value, got '{text or 'end of input'}'")
+        text = self.expr[self.tokens[start][2] : self.tokens[self.index - 1][3]]
+        return _compile_operand(text)
+
+    def _continues(self, right_operand: bool) -> bool:
+        """Whether the keyword at the current token ends the operand."""
+        keyword = self.tokens[self.index][1]
+        if keyword in ("and", "or"):
+            return self._starts_operand(self.index + 1)
+        if right_operand:
+            return False  # comparisons do not chain
+        if keyword == "not":
+            following = self.index + 1
+            return (
+                following < len(self.tokens)
+                and self.tokens[following][1] in ("in", "contains")
+                and self._starts_operand(following + 1)
+            )
+        return self._starts_operand(self.index + 1)
+
+    def _starts_operand(self, index: int) -> bool:
+        """Whether the token at ``index`` can begin a (negated) operand."""
+        if index >= len(self.tokens):
+            return False
+        kind, text, _, _ = self.tokens[index]
+        if kind == "keyword" and text == "not":
+            return self._starts_operand(index + 1)
+        return kind in ("string", "list", "word") or (kind, text) == ("paren", "(")
+
+
+def _compile_operand(text: str) -> ConditionFunc:
+    """Compile an operand to a closure returning its value."""
+    # Quoted string
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        value: Any = text[1:-1]
+        return lambda ctx: value
+
+    # Number
+    try:
+        value = float(text) if "." in text else int(text)
+        return lambda ctx: value
+    except ValueError:
+        pass
+
+    # Boolean and None literals
+    literals = {"true": True, "false": False, "none": None}
+    if text.lower() in literals:
+        value = literals[text.lower()]
+        return lambda ctx: value
+
+    # List literal
+    if text.startswith("[") and text.endswith("]"):
+        try:
+            value = json.loads(text)
+            return lambda ctx: value
+        except json.JSONDecodeError:
+            pass
+
+    # Nested context access with dot notation
+    if "." in text:
+        path = text.split(".")
+
+        def lookup(ctx: Dict[str, Any]) -> Any:
+            value: Any = ctx
+            for part in path:
+                if not isinstance(value, dict):
+                    return None
+                value = value.get(part)
+            return value
+
+        return lookup
+
+    # Simple context lookup; unknown names stand for themselves
+    return lambda ctx: ctx.get(text, text)
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(condition_expr: str) -> ConditionFunc:
+    """
+    Compile a condition expression into a callable over a context dict.
+
+    Compiled conditions are cached, so each distinct expression is parsed
+    once. ``and``/``or`` short-circuit when the callable runs.
+
+    Args:
+        condition_expr: Condition expression
+
+    Returns:
+        Callable taking the context and returning the condition's value
+
+    Raises:
+        ValueError: If the expression is empty or malformed
+    """
+    try:
+        return _ConditionParser(condition_expr.strip()).parse()
+    except ValueError as e:
+        raise ValueError(f"Invalid condition '{condition_expr}': {e}") from e
+
+
 class ConditionalBranch(BaseModel):
     """Model for conditional workflow branching."""
 
@@ -74,6 +357,8 @@ class ConditionalBranch(BaseModel):
         """Validate condition expression syntax."""
         if not v or not v.strip():
             raise ValueError("Condition expression cannot be empty")
+        # Compiling here both validates and warms the compile cache
+        compile_condition(v.strip())
         return v.strip()
 
 
@@ -450,6 +735,185 @@ class BugFixWorkflow(WorkflowTemplate):
         return workflow
 
 
+class CheckpointLog:
+    """
+    Append-only SQLite log of completed workflow tasks.
+
+    Each completion is appended to checkpoint_log as it happens. Compaction
+    folds a workflow's log rows into checkpoint_tasks, one row per task,
+    and deletes them, so loading reads the compacted rows and replays only
+    the log tail written since. The database runs in WAL mode; a commit
+    survives a crash of the process, though not necessarily a power loss.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS checkpoint_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            workflow_id TEXT NOT NULL,
+            task_id TEXT NOT NULL,
+            output TEXT,
+            completed_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS checkpoint_log_workflow
+            ON checkpoint_log (workflow_id, seq);
+        CREATE TABLE IF NOT EXISTS checkpoint_tasks (
+            workflow_id TEXT NOT NULL,
+            task_id TEXT NOT NULL,
+            output TEXT,
+            completed_at TEXT,
+            PRIMARY KEY (workflow_id, task_id)
+        );
+    """
+
+    def __init__(self, path: str, compact_threshold: int = 1000):
+        """
+        Open (or create) a checkpoint database.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+            compact_threshold: Log rows per workflow that trigger compaction
+        """
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._tail: Dict[str, int] = {}
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def append(self, workflow_id: str, task: Task) -> None:
+        """
+        Record a completed task and its output.
+
+        Args:
+            workflow_id: Workflow the task belongs to
+            task: Completed task
+        """
+        completed_at = task.completed_at or datetime.now(timezone.utc)
+        with self._lock:
+            tail = self._tail_length(workflow_id) + 1
+            self._conn.execute(
+                "INSERT INTO checkpoint_log "
+                "(workflow_id, task_id, output, completed_at) VALUES (?, ?, ?, ?)",
+                (
+                    workflow_id,
+                    task.task_id,
+                    json.dumps(task.output, default=str),
+                    completed_at.isoformat(),
+                ),
+            )
+            self._tail[workflow_id] = tail
+            if tail >= self.compact_threshold:
+                self._compact(workflow_id)
+
+    def load(self, workflow_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the completed tasks of a workflow.
+
+        Args:
+            workflow_id: Workflow ID
+
+        Returns:
+            Mapping of task ID to {"output", "completed_at"}, empty if the
+            workflow has no checkpoints
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_id, output, completed_at FROM checkpoint_tasks "
+                "WHERE workflow_id = ?",
+                (workflow_id,),
+            ).fetchall()
+            rows += self._conn.execute(
+                "SELECT task_id, output, completed_at FROM checkpoint_log "
+                "WHERE workflow_id = ? ORDER BY seq",
+                (workflow_id,),
+            ).fetchall()
+
+        return {
+            task_id: {"output": json.loads(output), "completed_at": completed_at}
+            for task_id, output, completed_at in rows
+        }
+
+    def compact(self, workflow_id: str) -> int:
+        """
+        Fold a workflow's log tail into its compacted rows.
+
+        Args:
+            workflow_id: Workflow ID
+
+        Returns:
+            Number of log rows folded
+        """
+        with self._lock:
+            return self._compact(workflow_id)
+
+    def delete(self, workflow_id: str) -> None:
+        """
+        Drop all checkpoints of a workflow.
+
+        Args:
+            workflow_id: Workflow ID
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table in ("checkpoint_log", "checkpoint_tasks"):
+                    self._conn.execute(
+                        f"DELETE FROM {table} WHERE workflow_id = ?", (workflow_id,)
+                    )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._tail[workflow_id] = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _tail_length(self, workflow_id: str) -> int:
+        """Number of uncompacted log rows for a workflow."""
+        if workflow_id not in self._tail:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM checkpoint_log WHERE workflow_id = ?",
+                (workflow_id,),
+            ).fetchone()
+            self._tail[workflow_id] = count
+        return self._tail[workflow_id]
+
+    def _compact(self, workflow_id: str) -> int:
+        """Compact under the caller's lock; later log rows win."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            (last,) = self._conn.execute(
+                "SELECT MAX(seq) FROM checkpoint_log WHERE workflow_id = ?",
+                (workflow_id,),
+            ).fetchone()
+            folded = 0
+            if last is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoint_tasks "
+                    "SELECT workflow_id, task_id, output, completed_at "
+                    "FROM checkpoint_log WHERE workflow_id = ? AND seq <= ? "
+                    "ORDER BY seq",
+                    (workflow_id, last),
+                )
+                folded = self._conn.execute(
+                    "DELETE FROM checkpoint_log WHERE workflow_id = ? AND seq <= ?",
+                    (workflow_id, last),
+                ).rowcount
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._tail[workflow_id] = 0
+        return folded
+
+
 class WorkflowEngine:
     """
     Advanced workflow execution engine.
@@ -463,6 +927,8 @@ class WorkflowEngine:
         self,
         redis_url: str = "redis://localhost:6379",
         task_orchestrator: Optional[TaskOrchestrator] = None,
+        max_concurrency: int = 16,
+        checkpoint_path: Optional[str] = None,
     ):
         """
         Initialize workflow engine.
@@ -470,11 +936,26 @@ class WorkflowEngine:
         Args:
             redis_url: Redis connection URL for state storage
             task_orchestrator: TaskOrchestrator instance for task execution
+            max_concurrency: Default ceiling on tasks in flight during
+                parallel execution
+            checkpoint_path: SQLite file for the task checkpoint log; None
+                disables checkpointing
+
+        Raises:
+            ValueError: If max_concurrency is less than 1
         """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         self.redis_url = redis_url
         self.redis_client = redis.from_url(redis_url, decode_responses=True)
         self.orchestrator = task_orchestrator or TaskOrchestrator(redis_url)
+        self.max_concurrency = max_concurrency
         self.workflows: Dict[str, Workflow] = {}
+        self.checkpoints = CheckpointLog(checkpoint_path) if checkpoint_path else None
+        # In-flight parallel tasks by task_id, for cancel_task
+        self._running: Dict[str, asyncio.Future] = {}
+        self._paused: Set[str] = set()
         self.templates: Dict[str, WorkflowTemplate] = {
             "tdd": TDDWorkflow,
             "feature_development": FeatureDevelopmentWorkflow,
@@ -527,6 +1008,85 @@ class WorkflowEngine:
 
         return workflow
 
+    def execute_workflow(
+        self, workflow_id: str, max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a registered workflow, skipping tasks already checkpointed.
+
+        Tasks run level by level in dependency order, each level through
+        stream_parallel. Every completed task is appended to the checkpoint
+        log as it finishes, so an engine restarted after a crash or pause
+        picks up at the first unfinished task. Pausing the workflow stops
+        new tasks from starting; tasks already running finish and are
+        checkpointed.
+
+        Args:
+            workflow_id: Workflow ID
+            max_concurrency: Tasks allowed in flight (default: engine setting)
+
+        Returns:
+            Workflow state as returned by get_workflow_state
+
+        Raises:
+            ValueError: If workflow not found or its dependencies are invalid
+            RuntimeError: If a task fails
+        """
+        workflow = self.workflows.get(workflow_id)
+        if not workflow:
+            raise ValueError(f"Workflow {workflow_id} not found")
+        workflow.validate_dependencies()
+
+        self._restore_checkpoint(workflow)
+        for task in workflow.tasks:
+            if task.status != TaskStatus.COMPLETED:
+                task.status = TaskStatus.PENDING
+                task.error = None
+        workflow.tasks_failed = 0
+        workflow.status = WorkflowStatus.RUNNING
+        workflow.started_at = workflow.started_at or datetime.now(timezone.utc)
+        self._save_workflow_state(workflow)
+
+        def unpaused(level: List[Task]) -> Iterable[Task]:
+            for task in level:
+                if workflow_id in self._paused:
+                    return
+                yield task
+
+        async def run_levels() -> Optional[Task]:
+            for level in self._dependency_levels(workflow):
+                async for task in self.stream_parallel(
+                    unpaused(level), None, max_concurrency, FailureMode.FAIL_FAST
+                ):
+                    if task.status == TaskStatus.COMPLETED:
+                        workflow.tasks_completed += 1
+                        if self.checkpoints is not None:
+                            self.checkpoints.append(workflow_id, task)
+                    elif task.status == TaskStatus.FAILED:
+                        workflow.tasks_failed += 1
+                        return task
+                if workflow_id in self._paused:
+                    break
+            return None
+
+        failed = asyncio.run(run_levels())
+        if failed is not None:
+            workflow.status = WorkflowStatus.FAILED
+        elif all(t.status == TaskStatus.COMPLETED for t in workflow.tasks):
+            workflow.status = WorkflowStatus.COMPLETED
+        if workflow.status != WorkflowStatus.RUNNING:
+            workflow.completed_at = datetime.now(timezone.utc)
+        if self.checkpoints is not None:
+            self.checkpoints.compact(workflow_id)
+        self._save_workflow_state(workflow)
+
+        if failed is not None:
+            raise RuntimeError(
+                f"Workflow {workflow_id} failed at task {failed.task_id}: "
+                f"{failed.error}"
+            )
+        return self.get_workflow_state(workflow_id)
+
     @flow(name="execute_sequential_tasks", task_runner=ConcurrentTaskRunner())
     def execute_sequential(
         self, tasks: List[Task], context: Optional[Dict[str, Any]] = None
@@ -589,19 +1149,26 @@ class WorkflowEngine:
 
         return results
 
-    @flow(name="execute_parallel_tasks", task_runner=ConcurrentTaskRunner())
     def execute_parallel(
-        self, tasks: List[Task], context: Optional[Dict[str, Any]] = None
+        self,
+        tasks: List[Task],
+        context: Optional[Dict[str, Any]] = None,
+        max_concurrency: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Execute tasks in parallel (all simultaneously).
+        Execute tasks in parallel with a bounded number in flight.
+
+        Blocking wrapper around stream_parallel. The first failure stops
+        new tasks from starting and cancels the ones still running.
 
         Args:
             tasks: List of tasks to execute
-            context: Execution context shared across tasks
+            context: Execution context shared read-only across tasks
+            max_concurrency: Tasks allowed in flight (default: engine setting)
 
         Returns:
-            List of task results (order may vary)
+            List of task results in the order the tasks were given (None
+            for tasks cancelled with cancel_task)
 
         Raises:
             ValueError: If tasks list is empty
@@ -610,55 +1177,145 @@ class WorkflowEngine:
         if not tasks:
             raise ValueError("Tasks list cannot be empty")
 
-        logger = get_run_logger()
         logger.info(f"Executing {len(tasks)} tasks in parallel")
 
-        execution_context = context or {}
+        async def drain() -> List[Task]:
+            return [
+                task
+                async for task in self.stream_parallel(
+                    tasks, context, max_concurrency, FailureMode.FAIL_FAST
+                )
+            ]
 
-        # Create Prefect tasks for parallel execution
-        @prefect_task
-        def execute_task_wrapper(task: Task) -> Dict[str, Any]:
-            """Wrapper for parallel task execution."""
-            try:
-                task.status = TaskStatus.RUNNING
-                task.started_at = datetime.now(timezone.utc)
+        finished = asyncio.run(drain())
+        failed = next((t for t in finished if t.status == TaskStatus.FAILED), None)
+        if failed is not None:
+            for task in tasks:
+                if task.status == TaskStatus.PENDING:
+                    task.status = TaskStatus.CANCELLED
+            raise RuntimeError(f"Parallel execution failed: {failed.error}")
 
-                # Add shared context
-                task.input_data["context"] = execution_context
+        return [task.output for task in tasks]
 
-                # Execute task
-                result = self._execute_single_task(task)
+    async def stream_parallel(
+        self,
+        tasks: Iterable[Task],
+        context: Optional[Mapping[str, Any]] = None,
+        max_concurrency: Optional[int] = None,
+        failure_mode: FailureMode = FailureMode.CONTINUE,
+    ) -> AsyncIterator[Task]:
+        """
+        Run tasks concurrently and yield each one as it finishes.
+
+        At most max_concurrency tasks are in flight. Tasks are pulled from
+        the iterable only when a slot frees up, and a slot only frees up
+        once the consumer has taken the finished task, so a slow consumer
+        or a generator of tasks is never run ahead of. Every task sees the
+        shared context through its own overlay in input_data["context"]:
+        reads fall through to the shared mapping, writes stay with the task,
+        and the context itself is never copied. Nested values are shared, so
+        tasks must not mutate them in place.
+
+        Yielded tasks carry their final status, output and error. Tasks
+        whose status is already CANCELLED when reached are yielded without
+        running; running ones can be stopped with cancel_task. With
+        FAIL_FAST the first failure cancels the tasks in flight and no new
+        ones are started. Closing the generator early cancels whatever is
+        still running.
 
-                task.status = TaskStatus.COMPLETED
-                task.completed_at = datetime.now(timezone.utc)
-                task.output = result
+        Args:
+            tasks: Tasks to execute, consumed lazily
+            context: Execution context shared read-only across tasks
+            max_concurrency: Tasks allowed in flight (default: engine setting)
+            failure_mode: Whether a failure stops the remaining tasks
 
-                return result
+        Yields:
+            Each task once it has completed, failed or been cancelled
 
-            except Exception as e:
-                task.status = TaskStatus.FAILED
-                task.error = str(e)
-                task.completed_at = datetime.now(timezone.utc)
-                raise
+        Raises:
+            ValueError: If max_concurrency is less than 1
+        """
+        limit = max_concurrency or self.max_concurrency
+        if limit < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        shared = MappingProxyType({} if context is None else context)
+        pending = iter(tasks)
+        exhausted = False
+        stopped = False
+        running: Dict[asyncio.Future, Task] = {}
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=limit, thread_name_prefix="workflow-parallel"
+        )
 
-        # Submit all tasks for parallel execution
-        futures = []
-        for task in tasks:
-            future = execute_task_wrapper.submit(task)
-            futures.append(future)
+        try:
+            while True:
+                while not (exhausted or stopped) and len(running) < limit:
+                    task = next(pending, None)
+                    if task is None:
+                        exhausted = True
+                    elif task.status == TaskStatus.CANCELLED:
+                        yield task
+                    else:
+                        future = asyncio.ensure_future(
+                            self._run_parallel_task(task, shared, loop, executor)
+                        )
+                        running[future] = task
+                        self._running[task.task_id] = future
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    task = running.pop(future)
+                    self._running.pop(task.task_id, None)
+                    task.completed_at = datetime.now(timezone.utc)
+                    if future.cancelled():
+                        task.status = TaskStatus.CANCELLED
+                    elif future.exception() is not None:
+                        task.status = TaskStatus.FAILED
+                        task.error = str(future.exception())
+                        logger.error(
+                            f"Parallel task {task.task_id} failed: {task.error}"
+                        )
+                        if failure_mode == FailureMode.FAIL_FAST and not stopped:
+                            stopped = True
+                            for other in running:
+                                other.cancel()
+                    else:
+                        task.status = TaskStatus.COMPLETED
+                        task.output = future.result()
+                    yield task
+        finally:
+            for future, task in running.items():
+                future.cancel()
+                task.status = TaskStatus.CANCELLED
+                self._running.pop(task.task_id, None)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        Cancel a task running under stream_parallel or execute_parallel.
 
-        # Wait for all tasks to complete
-        results = []
-        for idx, future in enumerate(futures):
-            try:
-                result = future.result()
-                results.append(result)
-                logger.info(f"Parallel task {idx + 1} completed")
-            except Exception as e:
-                logger.error(f"Parallel task {idx + 1} failed: {str(e)}")
-                raise RuntimeError(f"Parallel execution failed: {str(e)}") from e
+        Safe to call from any thread. A synchronous task body already on a
+        worker thread runs to completion, but its result is discarded and
+        the task is reported as CANCELLED.
 
-        return results
+        Args:
+            task_id: Task identifier
+
+        Returns:
+            True if the task was in flight, False otherwise
+        """
+        future = self._running.get(task_id)
+        if future is None:
+            return False
+        future.get_loop().call_soon_threadsafe(future.cancel)
+        return True
 
     @flow(
         name="execute_conditional_tasks",
@@ -729,7 +1386,9 @@ class WorkflowEngine:
         """
         Evaluate a conditional expression.
 
-        Supports operators: ==, !=, >, <, >=, <=, contains, in, and, or, not
+        Supports operators: ==, !=, >, <, >=, <=, contains, in, not in,
+        and, or, not, with Python precedence and parentheses. The
+        expression is compiled once by compile_condition() and cached.
 
         Args:
             condition_expr: Condition expression to evaluate
@@ -739,141 +1398,19 @@ class WorkflowEngine:
             Boolean result of condition evaluation
 
         Raises:
-            ValueError: If expression is invalid
-            RuntimeError: If evaluation fails
+            ValueError: If expression is empty
+            RuntimeError: If the expression is malformed or evaluation fails
         """
         if not condition_expr or not condition_expr.strip():
             raise ValueError("Condition expression cannot be empty")
 
         try:
-            # Handle compound conditions (and, or)
-            if " and " in condition_expr.lower():
-                parts = re.split(r"\s+and\s+", condition_expr, flags=re.IGNORECASE)
-                return all(
-                    self.evaluate_condition(part.strip(), context) for part in parts
-                )
-
-            if " or " in condition_expr.lower():
-                parts = re.split(r"\s+or\s+", condition_expr, flags=re.IGNORECASE)
-                return any(
-                    self.evaluate_condition(part.strip(), context) for part in parts
-                )
-
-            # Handle negation
-            if condition_expr.strip().lower().startswith("not "):
-                inner_expr = condition_expr.strip()[4:].strip()
-                return not self.evaluate_condition(inner_expr, context)
-
-            # Handle comparison operators
-            operators = [
-                (">=", lambda a, b: a >= b),
-                ("<=", lambda a, b: a <= b),
-                ("==", lambda a, b: a == b),
-                ("!=", lambda a, b: a != b),
-                (">", lambda a, b: a > b),
-                ("<", lambda a, b: a < b),
-            ]
-
-            for op, func in operators:
-                if op in condition_expr:
-                    left, right = condition_expr.split(op, 1)
-                    left_val = self._resolve_value(left.strip(), context)
-                    right_val = self._resolve_value(right.strip(), context)
-                    return func(left_val, right_val)
-
-            # Handle 'contains' operator
-            if " contains " in condition_expr.lower():
-                parts = re.split(r"\s+contains\s+", condition_expr, flags=re.IGNORECASE)
-                if len(parts) != 2:
-                    raise ValueError("Invalid 'contains' expression")
-                left_val = self._resolve_value(parts[0].strip(), context)
-                right_val = self._resolve_value(parts[1].strip(), context)
-                return right_val in str(left_val)
-
-            # Handle 'in' operator
-            if " in " in condition_expr.lower():
-                parts = re.split(r"\s+in\s+", condition_expr, flags=re.IGNORECASE)
-                if len(parts) != 2:
-                    raise ValueError("Invalid 'in' expression")
-                left_val = self._resolve_value(parts[0].strip(), context)
-                right_val = self._resolve_value(parts[1].strip(), context)
-
-                # Handle list/set membership
-                if isinstance(right_val, (list, set, tuple)):
-                    return left_val in right_val
-                return left_val in str(right_val)
-
-            # Handle boolean literals
-            if condition_expr.strip().lower() == "true":
-                return True
-            if condition_expr.strip().lower() == "false":
-                return False
-
-            # Handle variable evaluation (treat as truthy check)
-            value = self._resolve_value(condition_expr.strip(), context)
-            return bool(value)
-
+            return bool(compile_condition(condition_expr)(context))
         except Exception as e:
             raise RuntimeError(
                 f"Failed to evaluate condition '{condition_expr}': {str(e)}"
             ) from e
 
-    def _resolve_value(self, expr: str, context: Dict[str, Any]) -> Any:
-        """
-        Resolve a value from expression or context.
-
-        Args:
-            expr: Expression to resolve
-            context: Context for variable lookup
-
-        Returns:
-            Resolved value
-        """
-        # Remove quotes if present
-        if (expr.startswith('"') and expr.endswith('"')) or (
-            expr.startswith("'") and expr.endswith("'")
-        ):
-            return expr[1:-1]
-
-        # Try to parse as number
-        try:
-            if "." in expr:
-                return float(expr)
-            return int(expr)
-        except ValueError:
-            pass
-
-        # Try to parse as boolean
-        if expr.lower() == "true":
-            return True
-        if expr.lower() == "false":
-            return False
-
-        # Try to parse as None
-        if expr.lower() == "none":
-            return None
-
-        # Try to parse as list
-        if expr.startswith("[") and expr.endswith("]"):
-            try:
-                return json.loads(expr)
-            except json.JSONDecodeError:
-                pass
-
-        # Resolve from context (support nested access with dot notation)
-        if "." in expr:
-            parts = expr.split(".")
-            value = context
-            for part in parts:
-                if isinstance(value, dict):
-                    value = value.get(part)
-                else:
-                    return None
-            return value
-
-        # Simple context lookup
-        return context.get(expr, expr)
-
     def generate_dynamic_tasks(
         self,
         generator_func: Callable[[Dict[str, Any]], List[Task]],
@@ -930,6 +1467,11 @@ class WorkflowEngine:
         if workflow.status != WorkflowStatus.RUNNING:
             return False
 
+        # Stop execute_workflow from starting further tasks
+        self._paused.add(workflow_id)
+        if self.checkpoints is not None:
+            self.checkpoints.compact(workflow_id)
+
         # Save current state to Redis
         state = {
             "workflow_id": workflow_id,
@@ -957,6 +1499,11 @@ class WorkflowEngine:
         """
         Resume a paused workflow.
 
+        Task states come from the paused snapshot in Redis and, when
+        checkpointing is enabled, from the checkpoint log, which also lets a
+        restarted engine resume a workflow that was never paused. Call
+        execute_workflow afterwards to run the remaining tasks.
+
         Args:
             workflow_id: Workflow ID to resume
 
@@ -969,11 +1516,12 @@ class WorkflowEngine:
         # Retrieve paused state from Redis
         state_key = f"workflow:paused:{workflow_id}"
         state_data = self.redis_client.get(state_key)
+        checkpointed = self.checkpoints.load(workflow_id) if self.checkpoints else {}
 
-        if not state_data:
+        if not state_data and not checkpointed:
             raise ValueError(f"No paused state found for workflow {workflow_id}")
 
-        state = json.loads(state_data)
+        state = json.loads(state_data) if state_data else {"status": "paused"}
 
         if state.get("status") != "paused":
             return False
@@ -990,9 +1538,11 @@ class WorkflowEngine:
                 task.status = TaskStatus(saved_state["status"])
                 if saved_state.get("output"):
                     task.output = saved_state["output"]
+        self._restore_checkpoint(workflow, checkpointed)
 
         # Delete paused state
         self.redis_client.delete(state_key)
+        self._paused.discard(workflow_id)
 
         return True
 
@@ -1016,6 +1566,19 @@ class WorkflowEngine:
             state_data = self.redis_client.get(state_key)
             if state_data:
                 return json.loads(state_data)
+            checkpointed = (
+                self.checkpoints.load(workflow_id) if self.checkpoints else {}
+            )
+            if checkpointed:
+                return {
+                    "workflow_id": workflow_id,
+                    "status": "checkpointed",
+                    "tasks_completed": len(checkpointed),
+                    "tasks": [
+                        {"task_id": task_id, "status": "completed", **entry}
+                        for task_id, entry in checkpointed.items()
+                    ],
+                }
             raise ValueError(f"Workflow {workflow_id} not found")
 
         return {
@@ -1047,6 +1610,101 @@ class WorkflowEngine:
             ],
         }
 
+    def _restore_checkpoint(
+        self,
+        workflow: Workflow,
+        checkpointed: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> int:
+        """
+        Mark checkpointed tasks of a workflow as completed.
+
+        Args:
+            workflow: Workflow to update in place
+            checkpointed: Entries already loaded from the checkpoint log
+
+        Returns:
+            Number of tasks restored
+        """
+        if checkpointed is None:
+            if self.checkpoints is None:
+                return 0
+            checkpointed = self.checkpoints.load(workflow.workflow_id)
+
+        restored = 0
+        for task in workflow.tasks:
+            entry = checkpointed.get(task.task_id)
+            if entry is None:
+                continue
+            task.status = TaskStatus.COMPLETED
+            task.output = entry["output"]
+            task.completed_at = datetime.fromisoformat(entry["completed_at"])
+            restored += 1
+        workflow.tasks_completed = sum(
+            t.status == TaskStatus.COMPLETED for t in workflow.tasks
+        )
+        return restored
+
+    @staticmethod
+    def _dependency_levels(workflow: Workflow) -> List[List[Task]]:
+        """
+        Group the unfinished tasks of a workflow into dependency levels.
+
+        A task's level is one more than the deepest of its dependencies, so
+        every level only depends on earlier ones.
+        """
+        tasks = {task.task_id: task for task in workflow.tasks}
+        dependents = workflow.get_dependents()
+        waiting = {task.task_id: len(task.depends_on) for task in workflow.tasks}
+        depth = {task_id: 0 for task_id in tasks}
+        queue = [task_id for task_id, count in waiting.items() if count == 0]
+        while queue:
+            task_id = queue.pop()
+            for dependent in dependents.get(task_id, []):
+                depth[dependent] = max(depth[dependent], depth[task_id] + 1)
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    queue.append(dependent)
+
+        levels: List[List[Task]] = [
+            [] for _ in range(max(depth.values(), default=0) + 1)
+        ]
+        for task in workflow.tasks:
+            if task.status != TaskStatus.COMPLETED:
+                levels[depth[task.task_id]].append(task)
+        return [level for level in levels if level]
+
+    async def _run_parallel_task(
+        self,
+        task: Task,
+        shared: Mapping[str, Any],
+        loop: asyncio.AbstractEventLoop,
+        executor: ThreadPoolExecutor,
+    ) -> Dict[str, Any]:
+        """
+        Run one parallel task body within its timeout.
+
+        The task gets a copy-on-write view of the shared context for the
+        duration of the call only, so finished tasks do not pin it.
+
+        Raises:
+            TimeoutError: If the task exceeds task.timeout seconds
+        """
+        task.status = TaskStatus.RUNNING
+        task.started_at = datetime.now(timezone.utc)
+        task.input_data["context"] = ChainMap({}, shared)
+        try:
+            if inspect.iscoroutinefunction(self._execute_single_task):
+                call = self._execute_single_task(task)
+            else:
+                call = loop.run_in_executor(executor, self._execute_single_task, task)
+            return await asyncio.wait_for(call, timeout=task.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Task {task.task_id} timed out after {task.timeout}s"
+            ) from None
+        finally:
+            task.input_data.pop("context", None)
+
     def _execute_single_task(self, task: Task) -> Dict[str, Any]:
         """
         Execute a single task (delegates to orchestrator).